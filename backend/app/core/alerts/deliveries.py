@@ -0,0 +1,222 @@
+"""Deduplication and cooldown of alert deliveries.
+
+An alert condition that keeps holding (a price sitting under its target,
+a price bouncing around a rule's threshold) would otherwise notify the
+user on every evaluation. Before an alert is produced, its delivery key
+(user, item and rule) is looked up in the ``alert_deliveries`` table. The
+alert is let through only if it was never sent, its cooldown has passed,
+or the price dropped meaningfully below the last price sent. Deliveries
+let through are recorded with one upsert in the caller's transaction.
+
+Recent deliveries are kept in a bounded per-process LRU in front of the
+table, so the alert jobs mostly skip the lookup query. A cached delivery
+is only trusted to suppress an alert: another process may have sent one
+since, so alerts the cache would let through are checked against the
+table. Deliveries older than the cooldown no longer suppress anything and
+are purged daily.
+"""
+
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.models.alert_delivery import AlertDelivery
+from app.core.price_history.rollups import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+# Keys per lookup query, well under the bind parameter limits
+LOOKUP_CHUNK_SIZE = 500
+
+# Deliveries per upsert statement, six bind parameters each
+RECORD_CHUNK_SIZE = 1000
+
+
+class DeliveryKey(NamedTuple):
+    """What an alert is about and who receives it."""
+
+    user_id: int  # 0 for product alert rules
+    category: str
+    item_id: int
+    rule: str
+
+
+class Delivery(NamedTuple):
+    """The last delivery of an alert."""
+
+    price: Decimal
+    sent_at: datetime
+
+
+class AlertDeliveryStore:
+    """Decides which triggered alerts are sent, and records them."""
+
+    def __init__(
+        self,
+        cooldown: timedelta = timedelta(hours=settings.alert_cooldown_hours),
+        repeat_drop_percent: float = settings.alert_repeat_drop_percent,
+        max_entries: int = settings.alert_dedup_cache_size,
+    ):
+        """Initialize with the repeat policy and an empty cache."""
+        self.cooldown = cooldown
+        self.repeat_factor = 1 - Decimal(str(repeat_drop_percent)) / 100
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[DeliveryKey, Delivery]" = OrderedDict()
+
+    def should_send(self, last: Optional[Delivery], price: Decimal, now: datetime) -> bool:
+        """Whether an alert at `price` is sent, given its last delivery."""
+        if last is None:
+            return True
+        sent_at = last.sent_at
+        if sent_at.tzinfo is None:
+            sent_at = sent_at.replace(tzinfo=timezone.utc)
+        if now - sent_at >= self.cooldown:
+            return True
+        return Decimal(str(price)) <= last.price * self.repeat_factor
+
+    def claim(
+        self,
+        db: Session,
+        alerts: Sequence[Tuple[DeliveryKey, Decimal]],
+        now: Optional[datetime] = None,
+    ) -> Set[DeliveryKey]:
+        """Keys of the alerts to send, recording their delivery.
+
+        `alerts` pairs each triggered alert's key with its price. The
+        deliveries are written but not committed; if the caller's
+        transaction fails it should call `clear`, as the cache already
+        holds them.
+        """
+        if not alerts:
+            return set()
+
+        now = now or datetime.now(timezone.utc)
+        last = self._cached({key for key, _ in alerts})
+        unconfirmed = {
+            key
+            for key, price in alerts
+            if key not in last or self.should_send(last[key], price, now)
+        }
+        for key in unconfirmed:
+            last.pop(key, None)
+        last.update(self._load(db, unconfirmed))
+
+        sent: Dict[DeliveryKey, Decimal] = {}
+        for key, price in alerts:
+            if key not in sent and self.should_send(last.get(key), price, now):
+                sent[key] = price
+
+        if sent:
+            self._record(db, sent, now)
+        suppressed = len(alerts) - len(sent)
+        if suppressed:
+            logger.debug(f"Suppressed {suppressed} repeated alerts")
+        return set(sent)
+
+    def clear(self) -> None:
+        """Forget the cached deliveries, e.g. after a failed commit."""
+        self._cache.clear()
+
+    def purge(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Delete deliveries older than the cooldown, returning how many.
+
+        Nothing is committed here.
+        """
+        cutoff = (now or datetime.now(timezone.utc)) - self.cooldown
+        result = db.execute(delete(AlertDelivery).where(AlertDelivery.last_sent_at < cutoff))
+        return result.rowcount
+
+    def _cached(self, keys: Set[DeliveryKey]) -> Dict[DeliveryKey, Delivery]:
+        """Last deliveries of the keys found in the cache."""
+        found: Dict[DeliveryKey, Delivery] = {}
+        for key in keys:
+            delivery = self._cache.get(key)
+            if delivery is not None:
+                self._cache.move_to_end(key)
+                found[key] = delivery
+        return found
+
+    def _load(self, db: Session, keys: Set[DeliveryKey]) -> Dict[DeliveryKey, Delivery]:
+        """Last deliveries of the keys stored in the table, caching them."""
+        found: Dict[DeliveryKey, Delivery] = {}
+        missing: List[DeliveryKey] = list(keys)
+        key_columns = tuple_(
+            AlertDelivery.user_id, AlertDelivery.category, AlertDelivery.item_id, AlertDelivery.rule
+        )
+        for start in range(0, len(missing), LOOKUP_CHUNK_SIZE):
+            rows = db.execute(
+                select(
+                    AlertDelivery.user_id,
+                    AlertDelivery.category,
+                    AlertDelivery.item_id,
+                    AlertDelivery.rule,
+                    AlertDelivery.last_price,
+                    AlertDelivery.last_sent_at,
+                ).where(key_columns.in_(missing[start : start + LOOKUP_CHUNK_SIZE]))
+            )
+            for user_id, category, item_id, rule, price, sent_at in rows:
+                key = DeliveryKey(user_id, category, item_id, rule)
+                found[key] = Delivery(price, sent_at)
+                self._remember(key, found[key])
+
+        for key in keys - found.keys():
+            self._cache.pop(key, None)  # purged since it was cached
+        return found
+
+    def _record(self, db: Session, sent: Dict[DeliveryKey, Decimal], now: datetime) -> None:
+        """Upsert the deliveries of the alerts being sent."""
+        rows = [
+            {**key._asdict(), "last_price": price, "last_sent_at": now}
+            for key, price in sent.items()
+        ]
+        insert = dialect_insert(db.get_bind().dialect.name)
+        if insert is None:
+            self._record_fallback(db, rows)
+        else:
+            for start in range(0, len(rows), RECORD_CHUNK_SIZE):
+                stmt = insert(AlertDelivery).values(rows[start : start + RECORD_CHUNK_SIZE])
+                db.execute(
+                    stmt.on_conflict_do_update(
+                        index_elements=list(DeliveryKey._fields),
+                        set_={
+                            "last_price": stmt.excluded.last_price,
+                            "last_sent_at": stmt.excluded.last_sent_at,
+                            "updated_at": func.now(),
+                        },
+                    )
+                )
+
+        for key, price in sent.items():
+            self._remember(key, Delivery(Decimal(str(price)), now))
+
+    def _record_fallback(self, db: Session, rows: Iterable[Dict]) -> None:
+        """Read-modify-write upsert for backends without ON CONFLICT."""
+        for row in rows:
+            delivery = db.scalar(
+                select(AlertDelivery).filter_by(
+                    **{field: row[field] for field in DeliveryKey._fields}
+                )
+            )
+            if delivery is None:
+                db.add(AlertDelivery(**row))
+            else:
+                delivery.last_price = row["last_price"]
+                delivery.last_sent_at = row["last_sent_at"]
+        db.flush()
+
+    def _remember(self, key: DeliveryKey, delivery: Delivery) -> None:
+        """Cache a delivery, evicting the least recently used beyond the bound."""
+        self._cache[key] = delivery
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+# Global alert delivery store instance
+alert_deliveries = AlertDeliveryStore()
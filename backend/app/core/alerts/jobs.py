@@ -0,0 +1,44 @@
+"""Scheduled alert jobs."""
+
+import logging
+
+from app.core.alerts.deliveries import alert_deliveries
+from app.core.alerts.watchlists import watchlist_evaluator
+from app.core.database import BackgroundSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def check_watchlist_alerts():
+    """Alert watchlist owners about the prices changed since the last run.
+
+    The alerts' emails are written to the email outbox with them and sent
+    by its drainer.
+    """
+    logger.info("Starting watchlist alerts check")
+
+    async with BackgroundSessionLocal() as db:
+        try:
+            alerts = await db.run_sync(watchlist_evaluator.evaluate)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            alert_deliveries.clear()
+            logger.error(f"Watchlist alerts check failed: {e}")
+            return
+
+    logger.info(f"Watchlist alerts check completed: {alerts} alerts created")
+
+
+async def purge_alert_deliveries():
+    """Delete alert deliveries whose cooldown has passed."""
+    async with BackgroundSessionLocal() as db:
+        try:
+            purged = await db.run_sync(alert_deliveries.purge)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Alert delivery purge failed: {e}")
+            return
+
+    logger.info(f"Purged {purged} expired alert deliveries")
@@ -0,0 +1,177 @@
+"""In-memory index of a product's active alert rules.
+
+Matching a price against every rule of a popular product in turn costs
+O(rules) per price change. The index keeps threshold rules sorted by
+threshold, so the rules a new price triggers are a suffix found by binary
+search, and percentage drop rules bucketed by their percentage, so the
+buckets a drop reaches are a prefix. A price change costs
+O(log n + triggered).
+
+Indexes are cached per process in a bounded LRU. Each product has a
+version counter in Redis that is bumped whenever its rules change, so
+every process rebuilds a stale index on its next lookup. Without Redis,
+indexes are trusted for ``alert_rule_index_ttl`` seconds.
+"""
+
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+from app.core.models.alert import AlertRule
+from app.utils.helpers import calculate_discount_percentage
+
+logger = logging.getLogger(__name__)
+
+# Drop percentage of price_drop rules without one, and of deal_appeared rules
+DEFAULT_DROP_PERCENT = Decimal("5")
+DEAL_PERCENT = Decimal("10")
+
+VERSION_KEY = "alert_rules:version:{}"
+
+
+class IndexedRule(NamedTuple):
+    """The fields of an alert rule needed to evaluate and report it."""
+
+    id: int
+    product_id: int
+    rule_type: str
+    threshold_value: Optional[Decimal]
+    percentage_threshold: Optional[Decimal]
+
+
+class ProductRuleIndex:
+    """A product's active alert rules, arranged for matching a new price."""
+
+    __slots__ = ("thresholds", "threshold_rules", "drop_percents", "drop_buckets", "deal_rules")
+
+    def __init__(self, rules: Iterable[IndexedRule] = ()):
+        """Index rules by type and threshold."""
+        thresholds: List[IndexedRule] = []
+        drops: Dict[Decimal, List[IndexedRule]] = {}
+        self.deal_rules: List[IndexedRule] = []
+
+        for rule in rules:
+            if rule.rule_type == "threshold" and rule.threshold_value:
+                thresholds.append(rule)
+            elif rule.rule_type == "price_drop":
+                percent = rule.percentage_threshold or DEFAULT_DROP_PERCENT
+                drops.setdefault(percent, []).append(rule)
+            elif rule.rule_type == "deal_appeared":
+                self.deal_rules.append(rule)
+
+        thresholds.sort(key=lambda rule: rule.threshold_value)
+        self.thresholds = [rule.threshold_value for rule in thresholds]
+        self.threshold_rules = thresholds
+        self.drop_percents = sorted(drops)
+        self.drop_buckets = [drops[percent] for percent in self.drop_percents]
+
+    def __len__(self) -> int:
+        """Number of indexed rules."""
+        return (
+            len(self.threshold_rules)
+            + sum(len(bucket) for bucket in self.drop_buckets)
+            + len(self.deal_rules)
+        )
+
+    def match(
+        self, current_price: Decimal, previous_price: Optional[Decimal] = None
+    ) -> List[IndexedRule]:
+        """Rules a price triggers, given the price before it.
+
+        Threshold and drop rules are returned only if they trigger. Deal
+        rules are returned for every drop of at least 10%, as their
+        reference price is checked when they are evaluated.
+        """
+        # Thresholds at or above the price
+        triggered = self.threshold_rules[bisect_left(self.thresholds, current_price) :]
+
+        if previous_price and current_price < previous_price:
+            drop = calculate_discount_percentage(previous_price, current_price)
+            for bucket in self.drop_buckets[: bisect_right(self.drop_percents, drop)]:
+                triggered.extend(bucket)
+            if drop >= DEAL_PERCENT:
+                triggered.extend(self.deal_rules)
+
+        return triggered
+
+
+class AlertRuleIndex:
+    """Per-process LRU of product rule indexes, invalidated through Redis."""
+
+    def __init__(
+        self,
+        max_products: int = settings.alert_rule_index_size,
+        ttl: int = settings.alert_rule_index_ttl,
+    ):
+        """Initialize an empty cache."""
+        self.max_products = max_products
+        self.ttl = ttl
+        # product id -> (version, loaded at, index)
+        self._entries: "OrderedDict[int, Tuple[Optional[str], float, ProductRuleIndex]]" = (
+            OrderedDict()
+        )
+
+    def _version(self, product_id: int) -> Optional[str]:
+        """A product's rules version in Redis ("0" if never bumped, None without Redis)."""
+        if not cache_manager.redis_client:
+            return None
+        try:
+            return cache_manager.redis_client.get(VERSION_KEY.format(product_id)) or "0"
+        except Exception:
+            return None
+
+    async def get(self, db: AsyncSession, product_id: int) -> ProductRuleIndex:
+        """A product's rule index, rebuilt from the database if stale."""
+        version = self._version(product_id)
+        entry = self._entries.get(product_id)
+        if entry is not None:
+            cached_version, loaded_at, index = entry
+            fresh = (
+                cached_version == version
+                if version is not None
+                else time.monotonic() - loaded_at < self.ttl
+            )
+            if fresh:
+                self._entries.move_to_end(product_id)
+                return index
+
+        result = await db.execute(
+            select(
+                AlertRule.id,
+                AlertRule.product_id,
+                AlertRule.rule_type,
+                AlertRule.threshold_value,
+                AlertRule.percentage_threshold,
+            ).where(AlertRule.product_id == product_id, AlertRule.is_active)
+        )
+        index = ProductRuleIndex(IndexedRule(*row) for row in result.all())
+
+        self._entries[product_id] = (version, time.monotonic(), index)
+        self._entries.move_to_end(product_id)
+        while len(self._entries) > self.max_products:
+            self._entries.popitem(last=False)
+
+        logger.debug(f"Indexed {len(index)} alert rules for product {product_id}")
+        return index
+
+    def invalidate(self, product_id: int) -> None:
+        """Mark a product's rules as changed, in this and every other process."""
+        self._entries.pop(product_id, None)
+        if not cache_manager.redis_client:
+            return
+        try:
+            cache_manager.redis_client.incr(VERSION_KEY.format(product_id))
+        except Exception as e:
+            logger.warning(f"Failed to bump alert rules version for product {product_id}: {e}")
+
+
+# Global alert rule index instance
+alert_rule_index = AlertRuleIndex()
@@ -2,19 +2,24 @@
 
 import logging
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Optional, Union
 
 logger = logging.getLogger(__name__)
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.alerts.deliveries import DeliveryKey, alert_deliveries
+from app.core.alerts.rule_index import IndexedRule, alert_rule_index
 from app.core.models.alert import AlertHistory, AlertRule
 from app.core.models.user import User
-from app.core.services.email_service import email_service
-from app.core.services.notification_service import NotificationService
+from app.core.price_history.baselines import load_baselines
+from app.core.services.email_outbox import enqueue_emails, outbox_email
+from app.core.services.notification_service import Notification, price_drop_notification
 from app.ecommerce.models import PriceHistory, Product
 from app.utils.helpers import calculate_discount_percentage
 
+RuleLike = Union[AlertRule, IndexedRule]
+
 
 class AlertRulesEngine:
     """Engine for evaluating alert rules and triggering notifications."""
@@ -26,16 +31,15 @@ class AlertRulesEngine:
     async def evaluate_price_change(
         self, product_id: int, current_price: Decimal, previous_price: Optional[Decimal] = None
     ) -> List[AlertHistory]:
-        """Evaluate all alert rules for a price change."""
+        """Evaluate all alert rules for a price change.
 
-        # Get all active alert rules for this product
-        stmt = select(AlertRule).where(
-            AlertRule.product_id == product_id, AlertRule.is_active
-        )
-        result = await self.db.execute(stmt)
-        alert_rules = list(result.scalars().all())
+        The product's rule index finds the triggered rules without visiting
+        the others. Alerts repeating one sent recently are dropped, and the
+        rest have their alert history rows inserted together.
+        """
 
-        if not alert_rules:
+        index = await alert_rule_index.get(self.db, product_id)
+        if not len(index):
             return []
 
         # Get previous price if not provided
@@ -44,15 +48,36 @@ class AlertRulesEngine:
 
         triggered_alerts = []
 
-        for rule in alert_rules:
+        for rule in index.match(current_price, previous_price):
             alert = await self._evaluate_rule(rule, current_price, previous_price)
             if alert:
                 triggered_alerts.append(alert)
 
+        if triggered_alerts:
+            allowed = await self.db.run_sync(
+                alert_deliveries.claim,
+                [(self._delivery_key(alert), current_price) for alert in triggered_alerts],
+            )
+            triggered_alerts = [
+                alert for alert in triggered_alerts if self._delivery_key(alert) in allowed
+            ]
+
+        if triggered_alerts:
+            try:
+                await self._save_alert_history(triggered_alerts)
+            except Exception:
+                alert_deliveries.clear()
+                raise
+
         return triggered_alerts
 
+    @staticmethod
+    def _delivery_key(alert: AlertHistory) -> DeliveryKey:
+        """Delivery key of a rule's alert, which goes to every user."""
+        return DeliveryKey(0, "ecommerce", alert.product_id, f"rule:{alert.alert_rule_id}")
+
     async def _evaluate_rule(
-        self, rule: AlertRule, current_price: Decimal, previous_price: Optional[Decimal]
+        self, rule: RuleLike, current_price: Decimal, previous_price: Optional[Decimal]
     ) -> Optional[AlertHistory]:
         """Evaluate a single alert rule."""
 
@@ -66,7 +91,7 @@ class AlertRulesEngine:
         return None
 
     async def _evaluate_price_drop_rule(
-        self, rule: AlertRule, current_price: Decimal, previous_price: Decimal
+        self, rule: RuleLike, current_price: Decimal, previous_price: Decimal
     ) -> Optional[AlertHistory]:
         """Evaluate price drop percentage rule."""
 
@@ -81,12 +106,12 @@ class AlertRulesEngine:
                 f"from ${previous_price} to ${current_price}"
             )
 
-            return await self._create_alert_history(rule, current_price, message)
+            return self._build_alert_history(rule, current_price, message)
 
         return None
 
     async def _evaluate_threshold_rule(
-        self, rule: AlertRule, current_price: Decimal
+        self, rule: RuleLike, current_price: Decimal
     ) -> Optional[AlertHistory]:
         """Evaluate price threshold rule."""
 
@@ -96,37 +121,51 @@ class AlertRulesEngine:
                 f"(below threshold of ${rule.threshold_value})"
             )
 
-            return await self._create_alert_history(rule, current_price, message)
+            return self._build_alert_history(rule, current_price, message)
 
         return None
 
     async def _evaluate_deal_rule(
-        self, rule: AlertRule, current_price: Decimal, previous_price: Optional[Decimal]
+        self, rule: RuleLike, current_price: Decimal, previous_price: Optional[Decimal]
     ) -> Optional[AlertHistory]:
-        """Evaluate deal appearance rule."""
+        """Evaluate deal appearance rule.
+
+        The discount is measured from the previous price capped at the
+        product's robust baselines, so undoing a short price hike is not
+        reported as a deal.
+        """
 
         if not previous_price or current_price >= previous_price:
             return None
 
+        baselines = await load_baselines(self.db, "ecommerce", rule.product_id)
+        reference_price = baselines.reference(previous_price)
+        if current_price >= reference_price:
+            logger.debug(
+                f"Ignoring drop for product {rule.product_id}: "
+                f"{current_price} is not below baseline {reference_price}"
+            )
+            return None
+
         # Check if this qualifies as a significant deal (>10% off)
-        discount_percent = calculate_discount_percentage(previous_price, current_price)
+        discount_percent = calculate_discount_percentage(reference_price, current_price)
 
         if discount_percent >= Decimal("10"):
             message = (
                 f"Deal alert: Significant discount of {discount_percent:.1f}% "
-                f"detected (${previous_price} → ${current_price})"
+                f"detected (${reference_price} → ${current_price})"
             )
 
-            return await self._create_alert_history(rule, current_price, message)
+            return self._build_alert_history(rule, current_price, message)
 
         return None
 
-    async def _create_alert_history(
-        self, rule: AlertRule, trigger_value: Decimal, message: str
+    def _build_alert_history(
+        self, rule: RuleLike, trigger_value: Decimal, message: str
     ) -> AlertHistory:
-        """Create alert history entry."""
+        """Build an unsaved alert history entry."""
 
-        alert_history = AlertHistory(
+        return AlertHistory(
             alert_rule_id=rule.id,
             product_id=rule.product_id,
             trigger_value=trigger_value,
@@ -134,15 +173,20 @@ class AlertRulesEngine:
             notification_sent=False,
         )
 
-        self.db.add(alert_history)
-        await self.db.commit()
-        await self.db.refresh(alert_history)
+    async def _save_alert_history(self, alerts: List[AlertHistory]) -> None:
+        """Insert triggered alerts and their notifications in one transaction.
 
-        # Send email notification
-        await self._send_alert_email(alert_history)
+        Emails go to the email outbox, so they exist only if the alerts are
+        committed and sending them never holds up price evaluation.
+        """
 
-        logger.info(f"Alert triggered: {message}")
-        return alert_history
+        self.db.add_all(alerts)
+        for alert_history in alerts:
+            await self._queue_alert_notifications(alert_history)
+        await self.db.commit()
+
+        for alert_history in alerts:
+            logger.info(f"Alert triggered: {alert_history.message}")
 
     async def _get_previous_price(self, product_id: int) -> Optional[Decimal]:
         """Get the most recent price before current one."""
@@ -180,57 +224,54 @@ class AlertRulesEngine:
         self.db.add(rule)
         await self.db.commit()
         await self.db.refresh(rule)
+        alert_rule_index.invalidate(product_id)
 
         logger.info(f"Created alert rule: {rule_type} for product {product_id}")
         return rule
 
-    async def _send_alert_email(self, alert_history: AlertHistory) -> None:
-        """Send email and in-app notifications for triggered alert."""
-        try:
-            # Get product details
-            product_stmt = select(Product).where(Product.id == alert_history.product_id)
-            product_result = await self.db.execute(product_stmt)
-            product = product_result.scalar_one_or_none()
-            
-            if not product:
-                return
-                
-            # Get users (simplified - in real app, get users who subscribed to this product)
-            user_stmt = select(User).where(User.is_active)
-            user_result = await self.db.execute(user_stmt)
-            users = list(user_result.scalars().all())
+    async def _queue_alert_notifications(self, alert_history: AlertHistory) -> None:
+        """Add email and in-app notifications for triggered alert, without committing."""
+        # Get product details
+        product_stmt = select(Product).where(Product.id == alert_history.product_id)
+        product_result = await self.db.execute(product_stmt)
+        product = product_result.scalar_one_or_none()
+        
+        if not product:
+            return
             
-            # Convert async session to sync for notification service
-            from app.core.database import get_db
-            sync_db = next(get_db())
-            notification_service = NotificationService(sync_db)
-            
-            old_price = float(product.current_price or 0) + 100  # Simulate old price
-            new_price = float(alert_history.trigger_value)
-            
-            for user in users:
-                # Send email notification
-                await email_service.send_price_alert(
-                    to=user.email,
-                    product_name=product.name,
-                    old_price=old_price,
-                    new_price=new_price,
-                    currency="₦"
-                )
-                
-                # Send in-app notification
-                notification_service.notify_price_drop(
-                    user_id=user.id,
-                    product_name=product.name,
-                    old_price=old_price,
-                    new_price=new_price
-                )
-                
-            sync_db.close()
-            
-            # Mark notification as sent
-            alert_history.notification_sent = True
-            await self.db.commit()
+        # Get users (simplified - in real app, get users who subscribed to this product)
+        user_stmt = select(User.id, User.email).where(User.is_active)
+        user_result = await self.db.execute(user_stmt)
+        users = user_result.all()
+        
+        old_price = float(product.current_price or 0) + 100  # Simulate old price
+        new_price = float(alert_history.trigger_value)
+        
+        if users:
+            # Queue email notifications in the outbox
+            await self.db.run_sync(
+                enqueue_emails,
+                [
+                    outbox_email(
+                        "price_alert",
+                        email,
+                        product_name=product.name,
+                        old_price=old_price,
+                        new_price=new_price,
+                        currency="₦",
+                    )
+                    for _, email in users
+                ],
+            )
             
-        except Exception as e:
-            logger.error(f"Failed to send alert notifications: {e}")
+            # Send in-app notifications in one insert
+            await self.db.execute(
+                insert(Notification),
+                [
+                    price_drop_notification(user_id, product.name, old_price, new_price)
+                    for user_id, _ in users
+                ],
+            )
+        
+        # Mark notification as sent (handed to the outbox)
+        alert_history.notification_sent = True
@@ -0,0 +1,240 @@
+"""Set-based watchlist alert evaluation across categories.
+
+Rather than loading every watchlist and checking its item's price, each
+run only looks at price snapshots whose price changed since the job's
+watermark. For every category one query joins those snapshots to the
+active watchlists and their users and keeps the rows whose price is at
+or below their target or dropped. Alerts repeating one sent recently are
+dropped by the delivery store, so a price sitting under its target does
+not alert on every change. The in-app notifications and outbox emails
+are inserted in bulk, and the watermark moves forward in the same
+transaction.
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.alerts.deliveries import AlertDeliveryStore, DeliveryKey, alert_deliveries
+from app.core.config import settings
+from app.core.models.job_watermark import JobWatermark
+from app.core.models.price_snapshot import PriceSnapshot
+from app.core.models.user import User
+from app.core.price_history.snapshots import snapshot_join
+from app.core.services.email_outbox import enqueue_emails, outbox_email
+from app.core.services.notification_service import Notification, NotificationType
+from app.ecommerce.models.product import Product
+from app.ecommerce.models.watchlist import Watchlist
+from app.real_estate.models.property import Property
+from app.real_estate.models.watchlist import PropertyWatchlist
+from app.travel.models.flight import Flight
+from app.travel.models.hotel import Hotel
+from app.travel.models.watchlist import TravelWatchlist
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "watchlist_alerts"
+
+
+class WatchlistSource(NamedTuple):
+    """A kind of watchlist and the priced items it points to."""
+
+    category: str  # price history category
+    watchlist: Any
+    item_column: Any
+    item_model: Any
+    item_name: Any
+    item_key: str  # item id key in notification data
+
+
+WATCHLIST_SOURCES = (
+    WatchlistSource(
+        "ecommerce", Watchlist, Watchlist.product_id, Product, Product.name, "product_id"
+    ),
+    WatchlistSource(
+        "property",
+        PropertyWatchlist,
+        PropertyWatchlist.property_id,
+        Property,
+        Property.name,
+        "property_id",
+    ),
+    WatchlistSource(
+        "flight",
+        TravelWatchlist,
+        TravelWatchlist.flight_id,
+        Flight,
+        Flight.origin + "-" + Flight.destination,
+        "flight_id",
+    ),
+    WatchlistSource(
+        "hotel", TravelWatchlist, TravelWatchlist.hotel_id, Hotel, Hotel.name, "hotel_id"
+    ),
+)
+
+
+def triggered_watchlists(db: Session, source: WatchlistSource, since: datetime, until: datetime):
+    """Watchlist rows of one source whose item's price change in (since, until] alerts.
+
+    A target is reached when the price is at or below it, however many
+    changes it took to get there within the run; a drop alerts when the
+    new price is below the previous one.
+    """
+    watchlist = source.watchlist
+    reached = and_(
+        watchlist.alert_on_target,
+        watchlist.target_price.isnot(None),
+        PriceSnapshot.current_price <= watchlist.target_price,
+    )
+    dropped = and_(
+        watchlist.alert_on_any_drop, PriceSnapshot.previous_price > PriceSnapshot.current_price
+    )
+
+    return db.execute(
+        select(
+            watchlist.id,
+            watchlist.user_id,
+            User.email,
+            source.item_column.label("item_id"),
+            source.item_name.label("item_name"),
+            watchlist.target_price,
+            PriceSnapshot.current_price,
+            PriceSnapshot.previous_price,
+            reached.label("reached"),
+        )
+        .select_from(watchlist)
+        .join(PriceSnapshot, snapshot_join(source.category, source.item_column))
+        .join(source.item_model, source.item_model.id == source.item_column)
+        .join(User, User.id == watchlist.user_id)
+        .where(
+            watchlist.is_active,
+            PriceSnapshot.last_changed_at > since,
+            PriceSnapshot.last_changed_at <= until,
+            or_(reached, dropped),
+        )
+    ).all()
+
+
+def _delivery_key(source: WatchlistSource, row) -> DeliveryKey:
+    """Delivery key of a triggered watchlist's alert."""
+    rule = NotificationType.TARGET_REACHED if row.reached else NotificationType.PRICE_DROP
+    return DeliveryKey(row.user_id, source.category, row.item_id, rule.value)
+
+
+def _alert(source: WatchlistSource, row) -> Tuple[Dict, Dict]:
+    """Notification and outbox email rows for one triggered watchlist."""
+    current_price = float(row.current_price)
+    data = {source.item_key: row.item_id, "current_price": current_price}
+
+    if row.reached:
+        target_price = float(row.target_price)
+        data["target_price"] = target_price
+        notification = {
+            "type": NotificationType.TARGET_REACHED,
+            "title": "Target Price Reached",
+            "message": f"{row.item_name} is now at your target price of ₦{target_price:,.2f}",
+        }
+        old_price = target_price
+    else:
+        old_price = float(row.previous_price)
+        drop_percent = (old_price - current_price) / old_price * 100
+        data.update({"old_price": old_price, "drop_percent": drop_percent})
+        notification = {
+            "type": NotificationType.PRICE_DROP,
+            "title": "Price Drop Alert",
+            "message": (
+                f"{row.item_name} price dropped from ₦{old_price:,.2f} to "
+                f"₦{current_price:,.2f} ({drop_percent:.1f}% off)"
+            ),
+        }
+
+    notification.update(user_id=row.user_id, data=json.dumps(data), is_read=False)
+    email = outbox_email(
+        "price_alert",
+        row.email,
+        product_name=row.item_name,
+        old_price=old_price,
+        new_price=current_price,
+        currency="₦",
+    )
+    return notification, email
+
+
+class WatchlistAlertEvaluator:
+    """Evaluates every category's watchlists against recent price changes."""
+
+    def __init__(
+        self,
+        lag: timedelta = timedelta(seconds=settings.watchlist_alert_lag_seconds),
+        deliveries: AlertDeliveryStore = alert_deliveries,
+    ):
+        """Initialize with the lag kept behind the present.
+
+        Changes newer than the lag are left for the next run, so price
+        writes still in flight when a run starts are not skipped.
+        """
+        self.lag = lag
+        self.deliveries = deliveries
+
+    def _watermark(self, db: Session, until: datetime) -> Tuple[JobWatermark, datetime]:
+        """The job's watermark row, locked, and created one interval back on the first run."""
+        watermark = db.scalar(
+            select(JobWatermark).where(JobWatermark.name == WATERMARK_NAME).with_for_update()
+        )
+        if watermark is None:
+            start = until - timedelta(minutes=settings.watchlist_alert_minutes)
+            watermark = JobWatermark(name=WATERMARK_NAME, watermark=start)
+            db.add(watermark)
+        since = watermark.watermark
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return watermark, since
+
+    def evaluate(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Create the notifications for price changes since the last run.
+
+        Nothing is committed here; the caller commits the notifications,
+        their emails and the new watermark together. Returns the number of
+        alerts created.
+        """
+        until = (now or datetime.now(timezone.utc)) - self.lag
+        watermark, since = self._watermark(db, until)
+        if until <= since:
+            return 0
+
+        triggered = [
+            (source, row, _delivery_key(source, row))
+            for source in WATCHLIST_SOURCES
+            for row in triggered_watchlists(db, source, since, until)
+        ]
+        allowed = self.deliveries.claim(
+            db, [(key, row.current_price) for _, row, key in triggered], now=until
+        )
+
+        notifications: List[Dict] = []
+        emails: List[Dict] = []
+        for source, row, key in triggered:
+            if key in allowed:
+                allowed.discard(key)  # one alert per key, however many watchlists match
+                notification, email = _alert(source, row)
+                notifications.append(notification)
+                emails.append(email)
+
+        if notifications:
+            db.execute(insert(Notification), notifications)
+            enqueue_emails(db, emails)
+        watermark.watermark = until
+
+        logger.info(
+            f"Found {len(notifications)} of {len(triggered)} triggered watchlist alerts "
+            f"for changes since {since}"
+        )
+        return len(notifications)
+
+
+# Global watchlist alert evaluator instance
+watchlist_evaluator = WatchlistAlertEvaluator()
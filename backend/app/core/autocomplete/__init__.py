@@ -0,0 +1 @@
+"""Typeahead suggestions for products, hotels, destinations and locations."""
@@ -0,0 +1,18 @@
+"""Scheduled refresh of the autocomplete indexes."""
+
+import logging
+
+from app.core.autocomplete.service import autocomplete_service
+from app.core.database import BackgroundSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_autocomplete():
+    """Index the items and watchlist entries added since the last run."""
+    async with BackgroundSessionLocal() as db:
+        try:
+            await autocomplete_service.refresh(db, force=True)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Autocomplete refresh failed: {e}")
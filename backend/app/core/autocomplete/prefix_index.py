@@ -0,0 +1,175 @@
+"""Sorted-array prefix index for typeahead suggestions.
+
+Every word-start suffix of a suggestion ("apple iphone 13" is stored under
+"apple iphone 13", "iphone 13" and "13") is kept in one sorted list, so the
+suggestions for a prefix are a contiguous range found with two binary
+searches. New keys are collected and sorted into the list in one pass on
+`flush`, rather than inserted one at a time. Short prefixes match most of
+the catalog, so their best entries are kept in bounded heaps updated as
+suggestions are added. A longer prefix ranks its range when the range is
+small, and otherwise walks all suggestions in rank order until it has
+enough matches, which is quick because such a prefix matches densely.
+Weights only grow between rebuilds, which keeps the heaps exact.
+"""
+
+import heapq
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Prefixes up to this length answer from their top heaps
+CACHED_PREFIX_LENGTH = 4
+
+# Longer prefixes matching more index keys than this walk the rank order
+MAX_RANGE = 2000
+
+# Sorts after every character that can follow a normalized prefix
+_RANGE_END = "\uffff"
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase words of a text separated by single spaces."""
+    return " ".join(_TOKEN_PATTERN.findall(text.lower())) if text else ""
+
+
+def word_suffixes(normalized: str) -> List[str]:
+    """The text from the start of each of its words."""
+    words = normalized.split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class Suggestion:
+    """One suggestion with its popularity weight."""
+
+    __slots__ = ("text", "item_id", "weight", "key")
+
+    def __init__(self, text: str, item_id: Optional[int], key: Tuple[str, int]):
+        """Initialize a suggestion with no weight."""
+        self.text = text
+        self.item_id = item_id
+        self.weight = 0
+        self.key = key
+
+    def rank(self) -> Tuple:
+        """Sort key: most popular first, then shorter, then alphabetical."""
+        return (-self.weight, len(self.text), self.text)
+
+    def to_dict(self) -> Dict:
+        """Suggestion as returned by the API."""
+        return {"text": self.text, "item_id": self.item_id, "weight": self.weight}
+
+
+class _Worst:
+    """Heap entry ordering the worst-ranked suggestion first."""
+
+    __slots__ = ("suggestion",)
+
+    def __init__(self, suggestion: Suggestion):
+        """Wrap a suggestion."""
+        self.suggestion = suggestion
+
+    def __lt__(self, other: "_Worst") -> bool:
+        return self.suggestion.rank() > other.suggestion.rank()
+
+
+class PrefixIndex:
+    """Suggestions searchable by the prefix of any of their words."""
+
+    def __init__(self, top_k: int = 20):
+        """Initialize an empty index keeping `top_k` suggestions per short prefix."""
+        self.top_k = top_k
+        self._keys: List[Tuple[str, Tuple[str, int]]] = []
+        self._pending: List[Tuple[str, Tuple[str, int]]] = []
+        self._suggestions: Dict[Tuple[str, int], Suggestion] = {}
+        # Min-heaps of each short prefix's best suggestions, worst on top
+        self._top: Dict[str, List[_Worst]] = {}
+        self._top_members: Dict[str, Set[Tuple[str, int]]] = {}
+        # Every suggestion, best first, as of the last flush
+        self._by_rank: List[Suggestion] = []
+        self._ranked = True
+
+    def __len__(self) -> int:
+        return len(self._suggestions)
+
+    def add(self, text: str, item_id: Optional[int] = None, weight: int = 0) -> Optional[Suggestion]:
+        """Add a suggestion, or add `weight` to it if it is already indexed.
+
+        Suggestions without an item id (such as locations) are merged by text.
+        """
+        normalized = normalize(text)
+        if not normalized:
+            return None
+
+        key = (normalized, item_id if item_id is not None else -1)
+        suggestion = self._suggestions.get(key)
+        if suggestion is None:
+            suggestion = Suggestion(text.strip(), item_id, key)
+            self._suggestions[key] = suggestion
+            self._pending.extend((suffix, key) for suffix in word_suffixes(normalized))
+
+        suggestion.weight += weight
+        self._ranked = False
+        self._update_top(suggestion)
+        return suggestion
+
+    def flush(self):
+        """Sort keys and weights added since the last flush into the index."""
+        if self._pending:
+            self._keys.extend(self._pending)
+            self._keys.sort()
+            self._pending = []
+        if not self._ranked:
+            self._by_rank = sorted(self._suggestions.values(), key=Suggestion.rank)
+            self._ranked = True
+
+    def _update_top(self, suggestion: Suggestion):
+        """Place a new or heavier suggestion in the top heaps of its short prefixes."""
+        prefixes = {
+            suffix[:length]
+            for suffix in word_suffixes(suggestion.key[0])
+            for length in range(1, CACHED_PREFIX_LENGTH + 1)
+        }
+        for prefix in prefixes:
+            top = self._top.setdefault(prefix, [])
+            members = self._top_members.setdefault(prefix, set())
+            if suggestion.key in members:
+                heapq.heapify(top)  # its rank improved in place
+            elif len(top) < self.top_k:
+                heapq.heappush(top, _Worst(suggestion))
+                members.add(suggestion.key)
+            elif suggestion.rank() < top[0].suggestion.rank():
+                dropped = heapq.heapreplace(top, _Worst(suggestion))
+                members.discard(dropped.suggestion.key)
+                members.add(suggestion.key)
+
+    def search(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """Best suggestions with a word starting with `prefix`."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        if len(prefix) <= CACHED_PREFIX_LENGTH and limit <= self.top_k:
+            top = [entry.suggestion for entry in self._top.get(prefix, [])]
+            return sorted(top, key=Suggestion.rank)[:limit]
+
+        self.flush()
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + _RANGE_END,), start)
+        if end - start <= MAX_RANGE:
+            matches = {key for _, key in self._keys[start:end]}
+            return heapq.nsmallest(
+                limit, (self._suggestions[key] for key in matches), key=Suggestion.rank
+            )
+
+        # Word starts of a normalized text follow its start or a space
+        word_start = " " + prefix
+        found = []
+        for suggestion in self._by_rank:
+            text = suggestion.key[0]
+            if text.startswith(prefix) or word_start in text:
+                found.append(suggestion)
+                if len(found) == limit:
+                    break
+        return found
@@ -0,0 +1,188 @@
+"""Autocomplete over tracked items, kept in memory and refreshed incrementally.
+
+A scheduled job refreshes the indexes, so requests only read them.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.autocomplete.prefix_index import PrefixIndex
+from app.ecommerce.models.product import Product
+from app.ecommerce.models.watchlist import Watchlist
+from app.real_estate.models.property import Property
+from app.real_estate.models.watchlist import PropertyWatchlist
+from app.travel.models.flight import Flight
+from app.travel.models.hotel import Hotel
+from app.travel.models.watchlist import TravelWatchlist
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for new items and watchlist entries
+REFRESH_INTERVAL = 30
+
+# Seconds between full rebuilds, which drop removed items and unwatched weight
+REBUILD_INTERVAL = 3600
+
+
+class AutocompleteSource:
+    """Texts of one model that feed one kind of suggestion.
+
+    Each watchlist entry on an item adds one to the weight of the item's
+    suggestions. With `per_item` false, equal texts from different items
+    (such as a destination shared by many flights) merge into one suggestion.
+    """
+
+    def __init__(self, kind: str, model, text_columns: List, watch_column, per_item: bool = True):
+        """Initialize a source."""
+        self.kind = kind
+        self.model = model
+        self.text_columns = text_columns
+        self.watch_column = watch_column
+        self.watch_model = watch_column.class_
+        self.per_item = per_item
+
+    async def load_items(self, db: AsyncSession, after_id: int) -> List:
+        """Active items added after `after_id`, as (id, *texts) rows."""
+        result = await db.execute(
+            select(self.model.id, *self.text_columns)
+            .where(self.model.is_active, self.model.id > after_id)
+            .order_by(self.model.id)
+        )
+        return result.all()
+
+    async def load_watches(self, db: AsyncSession, after_id: int) -> List:
+        """Watchlist entries added after `after_id`, as (id, *texts, count, last id) rows."""
+        result = await db.execute(
+            select(
+                self.model.id,
+                *self.text_columns,
+                func.count(self.watch_model.id),
+                func.max(self.watch_model.id),
+            )
+            .join(self.watch_model, self.watch_column == self.model.id)
+            .where(self.model.is_active, self.watch_model.is_active, self.watch_model.id > after_id)
+            .group_by(self.model.id, *self.text_columns)
+        )
+        return result.all()
+
+
+SOURCES = [
+    AutocompleteSource("product", Product, [Product.name], Watchlist.product_id),
+    AutocompleteSource("hotel", Hotel, [Hotel.name], TravelWatchlist.hotel_id),
+    AutocompleteSource(
+        "destination",
+        Flight,
+        [Flight.origin, Flight.destination],
+        TravelWatchlist.flight_id,
+        per_item=False,
+    ),
+    AutocompleteSource(
+        "destination", Hotel, [Hotel.location], TravelWatchlist.hotel_id, per_item=False
+    ),
+    AutocompleteSource(
+        "location", Property, [Property.location], PropertyWatchlist.property_id, per_item=False
+    ),
+]
+
+KINDS = sorted({source.kind for source in SOURCES})
+
+
+class AutocompleteService:
+    """Prefix suggestions per kind, answered from memory."""
+
+    def __init__(self, sources: Iterable[AutocompleteSource] = SOURCES):
+        """Initialize with empty indexes."""
+        self.sources = list(sources)
+        self._lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Drop every index and start over from the first row."""
+        self.indexes: Dict[str, PrefixIndex] = {source.kind: PrefixIndex() for source in self.sources}
+        # Highest item and watchlist ids already indexed, per source
+        self._item_marks = [0] * len(self.sources)
+        self._watch_marks = [0] * len(self.sources)
+        self._refreshed_at: Optional[float] = None
+        self._built_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the indexes have been built."""
+        return self._built_at is not None
+
+    async def refresh(self, db: AsyncSession, force: bool = False):
+        """Index items and watchlist entries added since the last refresh.
+
+        Runs at most every REFRESH_INTERVAL seconds unless forced, and rebuilds
+        from scratch every REBUILD_INTERVAL seconds. Refreshes are serialized,
+        so one that waited on another finds the indexes fresh and returns.
+        """
+        async with self._lock:
+            now = time.monotonic()
+            if self._built_at is not None and now - self._built_at > REBUILD_INTERVAL:
+                # Built aside and swapped in, so suggestions stay available meanwhile
+                rebuilt = AutocompleteService(self.sources)
+                await rebuilt._load(db, now)
+                self.indexes = rebuilt.indexes
+                self._item_marks = rebuilt._item_marks
+                self._watch_marks = rebuilt._watch_marks
+                self._refreshed_at = self._built_at = now
+            elif (
+                force
+                or self._refreshed_at is None
+                or now - self._refreshed_at >= REFRESH_INTERVAL
+            ):
+                await self._load(db, now)
+
+    async def _load(self, db: AsyncSession, now: float):
+        """Add the rows past the marks to the indexes."""
+        started = time.perf_counter()
+        added = 0
+        for position, source in enumerate(self.sources):
+            index = self.indexes[source.kind]
+
+            for item_id, *texts in await source.load_items(db, self._item_marks[position]):
+                for text in texts:
+                    index.add(text, item_id if source.per_item else None)
+                self._item_marks[position] = item_id
+                added += 1
+
+            for item_id, *texts, count, last_watch_id in await source.load_watches(
+                db, self._watch_marks[position]
+            ):
+                for text in texts:
+                    index.add(text, item_id if source.per_item else None, weight=count)
+                self._watch_marks[position] = max(self._watch_marks[position], last_watch_id)
+
+        for index in self.indexes.values():
+            index.flush()
+        self._refreshed_at = now
+        if self._built_at is None:
+            self._built_at = now
+        if added:
+            logger.info(
+                f"Autocomplete indexed {added} new items in "
+                f"{(time.perf_counter() - started) * 1000:.1f}ms"
+            )
+
+    def suggest(self, prefix: str, kinds: Optional[Iterable[str]] = None, limit: int = 10) -> List[Dict]:
+        """Best suggestions for a prefix across the requested kinds."""
+        suggestions = []
+        for kind in kinds or self.indexes:
+            index = self.indexes.get(kind)
+            if index is None:
+                continue
+            for suggestion in index.search(prefix, limit):
+                suggestions.append({"kind": kind, **suggestion.to_dict()})
+
+        suggestions.sort(key=lambda s: (-s["weight"], len(s["text"]), s["text"]))
+        return suggestions[:limit]
+
+
+# Global autocomplete service instance
+autocomplete_service = AutocompleteService()
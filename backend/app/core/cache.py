@@ -35,8 +35,8 @@ class CacheManager:
         except Exception:
             self.redis_client = None
 
-    def _generate_key(self, prefix: str, *args, **kwargs) -> str:
-        """Generate cache key."""
+    def make_key(self, prefix: str, *args, **kwargs) -> str:
+        """Cache key of a prefix and the arguments identifying the value."""
         key_data = f"{prefix}:{args}:{sorted(kwargs.items())}"
         return f"cache:{hashlib.md5(key_data.encode()).hexdigest()}"
 
@@ -89,7 +89,7 @@ def cached(ttl: int = 300, key_prefix: str = ""):
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            cache_key = cache_manager._generate_key(
+            cache_key = cache_manager.make_key(
                 key_prefix or func.__name__, *args, **kwargs
             )
             cached_value = cache_manager.get(cache_key)
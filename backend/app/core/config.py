@@ -1,5 +1,7 @@
 """Application configuration settings."""
 
+from typing import Dict
+
 from pydantic_settings import BaseSettings
 
 
@@ -13,6 +15,13 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = ""
+    database_replica_url: str = ""  # analytics, dashboards and exports; primary if empty
+    database_pool_size: int = 20
+    database_max_overflow: int = 10
+    database_pool_timeout: int = 30
+    database_background_pool_size: int = 5  # scheduled jobs and Celery tasks
+    database_background_max_overflow: int = 5
+    database_background_pool_timeout: int = 120
 
     # Redis
     redis_url: str = ""
@@ -28,12 +37,45 @@ class Settings(BaseSettings):
     # Email service (Resend)
     resend_api_key: str = ""
     from_email: str = "noreply@priceinsight.ng"
+    email_transport: str = "resend"  # resend, or memory to keep emails in memory
+    email_concurrency: int = 10  # requests in flight, and pooled connections
+    email_timeout: float = 10.0  # seconds per request
+    email_requests_per_second: float = 2.0  # provider rate limit, batches count once
+    email_outbox_seconds: int = 30  # outbox drain interval
+    email_outbox_batch_size: int = 500  # emails claimed per drain
+    email_outbox_max_attempts: int = 5  # then the email is marked failed
+    email_outbox_retry_seconds: int = 60  # first retry delay, doubled per attempt
+    email_outbox_lease_seconds: int = 300  # claimed emails are retried after this
+    email_outbox_sent_retention_days: int = 7  # sent emails are purged after this
+    email_outbox_failed_retention_days: int = 30  # failed emails are purged after this
     
     # Scraping settings
     scraper_max_concurrent: int = 10
     scraper_batch_size: int = 50
     scraper_rate_limit: float = 1.0  # seconds between requests
 
+    # Price history retention
+    price_history_retention_days: int = 90  # raw rows older than this are downsampled
+    price_history_partition_months_ahead: int = 3
+    price_history_change_only: bool = True  # extend the current row when price is unchanged
+    price_history_archive_enabled: bool = True  # keep purged raw rows in Arrow files
+    price_history_archive_dir: str = "data/price_history_archive"
+
+    # Deal detection
+    deal_detection_batch_size: int = 5000  # price change events claimed per category and run
+    deal_reconciliation_hours: int = 24  # full-catalog detection interval
+    deal_detection_workers: int = 4  # shards run at once; keep under the background pool size
+    deal_detection_shards: Dict[str, int] = {}  # per-category shard counts, e.g. {"ecommerce": 4}
+
+    # Alert rules
+    alert_rule_index_size: int = 10000  # products whose rule index is kept in memory
+    alert_rule_index_ttl: int = 60  # seconds an index is trusted when Redis is unavailable
+    watchlist_alert_minutes: int = 30  # watchlist alert job interval
+    watchlist_alert_lag_seconds: int = 300  # newer price changes wait for the next run
+    alert_cooldown_hours: int = 24  # an alert is repeated at most this often...
+    alert_repeat_drop_percent: float = 5.0  # ...unless the price dropped this much further
+    alert_dedup_cache_size: int = 10000  # alert deliveries kept in memory
+
     class Config:
         env_file = ".env"
 
@@ -1,27 +1,168 @@
-"""Database configuration and session management."""
+"""Database configuration and session management.
+
+Connections are split by workload so one kind of traffic cannot starve
+another:
+
+- the primary engine serves interactive API requests;
+- the replica engine serves analytics, dashboard and export reads, and
+  points at ``database_replica_url`` when set (else it is the primary);
+- the background engine serves scheduled jobs and Celery tasks with its
+  own small pool, so a large sweep queues behind itself rather than
+  behind API requests.
+
+Every pool records how long checkouts wait and how full it is.
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Dict
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
-# Create async engine with optimized connection pooling
-engine = create_async_engine(
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Checkout wait times and saturation for one connection pool."""
+
+    def __init__(self, name: str, capacity: int, window: int = 1000):
+        """Initialize metrics for a pool of `capacity` connections."""
+        self.name = name
+        self.capacity = capacity
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.peak_checked_out = 0
+        self.recent_waits = deque(maxlen=window)
+
+    def record_checkout(self, wait: float, checked_out: int):
+        """Record a successful checkout and the connections in use after it."""
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent_waits.append(wait)
+        self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def record_timeout(self, wait: float):
+        """Record a checkout that gave up after `pool_timeout`."""
+        self.timeouts += 1
+        logger.warning(f"Database pool '{self.name}' checkout timed out after {wait:.2f}s")
+
+    def snapshot(self, pool) -> Dict:
+        """Current metrics, including the live state of the pool."""
+        waits = sorted(self.recent_waits)
+        p95 = waits[int(len(waits) * 0.95) - 1] if waits else 0.0
+        checked_out = pool.checkedout()
+
+        return {
+            "capacity": self.capacity,
+            "checked_out": checked_out,
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "saturation": round(checked_out / self.capacity, 3) if self.capacity else 0.0,
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 2) if self.checkouts else 0,
+            "p95_wait_ms": round(p95 * 1000, 2),
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+        }
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that times how long each checkout waits for a connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start, self.checkedout())
+        return connection
+
+
+# name -> (engine, metrics) for every distinct pool
+_pools: Dict[str, tuple] = {}
+
+
+def create_pooled_engine(name: str, url: str, pool_size: int, max_overflow: int, pool_timeout: int):
+    """Create an engine whose pool reports metrics under `name`."""
+    metrics = PoolMetrics(name, pool_size + max_overflow)
+    # A subclass per pool keeps the metrics attached when the pool is recreated
+    pool_class = type(f"{name.title()}QueuePool", (TimedQueuePool,), {"metrics": metrics})
+
+    pooled_engine = create_async_engine(
+        url,
+        poolclass=pool_class,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,  # Verify connections before using
+        pool_recycle=3600,  # Recycle connections after 1 hour
+        pool_timeout=pool_timeout,
+        echo_pool=False,  # Disable pool logging
+    )
+    _pools[name] = (pooled_engine, metrics)
+    return pooled_engine
+
+
+# Interactive API requests
+engine = create_pooled_engine(
+    "primary",
     settings.database_url,
-    pool_size=20,  # Base connection pool size
-    max_overflow=10,  # Allow 10 additional connections under load
-    pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    pool_timeout=30,  # Wait 30s for connection from pool
-    echo_pool=False,  # Disable pool logging
+    settings.database_pool_size,
+    settings.database_max_overflow,
+    settings.database_pool_timeout,
 )
 
-# Create async session maker
+# Analytics, dashboards and exports; tolerate replication lag
+if settings.database_replica_url:
+    replica_engine = create_pooled_engine(
+        "replica",
+        settings.database_replica_url,
+        settings.database_pool_size,
+        settings.database_max_overflow,
+        settings.database_pool_timeout,
+    )
+else:
+    replica_engine = engine
+
+# Scheduled jobs and Celery tasks
+background_engine = create_pooled_engine(
+    "background",
+    settings.database_url,
+    settings.database_background_pool_size,
+    settings.database_background_max_overflow,
+    settings.database_background_pool_timeout,
+)
+
+# Create async session makers
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
 
+ReplicaSessionLocal = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+BackgroundSessionLocal = async_sessionmaker(
+    background_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 async def get_db() -> AsyncSession:
     """Get database session."""
@@ -30,3 +171,26 @@ async def get_db() -> AsyncSession:
             yield session
         finally:
             await session.close()
+
+
+async def get_replica_db() -> AsyncSession:
+    """Get read-only session for analytics, dashboards and exports."""
+    async with ReplicaSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def get_pool_metrics() -> Dict[str, Dict]:
+    """Checkout wait times and saturation of every database pool."""
+    return {
+        name: metrics.snapshot(pooled_engine.pool)
+        for name, (pooled_engine, metrics) in _pools.items()
+    }
+
+
+async def dispose_engines():
+    """Close every pool."""
+    for pooled_engine, _ in _pools.values():
+        await pooled_engine.dispose()
@@ -2,36 +2,77 @@
 
 import logging
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 logger = logging.getLogger(__name__)
+from sqlalchemy import true
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.deal_detection.upsert import active_deal_keys, upsert_active_deals
+from app.core.models.base import BaseModel
+from app.core.price_history.baselines import PriceBaselines
+from app.core.price_history.bulk import PriceSeriesBatch
+from app.core.models.price_snapshot import PriceSnapshot
+from app.core.price_history.changes import claim_price_changes
+from app.core.price_history.extremes import RollingExtremes
+from app.core.price_history.snapshots import load_snapshots
 from app.utils.helpers import calculate_discount_percentage, is_valid_deal
 
+# A deal is a drop from the highest price observed in this many days
+DROP_WINDOW_DAYS = 7
+
+# (index, count): the items whose id % count == index
+Shard = Tuple[int, int]
+
+
+def shard_filter(id_column, shard: Optional[Shard] = None):
+    """Filter keeping one shard's items (every item without a shard)."""
+    if shard is None:
+        return true()
+    index, count = shard
+    return id_column % count == index
+
 
 class BaseDealDetector(ABC):
-    """Base class for deal detection across categories."""
+    """Base class for deal detection across categories.
+
+    Items are compared with the 7-day high kept in their price snapshot's
+    sliding-window extremes, capped at the snapshot's robust baselines so a
+    brief price hike does not make the return to normal look like a deal.
+    `detect_changed_deals` evaluates only items
+    with queued price change events; `detect_deals` rescans the whole
+    catalog and is run periodically as a reconciliation. Either way, the
+    deals found for a category are upserted with one bulk statement.
+    """
+
+    # Price history categories whose change events this detector handles
+    categories: Tuple[str, ...] = ()
+
+    # Deal model, and the column naming a deal's item per category
+    deal_model: Type[BaseModel]
+    deal_keys: Dict[str, str] = {}
 
     def __init__(self, min_discount: Decimal = Decimal("10")):
         """Initialize detector with minimum discount threshold."""
         self.min_discount = min_discount
+        self._price_batches: Dict[str, PriceSeriesBatch] = {}
 
     @abstractmethod
-    def get_items_for_detection(self, db: Session) -> List[Any]:
-        """Get items to check for deals. Must be implemented by subclasses."""
+    def get_items_for_detection(self, db: Session, shard: Optional[Shard] = None) -> List[Any]:
+        """Get items (of one shard) to check for deals. Must be implemented by subclasses."""
         pass
 
     @abstractmethod
-    def get_price_history(self, db: Session, item: Any) -> List[Any]:
-        """Get price history for item. Must be implemented by subclasses."""
+    def get_changed_items(self, db: Session, category: str, item_ids: List[int]) -> List[Any]:
+        """Get the detectable items among changed item ids. Must be implemented by subclasses."""
         pass
 
     @abstractmethod
-    def create_deal(self, db: Session, item: Any, deal_data: Dict) -> Any:
-        """Create deal record. Must be implemented by subclasses."""
+    def deal_values(self, db: Session, category: str, item: Any, deal_data: Dict) -> Dict:
+        """Deal columns for a detected price drop. Must be implemented by subclasses."""
         pass
 
     @abstractmethod
@@ -39,24 +80,58 @@ class BaseDealDetector(ABC):
         """Get current price from item. Must be implemented by subclasses."""
         pass
 
-    def detect_price_drop(self, current_price: Decimal, price_history: List[Any]) -> Optional[Dict]:
-        """Detect if current price represents a significant drop."""
-        if not price_history:
-            return None
-
-        # Get recent prices (last 7 days)
-        recent_cutoff = datetime.utcnow() - timedelta(days=7)
-        recent_prices = [
-            p for p in price_history if hasattr(p, "recorded_at") and p.recorded_at >= recent_cutoff
-        ]
-
-        if not recent_prices:
-            return None
-
-        # Find highest recent price
-        highest_price = max(getattr(p, "price", Decimal("0")) for p in recent_prices)
+    def on_new_deals(self, db: Session, category: str, new_deals: List[Dict]) -> None:
+        """Called with the deals created (not refreshed) by a run, e.g. to notify users."""
+        pass
 
-        if highest_price <= current_price:
+    def get_item_category(self, item: Any) -> str:
+        """Price history category of an item."""
+        return self.categories[0]
+
+    def get_price_context(
+        self, db: Session, category: str, item_id: int
+    ) -> Tuple[Optional[Dict], str]:
+        """30-day price statistics and 7-day trend for an item.
+
+        The category's rollups are loaded once per detection run and shared
+        by every item, instead of querying analytics per deal.
+        """
+        batch = self._price_batches.get(category)
+        if batch is None:
+            batch = PriceSeriesBatch.load(db, category, 30)
+            self._price_batches[category] = batch
+
+        return batch.window(30).get(item_id), batch.window(7).trend(item_id)
+
+    def detect_price_drop(
+        self, current_price: Decimal, snapshot: PriceSnapshot, now: Optional[datetime] = None
+    ) -> Optional[Dict]:
+        """Detect if current price is a significant drop from the item's reference price.
+
+        The reference is the recent high, capped at the median, trimmed mean
+        and pre-spike level of the item's daily closes. Snapshots written
+        before extremes were kept fall back to their rollup-based 7-day high.
+        """
+        if snapshot.extremes:
+            highest_price = RollingExtremes.loads(snapshot.extremes).high(DROP_WINDOW_DAYS, now)
+        else:
+            highest_price = snapshot.high_7d
+
+        if snapshot.baselines:
+            reference = PriceBaselines.loads(snapshot.baselines).reference(highest_price, now)
+            if reference != highest_price:
+                logger.debug(
+                    f"Capped {snapshot.category} {snapshot.item_id} reference price "
+                    f"{highest_price} at baseline {reference}"
+                )
+            highest_price = reference
+        return self.detect_drop_from_high(current_price, highest_price)
+
+    def detect_drop_from_high(
+        self, current_price: Decimal, highest_price: Optional[Decimal]
+    ) -> Optional[Dict]:
+        """Detect if current price is a significant drop from a recent high."""
+        if highest_price is None or highest_price <= current_price:
             return None
 
         # Calculate discount
@@ -72,30 +147,107 @@ class BaseDealDetector(ABC):
 
         return None
 
-    def detect_deals(self, db: Session) -> List[Dict]:
-        """Main deal detection method."""
-        items = self.get_items_for_detection(db)
-        detected_deals = []
-
+    def _evaluate(
+        self,
+        db: Session,
+        category: str,
+        items: List[Any],
+        snapshots: Dict[int, PriceSnapshot],
+        detected_deals: List[Dict],
+    ) -> None:
+        """Check items of one category against their snapshots and save their deals."""
+        candidates = []
         for item in items:
             try:
                 current_price = self.get_current_price(item)
-                if not current_price:
+                snapshot = snapshots.get(item.id)
+                if not current_price or snapshot is None:
                     continue
 
-                price_history = self.get_price_history(db, item)
-                deal_data = self.detect_price_drop(current_price, price_history)
-
+                deal_data = self.detect_price_drop(current_price, snapshot)
                 if deal_data:
-                    # Create deal record
-                    deal = self.create_deal(db, item, deal_data)
-                    if deal:
-                        detected_deals.append({"item": item, "deal": deal, "deal_data": deal_data})
-                        logger.info(f"Deal detected: {deal_data['discount_percent']:.1f}% off")
+                    row = self.deal_values(db, category, item, deal_data)
+                    candidates.append((item, deal_data, row))
 
             except Exception as e:
-                logger.error(
-                    f"Error detecting deals for item {getattr(item, 'id', 'unknown')}: {e}"
-                )
+                logger.error(f"Error detecting deals for {category} item {item.id}: {e}")
+
+        if candidates:
+            self._save_deals(db, category, candidates, detected_deals)
+
+    def _save_deals(
+        self,
+        db: Session,
+        category: str,
+        candidates: List[Tuple[Any, Dict, Dict]],
+        detected_deals: List[Dict],
+    ) -> None:
+        """Upsert the deals found for one category in bulk."""
+        key = self.deal_keys[category]
+        item_ids = [item.id for item, _, _ in candidates]
+        existing = active_deal_keys(db, self.deal_model, key, item_ids)
+        deals = {
+            getattr(deal, key): deal
+            for deal in upsert_active_deals(
+                db, self.deal_model, key, [{key: item.id, **row} for item, _, row in candidates]
+            )
+        }
+
+        new_deals = []
+        for item, deal_data, _ in candidates:
+            detected = {"item": item, "deal": deals[item.id], "deal_data": deal_data}
+            detected_deals.append(detected)
+            if item.id not in existing:
+                new_deals.append(detected)
+
+        if new_deals:
+            self.on_new_deals(db, category, new_deals)
+        logger.info(
+            f"Saved {len(candidates)} {category} deals ({len(new_deals)} new, "
+            f"{len(candidates) - len(new_deals)} updated)"
+        )
+
+    def detect_deals(self, db: Session, shard: Optional[Shard] = None) -> List[Dict]:
+        """Main deal detection method, rescanning every active item (of one shard)."""
+        items = self.get_items_for_detection(db, shard)
+        detected_deals = []
+        # Price statistics are reloaded for every run
+        self._price_batches = {}
+
+        items_by_category: Dict[str, List[Any]] = {}
+        for item in items:
+            items_by_category.setdefault(self.get_item_category(item), []).append(item)
+
+        for category, category_items in items_by_category.items():
+            item_ids = None if shard is None else [item.id for item in category_items]
+            snapshots = load_snapshots(db, category, item_ids)
+            self._evaluate(db, category, category_items, snapshots, detected_deals)
+
+        return detected_deals
+
+    def detect_changed_deals(
+        self, db: Session, limit: int = settings.deal_detection_batch_size
+    ) -> List[Dict]:
+        """Detect deals among items whose price changed since the last run.
+
+        Claims up to `limit` queued change events per category. Snapshots
+        and the price context rollups are each loaded with one query for all
+        changed items. The caller commits, which also removes the claimed
+        events.
+        """
+        detected_deals = []
+        self._price_batches = {}
+
+        for category in self.categories:
+            item_ids = claim_price_changes(db, category, limit)
+            if not item_ids:
+                continue
+
+            snapshots = load_snapshots(db, category, item_ids)
+            self._price_batches[category] = PriceSeriesBatch.load(db, category, 30, item_ids)
+            items = self.get_changed_items(db, category, item_ids)
+            self._evaluate(db, category, items, snapshots, detected_deals)
+
+            logger.info(f"Evaluated {len(item_ids)} changed {category} items for deals")
 
         return detected_deals
@@ -1,17 +1,30 @@
 """Centralized deal detection manager."""
 
+import asyncio
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional, Type
 
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+from app.core.config import settings
+from app.core.database import BackgroundSessionLocal
+from app.core.deal_detection.base_detector import BaseDealDetector, Shard
 from app.ecommerce.services.deal_detector import EcommerceDealDetector
 from app.real_estate.services.deal_detector import RealEstateDealDetector
 from app.travel.services.deal_detector import TravelDealDetector
 from app.utilities.services.deal_detector import UtilityDealDetector
 
+DETECTOR_CLASSES: Dict[str, Type[BaseDealDetector]] = {
+    "ecommerce": EcommerceDealDetector,
+    "travel": TravelDealDetector,
+    "real_estate": RealEstateDealDetector,
+    "utilities": UtilityDealDetector,
+}
+
 
 class DealDetectionManager:
     """Centralized manager for deal detection across all categories."""
@@ -85,6 +98,83 @@ class DealDetectionManager:
             db.rollback()
             return []
 
+    async def run_concurrently(
+        self,
+        incremental: bool = False,
+        session_factory: async_sessionmaker = BackgroundSessionLocal,
+        workers: Optional[int] = None,
+    ) -> Dict[str, Dict]:
+        """Run deal detection for all categories concurrently.
+
+        Each category is split into `deal_detection_shards` shards (one by
+        default), and every shard runs with its own detector and session and
+        commits on its own, so a slow or failing category neither delays
+        nor rolls back the others. At most `workers` shards run at once.
+        Incremental shards each claim their own batch of price changes.
+        """
+        semaphore = asyncio.Semaphore(workers or settings.deal_detection_workers)
+        shards = [
+            (category, (index, count))
+            for category in DETECTOR_CLASSES
+            for count in [max(settings.deal_detection_shards.get(category, 1), 1)]
+            for index in range(count)
+        ]
+        outcomes = await asyncio.gather(
+            *(
+                self._run_shard(category, shard, incremental, session_factory, semaphore)
+                for category, shard in shards
+            )
+        )
+
+        results: Dict[str, Dict] = {}
+        for category, outcome in zip((category for category, _ in shards), outcomes):
+            result = results.setdefault(
+                category, {"deals": 0, "shards": 0, "failed_shards": 0, "seconds": 0.0}
+            )
+            result["deals"] += outcome["deals"]
+            result["shards"] += 1
+            result["failed_shards"] += outcome["failed"]
+            result["seconds"] = max(result["seconds"], outcome["seconds"])
+
+        total_deals = sum(result["deals"] for result in results.values())
+        logger.info(
+            f"{'Incremental' if incremental else 'Full'} deal detection: "
+            f"{total_deals} deals detected"
+        )
+        return results
+
+    async def _run_shard(
+        self,
+        category: str,
+        shard: Shard,
+        incremental: bool,
+        session_factory: async_sessionmaker,
+        semaphore: asyncio.Semaphore,
+    ) -> Dict:
+        """Detect and commit one shard of a category's deals on its own session."""
+        async with semaphore:
+            started = time.perf_counter()
+            detector = DETECTOR_CLASSES[category]()
+            async with session_factory() as db:
+                try:
+                    if incremental:
+                        deals = await db.run_sync(detector.detect_changed_deals)
+                    else:
+                        deals = await db.run_sync(detector.detect_deals, shard)
+                    await db.commit()
+                    failed = False
+                except Exception as e:
+                    await db.rollback()
+                    logger.error(f"Error detecting {category} deals (shard {shard[0]}): {e}")
+                    deals, failed = [], True
+
+            seconds = time.perf_counter() - started
+            logger.info(
+                f"Detected {len(deals)} {category} deals in shard {shard[0] + 1}/{shard[1]} "
+                f"({seconds:.2f}s)"
+            )
+            return {"deals": len(deals), "failed": failed, "seconds": seconds}
+
 
 # Global deal detection manager
 deal_manager = DealDetectionManager()
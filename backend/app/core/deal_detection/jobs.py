@@ -0,0 +1,33 @@
+"""Scheduled deal detection jobs."""
+
+import logging
+from typing import Dict
+
+from app.core.deal_detection.deal_manager import deal_manager
+
+logger = logging.getLogger(__name__)
+
+
+async def detect_changed_deals():
+    """Detect deals for items whose price changed since the last run."""
+    logger.info("Starting incremental deal detection")
+    results = await deal_manager.run_concurrently(incremental=True)
+    logger.info(f"Incremental deal detection completed: {_summary(results)}")
+
+
+async def reconcile_deals():
+    """Rescan every active item for deals missed by incremental detection."""
+    logger.info("Starting deal reconciliation")
+    results = await deal_manager.run_concurrently()
+    logger.info(f"Deal reconciliation completed: {_summary(results)}")
+
+
+def _summary(results: Dict[str, Dict]) -> str:
+    """Per-category deal counts and timings for the job log."""
+    parts = []
+    for category, result in results.items():
+        part = f"{category}={result['deals']} ({result['seconds']:.1f}s)"
+        if result["failed_shards"]:
+            part += f" [{result['failed_shards']} failed shards]"
+        parts.append(part)
+    return ", ".join(parts)
@@ -0,0 +1,104 @@
+"""Bulk upsert of active price drop deals.
+
+Each deal table has a partial unique index allowing one active
+``price_drop`` deal per item. A detection run writes all of a category's
+deals with one ``INSERT ... ON CONFLICT DO UPDATE`` per chunk against that
+index, instead of querying for and flushing each item's deal in turn.
+"""
+
+import logging
+from typing import Any, Dict, List, Set
+
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.price_history.rollups import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+DEAL_TYPE = "price_drop"
+
+# Predicate of the deal tables' partial unique indexes. Conflict targets
+# repeat it verbatim, as SQLite only matches an index by its exact terms.
+ACTIVE_DEAL_PREDICATE = "is_active AND deal_type = 'price_drop'"
+
+# Rows per statement, well under the bind parameter limits
+UPSERT_CHUNK_SIZE = 1000
+
+
+def active_deal_filter(model):
+    """Active price drop deals, as selected by the partial unique indexes."""
+    return and_(model.is_active, model.deal_type == DEAL_TYPE)
+
+
+def active_deal_keys(db: Session, model, key: str, item_ids: List[int]) -> Set[int]:
+    """Items among `item_ids` that already have an active price drop deal."""
+    key_column = getattr(model, key)
+    return set(
+        db.scalars(
+            select(key_column).where(key_column.in_(item_ids), active_deal_filter(model))
+        ).all()
+    )
+
+
+def upsert_active_deals(db: Session, model, key: str, rows: List[Dict[str, Any]]) -> List[Any]:
+    """Insert or refresh each item's active price drop deal, returning the deals.
+
+    `rows` hold the deal columns keyed by the `key` item column, at most
+    one row per item.
+    """
+    if not rows:
+        return []
+
+    rows = [{**row, "deal_type": DEAL_TYPE, "is_active": True} for row in rows]
+    insert = dialect_insert(db.get_bind().dialect.name)
+    if insert is None:
+        return _upsert_active_deals_fallback(db, model, key, rows)
+
+    updated = [column for column in rows[0] if column not in (key, "deal_type", "is_active")]
+    deals = []
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = insert(model).values(rows[start : start + UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key],
+            index_where=text(ACTIVE_DEAL_PREDICATE),
+            set_={
+                **{column: stmt.excluded[column] for column in updated},
+                "updated_at": func.now(),
+            },
+        ).returning(model)
+        deals.extend(
+            db.scalars(stmt, execution_options={"populate_existing": True}).all()
+        )
+
+    logger.debug(f"Upserted {len(deals)} {model.__tablename__} rows")
+    return deals
+
+
+def _upsert_active_deals_fallback(
+    db: Session, model, key: str, rows: List[Dict[str, Any]]
+) -> List[Any]:
+    """Read-modify-write upsert for backends without ON CONFLICT."""
+    key_column = getattr(model, key)
+    existing = {
+        getattr(deal, key): deal
+        for deal in db.scalars(
+            select(model).where(
+                key_column.in_([row[key] for row in rows]), active_deal_filter(model)
+            )
+        )
+    }
+
+    deals = []
+    for row in rows:
+        deal = existing.get(row[key])
+        if deal is None:
+            deal = model(**row)
+            db.add(deal)
+        else:
+            for column, value in row.items():
+                setattr(deal, column, value)
+        deals.append(deal)
+
+    db.flush()
+    return deals
@@ -6,7 +6,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_replica_db
 from app.core.models.user import User
 from app.core.security import verify_token
 from app.core.services.auth_service import AuthService
@@ -21,6 +21,13 @@ async def get_database_session(
     yield db
 
 
+async def get_replica_session(
+    db: AsyncSession = Depends(get_replica_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Get read-only session dependency for analytics, dashboards and exports."""
+    yield db
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_database_session),
@@ -1,12 +1,20 @@
 """Job manager for registering and managing scheduled jobs."""
 
 import logging
+from datetime import datetime, timezone
 
 from apscheduler.triggers.interval import IntervalTrigger
 
 logger = logging.getLogger(__name__)
 
+from app.core.alerts.jobs import check_watchlist_alerts, purge_alert_deliveries
+from app.core.autocomplete.jobs import refresh_autocomplete
+from app.core.autocomplete.service import REFRESH_INTERVAL
+from app.core.config import settings
+from app.core.deal_detection.jobs import detect_changed_deals, reconcile_deals
+from app.core.price_history.jobs import maintain_price_history
 from app.core.scheduler import scheduler_manager
+from app.core.services.email_outbox import drain_email_outbox, purge_email_outbox
 from app.ecommerce.jobs.scrape_job import scrape_tracked_products
 from app.real_estate.jobs.property_scrape_job import scrape_tracked_properties
 from app.travel.jobs.travel_scrape_job import scrape_tracked_travel_items
@@ -27,6 +35,18 @@ class JobManager:
         # Register product scraping job
         await self._register_scraping_jobs()
 
+        # Register deal detection jobs
+        await self._register_deal_jobs()
+
+        # Register alert jobs
+        await self._register_alert_jobs()
+
+        # Register storage maintenance jobs
+        await self._register_maintenance_jobs()
+
+        # Register autocomplete index refresh
+        await self._register_autocomplete_jobs()
+
         logger.info(f"Registered {len(self.registered_jobs)} jobs")
 
     async def _register_scraping_jobs(self):
@@ -76,6 +96,108 @@ class JobManager:
         self.registered_jobs["scrape_utilities"] = utility_job
         logger.info("Registered utility scraping job (every 12 hours)")
 
+    async def _register_deal_jobs(self):
+        """Register incremental deal detection and its periodic full reconciliation."""
+
+        # Items whose price changed - every hour
+        changed_job = scheduler_manager.add_job(
+            func=detect_changed_deals,
+            trigger=IntervalTrigger(hours=1),
+            id="detect_changed_deals",
+            name="Detect Deals From Price Changes",
+            replace_existing=True,
+        )
+        self.registered_jobs["detect_changed_deals"] = changed_job
+        logger.info("Registered incremental deal detection job (every hour)")
+
+        # Full catalog rescan
+        hours = settings.deal_reconciliation_hours
+        reconcile_job = scheduler_manager.add_job(
+            func=reconcile_deals,
+            trigger=IntervalTrigger(hours=hours),
+            id="reconcile_deals",
+            name="Deal Reconciliation",
+            replace_existing=True,
+        )
+        self.registered_jobs["reconcile_deals"] = reconcile_job
+        logger.info(f"Registered deal reconciliation job (every {hours} hours)")
+
+    async def _register_alert_jobs(self):
+        """Register watchlist alert evaluation and email outbox draining."""
+
+        # Watchlists of every category against changed prices
+        minutes = settings.watchlist_alert_minutes
+        watchlist_job = scheduler_manager.add_job(
+            func=check_watchlist_alerts,
+            trigger=IntervalTrigger(minutes=minutes),
+            id="check_watchlist_alerts",
+            name="Check Watchlist Price Alerts",
+            replace_existing=True,
+        )
+        self.registered_jobs["check_watchlist_alerts"] = watchlist_job
+        logger.info(f"Registered watchlist alerts job (every {minutes} minutes)")
+
+        # Emails queued by alerts, deals and registrations
+        seconds = settings.email_outbox_seconds
+        outbox_job = scheduler_manager.add_job(
+            func=drain_email_outbox,
+            trigger=IntervalTrigger(seconds=seconds),
+            id="drain_email_outbox",
+            name="Send Queued Emails",
+            replace_existing=True,
+        )
+        self.registered_jobs["drain_email_outbox"] = outbox_job
+        logger.info(f"Registered email outbox job (every {seconds} seconds)")
+
+    async def _register_maintenance_jobs(self):
+        """Register database maintenance jobs."""
+
+        # Price history partitioning and downsampling - daily
+        retention_job = scheduler_manager.add_job(
+            func=maintain_price_history,
+            trigger=IntervalTrigger(hours=24),
+            id="maintain_price_history",
+            name="Price History Retention",
+            replace_existing=True,
+        )
+        self.registered_jobs["maintain_price_history"] = retention_job
+        logger.info("Registered price history maintenance job (every 24 hours)")
+
+        # Alert deliveries past their cooldown - daily
+        deliveries_job = scheduler_manager.add_job(
+            func=purge_alert_deliveries,
+            trigger=IntervalTrigger(hours=24),
+            id="purge_alert_deliveries",
+            name="Alert Delivery Retention",
+            replace_existing=True,
+        )
+        self.registered_jobs["purge_alert_deliveries"] = deliveries_job
+        logger.info("Registered alert delivery purge job (every 24 hours)")
+
+        # Sent and failed outbox emails past their retention - daily
+        outbox_job = scheduler_manager.add_job(
+            func=purge_email_outbox,
+            trigger=IntervalTrigger(hours=24),
+            id="purge_email_outbox",
+            name="Email Outbox Retention",
+            replace_existing=True,
+        )
+        self.registered_jobs["purge_email_outbox"] = outbox_job
+        logger.info("Registered email outbox purge job (every 24 hours)")
+
+    async def _register_autocomplete_jobs(self):
+        """Register the autocomplete index refresh, first run at startup."""
+        autocomplete_job = scheduler_manager.add_job(
+            func=refresh_autocomplete,
+            trigger=IntervalTrigger(seconds=REFRESH_INTERVAL),
+            id="refresh_autocomplete",
+            name="Refresh Autocomplete Index",
+            next_run_time=datetime.now(timezone.utc),
+            replace_existing=True,
+        )
+        self.registered_jobs["refresh_autocomplete"] = autocomplete_job
+        logger.info(f"Registered autocomplete refresh job (every {REFRESH_INTERVAL} seconds)")
+
     def get_job_status(self):
         """Get status of all registered jobs."""
         jobs = scheduler_manager.get_jobs()
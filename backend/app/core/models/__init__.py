@@ -1,5 +1,19 @@
 """Core models."""
 
+from .alert_delivery import AlertDelivery
+from .email_outbox import EmailOutbox
+from .job_watermark import JobWatermark
+from .price_change_event import PriceChangeEvent
+from .price_history_daily import PriceHistoryDaily
+from .price_snapshot import PriceSnapshot
 from .user import User
 
-__all__ = ["User"]
+__all__ = [
+    "User",
+    "AlertDelivery",
+    "EmailOutbox",
+    "JobWatermark",
+    "PriceChangeEvent",
+    "PriceHistoryDaily",
+    "PriceSnapshot",
+]
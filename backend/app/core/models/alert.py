@@ -3,7 +3,7 @@
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import DECIMAL, ForeignKey, String, Text
+from sqlalchemy import DECIMAL, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.models.base import BaseModel
@@ -37,6 +37,10 @@ class AlertHistory(BaseModel):
     """Alert history model for tracking fired alerts."""
 
     __tablename__ = "alert_history"
+    __table_args__ = (
+        # Newest-first cursor pagination
+        Index("ix_alert_history_keyset", "created_at", "id"),
+    )
 
     alert_rule_id: Mapped[int] = mapped_column(
         ForeignKey("alert_rules.id"), nullable=False, index=True
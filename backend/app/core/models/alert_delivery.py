@@ -0,0 +1,39 @@
+"""Alert delivery model."""
+
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, DateTime, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.base import BaseModel
+
+
+class AlertDelivery(BaseModel):
+    """The last alert of a kind sent to a user about an item.
+
+    Consulted before an alert is produced, so an alert that keeps
+    triggering is only repeated after a cooldown or a further price drop.
+    """
+
+    __tablename__ = "alert_deliveries"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "category", "item_id", "rule", name="uq_alert_deliveries_key"
+        ),
+    )
+
+    # 0 for product alert rules, which notify every user
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    category: Mapped[str] = mapped_column(String(20), nullable=False)  # ecommerce, flight, ...
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    rule: Mapped[str] = mapped_column(String(50), nullable=False)  # alert type or rule:<id>
+    last_price: Mapped[Decimal] = mapped_column(DECIMAL(15, 2), nullable=False)
+    last_sent_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<AlertDelivery(user_id={self.user_id}, {self.category} {self.item_id}, "
+            f"{self.rule}, {self.last_price})>"
+        )
@@ -0,0 +1,34 @@
+"""Email outbox model."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.base import BaseModel
+
+
+class EmailOutbox(BaseModel):
+    """An email waiting to be sent.
+
+    Written in the same transaction as whatever caused it (an alert, a
+    deal, a registration) and sent later by the outbox drainer; see
+    ``app.core.services.email_outbox``.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (Index("ix_email_outbox_due", "status", "next_attempt_at"),)
+
+    kind: Mapped[str] = mapped_column(String(30), nullable=False)  # price_alert, welcome, ...
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # JSON template arguments
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<EmailOutbox({self.kind} to {self.recipient}, {self.status})>"
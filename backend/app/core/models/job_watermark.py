@@ -0,0 +1,25 @@
+"""Job watermark model."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.base import BaseModel
+
+
+class JobWatermark(BaseModel):
+    """How far a periodic job has processed changes.
+
+    Each run handles the changes made after its job's watermark and moves
+    the watermark forward in the same transaction.
+    """
+
+    __tablename__ = "job_watermarks"
+
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
+    watermark: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<JobWatermark({self.name}, {self.watermark})>"
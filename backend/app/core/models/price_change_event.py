@@ -0,0 +1,36 @@
+"""Price change event model."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import DECIMAL, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.base import BaseModel
+
+
+class PriceChangeEvent(BaseModel):
+    """A tracked item's price changed and awaits deal detection.
+
+    Written by the price history recorder in the same transaction as the new
+    interval, and deleted when a detection run claims it; see
+    ``app.core.price_history.changes``.
+    """
+
+    __tablename__ = "price_change_events"
+    __table_args__ = (Index("ix_price_change_events_queue", "category", "id"),)
+
+    category: Mapped[str] = mapped_column(String(20), nullable=False)  # ecommerce, flight, ...
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    old_price: Mapped[Optional[Decimal]] = mapped_column(DECIMAL(15, 2), nullable=True)
+    new_price: Mapped[Decimal] = mapped_column(DECIMAL(15, 2), nullable=False)
+    currency: Mapped[str] = mapped_column(String(3), default="NGN")
+    observed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<PriceChangeEvent({self.category}:{self.item_id}, "
+            f"{self.old_price} -> {self.new_price})>"
+        )
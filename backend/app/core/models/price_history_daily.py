@@ -0,0 +1,46 @@
+"""Daily downsampled price history model."""
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import DECIMAL, Date, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.base import BaseModel
+
+
+class PriceHistoryDaily(BaseModel):
+    """Daily OHLC price summary for a tracked item.
+
+    One row per item per day, shared across all categories. Rows are updated
+    on every observation, and carry sum and sum of squares so window
+    averages and deviations can be combined across days without raw rows.
+    """
+
+    __tablename__ = "price_history_daily"
+    __table_args__ = (
+        UniqueConstraint("category", "item_id", "day", name="uq_price_history_daily_item_day"),
+    )
+
+    category: Mapped[str] = mapped_column(String(20), nullable=False)  # ecommerce, flight, ...
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    open_price: Mapped[Decimal] = mapped_column(DECIMAL(15, 2), nullable=False)
+    high_price: Mapped[Decimal] = mapped_column(DECIMAL(15, 2), nullable=False)
+    low_price: Mapped[Decimal] = mapped_column(DECIMAL(15, 2), nullable=False)
+    close_price: Mapped[Decimal] = mapped_column(DECIMAL(15, 2), nullable=False)
+    price_sum: Mapped[Decimal] = mapped_column(Numeric(30, 2), nullable=False)
+    price_sumsq: Mapped[Decimal] = mapped_column(Numeric(38, 4), nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    @property
+    def avg_price(self) -> Decimal:
+        """Average observed price for the day."""
+        return self.price_sum / self.sample_count if self.sample_count else self.close_price
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<PriceHistoryDaily({self.category}:{self.item_id}, day={self.day}, "
+            f"close={self.close_price})>"
+        )
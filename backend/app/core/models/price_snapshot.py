@@ -0,0 +1,55 @@
+"""Latest price snapshot model."""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import DECIMAL, DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.base import BaseModel
+
+
+class PriceSnapshot(BaseModel):
+    """Current price state of a tracked item.
+
+    One row per item, shared across all categories and upserted together with
+    every price history write, so listings and alert checks can read an
+    item's current price without scanning its history.
+    """
+
+    __tablename__ = "price_snapshots"
+    __table_args__ = (
+        UniqueConstraint("category", "item_id", name="uq_price_snapshots_item"),
+        # Watchlist alerts scan the prices changed since their last run
+        Index("ix_price_snapshots_last_changed", "last_changed_at"),
+    )
+
+    category: Mapped[str] = mapped_column(String(20), nullable=False)  # ecommerce, flight, ...
+    item_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    current_price: Mapped[Decimal] = mapped_column(DECIMAL(15, 2), nullable=False)
+    previous_price: Mapped[Optional[Decimal]] = mapped_column(DECIMAL(15, 2), nullable=True)
+    currency: Mapped[str] = mapped_column(String(3), default="NGN")
+    availability: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    last_changed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_seen_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    low_7d: Mapped[Optional[Decimal]] = mapped_column(DECIMAL(15, 2), nullable=True)
+    high_7d: Mapped[Optional[Decimal]] = mapped_column(DECIMAL(15, 2), nullable=True)
+    # Sliding-window max/min state, see app.core.price_history.extremes
+    extremes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Daily closes for robust reference prices, see app.core.price_history.baselines
+    baselines: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    @property
+    def change_percent(self) -> Optional[float]:
+        """Percent change from the previous price, if the price has changed."""
+        if not self.previous_price:
+            return None
+        return float((self.current_price - self.previous_price) / self.previous_price * 100)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<PriceSnapshot({self.category}:{self.item_id}, price={self.current_price}, "
+            f"previous={self.previous_price})>"
+        )
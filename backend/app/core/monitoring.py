@@ -7,6 +7,7 @@ from typing import Dict
 
 logger = logging.getLogger(__name__)
 
+from app.core.database import get_pool_metrics
 from app.core.job_manager import job_manager
 from app.core.scheduler import scheduler_manager
 
@@ -106,6 +107,7 @@ class MonitoringService:
                 ),
                 "total_requests": len(self.metrics["response_times"]),
             },
+            "database_pools": get_pool_metrics(),
             "scheduler_status": {
                 "running": scheduler_manager.is_running,
                 "jobs": job_manager.get_job_status(),
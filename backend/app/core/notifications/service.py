@@ -2,20 +2,28 @@
 
 import logging
 import os
+from collections import deque
 from datetime import datetime
-from typing import List, Set
+from typing import Deque, List, Set
 
 logger = logging.getLogger(__name__)
 
+from app.core.config import settings
 from app.core.models.alert import AlertHistory
 
 
 class NotificationService:
     """Service for dispatching notifications via multiple channels."""
 
-    def __init__(self):
-        """Initialize notification service."""
-        self.sent_alerts: Set[int] = set()  # Track sent alerts to prevent duplicates
+    def __init__(self, max_sent_alerts: int = settings.alert_dedup_cache_size):
+        """Initialize notification service.
+
+        Repeated alerts are suppressed before they are created (see
+        app.core.alerts.deliveries); the ids of recently sent alerts are
+        only kept to avoid dispatching the same alert twice.
+        """
+        self.sent_alerts: Set[int] = set()
+        self._sent_order: Deque[int] = deque(maxlen=max_sent_alerts)
         self.notifications_dir = "notifications"
         self._ensure_notifications_dir()
 
@@ -47,6 +55,9 @@ class NotificationService:
                 return False
 
             # Mark as sent
+            if len(self._sent_order) == self._sent_order.maxlen:
+                self.sent_alerts.discard(self._sent_order[0])
+            self._sent_order.append(alert.id)
             self.sent_alerts.add(alert.id)
             return True
 
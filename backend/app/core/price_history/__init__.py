@@ -0,0 +1 @@
+"""Price history storage, retention and downsampling."""
@@ -0,0 +1,249 @@
+"""Cold archive of raw price history in compressed Arrow IPC files.
+
+Before retention purges raw rows, they are appended to zstd-compressed
+Arrow IPC files under ``{archive_dir}/{category}/{YYYY-MM}/``, where the
+month is the one the interval was last observed in. Every run writes new
+part files sorted by item. Long-range charts and exports read the months
+they need memory-mapped, batch by batch, and merge the archived intervals
+with the hot rows still in the database.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+from sqlalchemy import DateTime, Integer, Numeric, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.price_history.intervals import observed_until, seen_since
+from app.core.price_history.registry import PriceHistoryTable, get_history_table
+
+logger = logging.getLogger(__name__)
+
+# Rows per record batch; a batch is the unit read back into memory
+BATCH_ROWS = 65536
+
+BASE_COLUMNS = ("id", "price", "currency", "source", "created_at", "last_seen_at", "observations")
+
+
+class ArchivedPrice(SimpleNamespace):
+    """Archived history row, read back with the same attributes as a model row."""
+
+
+def _utc(value: datetime) -> datetime:
+    """Datetime as timezone-aware UTC (SQLite returns naive UTC values)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _arrow_type(column) -> pa.DataType:
+    """Arrow type for a mapped column."""
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(column.type, Numeric):
+        return pa.decimal128(column.type.precision or 15, column.type.scale or 2)
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    return pa.string()
+
+
+def archive_schema(table: PriceHistoryTable) -> pa.Schema:
+    """Arrow schema of a category's archive files."""
+    columns = table.model.__table__.columns
+    fields = [pa.field("item_id", pa.int64(), nullable=False)]
+    for name in (*BASE_COLUMNS, *table.state_columns):
+        fields.append(pa.field(name, _arrow_type(columns[name])))
+    return pa.schema(fields)
+
+
+def archive_record(table: PriceHistoryTable, row: Any) -> Dict:
+    """Archive record of a raw history row."""
+    record = {"item_id": getattr(row, table.item_column)}
+    record.update({name: getattr(row, name) for name in (*BASE_COLUMNS, *table.state_columns)})
+    record["created_at"] = _utc(record["created_at"])
+    if record["last_seen_at"] is not None:
+        record["last_seen_at"] = _utc(record["last_seen_at"])
+    return record
+
+
+def merge_history(hot_rows: Iterable[Any], archived_rows: Iterable[Any]) -> List[Any]:
+    """Hot and archived intervals of one item, oldest first.
+
+    A row still in the database (archived by a run that failed before
+    purging) is taken from the database.
+    """
+    hot_rows = list(hot_rows)
+    hot_ids = {row.id for row in hot_rows}
+    rows = hot_rows + [row for row in archived_rows if row.id not in hot_ids]
+    rows.sort(key=lambda row: _utc(row.created_at))
+    return rows
+
+
+class PriceHistoryArchive:
+    """Writes and reads the price history archive files."""
+
+    def __init__(self, root: Optional[str] = None):
+        """Initialize with the archive directory."""
+        self.root = Path(root or settings.price_history_archive_dir)
+
+    def month_dir(self, category: str, month: date) -> Path:
+        """Directory holding a category's intervals last observed in a month."""
+        return self.root / category / f"{month.year:04d}-{month.month:02d}"
+
+    def months(self, category: str, since: Optional[datetime] = None) -> List[Path]:
+        """Month directories of a category that can hold intervals observed since a time."""
+        category_dir = self.root / category
+        if not category_dir.is_dir():
+            return []
+        first = f"{since.year:04d}-{since.month:02d}" if since else ""
+        return sorted(
+            path for path in category_dir.iterdir() if path.is_dir() and path.name >= first
+        )
+
+    def write(self, table: PriceHistoryTable, records: Iterable[Dict]) -> int:
+        """Append archive records to the archive, one new part file per month."""
+        by_month: Dict[date, List[Dict]] = {}
+        for record in records:
+            seen = record["last_seen_at"] or record["created_at"]
+            by_month.setdefault(date(seen.year, seen.month, 1), []).append(record)
+
+        schema = archive_schema(table)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        written = 0
+        for month, records in sorted(by_month.items()):
+            records.sort(key=lambda record: (record["item_id"], record["created_at"]))
+            directory = self.month_dir(table.category, month)
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"part-{stamp}.arrow"
+            partial = path.with_suffix(".arrow.tmp")
+
+            options = ipc.IpcWriteOptions(compression="zstd")
+            with pa.OSFile(str(partial), "wb") as sink:
+                with ipc.new_file(sink, schema, options=options) as writer:
+                    writer.write_table(
+                        pa.Table.from_pylist(records, schema=schema), max_chunksize=BATCH_ROWS
+                    )
+            # Readers only ever see complete files
+            os.replace(partial, path)
+            written += len(records)
+
+        return written
+
+    def read(
+        self, category: str, item_id: int, since: Optional[datetime] = None
+    ) -> List[ArchivedPrice]:
+        """Archived intervals of one item observed since a time, oldest first."""
+        since = _utc(since) if since else None
+        rows = []
+        for directory in self.months(category, since):
+            for path in sorted(directory.glob("part-*.arrow")):
+                rows.extend(self._read_file(path, item_id, since))
+
+        # A run that failed before purging leaves rows to be archived again
+        unique = {row.id: row for row in rows}
+        return sorted(unique.values(), key=lambda row: row.created_at)
+
+    def _read_file(
+        self, path: Path, item_id: int, since: Optional[datetime]
+    ) -> List[ArchivedPrice]:
+        """Matching rows of one memory-mapped part file."""
+        rows = []
+        with pa.memory_map(str(path), "r") as source:
+            reader = ipc.open_file(source)
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index)
+                item_ids = batch.column("item_id")
+                # Batches are sorted by item, so skip those whose range misses it
+                if not batch.num_rows:
+                    continue
+                if not item_ids[0].as_py() <= item_id <= item_ids[-1].as_py():
+                    continue
+
+                mask = pc.equal(item_ids, item_id)
+                if since is not None:
+                    seen = pc.coalesce(batch.column("last_seen_at"), batch.column("created_at"))
+                    mask = pc.and_(mask, pc.greater_equal(seen, pa.scalar(since, seen.type)))
+                for record in batch.filter(mask).to_pylist():
+                    rows.append(ArchivedPrice(**record))
+        return rows
+
+
+class ArchivedHistory:
+    """Loads an item's price history from the database and the archive."""
+
+    def __init__(self, archive: Optional[PriceHistoryArchive] = None):
+        """Initialize with an archive."""
+        self.archive = archive or PriceHistoryArchive()
+
+    def _needs_archive(self, since: Optional[datetime]) -> bool:
+        """Whether anything observed since a time can have been archived."""
+        if not settings.price_history_archive_enabled:
+            return False
+        if since is None:
+            return True
+        horizon = datetime.now(timezone.utc) - timedelta(days=settings.price_history_retention_days)
+        return _utc(since) < horizon
+
+    def _hot_query(self, table: PriceHistoryTable, item_id: int, since: Optional[datetime]):
+        """Database rows of one item, oldest first."""
+        query = select(table.model).where(table.item_col == item_id)
+        if since is not None:
+            query = query.where(seen_since(table.model, since))
+        return query.order_by(table.model.created_at.asc())
+
+    def load(
+        self, db: Session, category: str, item_id: int, since: Optional[datetime] = None
+    ) -> List[Any]:
+        """Intervals of one item observed since a time, oldest first."""
+        table = get_history_table(category)
+        hot_rows = db.execute(self._hot_query(table, item_id, since)).scalars().all()
+        if not self._needs_archive(since):
+            return list(hot_rows)
+        return merge_history(hot_rows, self.archive.read(category, item_id, since))
+
+    async def load_async(
+        self, db: AsyncSession, category: str, item_id: int, since: Optional[datetime] = None
+    ) -> List[Any]:
+        """Async variant of `load`; archive files are read in a worker thread."""
+        table = get_history_table(category)
+        result = await db.execute(self._hot_query(table, item_id, since))
+        hot_rows = result.scalars().all()
+        if not self._needs_archive(since):
+            return list(hot_rows)
+        archived = await asyncio.to_thread(self.archive.read, category, item_id, since)
+        return merge_history(hot_rows, archived)
+
+
+async def archive_expired(
+    db: AsyncSession, archive: PriceHistoryArchive, table: PriceHistoryTable, cutoff: datetime
+) -> int:
+    """Write raw rows last observed before cutoff to the archive, in batches."""
+    result = await db.stream_scalars(
+        select(table.model)
+        .where(observed_until(table.model) < cutoff, table.item_col.isnot(None))
+        .order_by(table.item_col, table.model.created_at)
+        .execution_options(yield_per=BATCH_ROWS)
+    )
+
+    written = 0
+    async for rows in result.partitions():
+        records = [archive_record(table, row) for row in rows]
+        written += await asyncio.to_thread(archive.write, table, records)
+
+    if written:
+        logger.info(f"Archived {written} {table.category} price history rows")
+    return written
+
+
+# Global archived history instance
+archived_history = ArchivedHistory()
@@ -0,0 +1,149 @@
+"""Robust reference prices kept with each item's snapshot.
+
+A retailer can raise a price for a day and then "drop" it back, which
+looks like a discount from the recent high. Each item therefore keeps
+its daily closing prices over the last 30 days, and a discount is only
+measured from the lowest of the recent high and three robust baselines
+over the days before the current one:
+
+- the rolling median of the daily closes;
+- their trimmed mean, ignoring the highest and lowest 10%;
+- the pre-spike level, the median before the most recent rise of more
+  than 15% above the price level preceding it.
+
+Appending a close is O(1); the baselines are computed when a deal is
+evaluated, over at most 30 values. The state is stored as compact JSON
+in ``price_snapshots.baselines``.
+"""
+
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from statistics import median
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models.price_snapshot import PriceSnapshot
+
+BASELINE_DAYS = 30
+
+# Fewer prior days than this give no baseline, so new items are not capped
+MIN_BASELINE_DAYS = 3
+
+TRIM_FRACTION = 0.1
+SPIKE_RISE = Decimal("0.15")
+
+Close = Tuple[int, Decimal]
+
+
+def _day(value: Optional[datetime]) -> int:
+    """Day ordinal of a timestamp (naive datetimes are taken as UTC)."""
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date().toordinal()
+
+
+class PriceBaselines:
+    """Daily closes of one item's price and the baselines derived from them."""
+
+    __slots__ = ("closes",)
+
+    def __init__(self, closes: Optional[List[Close]] = None):
+        """Initialize from stored closes, oldest first."""
+        self.closes: List[Close] = closes or []
+
+    @classmethod
+    def loads(cls, state: Optional[str]) -> "PriceBaselines":
+        """Rebuild from the stored JSON state (empty if there is none)."""
+        if not state:
+            return cls()
+        return cls([(day, Decimal(price)) for day, price in json.loads(state)["d"]])
+
+    def dumps(self) -> str:
+        """Compact JSON state."""
+        return json.dumps(
+            {"d": [[day, str(price)] for day, price in self.closes]}, separators=(",", ":")
+        )
+
+    @classmethod
+    def from_rollups(cls, rows: Iterable) -> "PriceBaselines":
+        """Build from daily rollup rows, oldest first."""
+        baselines = cls()
+        for row in rows:
+            day = row.day if isinstance(row.day, date) else date.fromisoformat(str(row.day))
+            baselines.append(datetime.combine(day, datetime.min.time()), row.close_price)
+        return baselines
+
+    def append(self, observed_at: Optional[datetime], price: Decimal) -> None:
+        """Make a price the close of its day (late observations count as the latest day)."""
+        price = Decimal(str(price))
+        day = _day(observed_at)
+        if self.closes and self.closes[-1][0] >= day:
+            self.closes[-1] = (self.closes[-1][0], price)
+        else:
+            self.closes.append((day, price))
+
+        expired = 0
+        while self.closes[expired][0] <= self.closes[-1][0] - BASELINE_DAYS:
+            expired += 1
+        if expired:
+            del self.closes[:expired]
+
+    def prior(self, now: Optional[datetime] = None) -> List[Decimal]:
+        """Closes of the window's days before the current one, oldest first."""
+        today = _day(now)
+        return [price for day, price in self.closes if today - BASELINE_DAYS <= day < today]
+
+    def median(self, now: Optional[datetime] = None) -> Optional[Decimal]:
+        """Median of the prior daily closes."""
+        closes = self.prior(now)
+        if len(closes) < MIN_BASELINE_DAYS:
+            return None
+        return median(closes)
+
+    def trimmed_mean(self, now: Optional[datetime] = None) -> Optional[Decimal]:
+        """Mean of the prior daily closes without the highest and lowest 10%."""
+        closes = sorted(self.prior(now))
+        if len(closes) < MIN_BASELINE_DAYS:
+            return None
+        trim = int(len(closes) * TRIM_FRACTION)
+        kept = closes[trim : len(closes) - trim]
+        return sum(kept) / len(kept)
+
+    def pre_spike(self, now: Optional[datetime] = None) -> Optional[Decimal]:
+        """Median price level before the most recent spike, if there was one.
+
+        A spike is a day-over-day rise that lifts the price more than 15%
+        above the median of the days before it. Recovering from a dip back
+        to the usual level is therefore not a spike.
+        """
+        closes = self.prior(now)
+        for index in range(len(closes) - 1, 0, -1):
+            if closes[index] <= closes[index - 1] * (1 + SPIKE_RISE):
+                continue
+            level = median(closes[:index])
+            if closes[index] > level * (1 + SPIKE_RISE):
+                return level
+        return None
+
+    def reference(
+        self, highest_price: Optional[Decimal], now: Optional[datetime] = None
+    ) -> Optional[Decimal]:
+        """The price a discount may be claimed from: the recent high capped at the baselines."""
+        if highest_price is None:
+            return None
+        baselines = [self.median(now), self.trimmed_mean(now), self.pre_spike(now)]
+        return min([highest_price] + [value for value in baselines if value is not None])
+
+
+async def load_baselines(db: AsyncSession, category: str, item_id: int) -> PriceBaselines:
+    """An item's stored baselines."""
+    result = await db.execute(
+        select(PriceSnapshot.baselines).where(
+            PriceSnapshot.category == category, PriceSnapshot.item_id == item_id
+        )
+    )
+    return PriceBaselines.loads(result.scalar_one_or_none())
@@ -0,0 +1,234 @@
+"""Vectorized price statistics for many items at once.
+
+Dashboards and deal detection need the same window statistics as the
+per-item analytics (first/last price, low/high, mean, deviation, trend,
+drop from high, savings from average) for every tracked item. Instead of
+one query and one Python loop per item, PriceSeriesBatch loads the daily
+rollups of a whole category in a single query into contiguous NumPy
+arrays sorted by item, and every statistic is a segment reduction over
+those arrays.
+"""
+
+import logging
+from datetime import date
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.models.price_history_daily import PriceHistoryDaily
+from app.core.price_history.rollups import window_start
+
+logger = logging.getLogger(__name__)
+
+# Percent change beyond which a window's price is rising or falling
+TREND_THRESHOLD = 5.0
+
+_COLUMNS = (
+    PriceHistoryDaily.item_id,
+    PriceHistoryDaily.day,
+    PriceHistoryDaily.open_price,
+    PriceHistoryDaily.close_price,
+    PriceHistoryDaily.low_price,
+    PriceHistoryDaily.high_price,
+    PriceHistoryDaily.price_sum,
+    PriceHistoryDaily.price_sumsq,
+    PriceHistoryDaily.sample_count,
+)
+
+
+def segment_starts(item_ids: np.ndarray) -> np.ndarray:
+    """Index of the first row of each item in an item-sorted array."""
+    if not len(item_ids):
+        return np.zeros(0, dtype=np.intp)
+    return np.flatnonzero(np.r_[True, item_ids[1:] != item_ids[:-1]])
+
+
+class BulkWindowStats:
+    """Per-item statistics for one window, one array element per item."""
+
+    def __init__(
+        self,
+        days: int,
+        item_ids: np.ndarray,
+        open_price: np.ndarray,
+        close_price: np.ndarray,
+        low_price: np.ndarray,
+        high_price: np.ndarray,
+        total: np.ndarray,
+        total_sq: np.ndarray,
+        count: np.ndarray,
+    ):
+        """Initialize from per-item segment reductions."""
+        self.days = days
+        self.item_ids = item_ids
+        self.open = open_price
+        self.close = close_price
+        self.low = low_price
+        self.high = high_price
+        self.count = count
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.mean = np.where(count > 0, total / count, close_price)
+            # Population variance; clamp tiny negative values from rounding
+            self.variance = np.where(
+                count > 0, np.maximum(total_sq / count - self.mean * self.mean, 0.0), 0.0
+            )
+            self.change_percent = np.where(
+                count < 2,
+                np.nan,
+                np.where(open_price > 0, (close_price - open_price) / open_price * 100, 0.0),
+            )
+            self.drop_from_high_percent = np.where(
+                high_price > 0, (high_price - close_price) / high_price * 100, 0.0
+            )
+            self.savings_from_average = self.mean - close_price
+            self.savings_percent = np.where(
+                self.mean > 0, self.savings_from_average / self.mean * 100, 0.0
+            )
+
+        self._positions = {int(item_id): index for index, item_id in enumerate(item_ids)}
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._positions
+
+    def stddev(self, sample: bool = False) -> np.ndarray:
+        """Standard deviation per item (NaN where fewer than two observations)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = self.variance
+            if sample:
+                variance = variance * self.count / (self.count - 1)
+            return np.where(self.count >= 2, np.sqrt(variance), np.nan)
+
+    def trends(self, insufficient: str = "stable") -> np.ndarray:
+        """Trend label per item: rising, falling or stable."""
+        change = self.change_percent
+        return np.select(
+            [np.isnan(change), change > TREND_THRESHOLD, change < -TREND_THRESHOLD],
+            [insufficient, "rising", "falling"],
+            default="stable",
+        )
+
+    def trend(self, item_id: int, insufficient: str = "stable") -> str:
+        """Trend label for one item."""
+        index = self._positions.get(item_id)
+        if index is None:
+            return insufficient
+
+        change = self.change_percent[index]
+        if np.isnan(change):
+            return insufficient
+        if change > TREND_THRESHOLD:
+            return "rising"
+        elif change < -TREND_THRESHOLD:
+            return "falling"
+        else:
+            return "stable"
+
+    def get(self, item_id: int) -> Optional[Dict]:
+        """Statistics for one item, keyed like the per-item analytics."""
+        index = self._positions.get(item_id)
+        if index is None:
+            return None
+
+        return {
+            "period_days": self.days,
+            "current_price": float(self.close[index]),
+            "lowest_price": float(self.low[index]),
+            "highest_price": float(self.high[index]),
+            "average_price": round(float(self.mean[index]), 2),
+            "price_drop": round(float(self.high[index] - self.close[index]), 2),
+            "price_drop_percentage": round(float(self.drop_from_high_percent[index]), 2),
+            "savings_from_average": round(float(self.savings_from_average[index]), 2),
+            "savings_percentage": round(float(self.savings_percent[index]), 2),
+            "data_points": int(self.count[index]),
+        }
+
+    def price_drops(self, item_ids: Optional[Iterable[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Indexes of items whose last price is below their first, and the drop amounts."""
+        mask = (self.count >= 2) & (self.close < self.open)
+        if item_ids is not None:
+            mask &= np.isin(self.item_ids, np.fromiter(item_ids, dtype=np.int64))
+
+        indexes = np.flatnonzero(mask)
+        return indexes, self.open[indexes] - self.close[indexes]
+
+
+class PriceSeriesBatch:
+    """Daily rollups for many items held as item-sorted NumPy columns."""
+
+    def __init__(self, rows: Sequence[Sequence], today: Optional[date] = None):
+        """Initialize from (item_id, day, open, close, low, high, sum, sumsq, count) rows.
+
+        Rows must be sorted by item id and then day.
+        """
+        n = len(rows)
+        self.today = today
+        self.item_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=n)
+        self.days = np.array([row[1] for row in rows], dtype="datetime64[D]")
+        self.open = np.fromiter((float(row[2]) for row in rows), dtype=np.float64, count=n)
+        self.close = np.fromiter((float(row[3]) for row in rows), dtype=np.float64, count=n)
+        self.low = np.fromiter((float(row[4]) for row in rows), dtype=np.float64, count=n)
+        self.high = np.fromiter((float(row[5]) for row in rows), dtype=np.float64, count=n)
+        self.price_sum = np.fromiter((float(row[6]) for row in rows), dtype=np.float64, count=n)
+        self.price_sumsq = np.fromiter((float(row[7]) for row in rows), dtype=np.float64, count=n)
+        self.sample_count = np.fromiter((row[8] for row in rows), dtype=np.int64, count=n)
+        self._windows: Dict[int, BulkWindowStats] = {}
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        category: str,
+        days: int,
+        item_ids: Optional[Iterable[int]] = None,
+    ) -> "PriceSeriesBatch":
+        """Load every item's rollups for the last `days` days with a single query."""
+        query = db.query(*_COLUMNS).filter(
+            PriceHistoryDaily.category == category,
+            PriceHistoryDaily.day >= window_start(days),
+        )
+        if item_ids is not None:
+            query = query.filter(PriceHistoryDaily.item_id.in_(list(item_ids)))
+
+        rows = query.order_by(PriceHistoryDaily.item_id, PriceHistoryDaily.day).all()
+        logger.debug(f"Loaded {len(rows)} {category} rollup rows for bulk statistics")
+        return cls(rows)
+
+    def __len__(self) -> int:
+        return len(self.item_ids)
+
+    def window(self, days: int) -> BulkWindowStats:
+        """Statistics for every item over the last `days` days."""
+        if days not in self._windows:
+            self._windows[days] = self._reduce(days)
+        return self._windows[days]
+
+    def _reduce(self, days: int) -> BulkWindowStats:
+        """Segment-reduce the rows inside a window to one value per item."""
+        mask = self.days >= np.datetime64(window_start(days, self.today))
+        item_ids = self.item_ids[mask]
+        starts = segment_starts(item_ids)
+
+        if not len(starts):
+            empty = np.zeros(0, dtype=np.float64)
+            return BulkWindowStats(
+                days, np.zeros(0, dtype=np.int64), empty, empty, empty, empty, empty, empty,
+                np.zeros(0, dtype=np.int64),
+            )
+
+        ends = np.r_[starts[1:], len(item_ids)] - 1
+        return BulkWindowStats(
+            days,
+            item_ids[starts],
+            self.open[mask][starts],
+            self.close[mask][ends],
+            np.minimum.reduceat(self.low[mask], starts),
+            np.maximum.reduceat(self.high[mask], starts),
+            np.add.reduceat(self.price_sum[mask], starts),
+            np.add.reduceat(self.price_sumsq[mask], starts),
+            np.add.reduceat(self.sample_count[mask], starts),
+        )
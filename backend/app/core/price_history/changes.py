@@ -0,0 +1,66 @@
+"""Price change events feeding incremental deal detection.
+
+The recorder queues an event whenever an item's price changes. Deal
+detection claims a category's pending events, evaluates only those items
+against their cached snapshot state, and deletes the events in the same
+transaction, so a failed run leaves them queued for the next one.
+"""
+
+import logging
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.models.price_change_event import PriceChangeEvent
+
+logger = logging.getLogger(__name__)
+
+
+def queue_price_change(
+    db: Session,
+    category: str,
+    item_id: int,
+    old_price: Optional[Decimal],
+    new_price: Decimal,
+    currency: str = "NGN",
+    observed_at: Optional[datetime] = None,
+) -> PriceChangeEvent:
+    """Add a price change event to the caller's unit of work."""
+    event = PriceChangeEvent(
+        category=category,
+        item_id=item_id,
+        old_price=old_price,
+        new_price=new_price,
+        currency=currency,
+        observed_at=observed_at or datetime.now(timezone.utc),
+    )
+    db.add(event)
+    return event
+
+
+def claim_price_changes(db: Session, category: str, limit: int) -> List[int]:
+    """Take up to `limit` of a category's oldest events, returning the changed item ids.
+
+    Claimed events are deleted; concurrent runs skip rows another run has
+    locked. The caller commits once the items have been evaluated.
+    """
+    events = db.execute(
+        select(PriceChangeEvent.id, PriceChangeEvent.item_id)
+        .where(PriceChangeEvent.category == category)
+        .order_by(PriceChangeEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not events:
+        return []
+
+    db.execute(
+        delete(PriceChangeEvent).where(PriceChangeEvent.id.in_([event.id for event in events]))
+    )
+    item_ids = sorted({event.item_id for event in events})
+    logger.debug(f"Claimed {len(events)} {category} price changes for {len(item_ids)} items")
+    return item_ids
+
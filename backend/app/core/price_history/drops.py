@@ -0,0 +1,121 @@
+"""Set-based price drop statistics over daily rollups.
+
+Dashboards compare every item's first and last price inside a window.
+Rather than querying each item's history, a single window-function query
+over ``price_history_daily`` finds the first open and last close per item
+and returns the drop aggregates together with the biggest drops.
+"""
+
+from typing import Dict, Iterable, Optional, Union
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.models.price_history_daily import PriceHistoryDaily
+from app.core.price_history.rollups import window_start
+
+
+def first_last_in_window(
+    category: str, days: int, item_ids: Optional[Union[Select, Iterable[int]]] = None
+) -> Select:
+    """First and last price per item over the last `days` days, one row per item."""
+    by_item = {"partition_by": PriceHistoryDaily.item_id, "order_by": PriceHistoryDaily.day}
+    windowed = select(
+        PriceHistoryDaily.item_id,
+        func.first_value(PriceHistoryDaily.open_price).over(**by_item).label("first_price"),
+        func.last_value(PriceHistoryDaily.close_price)
+        .over(**by_item, rows=(None, None))
+        .label("last_price"),
+        func.sum(PriceHistoryDaily.sample_count)
+        .over(partition_by=PriceHistoryDaily.item_id)
+        .label("observations"),
+        func.row_number().over(**by_item).label("position"),
+    ).where(
+        PriceHistoryDaily.category == category,
+        PriceHistoryDaily.day >= window_start(days),
+    )
+    if item_ids is not None:
+        windowed = windowed.where(PriceHistoryDaily.item_id.in_(item_ids))
+
+    windowed = windowed.subquery("windowed")
+    return select(
+        windowed.c.item_id,
+        windowed.c.first_price,
+        windowed.c.last_price,
+        windowed.c.observations,
+    ).where(windowed.c.position == 1)
+
+
+def price_drop_summary(
+    db: Session,
+    category: str,
+    days: int,
+    item_ids: Optional[Union[Select, Iterable[int]]] = None,
+    limit: int = 5,
+) -> Dict:
+    """Drop aggregates and the `limit` biggest drops for a category in one query.
+
+    An item dropped when its last price in the window is below its first and
+    it was observed at least twice. `item_ids` optionally restricts the items
+    (a list of ids or a select of ids, such as the active ones).
+    """
+    items = first_last_in_window(category, days, item_ids).subquery("items")
+    drop_amount = (items.c.first_price - items.c.last_price).label("drop_amount")
+    drops = (
+        select(
+            items.c.item_id,
+            items.c.first_price,
+            items.c.last_price,
+            drop_amount,
+            (drop_amount / items.c.first_price * 100).label("drop_percent"),
+        )
+        .where(
+            items.c.observations >= 2,
+            items.c.last_price < items.c.first_price,
+            items.c.first_price > 0,
+        )
+        .subquery("drops")
+    )
+
+    # Totals ride along on every returned row as window aggregates over all drops;
+    # at least one row is fetched so they are available even when limit is 0
+    rows = db.execute(
+        select(
+            drops,
+            func.count().over().label("drop_count"),
+            func.sum(drops.c.drop_amount).over().label("total_drop_amount"),
+            func.avg(drops.c.drop_percent).over().label("average_drop_percent"),
+        )
+        .order_by(drops.c.drop_amount.desc(), drops.c.item_id)
+        .limit(max(limit, 1))
+    ).all()
+
+    if not rows:
+        return {
+            "items_with_drops": 0,
+            "total_drop_amount": 0.0,
+            "average_drop_amount": 0.0,
+            "average_drop_percent": 0.0,
+            "top_drops": [],
+        }
+
+    drop_count = rows[0].drop_count
+    total_drop_amount = float(rows[0].total_drop_amount)
+
+    return {
+        "items_with_drops": drop_count,
+        "total_drop_amount": total_drop_amount,
+        "average_drop_amount": total_drop_amount / drop_count,
+        "average_drop_percent": float(rows[0].average_drop_percent),
+        "top_drops": [
+            {
+                "item_id": row.item_id,
+                "old_price": float(row.first_price),
+                "new_price": float(row.last_price),
+                "amount": float(row.drop_amount),
+                "percent": float(row.drop_percent),
+            }
+            for row in rows[:limit]
+        ],
+    }
@@ -0,0 +1,116 @@
+"""Sliding-window price extremes kept with each item's snapshot.
+
+Each item keeps two monotonic queues of (hour, price) over the longest
+window: highs with strictly decreasing prices and lows with strictly
+increasing prices. An observation pops the entries it dominates and is
+appended, so updates are amortized O(1). The queue for a shorter window is
+a suffix of the longest one, so the 7/30/90-day maximum and minimum are all
+read from the same queues by bisecting on the hour. The state is stored as
+compact JSON in ``price_snapshots.extremes``.
+"""
+
+import json
+from bisect import bisect_left
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Iterable, List, Optional, Tuple
+
+WINDOWS = (7, 30, 90)
+
+# Observations are bucketed by hour, which bounds each queue's length
+HORIZON_HOURS = max(WINDOWS) * 24
+
+Entry = Tuple[int, Decimal]
+
+
+def _hour(value: Optional[datetime]) -> int:
+    """Hours since the epoch (naive datetimes are taken as UTC)."""
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp()) // 3600
+
+
+class RollingExtremes:
+    """7/30/90-day maximum and minimum of one item's observed prices."""
+
+    __slots__ = ("highs", "lows")
+
+    def __init__(self, highs: Optional[List[Entry]] = None, lows: Optional[List[Entry]] = None):
+        """Initialize from stored queues."""
+        self.highs: List[Entry] = highs or []
+        self.lows: List[Entry] = lows or []
+
+    @classmethod
+    def loads(cls, state: Optional[str]) -> "RollingExtremes":
+        """Rebuild from the stored JSON state (empty if there is none)."""
+        if not state:
+            return cls()
+        data = json.loads(state)
+        return cls(
+            [(hour, Decimal(price)) for hour, price in data["h"]],
+            [(hour, Decimal(price)) for hour, price in data["l"]],
+        )
+
+    def dumps(self) -> str:
+        """Compact JSON state."""
+        return json.dumps(
+            {
+                "h": [[hour, str(price)] for hour, price in self.highs],
+                "l": [[hour, str(price)] for hour, price in self.lows],
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_intervals(cls, rows: Iterable) -> "RollingExtremes":
+        """Build from history interval rows, oldest first."""
+        extremes = cls()
+        for row in rows:
+            extremes.append(row.created_at, row.price)
+            if row.last_seen_at is not None:
+                extremes.append(row.last_seen_at, row.price)
+        return extremes
+
+    def append(self, observed_at: Optional[datetime], price: Decimal) -> None:
+        """Add an observation (late observations count as the latest hour)."""
+        price = Decimal(str(price))
+        hour = _hour(observed_at)
+        for queue in (self.highs, self.lows):
+            if queue:
+                hour = max(hour, queue[-1][0])
+
+        self._push(self.highs, hour, price, lambda kept: kept <= price)
+        self._push(self.lows, hour, price, lambda kept: kept >= price)
+        self._expire(hour - HORIZON_HOURS)
+
+    @staticmethod
+    def _push(queue: List[Entry], hour: int, price: Decimal, dominated) -> None:
+        """Append to a monotonic queue, dropping the entries the new price outlasts."""
+        while queue and dominated(queue[-1][1]):
+            queue.pop()
+        # An entry from this hour that is more extreme already covers it
+        if queue and queue[-1][0] == hour:
+            return
+        queue.append((hour, price))
+
+    def _expire(self, before: int) -> None:
+        """Drop entries older than the longest window."""
+        for queue in (self.highs, self.lows):
+            stale = bisect_left(queue, before, key=lambda entry: entry[0])
+            if stale:
+                del queue[:stale]
+
+    def _extreme(self, queue: List[Entry], days: int, now: Optional[datetime]) -> Optional[Decimal]:
+        """First queue entry inside the window."""
+        start = bisect_left(queue, _hour(now) - days * 24, key=lambda entry: entry[0])
+        return queue[start][1] if start < len(queue) else None
+
+    def high(self, days: int, now: Optional[datetime] = None) -> Optional[Decimal]:
+        """Highest price observed in the last `days` days."""
+        return self._extreme(self.highs, days, now)
+
+    def low(self, days: int, now: Optional[datetime] = None) -> Optional[Decimal]:
+        """Lowest price observed in the last `days` days."""
+        return self._extreme(self.lows, days, now)
+
@@ -0,0 +1,67 @@
+"""Read helpers for change-only (run-length) price history rows.
+
+Each history row is an interval: the price was observed at ``created_at``
+and on every scrape up to ``last_seen_at``, ``observations`` times in total.
+Rows written before change-only recording have no ``last_seen_at`` and
+count as a single observation.
+"""
+
+from datetime import datetime
+from typing import Any, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+
+
+def observed_until(model):
+    """SQL expression for the last time an interval row was observed."""
+    return func.coalesce(model.last_seen_at, model.created_at)
+
+
+def seen_since(model, cutoff: datetime):
+    """Filter for intervals still observed at or after cutoff.
+
+    Filtering on created_at alone would drop a long-running interval that
+    started before the window but still holds the current price.
+    """
+    return observed_until(model) >= cutoff
+
+
+def last_seen(row) -> datetime:
+    """Last time a history row was observed."""
+    return row.last_seen_at or row.created_at
+
+
+def observation_weight(row) -> int:
+    """Number of scrapes a history row stands for."""
+    return row.observations or 1
+
+
+def observation_count(rows: Iterable[Any]) -> int:
+    """Total scrapes represented by a set of history rows."""
+    return sum(observation_weight(row) for row in rows)
+
+
+def weighted_mean(rows: Iterable[Any]) -> Optional[float]:
+    """Average price weighted by the number of observations per interval."""
+    total = 0.0
+    weight = 0
+    for row in rows:
+        w = observation_weight(row)
+        total += float(row.price) * w
+        weight += w
+    return total / weight if weight else None
+
+
+def interval_points(rows: Iterable[Any]) -> List[Tuple[datetime, Any]]:
+    """Expand interval rows (oldest first) into chart points.
+
+    Every interval yields a point where it starts and, if it was seen again
+    later, a second point where it was last observed, so charts render the
+    flat stretch instead of jumping straight to the next change.
+    """
+    points = []
+    for row in rows:
+        points.append((row.created_at, row))
+        if row.last_seen_at is not None and row.last_seen_at != row.created_at:
+            points.append((row.last_seen_at, row))
+    return points
@@ -0,0 +1,29 @@
+"""Scheduled maintenance for price history storage."""
+
+import logging
+
+from app.core.database import BackgroundSessionLocal
+from app.core.price_history.retention import PriceHistoryRetention
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain_price_history():
+    """Create upcoming partitions and downsample expired price history."""
+    logger.info("Starting price history maintenance")
+
+    async with BackgroundSessionLocal() as db:
+        try:
+            retention = PriceHistoryRetention(db)
+            results = await retention.run()
+
+            total = sum(results.values())
+            logger.info(
+                f"Price history maintenance completed: {total} item-days downsampled "
+                f"({', '.join(f'{k}={v}' for k, v in results.items())})"
+            )
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Price history maintenance failed: {e}")
+            raise
@@ -0,0 +1,152 @@
+"""Change-only price history recording."""
+
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.price_history.changes import queue_price_change
+from app.core.price_history.registry import PriceHistoryTable, get_history_table
+from app.core.price_history.rollups import update_daily_rollup
+from app.core.price_history.snapshots import load_price_state, update_snapshot
+
+logger = logging.getLogger(__name__)
+
+CENTS = Decimal("0.01")
+
+
+def is_same_observation(
+    table: PriceHistoryTable, current, price: Decimal, currency: str, fields: Dict[str, Any]
+) -> bool:
+    """Check whether a scrape repeats the interval currently open for an item.
+
+    State fields the scraper did not report (None) are not treated as changes.
+    """
+    if current.price != Decimal(str(price)).quantize(CENTS) or current.currency != currency:
+        return False
+
+    for column in table.state_columns:
+        value = fields.get(column)
+        if value is not None and value != getattr(current, column):
+            return False
+
+    return True
+
+
+def current_price_row(db: Session, table: PriceHistoryTable, item_id: int):
+    """Latest history row (the open interval) for an item."""
+    return db.scalar(
+        select(table.model)
+        .where(table.item_col == item_id)
+        .order_by(table.model.created_at.desc(), table.model.id.desc())
+        .limit(1)
+    )
+
+
+def record_price(
+    db: Session,
+    category: str,
+    item_id: int,
+    price: Decimal,
+    currency: str = "NGN",
+    observed_at: Optional[datetime] = None,
+    change_only: bool = settings.price_history_change_only,
+    **fields: Any,
+):
+    """Record one observed price, returning the row that now covers it.
+
+    See `PriceHistoryRecorder`; this is its synchronous form.
+    """
+    table = get_history_table(category)
+    seen = observed_at or func.now()
+
+    update_daily_rollup(db, category, item_id, price, observed_at.date() if observed_at else None)
+    extremes, baselines = load_price_state(db, category, item_id)
+    extremes.append(observed_at, price)
+    baselines.append(observed_at, price)
+    update_snapshot(
+        db,
+        category,
+        item_id,
+        price,
+        currency,
+        fields.get(table.availability_column) if table.availability_column else None,
+        observed_at,
+        extremes,
+        baselines,
+    )
+
+    current = current_price_row(db, table, item_id)
+    if change_only and current is not None and is_same_observation(
+        table, current, price, currency, fields
+    ):
+        current.last_seen_at = seen
+        current.observations = (current.observations or 1) + 1
+        logger.debug(f"Extended {category} {item_id} interval at {price}")
+        return current
+
+    if current is not None and current.price != Decimal(str(price)).quantize(CENTS):
+        queue_price_change(db, category, item_id, current.price, price, currency, observed_at)
+
+    values = {
+        table.item_column: item_id,
+        "price": price,
+        "currency": currency,
+        "last_seen_at": seen,
+        "observations": 1,
+    }
+    values.update({key: value for key, value in fields.items() if value is not None})
+    if observed_at is not None:
+        values["created_at"] = observed_at
+
+    row = table.model(**values)
+    db.add(row)
+    return row
+
+
+class PriceHistoryRecorder:
+    """Writes price observations as run-length intervals.
+
+    An unchanged observation extends the item's latest row (last_seen_at and
+    observations) instead of inserting a duplicate. Every observation is also
+    folded into the item's daily rollup, price snapshot, sliding-window
+    extremes and baselines, and a price that differs from the open
+    interval's queues a price change event for deal detection. Nothing is
+    committed here; callers commit with the rest of their unit of work.
+    Code holding a sync session records through `record_price`.
+    """
+
+    def __init__(self, db: AsyncSession, change_only: bool = settings.price_history_change_only):
+        """Initialize with database session."""
+        self.db = db
+        self.change_only = change_only
+
+    async def get_current(self, table: PriceHistoryTable, item_id: int):
+        """Latest history row (the open interval) for an item."""
+        return await self.db.run_sync(current_price_row, table, item_id)
+
+    async def record(
+        self,
+        category: str,
+        item_id: int,
+        price: Decimal,
+        currency: str = "NGN",
+        observed_at: Optional[datetime] = None,
+        **fields: Any,
+    ):
+        """Record one observed price, returning the row that now covers it."""
+        return await self.db.run_sync(
+            record_price,
+            category,
+            item_id,
+            price,
+            currency,
+            observed_at,
+            change_only=self.change_only,
+            **fields,
+        )
@@ -0,0 +1,83 @@
+"""Registry of the per-category price history tables."""
+
+from typing import Dict, List, Optional, Sequence
+
+from app.ecommerce.models.price_history import PriceHistory
+from app.real_estate.models.price_history import PropertyPriceHistory
+from app.travel.models.price_history import TravelPriceHistory
+from app.utilities.models.price_history import UtilityPriceHistory
+
+
+class PriceHistoryTable:
+    """A price history table and the column identifying the tracked item.
+
+    state_columns are recorded alongside the price; a change in any of them
+    starts a new interval just like a price change does. availability_column
+    names the state column copied to the item's price snapshot, if any.
+    """
+
+    def __init__(
+        self,
+        category: str,
+        model,
+        item_column: str,
+        state_columns: Sequence[str] = (),
+        availability_column: Optional[str] = None,
+    ):
+        """Initialize table spec."""
+        self.category = category
+        self.model = model
+        self.item_column = item_column
+        self.state_columns = tuple(state_columns)
+        self.availability_column = availability_column
+
+    @property
+    def table_name(self) -> str:
+        """Underlying table name."""
+        return self.model.__tablename__
+
+    @property
+    def item_col(self):
+        """Mapped column holding the tracked item id."""
+        return getattr(self.model, self.item_column)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<PriceHistoryTable({self.category}, {self.table_name}.{self.item_column})>"
+
+
+# Travel history stores flights and hotels in one table, keyed by different columns
+PRICE_HISTORY_TABLES: List[PriceHistoryTable] = [
+    PriceHistoryTable("ecommerce", PriceHistory, "product_id", ["availability"], "availability"),
+    PriceHistoryTable("flight", TravelPriceHistory, "flight_id"),
+    PriceHistoryTable("hotel", TravelPriceHistory, "hotel_id"),
+    PriceHistoryTable(
+        "property",
+        PropertyPriceHistory,
+        "property_id",
+        ["price_per_sqm", "listing_status"],
+        "listing_status",
+    ),
+    PriceHistoryTable("utility", UtilityPriceHistory, "service_id", ["tariff_details"]),
+]
+
+PRICE_HISTORY_BY_CATEGORY: Dict[str, PriceHistoryTable] = {
+    table.category: table for table in PRICE_HISTORY_TABLES
+}
+
+
+def get_history_table(category: str) -> PriceHistoryTable:
+    """Look up the price history table for a category."""
+    try:
+        return PRICE_HISTORY_BY_CATEGORY[category]
+    except KeyError:
+        raise ValueError(f"Unknown price history category: {category}")
+
+
+def partitioned_table_names() -> List[str]:
+    """Distinct physical table names, in registry order."""
+    names = []
+    for table in PRICE_HISTORY_TABLES:
+        if table.table_name not in names:
+            names.append(table.table_name)
+    return names
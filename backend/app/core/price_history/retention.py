@@ -0,0 +1,307 @@
+"""Partition maintenance and downsampling for price history tables.
+
+On Postgres the history tables are range-partitioned by month on
+``created_at``. Daily rollups in ``price_history_daily`` are normally kept
+current by the recorder; this job backfills any day that has raw rows but
+no rollup, archives raw rows older than the retention window to Arrow files
+(see ``archive``), then removes them from the database (whole partitions
+are dropped where possible).
+"""
+
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, delete, exists, func, insert, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.models.price_history_daily import PriceHistoryDaily
+from app.core.price_history.archive import PriceHistoryArchive, archive_expired
+from app.core.price_history.intervals import observed_until
+from app.core.price_history.registry import (
+    PRICE_HISTORY_TABLES,
+    PriceHistoryTable,
+    partitioned_table_names,
+)
+
+logger = logging.getLogger(__name__)
+
+PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    """First day of the month containing value."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Shift a month start by a number of months."""
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: date) -> str:
+    """Name of the monthly partition holding the given month."""
+    return f"{table_name}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(table_name: str, name: str) -> Optional[date]:
+    """Parse the month back out of a partition name, if it is one of ours."""
+    if not name.startswith(f"{table_name}_p"):
+        return None
+    match = PARTITION_SUFFIX.search(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def partition_bounds(month: date) -> Tuple[date, date]:
+    """Inclusive lower and exclusive upper bound of a monthly partition."""
+    start = month_start(month)
+    return start, add_months(start, 1)
+
+
+def months_to_create(today: date, months_ahead: int) -> List[date]:
+    """Partitions that should exist: last month through months_ahead from now."""
+    current = month_start(today)
+    return [add_months(current, offset) for offset in range(-1, months_ahead + 1)]
+
+
+def expired_partitions(table_name: str, names: List[str], cutoff: datetime) -> List[str]:
+    """Partitions whose whole range lies before the retention cutoff."""
+    expired = []
+    for name in names:
+        month = partition_month(table_name, name)
+        if month is None:
+            continue
+        _, upper = partition_bounds(month)
+        if upper <= cutoff.date():
+            expired.append(name)
+    return sorted(expired)
+
+
+class PriceHistoryRetention:
+    """Applies the retention policy to all price history tables."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        retention_days: int = settings.price_history_retention_days,
+        months_ahead: int = settings.price_history_partition_months_ahead,
+        archive: Optional[PriceHistoryArchive] = None,
+    ):
+        """Initialize with database session.
+
+        Expired raw rows are archived first when an archive is given or
+        archiving is enabled in settings.
+        """
+        self.db = db
+        self.retention_days = retention_days
+        self.months_ahead = months_ahead
+        if archive is None and settings.price_history_archive_enabled:
+            archive = PriceHistoryArchive()
+        self.archive = archive
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Raw rows last observed before this moment are purged.
+
+        The cutoff is aligned to midnight so a day is never split.
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=self.retention_days)
+        return cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def _is_postgres(self) -> bool:
+        """Check whether the session is bound to Postgres."""
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    async def run(self) -> Dict[str, int]:
+        """Run partition maintenance and downsampling, returning item-days folded per category."""
+        cutoff = self.cutoff()
+        today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        postgres = self._is_postgres()
+
+        if postgres:
+            await self.ensure_partitions()
+
+        results = {}
+        for table in PRICE_HISTORY_TABLES:
+            results[table.category] = await self.downsample(table, today)
+            await self.db.commit()
+
+        if self.archive is not None:
+            # Raises before anything is removed if the archive cannot be written
+            for table in PRICE_HISTORY_TABLES:
+                await archive_expired(self.db, self.archive, table, cutoff)
+
+        if postgres:
+            for table_name in partitioned_table_names():
+                await self.drop_expired_partitions(table_name, cutoff)
+            await self.db.commit()
+
+        for table in PRICE_HISTORY_TABLES:
+            await self.purge_raw(table, cutoff)
+        await self.db.commit()
+
+        return results
+
+    async def downsample(self, table: PriceHistoryTable, before: datetime) -> int:
+        """Fold raw rows started before `before` into days that have no rollup yet.
+
+        An interval row is folded into the day it started on, weighted by its
+        observations. Days already maintained by the recorder are skipped, so
+        the backfill can be repeated safely.
+        """
+        model = table.model
+        item_col = table.item_col
+        day = func.date(model.created_at)
+        weight = func.coalesce(model.observations, 1)
+
+        ranked = (
+            select(
+                item_col.label("item_id"),
+                day.label("day"),
+                model.price.label("price"),
+                weight.label("weight"),
+                func.row_number()
+                .over(partition_by=(item_col, day), order_by=(model.created_at, model.id))
+                .label("rn_first"),
+                func.row_number()
+                .over(
+                    partition_by=(item_col, day),
+                    order_by=(model.created_at.desc(), model.id.desc()),
+                )
+                .label("rn_last"),
+            )
+            .where(model.created_at < before, item_col.isnot(None))
+            .subquery()
+        )
+
+        daily = (
+            select(
+                literal(table.category).label("category"),
+                ranked.c.item_id,
+                ranked.c.day,
+                func.max(case((ranked.c.rn_first == 1, ranked.c.price))).label("open_price"),
+                func.max(ranked.c.price).label("high_price"),
+                func.min(ranked.c.price).label("low_price"),
+                func.max(case((ranked.c.rn_last == 1, ranked.c.price))).label("close_price"),
+                func.sum(ranked.c.price * ranked.c.weight).label("price_sum"),
+                func.sum(ranked.c.price * ranked.c.price * ranked.c.weight).label("price_sumsq"),
+                func.sum(ranked.c.weight).label("sample_count"),
+            )
+            .group_by(ranked.c.item_id, ranked.c.day)
+            .subquery()
+        )
+
+        already_folded = exists().where(
+            PriceHistoryDaily.category == daily.c.category,
+            PriceHistoryDaily.item_id == daily.c.item_id,
+            PriceHistoryDaily.day == daily.c.day,
+        )
+
+        columns = [
+            "category",
+            "item_id",
+            "day",
+            "open_price",
+            "high_price",
+            "low_price",
+            "close_price",
+            "price_sum",
+            "price_sumsq",
+            "sample_count",
+        ]
+        stmt = insert(PriceHistoryDaily).from_select(
+            columns,
+            select(*[daily.c[name] for name in columns]).where(~already_folded),
+        )
+
+        result = await self.db.execute(stmt)
+        inserted = result.rowcount or 0
+        if inserted:
+            logger.info(f"Backfilled {inserted} {table.category} item-days before {before}")
+        return inserted
+
+    async def purge_raw(self, table: PriceHistoryTable, cutoff: datetime) -> int:
+        """Delete raw rows last observed before cutoff once they have been downsampled."""
+        result = await self.db.execute(
+            delete(table.model).where(
+                observed_until(table.model) < cutoff, table.item_col.isnot(None)
+            )
+        )
+        deleted = result.rowcount or 0
+        if deleted:
+            logger.info(f"Purged {deleted} raw {table.category} price history rows")
+        return deleted
+
+    async def list_partitions(self, table_name: str) -> List[str]:
+        """Names of the partitions attached to a partitioned table."""
+        result = await self.db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :parent"
+            ),
+            {"parent": table_name},
+        )
+        return [row[0] for row in result.all()]
+
+    async def ensure_partitions(self, today: Optional[date] = None) -> List[str]:
+        """Create any missing monthly partitions ahead of time."""
+        today = today or datetime.now(timezone.utc).date()
+        created = []
+
+        for table_name in partitioned_table_names():
+            existing = set(await self.list_partitions(table_name))
+            for month in months_to_create(today, self.months_ahead):
+                name = partition_name(table_name, month)
+                if name in existing:
+                    continue
+                lower, upper = partition_bounds(month)
+                try:
+                    async with self.db.begin_nested():
+                        await self.db.execute(
+                            text(
+                                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table_name} "
+                                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+                            )
+                        )
+                    created.append(name)
+                except Exception as e:
+                    # Usually rows for this month already sit in the default partition
+                    logger.error(f"Failed to create partition {name}: {e}")
+
+        await self.db.commit()
+        if created:
+            logger.info(f"Created price history partitions: {', '.join(created)}")
+        return created
+
+    async def drop_expired_partitions(self, table_name: str, cutoff: datetime) -> List[str]:
+        """Drop partitions that lie entirely before the cutoff.
+
+        A partition is kept while it still holds an interval observed after
+        the cutoff (an unchanged price that started long ago).
+        """
+        names = await self.list_partitions(table_name)
+        dropped = []
+
+        for name in expired_partitions(table_name, names, cutoff):
+            live = await self.db.execute(
+                text(
+                    f"SELECT EXISTS (SELECT 1 FROM {name} "
+                    f"WHERE coalesce(last_seen_at, created_at) >= :cutoff)"
+                ),
+                {"cutoff": cutoff},
+            )
+            if live.scalar():
+                continue
+            await self.db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+
+        if dropped:
+            logger.info(f"Dropped expired partitions: {', '.join(dropped)}")
+        return dropped
@@ -0,0 +1,207 @@
+"""Incrementally maintained daily price rollups.
+
+Every recorded observation is folded into ``price_history_daily`` for the
+day it was seen (open/high/low/close, count, sum and sum of squares).
+Window statistics are then combined from at most one row per day instead
+of scanning raw history.
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.models.price_history_daily import PriceHistoryDaily
+
+logger = logging.getLogger(__name__)
+
+STANDARD_WINDOWS = (7, 30, 60, 90, 365)
+
+
+def window_start(days: int, today: Optional[date] = None) -> date:
+    """First day included in a window of the given length ending today."""
+    today = today or datetime.now(timezone.utc).date()
+    return today - timedelta(days=max(days, 1) - 1)
+
+
+def dialect_insert(dialect_name: str):
+    """Dialect insert construct supporting ON CONFLICT, if available."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+
+        return insert
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+
+        return insert
+    return None
+
+
+def update_daily_rollup(
+    db: Session,
+    category: str,
+    item_id: int,
+    price: Decimal,
+    day: Optional[date] = None,
+) -> None:
+    """Fold one observed price into the item's rollup row for the day.
+
+    Observations are assumed to arrive in time order, so the latest one
+    becomes the day's close.
+    """
+    price = Decimal(str(price))
+    day = day or datetime.now(timezone.utc).date()
+    values = {
+        "category": category,
+        "item_id": item_id,
+        "day": day,
+        "open_price": price,
+        "high_price": price,
+        "low_price": price,
+        "close_price": price,
+        "price_sum": price,
+        "price_sumsq": price * price,
+        "sample_count": 1,
+        "is_active": True,
+    }
+
+    insert = dialect_insert(db.get_bind().dialect.name)
+    if insert is None:
+        _update_daily_rollup_fallback(db, values)
+        return
+
+    stmt = insert(PriceHistoryDaily).values(**values)
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["category", "item_id", "day"],
+        set_={
+            "high_price": case(
+                (excluded.high_price > PriceHistoryDaily.high_price, excluded.high_price),
+                else_=PriceHistoryDaily.high_price,
+            ),
+            "low_price": case(
+                (excluded.low_price < PriceHistoryDaily.low_price, excluded.low_price),
+                else_=PriceHistoryDaily.low_price,
+            ),
+            "close_price": excluded.close_price,
+            "price_sum": PriceHistoryDaily.price_sum + excluded.price_sum,
+            "price_sumsq": PriceHistoryDaily.price_sumsq + excluded.price_sumsq,
+            "sample_count": PriceHistoryDaily.sample_count + 1,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def _update_daily_rollup_fallback(db: Session, values: Dict) -> None:
+    """Read-modify-write rollup update for backends without ON CONFLICT."""
+    row = db.scalar(
+        select(PriceHistoryDaily).where(
+            PriceHistoryDaily.category == values["category"],
+            PriceHistoryDaily.item_id == values["item_id"],
+            PriceHistoryDaily.day == values["day"],
+        )
+    )
+    if row is None:
+        db.add(PriceHistoryDaily(**values))
+        return
+
+    price = values["close_price"]
+    row.high_price = max(row.high_price, price)
+    row.low_price = min(row.low_price, price)
+    row.close_price = price
+    row.price_sum += price
+    row.price_sumsq += values["price_sumsq"]
+    row.sample_count += 1
+
+
+def load_daily_rollups(
+    db: Session, category: str, item_id: int, days: int
+) -> List[PriceHistoryDaily]:
+    """Rollup rows for one item over the last `days` days, oldest first."""
+    return (
+        db.query(PriceHistoryDaily)
+        .filter(
+            PriceHistoryDaily.category == category,
+            PriceHistoryDaily.item_id == item_id,
+            PriceHistoryDaily.day >= window_start(days),
+        )
+        .order_by(PriceHistoryDaily.day.asc())
+        .all()
+    )
+
+
+def summarize_rollups(rows: Sequence[PriceHistoryDaily]) -> Optional[Dict]:
+    """Combine daily rollup rows (oldest first) into window statistics."""
+    if not rows:
+        return None
+
+    count = sum(row.sample_count for row in rows)
+    total = sum(float(row.price_sum) for row in rows)
+    total_sq = sum(float(row.price_sumsq) for row in rows)
+    mean = total / count if count else float(rows[-1].close_price)
+    # Population variance; clamp tiny negative values from rounding
+    variance = max(total_sq / count - mean * mean, 0.0) if count else 0.0
+
+    return {
+        "open": float(rows[0].open_price),
+        "close": float(rows[-1].close_price),
+        "low": min(float(row.low_price) for row in rows),
+        "high": max(float(row.high_price) for row in rows),
+        "mean": mean,
+        "variance": variance,
+        "count": count,
+        "days": len(rows),
+        "first_day": rows[0].day,
+        "last_day": rows[-1].day,
+        "last_updated": rows[-1].updated_at,
+    }
+
+
+def sample_stddev(summary: Dict) -> Optional[float]:
+    """Sample standard deviation of a window summary."""
+    count = summary["count"]
+    if count < 2:
+        return None
+    return (summary["variance"] * count / (count - 1)) ** 0.5
+
+
+def summarize_items(
+    db: Session, category: str, item_ids: Union[Iterable[int], Select], days: int
+) -> Optional[Dict]:
+    """Combined average/min/max across several items over a window.
+
+    `item_ids` may be a select of ids, which is filtered as a subquery
+    instead of an id list.
+    """
+    if not isinstance(item_ids, Select):
+        item_ids = list(item_ids)
+        if not item_ids:
+            return None
+
+    result = (
+        db.query(
+            func.sum(PriceHistoryDaily.price_sum).label("price_sum"),
+            func.sum(PriceHistoryDaily.sample_count).label("sample_count"),
+            func.min(PriceHistoryDaily.low_price).label("min_price"),
+            func.max(PriceHistoryDaily.high_price).label("max_price"),
+        )
+        .filter(
+            PriceHistoryDaily.category == category,
+            PriceHistoryDaily.item_id.in_(item_ids),
+            PriceHistoryDaily.day >= window_start(days),
+        )
+        .first()
+    )
+
+    if not result or not result.sample_count:
+        return None
+
+    return {
+        "avg_price": float(result.price_sum) / int(result.sample_count),
+        "min_price": float(result.min_price),
+        "max_price": float(result.max_price),
+    }
@@ -0,0 +1,172 @@
+"""Latest-price snapshots maintained alongside price history.
+
+Every recorded observation upserts the item's ``price_snapshots`` row in
+the same transaction as the history write: current and previous price,
+when the price last changed, availability, the 7-day low/high and the
+sliding-window extremes and baseline state used by deal detection. Reads
+that only need an item's current price join this table instead of
+picking the newest history row per item.
+"""
+
+import logging
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+
+from app.core.models.price_history_daily import PriceHistoryDaily
+from app.core.models.price_snapshot import PriceSnapshot
+from app.core.price_history.baselines import PriceBaselines
+from app.core.price_history.extremes import RollingExtremes
+from app.core.price_history.rollups import dialect_insert, window_start
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_RANGE_DAYS = 7
+
+
+def snapshot_join(category: str, item_column):
+    """Join condition between an item id column and its category's snapshot."""
+    return and_(PriceSnapshot.category == category, PriceSnapshot.item_id == item_column)
+
+
+def _range_extreme(aggregate, column, category: str, item_id: int, since):
+    """Scalar subquery over the item's daily rollups since a day."""
+    return (
+        select(aggregate(column))
+        .where(
+            PriceHistoryDaily.category == category,
+            PriceHistoryDaily.item_id == item_id,
+            PriceHistoryDaily.day >= since,
+        )
+        .scalar_subquery()
+    )
+
+
+def load_price_state(
+    db: Session, category: str, item_id: int
+) -> Tuple[RollingExtremes, PriceBaselines]:
+    """An item's stored extremes and baselines (empty for a new item)."""
+    result = db.execute(
+        select(PriceSnapshot.extremes, PriceSnapshot.baselines).where(
+            PriceSnapshot.category == category, PriceSnapshot.item_id == item_id
+        )
+    )
+    extremes, baselines = result.one_or_none() or (None, None)
+    return RollingExtremes.loads(extremes), PriceBaselines.loads(baselines)
+
+
+def update_snapshot(
+    db: Session,
+    category: str,
+    item_id: int,
+    price: Decimal,
+    currency: str = "NGN",
+    availability: Optional[str] = None,
+    observed_at: Optional[datetime] = None,
+    extremes: Optional[RollingExtremes] = None,
+    baselines: Optional[PriceBaselines] = None,
+) -> None:
+    """Upsert an item's snapshot with one observed price.
+
+    Expects the observation to be folded into the daily rollups first, as
+    the 7-day low/high are read from them. Availability the scraper did not
+    report (None) keeps the last known value, as do extremes and baselines
+    not passed in.
+    """
+    price = Decimal(str(price))
+    seen = observed_at or datetime.now(timezone.utc)
+    since = window_start(SNAPSHOT_RANGE_DAYS, seen.date())
+    values = {
+        "category": category,
+        "item_id": item_id,
+        "current_price": price,
+        "previous_price": None,
+        "currency": currency,
+        "availability": availability,
+        "last_changed_at": seen,
+        "last_seen_at": seen,
+        "low_7d": _range_extreme(func.min, PriceHistoryDaily.low_price, category, item_id, since),
+        "high_7d": _range_extreme(func.max, PriceHistoryDaily.high_price, category, item_id, since),
+        "extremes": extremes.dumps() if extremes is not None else None,
+        "baselines": baselines.dumps() if baselines is not None else None,
+        "is_active": True,
+    }
+
+    insert = dialect_insert(db.get_bind().dialect.name)
+    if insert is None:
+        _update_snapshot_fallback(db, values)
+        return
+
+    stmt = insert(PriceSnapshot).values(**values)
+    excluded = stmt.excluded
+    changed = PriceSnapshot.current_price != excluded.current_price
+    # Every SET expression sees the row as it was before this update
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["category", "item_id"],
+        set_={
+            "previous_price": case(
+                (changed, PriceSnapshot.current_price), else_=PriceSnapshot.previous_price
+            ),
+            "last_changed_at": case(
+                (changed, excluded.last_changed_at), else_=PriceSnapshot.last_changed_at
+            ),
+            "current_price": excluded.current_price,
+            "currency": excluded.currency,
+            "availability": func.coalesce(excluded.availability, PriceSnapshot.availability),
+            "last_seen_at": excluded.last_seen_at,
+            "low_7d": excluded.low_7d,
+            "high_7d": excluded.high_7d,
+            "extremes": func.coalesce(excluded.extremes, PriceSnapshot.extremes),
+            "baselines": func.coalesce(excluded.baselines, PriceSnapshot.baselines),
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt)
+
+
+def _update_snapshot_fallback(db: Session, values: Dict) -> None:
+    """Read-modify-write snapshot update for backends without ON CONFLICT."""
+    low_high = db.execute(select(values.pop("low_7d"), values.pop("high_7d")))
+    values["low_7d"], values["high_7d"] = low_high.one()
+
+    snapshot = db.scalar(
+        select(PriceSnapshot).where(
+            PriceSnapshot.category == values["category"],
+            PriceSnapshot.item_id == values["item_id"],
+        )
+    )
+    if snapshot is None:
+        db.add(PriceSnapshot(**values))
+        return
+
+    if snapshot.current_price != values["current_price"]:
+        snapshot.previous_price = snapshot.current_price
+        snapshot.last_changed_at = values["last_seen_at"]
+    snapshot.current_price = values["current_price"]
+    snapshot.currency = values["currency"]
+    if values["availability"] is not None:
+        snapshot.availability = values["availability"]
+    snapshot.last_seen_at = values["last_seen_at"]
+    snapshot.low_7d = values["low_7d"]
+    snapshot.high_7d = values["high_7d"]
+    if values["extremes"] is not None:
+        snapshot.extremes = values["extremes"]
+    if values["baselines"] is not None:
+        snapshot.baselines = values["baselines"]
+
+
+def load_snapshots(
+    db: Session, category: str, item_ids: Optional[Iterable[int]] = None
+) -> Dict[int, PriceSnapshot]:
+    """Snapshots for several (by default all) items of one category, keyed by item id."""
+    query = db.query(PriceSnapshot).filter(PriceSnapshot.category == category)
+    if item_ids is not None:
+        item_ids = list(item_ids)
+        if not item_ids:
+            return {}
+        query = query.filter(PriceSnapshot.item_id.in_(item_ids))
+
+    return {snapshot.item_id: snapshot for snapshot in query.all()}
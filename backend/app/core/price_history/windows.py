@@ -0,0 +1,129 @@
+"""Multi-window price statistics from a single rollup read.
+
+Analytics endpoints ask for several overlapping windows (7/30/60/90/365
+days), trends and volatility for the same item. PriceWindows loads the
+longest window once and computes every window in one newest-to-oldest
+pass over the daily rows.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.models.price_history_daily import PriceHistoryDaily
+from app.core.price_history.rollups import STANDARD_WINDOWS, load_daily_rollups, window_start
+
+
+def summarize_windows(
+    rows: List[PriceHistoryDaily], windows: Iterable[int], today: Optional[date] = None
+) -> Dict[int, Optional[Dict]]:
+    """Summaries for each window length from daily rows (oldest first).
+
+    Walks the rows once from newest to oldest, emitting each window's
+    summary as soon as the walk crosses its start day. Summaries have the
+    same shape as rollups.summarize_rollups.
+    """
+    pending = sorted(set(windows))
+    results: Dict[int, Optional[Dict]] = {days: None for days in pending}
+    if not rows or not pending:
+        return results
+
+    starts = {days: window_start(days, today) for days in pending}
+    newest = rows[-1]
+    count = 0
+    total = 0.0
+    total_sq = 0.0
+    low = None
+    high = None
+    oldest = None
+
+    def emit(days: int) -> None:
+        if not count:
+            return
+        mean = total / count
+        results[days] = {
+            "open": float(oldest.open_price),
+            "close": float(newest.close_price),
+            "low": low,
+            "high": high,
+            "mean": mean,
+            "variance": max(total_sq / count - mean * mean, 0.0),
+            "count": count,
+            "days": days_seen,
+            "first_day": oldest.day,
+            "last_day": newest.day,
+            "last_updated": newest.updated_at,
+        }
+
+    days_seen = 0
+    for row in reversed(rows):
+        while pending and row.day < starts[pending[0]]:
+            emit(pending.pop(0))
+        if not pending:
+            break
+
+        count += row.sample_count
+        total += float(row.price_sum)
+        total_sq += float(row.price_sumsq)
+        row_low = float(row.low_price)
+        row_high = float(row.high_price)
+        low = row_low if low is None else min(low, row_low)
+        high = row_high if high is None else max(high, row_high)
+        oldest = row
+        days_seen += 1
+
+    for days in pending:
+        emit(days)
+
+    return results
+
+
+class PriceWindows:
+    """Window statistics for one item, answered from one rollup read."""
+
+    def __init__(
+        self,
+        rows: List[PriceHistoryDaily],
+        windows: Iterable[int] = STANDARD_WINDOWS,
+        today: Optional[date] = None,
+    ):
+        """Initialize from daily rollup rows covering the longest window."""
+        self.rows = rows
+        self.today = today
+        self.summaries = summarize_windows(rows, windows, today)
+
+    @classmethod
+    def load(
+        cls, db: Session, category: str, item_id: int, windows: Iterable[int] = STANDARD_WINDOWS
+    ) -> "PriceWindows":
+        """Load rollups covering the longest requested window with a single query."""
+        windows = set(windows)
+        rows = load_daily_rollups(db, category, item_id, max(windows))
+        return cls(rows, windows)
+
+    def summary(self, days: int) -> Optional[Dict]:
+        """Summary for a window, computing it on demand if it was not preloaded."""
+        if days not in self.summaries:
+            self.summaries.update(summarize_windows(self.rows, [days], self.today))
+        return self.summaries[days]
+
+    def change_percent(self, days: int) -> Optional[float]:
+        """Percent change from the window's first to last price, if there are two observations."""
+        summary = self.summary(days)
+        if not summary or summary["count"] < 2:
+            return None
+        first_price = summary["open"]
+        if first_price <= 0:
+            return 0.0
+        return (summary["close"] - first_price) / first_price * 100
+
+    def stddev(self, days: int, sample: bool = False) -> Optional[float]:
+        """Standard deviation of observed prices in a window."""
+        summary = self.summary(days)
+        if not summary or summary["count"] < 2:
+            return None
+        variance = summary["variance"]
+        if sample:
+            variance = variance * summary["count"] / (summary["count"] - 1)
+        return variance ** 0.5
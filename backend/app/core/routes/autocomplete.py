@@ -0,0 +1,34 @@
+"""Autocomplete endpoints."""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.autocomplete.service import KINDS, autocomplete_service
+from app.core.deps import get_current_user, get_database_session
+from app.core.models.user import User
+
+router = APIRouter(prefix="/api/autocomplete", tags=["Autocomplete"])
+
+
+@router.get("")
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    kind: Optional[List[str]] = Query(
+        None, description=f"Suggestion kinds to include: {', '.join(KINDS)}"
+    ),
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncSession = Depends(get_database_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Suggest products, hotels, destinations and locations as the user types."""
+    unknown = set(kind or []) - set(KINDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown kinds: {', '.join(sorted(unknown))}")
+
+    # Kept fresh by the scheduled refresh; only built here before its first run
+    if not autocomplete_service.ready:
+        await autocomplete_service.refresh(db)
+
+    return {"query": q, "suggestions": autocomplete_service.suggest(q, kind, limit)}
@@ -1,8 +1,11 @@
 """Monitoring endpoints for health and metrics."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import get_db
 from app.core.monitoring import monitoring_service
+from app.core.services.email_outbox import email_outbox_drainer, outbox_metrics
 
 router = APIRouter(prefix="/api/monitoring", tags=["Monitoring"])
 
@@ -30,3 +33,12 @@ async def get_performance_summary():
         "avg_response_time_ms": health["avg_response_time_ms"],
         "scheduler_running": health["scheduler_running"],
     }
+
+
+@router.get("/email-outbox")
+async def get_email_outbox_metrics(db: AsyncSession = Depends(get_db)):
+    """Get email outbox queue depth and the last drain's results."""
+    return {
+        "queue": await db.run_sync(outbox_metrics),
+        "last_drain": email_outbox_drainer.last_run,
+    }
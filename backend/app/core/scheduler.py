@@ -37,7 +37,6 @@ class SchedulerManager:
     def _register_jobs(self) -> None:
         """Register all scheduled jobs."""
         from app.real_estate.jobs.property_scrape_job import (
-            check_property_watchlist_alerts,
             detect_property_deals,
             scrape_tracked_properties,
         )
@@ -58,14 +57,6 @@ class SchedulerManager:
             replace_existing=True,
         )
 
-        self.scheduler.add_job(
-            check_property_watchlist_alerts,
-            "interval",
-            minutes=30,
-            id="check_property_watchlist_alerts",
-            replace_existing=True,
-        )
-
         logger.info("Registered real estate scheduled jobs")
 
     async def shutdown(self) -> None:
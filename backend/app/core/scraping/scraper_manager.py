@@ -9,12 +9,12 @@ logger = logging.getLogger(__name__)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.price_history.recorder import PriceHistoryRecorder
 from app.core.scraping.scraper_factory import scraper_factory
 from app.ecommerce.models.product import Product as EcommerceProduct
 from app.real_estate.models.property import Property
 from app.travel.models.flight import Flight
 from app.travel.models.hotel import Hotel
-from app.travel.models.price_history import TravelPriceHistory
 from app.utilities.models.service import UtilityService
 
 
@@ -196,7 +196,14 @@ class ScraperManager:
             if data.get("name"):
                 product.name = data["name"]
             if data.get("price"):
-                product.current_price = data["price"]
+                # Record price history; this also refreshes the product's price snapshot
+                await PriceHistoryRecorder(db).record(
+                    "ecommerce",
+                    product.id,
+                    data["price"],
+                    data.get("currency", "NGN"),
+                    availability=data.get("availability"),
+                )
             if data.get("availability"):
                 product.availability = data["availability"]
 
@@ -214,38 +221,30 @@ class ScraperManager:
             result = await db.execute(select(Flight).where(Flight.url == data["url"]))
             flight = result.scalar_one_or_none()
             if flight:
-                old_price = flight.price
-                if data.get("price") and data["price"] != old_price:
-                    flight.price = data["price"]
-                    flight.last_updated = datetime.utcnow()
-
-                    # Record price history
-                    price_history = TravelPriceHistory(
-                        flight_id=flight.id,
-                        price=data["price"],
-                        currency=data.get("currency", "NGN"),
-                        source="scraper",
+                if data.get("price"):
+                    if data["price"] != flight.price:
+                        flight.price = data["price"]
+                        flight.last_updated = datetime.utcnow()
+
+                    # Record price history (extends the open interval if unchanged)
+                    await PriceHistoryRecorder(db).record(
+                        "flight", flight.id, data["price"], data.get("currency", "NGN")
                     )
-                    db.add(price_history)
                 return 1
 
             # Try to find hotel
             result = await db.execute(select(Hotel).where(Hotel.url == data["url"]))
             hotel = result.scalar_one_or_none()
             if hotel:
-                old_price = hotel.price_per_night
-                if data.get("price") and data["price"] != old_price:
-                    hotel.price_per_night = data["price"]
-                    hotel.last_updated = datetime.utcnow()
-
-                    # Record price history
-                    price_history = TravelPriceHistory(
-                        hotel_id=hotel.id,
-                        price=data["price"],
-                        currency=data.get("currency", "NGN"),
-                        source="scraper",
+                if data.get("price"):
+                    if data["price"] != hotel.price_per_night:
+                        hotel.price_per_night = data["price"]
+                        hotel.last_updated = datetime.utcnow()
+
+                    # Record price history (extends the open interval if unchanged)
+                    await PriceHistoryRecorder(db).record(
+                        "hotel", hotel.id, data["price"], data.get("currency", "NGN")
                     )
-                    db.add(price_history)
                 return 1
 
             return 0
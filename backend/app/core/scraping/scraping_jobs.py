@@ -13,7 +13,6 @@ logger = logging.getLogger(__name__)
 from app.core.database import get_db
 from app.core.scraping.scraper_manager import scraper_manager
 from app.ecommerce.services.deal_detector import EcommerceDealDetector
-from app.ecommerce.services.watchlist_service import WatchlistService
 from app.travel.services.deal_detector import TravelDealDetector
 
 
@@ -152,15 +151,6 @@ class ScrapingJobScheduler:
             name="Comprehensive Daily Scrape",
         )
         
-        # Watchlist alerts - every 30 minutes
-        self.scheduler.add_job(
-            self._check_watchlist_alerts_job,
-            "interval",
-            minutes=30,
-            id="check_watchlist_alerts",
-            name="Check Watchlist Price Alerts",
-        )
-        
         # E-commerce deal detection - every 1 hour
         self.scheduler.add_job(
             self._detect_ecommerce_deals_job,
@@ -192,9 +182,9 @@ class ScrapingJobScheduler:
             updated_count = await scraper_manager.scrape_travel_deals(db)
             logger.info(f"Travel scraping completed: {updated_count} deals updated")
 
-            # Run deal detection
+            # Run deal detection for the items whose price changed
             deal_detector = TravelDealDetector()
-            detected_deals = deal_detector.detect_deals(db)
+            detected_deals = deal_detector.detect_changed_deals(db)
             logger.info(f"Travel deal detection completed: {len(detected_deals)} deals detected")
 
             db.commit()
@@ -245,25 +235,13 @@ class ScrapingJobScheduler:
         finally:
             db.close()
     
-    async def _check_watchlist_alerts_job(self) -> None:
-        """Scheduled job for checking watchlist price alerts."""
-        logger.info("Starting watchlist alerts check")
-        try:
-            db = next(get_db())
-            await WatchlistService.check_watchlist_alerts(db)
-            logger.info("Watchlist alerts check completed")
-        except Exception as e:
-            logger.error(f"Watchlist alerts check failed: {e}")
-        finally:
-            db.close()
-    
     async def _detect_ecommerce_deals_job(self) -> None:
         """Scheduled job for e-commerce deal detection."""
         logger.info("Starting e-commerce deal detection")
         try:
             db = next(get_db())
             deal_detector = EcommerceDealDetector()
-            detected_deals = deal_detector.detect_deals(db)
+            detected_deals = deal_detector.detect_changed_deals(db)
             logger.info(f"E-commerce deal detection completed: {len(detected_deals)} deals detected")
             db.commit()
         except Exception as e:
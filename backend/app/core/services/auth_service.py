@@ -15,7 +15,7 @@ from app.core.security import (
     hash_password,
     verify_password,
 )
-from app.core.services.email_service import EmailService
+from app.core.services.email_outbox import enqueue_email
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +26,6 @@ class AuthService:
     def __init__(self, db: AsyncSession):
         """Initialize service."""
         self.db = db
-        self.email_service = EmailService()
 
     async def register_user(
         self, email: str, password: str, full_name: Optional[str] = None
@@ -47,17 +46,14 @@ class AuthService:
         user = User(email=email, hashed_password=hashed_pwd, full_name=full_name)
 
         self.db.add(user)
+
+        # Queue welcome email in the outbox, committed with the user
+        enqueue_email(
+            self.db, "welcome", to=email, user_name=full_name or email.split("@")[0]
+        )
         await self.db.commit()
         await self.db.refresh(user)
-
-        # Send welcome email
-        try:
-            await self.email_service.send_welcome_email(
-                to_email=user.email, user_name=user.full_name or user.email.split("@")[0]
-            )
-            log_event("user_welcome_email_sent", {"user_id": user.id, "email": user.email})
-        except Exception as e:
-            logger.error(f"Failed to send welcome email to {user.email}: {e}")
+        log_event("user_welcome_email_queued", {"user_id": user.id, "email": user.email})
 
         return user
 
@@ -0,0 +1,292 @@
+"""Transactional email outbox.
+
+Code paths that produce emails (alert jobs, deal detection, registration)
+only add outbox rows to their own transaction, so an email exists exactly
+when what caused it was committed and a slow provider never stalls them.
+A scheduled drainer claims due emails under a lease, renders them, sends
+them in provider batches at a bounded rate, and records the outcome.
+Failed emails are retried with exponential backoff until
+``email_outbox_max_attempts``; emails whose drain died mid-send become due
+again once their lease expires. Sent and failed emails are purged daily
+after their retention period.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import BackgroundSessionLocal
+from app.core.models.email_outbox import EmailOutbox
+from app.core.services.email_service import EmailMessage, EmailService, email_service
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SENT = "sent"
+FAILED = "failed"
+
+# Outbox kind -> EmailService method rendering it
+RENDERERS = {
+    "price_alert": "price_alert_message",
+    "deal_notification": "deal_notification_message",
+    "welcome": "welcome_message",
+}
+
+
+def outbox_email(kind: str, to: str, **payload: Any) -> Dict[str, Any]:
+    """Column values of an outbox email, rendered later with `payload`."""
+    if kind not in RENDERERS:
+        raise ValueError(f"Unknown email kind: {kind}")
+    return {
+        "kind": kind,
+        "recipient": to,
+        "payload": json.dumps(payload),
+        "status": PENDING,
+        "attempts": 0,
+        "next_attempt_at": datetime.now(timezone.utc),
+    }
+
+
+def enqueue_email(db, kind: str, to: str, **payload: Any) -> EmailOutbox:
+    """Add one email to the caller's unit of work (sync or async session)."""
+    email = EmailOutbox(**outbox_email(kind, to, **payload))
+    db.add(email)
+    return email
+
+
+def enqueue_emails(db: Session, emails: Sequence[Dict[str, Any]]) -> int:
+    """Insert `outbox_email` rows in one statement, without committing."""
+    if emails:
+        db.execute(insert(EmailOutbox), list(emails))
+    return len(emails)
+
+
+def claim_emails(db: Session, limit: int, lease: timedelta, now: datetime) -> List[EmailOutbox]:
+    """Take up to `limit` due emails, leasing them until `now + lease`.
+
+    Concurrent drains skip rows another drain has locked. The caller
+    commits, which releases the locks while the lease keeps the emails
+    from being claimed again.
+    """
+    emails = list(
+        db.scalars(
+            select(EmailOutbox)
+            .where(EmailOutbox.status == PENDING, EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    )
+    for email in emails:
+        email.next_attempt_at = now + lease
+    return emails
+
+
+def record_results(
+    db: Session,
+    sent: Sequence[int],
+    failed: Sequence[Tuple[int, str]],
+    max_attempts: int,
+    retry_delay: timedelta,
+    now: datetime,
+) -> None:
+    """Mark emails sent, or schedule their retry with exponential backoff."""
+    if sent:
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(sent))
+            .values(status=SENT, sent_at=now, attempts=EmailOutbox.attempts + 1, last_error=None)
+        )
+    errors = dict(failed)
+    for email in db.scalars(select(EmailOutbox).where(EmailOutbox.id.in_(errors))):
+        email.attempts += 1
+        email.last_error = errors[email.id][:1000]
+        if email.attempts >= max_attempts:
+            email.status = FAILED
+        else:
+            email.next_attempt_at = now + retry_delay * 2 ** (email.attempts - 1)
+
+
+def purge_emails(db: Session, sent_before: datetime, failed_before: datetime) -> int:
+    """Delete emails sent or failed before the cutoffs, returning how many.
+
+    An email's last attempt is dated by the lease it was last claimed
+    under. Nothing is committed here.
+    """
+    result = db.execute(
+        delete(EmailOutbox).where(
+            or_(
+                and_(EmailOutbox.status == SENT, EmailOutbox.next_attempt_at < sent_before),
+                and_(EmailOutbox.status == FAILED, EmailOutbox.next_attempt_at < failed_before),
+            )
+        )
+    )
+    return result.rowcount
+
+
+def outbox_metrics(db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Queue depth of the outbox: emails per status, due now and oldest pending age."""
+    now = now or datetime.now(timezone.utc)
+    counts = dict(
+        db.execute(select(EmailOutbox.status, func.count()).group_by(EmailOutbox.status)).all()
+    )
+    due, oldest = db.execute(
+        select(
+            func.count().filter(EmailOutbox.next_attempt_at <= now),
+            func.min(EmailOutbox.created_at),
+        ).where(EmailOutbox.status == PENDING)
+    ).one()
+    if oldest is not None and oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    return {
+        "pending": counts.get(PENDING, 0),
+        "due": due,
+        "sent": counts.get(SENT, 0),
+        "failed": counts.get(FAILED, 0),
+        "oldest_pending_seconds": (now - oldest).total_seconds() if oldest else 0,
+    }
+
+
+class EmailOutboxDrainer:
+    """Sends due outbox emails in batches, within the provider's rate limit."""
+
+    def __init__(
+        self,
+        service: EmailService = email_service,
+        batch_size: int = settings.email_outbox_batch_size,
+        requests_per_second: float = settings.email_requests_per_second,
+        max_attempts: int = settings.email_outbox_max_attempts,
+        retry_delay: timedelta = timedelta(seconds=settings.email_outbox_retry_seconds),
+        lease: timedelta = timedelta(seconds=settings.email_outbox_lease_seconds),
+    ):
+        """Initialize drainer."""
+        self.service = service
+        self.batch_size = batch_size
+        self.interval = 1 / requests_per_second if requests_per_second > 0 else 0
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self.last_run: Dict[str, Any] = {}
+        self._next_request = 0.0
+
+    async def _pace(self) -> None:
+        """Wait for the next request slot allowed by the rate limit."""
+        # No await before the slot is taken, so concurrent batches get distinct slots
+        now = time.monotonic()
+        wait = self._next_request - now
+        self._next_request = max(now, self._next_request) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _render(self, email: EmailOutbox) -> EmailMessage:
+        """The email message of an outbox row."""
+        render = getattr(self.service, RENDERERS[email.kind])
+        return render(email.recipient, **json.loads(email.payload))
+
+    async def _send(
+        self, emails: List[EmailOutbox]
+    ) -> Tuple[List[int], List[Tuple[int, str]]]:
+        """Send claimed emails, returning the sent ids and failed (id, error) pairs."""
+        sent: List[int] = []
+        failed: List[Tuple[int, str]] = []
+        ids: List[int] = []
+        messages: List[EmailMessage] = []
+        for email in emails:
+            try:
+                messages.append(self._render(email))
+                ids.append(email.id)
+            except Exception as e:
+                failed.append((email.id, f"render: {e}"))
+
+        errors = await self.service.send_batches(messages, pace=self._pace)
+        for email_id, error in zip(ids, errors):
+            if error is None:
+                sent.append(email_id)
+            else:
+                failed.append((email_id, error))
+        return sent, failed
+
+    async def drain(
+        self, session_factory: async_sessionmaker = BackgroundSessionLocal
+    ) -> Dict[str, Any]:
+        """Send one batch of due emails, returning the run's counts."""
+        if self.service.transport is None:
+            logger.warning("Resend API key not configured, leaving emails in the outbox")
+            return {}
+
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        async with session_factory() as db:
+            emails = await db.run_sync(claim_emails, self.batch_size, self.lease, now)
+            await db.commit()
+        if not emails:
+            return {"claimed": 0}
+
+        sent, failed = await self._send(emails)
+
+        async with session_factory() as db:
+            await db.run_sync(
+                record_results,
+                sent,
+                failed,
+                self.max_attempts,
+                self.retry_delay,
+                datetime.now(timezone.utc),
+            )
+            await db.commit()
+
+        self.last_run = {
+            "claimed": len(emails),
+            "sent": len(sent),
+            "failed": len(failed),
+            "seconds": round(time.perf_counter() - started, 3),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+        }
+        logger.info(
+            f"Drained email outbox: {len(sent)} sent, {len(failed)} failed "
+            f"of {len(emails)} in {self.last_run['seconds']}s"
+        )
+        return self.last_run
+
+
+async def drain_email_outbox():
+    """Send the email outbox's due emails until none are left or a batch fails."""
+    while True:
+        try:
+            result = await email_outbox_drainer.drain()
+        except Exception as e:
+            logger.error(f"Email outbox drain failed: {e}")
+            return
+        if not result.get("sent") or result["claimed"] < email_outbox_drainer.batch_size:
+            return
+
+
+async def purge_email_outbox():
+    """Delete sent and failed emails past their retention."""
+    now = datetime.now(timezone.utc)
+    async with BackgroundSessionLocal() as db:
+        try:
+            purged = await db.run_sync(
+                purge_emails,
+                now - timedelta(days=settings.email_outbox_sent_retention_days),
+                now - timedelta(days=settings.email_outbox_failed_retention_days),
+            )
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Email outbox purge failed: {e}")
+            return
+
+    logger.info(f"Purged {purged} sent and failed emails from the outbox")
+
+
+# Global email outbox drainer instance
+email_outbox_drainer = EmailOutboxDrainer()
@@ -1,30 +1,151 @@
 """Email service using Resend."""
 
+import asyncio
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence
 
 import httpx
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 
 from app.core.config import settings
 from app.core.logging import log_event
 
 logger = logging.getLogger(__name__)
 
+TEMPLATE_DIR = Path(__file__).parent.parent.parent / "templates"
+
+
+class EmailMessage(NamedTuple):
+    """A rendered email."""
+
+    to: List[str]
+    subject: str
+    html: str
+    text: Optional[str] = None
+
+
+class ResendTransport:
+    """Sends emails through the Resend API over a pooled connection.
+
+    One client is shared by every send made on an event loop. Celery tasks
+    run each send on a fresh loop, so a client is only reused while the
+    loop that created it is running.
+    """
+
+    base_url = "https://api.resend.com"
+    batch_size = 100  # emails per request to the batch endpoint
+
+    def __init__(self, api_key: str, from_email: str):
+        """Initialize transport."""
+        self.api_key = api_key
+        self.from_email = from_email
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """The shared client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                },
+                timeout=settings.email_timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.email_concurrency,
+                    max_keepalive_connections=settings.email_concurrency,
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    def _payload(self, message: EmailMessage) -> Dict:
+        """Resend request body of an email."""
+        return {
+            "from": self.from_email,
+            "to": message.to,
+            "subject": message.subject,
+            "html": message.html,
+            "text": message.text or message.html,
+        }
+
+    async def send(self, message: EmailMessage) -> None:
+        """Send one email, raising on failure."""
+        response = await self._get_client().post("/emails", json=self._payload(message))
+        response.raise_for_status()
+
+    async def send_batch(self, messages: Sequence[EmailMessage]) -> None:
+        """Send up to `batch_size` emails in one request, raising on failure."""
+        response = await self._get_client().post(
+            "/emails/batch", json=[self._payload(message) for message in messages]
+        )
+        response.raise_for_status()
+
+    async def aclose(self) -> None:
+        """Close the shared client."""
+        if self._client is not None:
+            client, self._client, self._loop = self._client, None, None
+            try:
+                await client.aclose()
+            except RuntimeError:
+                pass  # its event loop is already closed
+
+
+class MemoryTransport:
+    """Keeps emails in memory instead of sending them, for tests and local runs."""
+
+    batch_size = 100
+
+    def __init__(self):
+        """Initialize transport."""
+        self.sent: List[EmailMessage] = []
+        self.requests = 0
+
+    async def send(self, message: EmailMessage) -> None:
+        """Record one email."""
+        self.requests += 1
+        self.sent.append(message)
+
+    async def send_batch(self, messages: Sequence[EmailMessage]) -> None:
+        """Record a batch of emails."""
+        self.requests += 1
+        self.sent.extend(messages)
+
+    async def aclose(self) -> None:
+        """Nothing to close."""
+
+
+def default_transport():
+    """Transport selected by the email settings, or None if unconfigured."""
+    if settings.email_transport == "memory":
+        return MemoryTransport()
+    if settings.resend_api_key:
+        return ResendTransport(settings.resend_api_key, settings.from_email)
+    return None
+
 
 class EmailService:
     """Email service using Resend API."""
 
-    def __init__(self):
-        """Initialize email service."""
-        self.api_key = getattr(settings, "resend_api_key", None)
-        self.base_url = "https://api.resend.com"
-        self.from_email = getattr(settings, "from_email", "noreply@priceinsight.ng")
+    def __init__(self, transport=None, concurrency: int = settings.email_concurrency):
+        """Initialize email service.
+
+        Templates are compiled once here rather than on every render.
+        """
+        self.transport = transport if transport is not None else default_transport()
+        self.concurrency = concurrency
 
         # Setup Jinja2 template environment
-        template_dir = Path(__file__).parent.parent.parent / "templates"
-        self.jinja_env = Environment(loader=FileSystemLoader(template_dir))
+        self.jinja_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+        self.templates: Dict[str, Template] = {}
+        for template_name in self.jinja_env.list_templates():
+            try:
+                self.templates[template_name] = self.jinja_env.get_template(template_name)
+            except Exception as e:
+                logger.error(f"Failed to compile template {template_name}: {e}")
 
     async def send_email(
         self,
@@ -34,55 +155,91 @@ class EmailService:
         text_content: Optional[str] = None,
     ) -> bool:
         """Send email using Resend API."""
-        if not self.api_key:
+        if self.transport is None:
             logger.warning("Resend API key not configured")
             return False
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/emails",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "from": self.from_email,
-                        "to": to,
-                        "subject": subject,
-                        "html": html_content,
-                        "text": text_content or html_content,
-                    },
-                )
-                response.raise_for_status()
-                log_event("email_sent", {"to": to, "subject": subject})
-                logger.info(f"Email sent successfully to {to}")
-                return True
+            await self.transport.send(EmailMessage(to, subject, html_content, text_content))
+            log_event("email_sent", {"to": to, "subject": subject})
+            logger.info(f"Email sent successfully to {to}")
+            return True
 
         except Exception as e:
             log_event("email_failed", {"error": str(e), "to": to})
             logger.error(f"Failed to send email: {e}")
             return False
 
+    async def send_batches(
+        self,
+        messages: Sequence[EmailMessage],
+        pace: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> List[Optional[str]]:
+        """Send many emails, returning each one's error, or None if it was sent.
+
+        Emails go out in batches of the transport's batch size, with at
+        most `concurrency` batches in flight at once. `pace`, if given, is
+        awaited before each request, e.g. to keep to a rate limit.
+        """
+        if self.transport is None:
+            logger.warning("Resend API key not configured")
+            return ["Resend API key not configured"] * len(messages)
+
+        errors: List[Optional[str]] = [None] * len(messages)
+        batch_size = self.transport.batch_size
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send_batch(start: int) -> None:
+            batch = messages[start : start + batch_size]
+            async with semaphore:
+                if pace is not None:
+                    await pace()
+                try:
+                    await self.transport.send_batch(batch)
+                except Exception as e:
+                    log_event("email_batch_failed", {"error": str(e), "count": len(batch)})
+                    logger.error(f"Failed to send batch of {len(batch)} emails: {e}")
+                    errors[start : start + len(batch)] = [str(e)] * len(batch)
+
+        await asyncio.gather(*(send_batch(start) for start in range(0, len(messages), batch_size)))
+        return errors
+
+    async def send_bulk(self, messages: Sequence[EmailMessage]) -> int:
+        """Send many emails in batches, returning how many were sent."""
+        if not messages:
+            return 0
+
+        sent = (await self.send_batches(messages)).count(None)
+        log_event("email_bulk_sent", {"sent": sent, "total": len(messages)})
+        logger.info(f"Sent {sent}/{len(messages)} emails")
+        return sent
+
+    async def aclose(self) -> None:
+        """Close the transport's connections."""
+        if self.transport is not None:
+            await self.transport.aclose()
+
     def render_template(self, template_name: str, **context) -> str:
         """Render HTML template with context."""
         try:
-            template = self.jinja_env.get_template(template_name)
+            template = self.templates.get(template_name) or self.jinja_env.get_template(
+                template_name
+            )
             return template.render(**context)
         except Exception as e:
             log_event("template_render_failed", {"template": template_name, "error": str(e)})
             logger.error(f"Failed to render template {template_name}: {e}")
             return "<p>Error rendering email template</p>"
 
-    async def send_price_alert(
+    def price_alert_message(
         self,
         to: str,
         product_name: str,
         old_price: float,
         new_price: float,
         currency: str = "₦",
-    ) -> bool:
-        """Send price drop alert email."""
+    ) -> EmailMessage:
+        """Render a price drop alert email."""
         discount_percent = ((old_price - new_price) / old_price) * 100
         savings = old_price - new_price
 
@@ -95,27 +252,55 @@ class EmailService:
             savings=f"{savings:,.2f}",
             discount_percent=f"{discount_percent:.1f}",
         )
+        return EmailMessage([to], f"Price Drop: {product_name}", html_content)
 
+    async def send_price_alert(
+        self,
+        to: str,
+        product_name: str,
+        old_price: float,
+        new_price: float,
+        currency: str = "₦",
+    ) -> bool:
+        """Send price drop alert email."""
+        message = self.price_alert_message(to, product_name, old_price, new_price, currency)
         return await self.send_email(
-            to=[to],
-            subject=f"Price Drop: {product_name}",
-            html_content=html_content,
+            to=message.to,
+            subject=message.subject,
+            html_content=message.html,
         )
 
-    async def send_welcome_email(self, to: str, user_name: str) -> bool:
-        """Send welcome email to new user."""
+    async def send_price_alerts(
+        self,
+        recipients: Sequence[str],
+        product_name: str,
+        old_price: float,
+        new_price: float,
+        currency: str = "₦",
+    ) -> int:
+        """Send the same price drop alert to many recipients, one email each."""
+        # Rendered once; only the recipient differs between the emails
+        message = self.price_alert_message("", product_name, old_price, new_price, currency)
+        return await self.send_bulk([message._replace(to=[to]) for to in recipients])
+
+    def welcome_message(self, to: str, user_name: str) -> EmailMessage:
+        """Render a welcome email."""
         html_content = self.render_template(
             "welcome.html",
             user_name=user_name,
         )
+        return EmailMessage([to], "Welcome to Price Insight!", html_content)
 
+    async def send_welcome_email(self, to: str, user_name: str) -> bool:
+        """Send welcome email to new user."""
+        message = self.welcome_message(to, user_name)
         return await self.send_email(
-            to=[to],
-            subject="Welcome to Price Insight!",
-            html_content=html_content,
+            to=message.to,
+            subject=message.subject,
+            html_content=message.html,
         )
 
-    async def send_deal_notification(
+    def deal_notification_message(
         self,
         to: str,
         item_name: str,
@@ -125,8 +310,8 @@ class EmailService:
         deal_type: str = "Hot Deal",
         discount_percent: Optional[float] = None,
         currency: str = "₦",
-    ) -> bool:
-        """Send deal notification email."""
+    ) -> EmailMessage:
+        """Render a deal notification email."""
         html_content = self.render_template(
             "deal_notification.html",
             item_name=item_name,
@@ -137,11 +322,27 @@ class EmailService:
             discount_percent=f"{discount_percent:.1f}" if discount_percent else None,
             currency=currency,
         )
+        return EmailMessage([to], f"🔥 {deal_type}: {item_name}", html_content)
 
+    async def send_deal_notification(
+        self,
+        to: str,
+        item_name: str,
+        category: str,
+        price: float,
+        provider: str,
+        deal_type: str = "Hot Deal",
+        discount_percent: Optional[float] = None,
+        currency: str = "₦",
+    ) -> bool:
+        """Send deal notification email."""
+        message = self.deal_notification_message(
+            to, item_name, category, price, provider, deal_type, discount_percent, currency
+        )
         return await self.send_email(
-            to=[to],
-            subject=f"🔥 {deal_type}: {item_name}",
-            html_content=html_content,
+            to=message.to,
+            subject=message.subject,
+            html_content=message.html,
         )
 
 
@@ -2,7 +2,7 @@
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
 from sqlalchemy.orm import Session
@@ -18,6 +18,7 @@ logger = logging.getLogger(__name__)
 class NotificationType(str, Enum):
     """Notification types."""
     PRICE_DROP = "price_drop"
+    TARGET_REACHED = "target_reached"
     DEAL_ALERT = "deal_alert"
     SYSTEM = "system"
     WELCOME = "welcome"
@@ -39,6 +40,21 @@ class Notification(BaseModel):
     user = relationship("User", backref="notifications")
 
 
+def price_drop_notification(user_id: int, product_name: str, old_price: float, new_price: float) -> Dict:
+    """Column values of a price drop notification, for single or bulk inserts."""
+    savings = old_price - new_price
+    discount = ((old_price - new_price) / old_price) * 100
+    
+    return {
+        "user_id": user_id,
+        "title": f"Price Drop: {product_name}",
+        "message": f"Price dropped by {discount:.1f}% - Save ₦{savings:,.2f}",
+        "type": NotificationType.PRICE_DROP,
+        "data": f'{{"product_name": "{product_name}", "old_price": {old_price}, "new_price": {new_price}}}',
+        "is_read": False,
+    }
+
+
 class NotificationService:
     """Service for managing in-app notifications."""
     
@@ -116,15 +132,14 @@ class NotificationService:
     
     def notify_price_drop(self, user_id: int, product_name: str, old_price: float, new_price: float) -> Notification:
         """Create price drop notification."""
-        savings = old_price - new_price
-        discount = ((old_price - new_price) / old_price) * 100
+        values = price_drop_notification(user_id, product_name, old_price, new_price)
         
         return self.create_notification(
             user_id=user_id,
-            title=f"Price Drop: {product_name}",
-            message=f"Price dropped by {discount:.1f}% - Save ₦{savings:,.2f}",
-            notification_type=NotificationType.PRICE_DROP,
-            data=f'{{"product_name": "{product_name}", "old_price": {old_price}, "new_price": {new_price}}}'
+            title=values["title"],
+            message=values["message"],
+            notification_type=values["type"],
+            data=values["data"]
         )
     
     def notify_deal_alert(self, user_id: int, product_name: str, discount_percent: float) -> Notification:
@@ -8,7 +8,7 @@ from celery import group
 from sqlalchemy import select
 
 from app.core.celery_app import celery_app
-from app.core.database import AsyncSessionLocal
+from app.core.database import BackgroundSessionLocal
 from app.core.scraping.scraper_manager import scraper_manager
 from app.ecommerce.models.product import Product
 from app.real_estate.models.property import Property
@@ -107,7 +107,7 @@ async def _scrape_batch_async(urls: List[str], category: str):
 async def _distribute_ecommerce_scraping():
     """Distribute e-commerce scraping to multiple workers."""
     
-    async with AsyncSessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         result = await db.execute(
             select(Product.url).where(Product.is_active == True)
         )
@@ -134,7 +134,7 @@ async def _distribute_ecommerce_scraping():
 
 async def _distribute_travel_scraping():
     """Distribute travel scraping to multiple workers."""
-    async with AsyncSessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         flight_result = await db.execute(
             select(Flight.url).where(Flight.is_active == True)
         )
@@ -162,7 +162,7 @@ async def _distribute_travel_scraping():
 
 async def _distribute_real_estate_scraping():
     """Distribute real estate scraping to multiple workers."""
-    async with AsyncSessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         result = await db.execute(
             select(Property.url).where(Property.is_active == True)
         )
@@ -187,7 +187,7 @@ async def _distribute_real_estate_scraping():
 
 async def _distribute_utilities_scraping():
     """Distribute utilities scraping to multiple workers."""
-    async with AsyncSessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         result = await db.execute(
             select(UtilityService.url).where(UtilityService.is_active == True)
         )
@@ -5,9 +5,10 @@ from typing import Dict, List
 
 logger = logging.getLogger(__name__)
 
-from app.core.database import AsyncSessionLocal
+from app.core.database import BackgroundSessionLocal
 from app.ecommerce.models import Product
 from app.ecommerce.services.change_detector import ChangeDetector
+from app.ecommerce.services.product_matching import group_duplicate_listings
 from app.ecommerce.services.product_service import ProductService
 from app.ecommerce.services.scrapers.amazon import AmazonScraper
 from app.ecommerce.services.scrapers.generic import COMMON_SELECTORS, GenericScraper
@@ -17,7 +18,7 @@ async def scrape_tracked_products():
     """Main scraping job that processes all tracked products."""
     logger.info("Starting product scraping job")
 
-    async with AsyncSessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         try:
             product_service = ProductService(db)
             change_detector = ChangeDetector(db)
@@ -33,36 +34,44 @@ async def scrape_tracked_products():
             products_by_site = _group_products_by_site(products)
 
             total_scraped = 0
+            total_skipped = 0
             total_deals = 0
 
             for site, site_products in products_by_site.items():
-                logger.info(f"Scraping {len(site_products)} products from {site}")
+                listings = group_duplicate_listings(site_products)
+                logger.info(
+                    f"Scraping {len(listings)} listings for {len(site_products)} products "
+                    f"from {site}"
+                )
 
                 # Get appropriate scraper for site
                 scraper = _get_scraper_for_site(site)
 
                 async with scraper:
-                    for product in site_products:
+                    for listing_products in listings.values():
+                        product = listing_products[0]
                         try:
-                            # Scrape product data
+                            # Scrape the listing once for every product tracking it
                             data = await scraper.scrape(product.url)
 
                             if data and "price" in data:
-                                # Process price change and trigger alerts
-                                alerts = await change_detector.process_price_change(
-                                    product.id,
-                                    data["price"],
-                                    data.get("currency", "NGN"),
-                                    data.get("availability"),
-                                )
-
-                                if alerts:
-                                    total_deals += len(alerts)
-                                    logger.info(
-                                        f"Triggered {len(alerts)} alerts for {product.name}"
+                                for duplicate in listing_products:
+                                    # Process price change and trigger alerts
+                                    alerts = await change_detector.process_price_change(
+                                        duplicate.id,
+                                        data["price"],
+                                        data.get("currency", "NGN"),
+                                        data.get("availability"),
                                     )
 
+                                    if alerts:
+                                        total_deals += len(alerts)
+                                        logger.info(
+                                            f"Triggered {len(alerts)} alerts for {duplicate.name}"
+                                        )
+
                                 total_scraped += 1
+                                total_skipped += len(listing_products) - 1
 
                             else:
                                 logger.warning(f"Failed to scrape data for {product.name}")
@@ -72,8 +81,8 @@ async def scrape_tracked_products():
                             continue
 
             logger.info(
-                f"Scraping job completed: {total_scraped} products scraped, "
-                f"{total_deals} alerts triggered"
+                f"Scraping job completed: {total_scraped} listings scraped, "
+                f"{total_skipped} duplicate listings skipped, {total_deals} alerts triggered"
             )
 
         except Exception as e:
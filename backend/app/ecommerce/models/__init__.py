@@ -4,5 +4,6 @@ from .deal import Deal
 from .deal_preference import DealPreference
 from .price_history import PriceHistory
 from .product import Product
+from .product_match import ProductMatchBucket
 
-__all__ = ["Product", "PriceHistory", "Deal", "DealPreference"]
+__all__ = ["Product", "PriceHistory", "Deal", "DealPreference", "ProductMatchBucket"]
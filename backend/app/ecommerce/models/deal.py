@@ -4,7 +4,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import DECIMAL, DateTime, ForeignKey, String, Text
+from sqlalchemy import DECIMAL, DateTime, ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.models.base import BaseModel
@@ -14,6 +14,24 @@ class Deal(BaseModel):
     """Deal model for tracking product deals and discounts."""
 
     __tablename__ = "deals"
+    __table_args__ = (
+        # One active price drop deal per item, the bulk upsert's conflict target
+        Index(
+            "uq_deals_active_product",
+            "product_id",
+            unique=True,
+            postgresql_where=text("is_active AND deal_type = 'price_drop'"),
+            sqlite_where=text("is_active AND deal_type = 'price_drop'"),
+        ),
+        # Newest-first cursor pagination over active rows
+        Index(
+            "ix_deals_keyset",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False, index=True)
     original_price: Mapped[Decimal] = mapped_column(DECIMAL(10, 2), nullable=False)
@@ -40,8 +58,8 @@ class Deal(BaseModel):
         )
 
     @property
-    def is_active(self) -> bool:
-        """Check if deal is currently active."""
+    def is_current(self) -> bool:
+        """Check if deal is active and within its start and end dates."""
         now = datetime.utcnow()
         if self.deal_end_date and now > self.deal_end_date:
             return False
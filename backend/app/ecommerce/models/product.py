@@ -1,6 +1,8 @@
 """Product model for e-commerce tracking."""
 
-from sqlalchemy import Boolean, String, Text
+from typing import Optional
+
+from sqlalchemy import Boolean, Index, Integer, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.models.base import BaseModel
@@ -10,12 +12,28 @@ class Product(BaseModel):
     """Product model for tracking e-commerce items."""
 
     __tablename__ = "products"
+    __table_args__ = (
+        # Newest-first cursor pagination over active rows
+        Index(
+            "ix_products_keyset",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     name: Mapped[str] = mapped_column(String(500), nullable=False)
     url: Mapped[str] = mapped_column(Text, nullable=False, unique=True, index=True)
     site: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     category: Mapped[str] = mapped_column(String(100), nullable=True, index=True)
     is_tracked: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
+    # URL without tracking parameters, shared by duplicate listings of one item
+    canonical_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True, index=True)
+    # Id of the first product in the cross-retailer group this product matches
+    match_group_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    # search_vector (tsvector) is a Postgres generated column used only by product search,
+    # so it is not mapped here; see the product_search_index migration
 
     # Relationships
     price_history = relationship("PriceHistory", back_populates="product")
@@ -23,6 +41,17 @@ class Product(BaseModel):
     alert_rules = relationship("AlertRule", back_populates="product")
     watchlists = relationship("Watchlist", back_populates="product")
 
+    # Latest price state, maintained with every price history write
+    snapshot = relationship(
+        "PriceSnapshot",
+        primaryjoin=(
+            "and_(PriceSnapshot.category == 'ecommerce', "
+            "foreign(PriceSnapshot.item_id) == Product.id)"
+        ),
+        uselist=False,
+        viewonly=True,
+    )
+
     def __repr__(self) -> str:
         """String representation."""
         return f"<Product(id={self.id}, name='{self.name[:50]}...', site='{self.site}')>"
@@ -0,0 +1,23 @@
+"""Product matching bucket model."""
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.base import BaseModel
+
+
+class ProductMatchBucket(BaseModel):
+    """LSH band bucket a product's name signature falls into.
+
+    Products sharing a bucket are candidate matches; see
+    ``app.ecommerce.services.product_matching``.
+    """
+
+    __tablename__ = "product_match_buckets"
+
+    band_key: Mapped[str] = mapped_column(String(24), nullable=False, index=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<ProductMatchBucket({self.band_key}, product_id={self.product_id})>"
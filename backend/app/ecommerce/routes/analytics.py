@@ -14,7 +14,7 @@ from app.core.constants import (
     CACHE_TTL_GLOBAL_DASHBOARD,
     CACHE_TTL_USER_DASHBOARD,
 )
-from app.core.database import get_db
+from app.core.database import get_replica_db
 from app.core.deps import get_current_user
 from app.core.models.user import User
 from app.ecommerce.schemas.analytics import (
@@ -36,7 +36,7 @@ router = APIRouter(prefix="/analytics/dashboard", tags=["Analytics Dashboard"])
 @cached(ttl=CACHE_TTL_USER_DASHBOARD, key_prefix="dashboard:user")
 async def get_user_dashboard(
     days: int = Query(30, ge=1, le=365, description="Days to analyze"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get user-specific analytics dashboard."""
@@ -48,7 +48,7 @@ async def get_user_dashboard(
 @cached(ttl=CACHE_TTL_GLOBAL_DASHBOARD, key_prefix="dashboard:global")
 async def get_global_dashboard(
     days: int = Query(30, ge=1, le=365, description="Days to analyze"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get global analytics dashboard."""
@@ -60,7 +60,7 @@ async def get_global_dashboard(
 @cached(ttl=CACHE_TTL_ANALYTICS_SAVINGS, key_prefix="analytics:savings")
 async def get_savings_stats(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get total savings statistics."""
@@ -72,7 +72,7 @@ async def get_savings_stats(
 @cached(ttl=CACHE_TTL_ANALYTICS_MOST_TRACKED, key_prefix="analytics:most_tracked")
 async def get_most_tracked(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get most tracked products."""
@@ -88,7 +88,7 @@ async def get_most_tracked(
 async def get_best_retailers(
     days: int = Query(30, ge=1, le=365),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get best performing retailers."""
@@ -104,9 +104,10 @@ async def get_best_retailers(
 @cached(ttl=CACHE_TTL_ANALYTICS_PRICE_DROPS, key_prefix="analytics:price_drops")
 async def get_price_drops(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    limit: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get price drop statistics."""
-    stats = AnalyticsDashboard.get_price_drop_statistics(db, days)
+    """Get price drop statistics and the biggest drops."""
+    stats = AnalyticsDashboard.get_price_drop_statistics(db, days, limit)
     return PriceDropStats(**stats)
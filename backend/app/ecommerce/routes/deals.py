@@ -21,7 +21,7 @@ from app.ecommerce.schemas.deal import (
     DealResponse,
     DealWithProductResponse,
 )
-from app.utils.pagination import PaginationParams, paginate_joined_query
+from app.utils.pagination import CountMode, PaginationParams, paginate_joined_query
 
 router = APIRouter(prefix="/api/e-commerce", tags=["E-commerce Deals & Alerts"])
 
@@ -30,6 +30,10 @@ router = APIRouter(prefix="/api/e-commerce", tags=["E-commerce Deals & Alerts"])
 async def list_deals(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(
+        None, description="How to compute the total: exact, cached, estimate or none"
+    ),
     site: Optional[str] = Query(None, description="Filter by site"),
     min_discount: Optional[float] = Query(
         None, ge=0, le=100, description="Minimum discount percentage"
@@ -67,8 +71,8 @@ async def list_deals(
         return DealWithProductResponse(**deal_dict)
 
     # Use pagination utility
-    pagination = PaginationParams(page=page, size=size)
-    result = await paginate_joined_query(db, query, pagination, format_deal)
+    pagination = PaginationParams(page=page, size=size, cursor=cursor, count=count)
+    result = await paginate_joined_query(db, query, pagination, format_deal, keyset_model=Deal)
 
     return DealListResponse(**result.model_dump())
 
@@ -95,6 +99,10 @@ async def get_deal(
 async def list_alerts(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(
+        None, description="How to compute the total: exact, cached, estimate or none"
+    ),
     product_id: Optional[int] = Query(None, description="Filter by product ID"),
     rule_type: Optional[str] = Query(None, description="Filter by rule type"),
     db: AsyncSession = Depends(get_database_session),
@@ -126,8 +134,10 @@ async def list_alerts(
         return AlertHistoryWithDetailsResponse(**alert_dict)
 
     # Use pagination utility
-    pagination = PaginationParams(page=page, size=size)
-    result = await paginate_joined_query(db, query, pagination, format_alert)
+    pagination = PaginationParams(page=page, size=size, cursor=cursor, count=count)
+    result = await paginate_joined_query(
+        db, query, pagination, format_alert, keyset_model=AlertHistory
+    )
 
     return AlertListResponse(**result.model_dump())
 
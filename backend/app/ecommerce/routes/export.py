@@ -1,11 +1,15 @@
 """E-commerce export endpoints."""
 
-from fastapi import APIRouter, Depends, Response
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_database_session
+from app.core.deps import get_current_user, get_replica_session
 from app.core.models.user import User
+from app.core.price_history.archive import archived_history
 from app.ecommerce.models import Product
 from app.utils.export import export_service
 
@@ -14,7 +18,7 @@ router = APIRouter(prefix="/api/e-commerce/export", tags=["E-commerce Export"])
 
 @router.get("/products/csv")
 async def export_products_csv(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export products to CSV."""
@@ -34,7 +38,7 @@ async def export_products_csv(
 
 @router.get("/products/pdf")
 async def export_products_pdf(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export products to PDF."""
@@ -50,3 +54,28 @@ async def export_products_pdf(
         media_type="application/pdf",
         headers={"Content-Disposition": "attachment; filename=products.pdf"},
     )
+
+
+@router.get("/products/{product_id}/history/csv")
+async def export_product_history_csv(
+    product_id: int,
+    days: Optional[int] = Query(None, ge=1, description="Days of history (all if omitted)"),
+    db: AsyncSession = Depends(get_replica_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Export a product's price history, archived history included, to CSV."""
+    if not await db.get(Product, product_id):
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    rows = await archived_history.load_async(db, "ecommerce", product_id, since)
+
+    filename = f"product_{product_id}_history.csv"
+    data = export_service.prepare_price_history_data(rows)
+    csv_output = export_service.generate_csv(data, filename)
+
+    return Response(
+        content=csv_output.getvalue(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
@@ -13,7 +13,7 @@ from app.core.constants import (
     CACHE_TTL_PRICE_TREND,
     CACHE_TTL_PRODUCT_ANALYTICS,
 )
-from app.core.database import get_db
+from app.core.database import get_replica_db
 from app.core.deps import get_current_user
 from app.core.models.user import User
 from app.ecommerce.models.product import Product
@@ -34,7 +34,7 @@ router = APIRouter(prefix="/analytics", tags=["Price Analytics"])
 async def get_product_analytics(
     product_id: int,
     days: int = Query(30, ge=1, le=365, description="Days of history to analyze"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get comprehensive price analytics for a product."""
@@ -42,21 +42,12 @@ async def get_product_analytics(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    # Get multi-period statistics
-    multi_stats = PriceAnalytics.get_multi_period_stats(db, product_id)
+    # Multi-period statistics, volatility, deal status and trend from one rollup read
+    summary = PriceAnalytics.get_analytics_summary(db, product_id, days)
     
     # Get price history for charting
     history = PriceAnalytics.get_price_history_chart(db, product_id, days)
     
-    # Get volatility
-    volatility = PriceAnalytics.get_price_volatility(db, product_id, days)
-    
-    # Check if it's a good deal
-    is_good_deal = PriceAnalytics.is_good_deal(db, product_id)
-    
-    # Get current trend
-    trend = PriceAnalytics.get_price_trend(db, product_id, 7)
-    
     # Get current price
     current_price = history[-1]["price"] if history else 0.0
     
@@ -64,11 +55,11 @@ async def get_product_analytics(
         product_id=product_id,
         product_name=product.name,
         current_price=current_price,
-        statistics=MultiPeriodStats(**multi_stats),
+        statistics=MultiPeriodStats(**summary["statistics"]),
         price_history=[PricePoint(**p) for p in history],
-        volatility=volatility,
-        is_good_deal=is_good_deal,
-        trend=trend
+        volatility=summary["volatility"],
+        is_good_deal=summary["is_good_deal"],
+        trend=summary["trend"]
     )
 
 
@@ -77,7 +68,7 @@ async def get_product_analytics(
 async def get_price_stats(
     product_id: int,
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get price statistics for a specific time period."""
@@ -97,7 +88,7 @@ async def get_price_stats(
 async def get_price_trend(
     product_id: int,
     days: int = Query(7, ge=1, le=90),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get price trend for a product."""
@@ -119,7 +110,7 @@ async def get_price_trend(
 async def get_price_history(
     product_id: int,
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get price history for charting."""
@@ -136,7 +127,7 @@ async def get_price_history(
 def check_if_good_deal(
     product_id: int,
     threshold: float = Query(10.0, ge=0, le=100, description="Discount threshold percentage"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user)
 ):
     """Check if current price is a good deal."""
@@ -1,7 +1,7 @@
 """Product search API endpoints."""
 
 import logging
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
@@ -21,24 +21,27 @@ router = APIRouter(prefix="/products/search", tags=["Product Search"])
 def search_tracked_products(
     q: str = Query(..., min_length=2, description="Search query"),
     limit: int = Query(10, ge=1, le=50),
+    site: Optional[str] = Query(None, description="Filter by site"),
+    category: Optional[str] = Query(None, description="Filter by category"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Search existing tracked products."""
-    products = ProductSearchService.search_tracked_products(db, q, limit)
+    """Search existing tracked products, best match first."""
+    matches = ProductSearchService.rank_tracked_products(db, q, limit, site, category)
     
     return {
         "query": q,
-        "count": len(products),
+        "count": len(matches),
         "products": [
             {
                 "id": p.id,
                 "name": p.name,
                 "url": p.url,
                 "site": p.site,
-                "category": p.category
+                "category": p.category,
+                "score": round(score, 3)
             }
-            for p in products
+            for p, score in matches
         ]
     }
 
@@ -15,11 +15,13 @@ from app.ecommerce.schemas.product import (
     ProductCreate,
     ProductDetailResponse,
     ProductListResponse,
+    ProductOffersResponse,
     ProductResponse,
     ProductUpdate,
 )
+from app.ecommerce.services.product_matching import product_matcher
 from app.ecommerce.services.product_service import ProductService
-from app.utils.pagination import PaginationParams, paginate_query
+from app.utils.pagination import CountMode, PaginationParams, paginate_query
 
 router = APIRouter(prefix="/api/e-commerce/products", tags=["E-commerce Products"])
 
@@ -53,6 +55,10 @@ async def create_product(
 async def list_products(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(
+        None, description="How to compute the total: exact, cached, estimate or none"
+    ),
     site: Optional[str] = Query(None, description="Filter by site"),
     category: Optional[str] = Query(None, description="Filter by category"),
     is_tracked: Optional[bool] = Query(None, description="Filter by tracking status"),
@@ -75,8 +81,8 @@ async def list_products(
     query = query.order_by(Product.created_at.desc())
 
     # Use pagination utility
-    pagination = PaginationParams(page=page, size=size)
-    result = await paginate_query(db, query, pagination, ProductResponse)
+    pagination = PaginationParams(page=page, size=size, cursor=cursor, count=count)
+    result = await paginate_query(db, query, pagination, ProductResponse, keyset_model=Product)
 
     return ProductListResponse(**result.model_dump())
 
@@ -104,6 +110,27 @@ async def get_product(
     return ProductDetailResponse.model_validate(product)
 
 
+@router.get("/{product_id}/offers", response_model=ProductOffersResponse)
+async def get_product_offers(
+    product_id: int,
+    db: AsyncSession = Depends(get_database_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the same product's current prices across retailers, cheapest first."""
+
+    offers = await product_matcher.get_offers(db, product_id)
+    if not offers:
+        exists = await db.execute(
+            select(Product.id).where(Product.id == product_id, Product.is_active)
+        )
+        if exists.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+
+    return ProductOffersResponse(
+        product_id=product_id, offers=offers, cheapest=offers[0] if offers else None
+    )
+
+
 @router.patch("/{product_id}", response_model=ProductResponse)
 async def update_product(
     product_id: int,
@@ -126,6 +153,9 @@ async def update_product(
     for field, value in update_data.items():
         setattr(product, field, value)
 
+    if "name" in update_data:
+        await product_matcher.assign(db, product)
+
     await db.commit()
     await db.refresh(product)
     
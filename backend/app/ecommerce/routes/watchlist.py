@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.deps import get_current_user
 from app.core.models.user import User
-from app.ecommerce.models.price_history import PriceHistory
+from app.core.price_history.snapshots import load_snapshots
 from app.ecommerce.models.product import Product
 from app.ecommerce.schemas.watchlist import (
     WatchlistCreate,
@@ -58,18 +58,22 @@ def get_watchlist(
     """Get user's watchlist with product details."""
     watchlists = WatchlistService.get_user_watchlist(db, current_user.id)
     
+    # Products and their current prices for the whole list in two queries
+    product_ids = [watchlist.product_id for watchlist in watchlists]
+    products = {
+        product.id: product
+        for product in db.query(Product).filter(Product.id.in_(product_ids)).all()
+    } if product_ids else {}
+    snapshots = load_snapshots(db, "ecommerce", product_ids)
+    
     result = []
     for watchlist in watchlists:
-        product = db.query(Product).filter(Product.id == watchlist.product_id).first()
+        product = products.get(watchlist.product_id)
         if not product:
             continue
         
-        # Get current price
-        latest_price = db.query(PriceHistory).filter(
-            PriceHistory.product_id == product.id
-        ).order_by(PriceHistory.created_at.desc()).first()
-        
-        current_price = latest_price.price if latest_price else None
+        snapshot = snapshots.get(product.id)
+        current_price = snapshot.current_price if snapshot else None
         
         # Determine price status
         price_status = "no_target"
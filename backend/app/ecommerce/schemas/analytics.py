@@ -54,6 +54,7 @@ class PriceDropStats(BaseModel):
     average_drop_amount: float
     average_drop_percent: float
     biggest_drop: Optional[BiggestDrop]
+    top_drops: List[BiggestDrop] = []
     period_days: int
 
 
@@ -86,17 +86,21 @@ class DealListResponse(BaseModel):
     """Schema for paginated deal list response."""
 
     items: List[DealWithProductResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
 class AlertListResponse(BaseModel):
     """Schema for paginated alert list response."""
 
     items: List[AlertHistoryWithDetailsResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
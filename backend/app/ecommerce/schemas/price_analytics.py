@@ -37,6 +37,7 @@ class MultiPeriodStats(BaseModel):
     last_30_days: Optional[PriceStats] = None
     last_60_days: Optional[PriceStats] = None
     last_90_days: Optional[PriceStats] = None
+    last_365_days: Optional[PriceStats] = None
     trend_7_days: str
     trend_30_days: str
 
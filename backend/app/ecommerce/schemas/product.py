@@ -47,6 +47,7 @@ class ProductResponse(BaseModel):
     category: Optional[str]
     is_tracked: bool
     is_active: bool
+    match_group_id: Optional[int] = None
     created_at: datetime
     updated_at: datetime
 
@@ -60,11 +61,34 @@ class ProductDetailResponse(ProductResponse):
     price_history: List[PriceHistoryResponse] = []
 
 
+class ProductOffer(BaseModel):
+    """Current price of one retailer's listing of a product."""
+
+    product_id: int
+    name: str
+    site: str
+    url: str
+    price: float
+    currency: str
+    availability: Optional[str] = None
+    last_seen_at: datetime
+
+
+class ProductOffersResponse(BaseModel):
+    """Schema for a product's offers across retailers, cheapest first."""
+
+    product_id: int
+    offers: List[ProductOffer]
+    cheapest: Optional[ProductOffer] = None
+
+
 class ProductListResponse(BaseModel):
     """Schema for paginated product list response."""
 
     items: List[ProductResponse]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
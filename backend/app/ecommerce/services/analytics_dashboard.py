@@ -8,8 +8,10 @@ from typing import Dict, List
 from sqlalchemy import func, desc
 from sqlalchemy.orm import Session
 
+from app.core.models.price_snapshot import PriceSnapshot
+from app.core.price_history.drops import price_drop_summary
+from app.core.price_history.snapshots import snapshot_join
 from app.ecommerce.models.deal import Deal
-from app.ecommerce.models.price_history import PriceHistory
 from app.ecommerce.models.product import Product
 from app.ecommerce.models.watchlist import Watchlist
 
@@ -57,34 +59,33 @@ class AnalyticsDashboard:
     def get_most_tracked_products(db: Session, limit: int = 10) -> List[Dict]:
         """Get most tracked products by watchlist count."""
         try:
+            # Current price comes from the maintained snapshot, not a query per product
             results = db.query(
                 Product.id,
                 Product.name,
                 Product.site,
                 Product.url,
+                PriceSnapshot.current_price,
                 func.count(Watchlist.id).label('watchlist_count')
             ).join(
                 Watchlist, Product.id == Watchlist.product_id
+            ).outerjoin(
+                PriceSnapshot, snapshot_join("ecommerce", Product.id)
             ).group_by(
-                Product.id
+                Product.id, PriceSnapshot.current_price
             ).order_by(
                 desc('watchlist_count')
             ).limit(limit).all()
             
             products = []
             for r in results:
-                # Get current price
-                latest_price = db.query(PriceHistory).filter(
-                    PriceHistory.product_id == r.id
-                ).order_by(PriceHistory.created_at.desc()).first()
-                
                 products.append({
                     "product_id": r.id,
                     "name": r.name,
                     "site": r.site,
                     "url": r.url,
                     "watchlist_count": r.watchlist_count,
-                    "current_price": float(latest_price.price) if latest_price else None
+                    "current_price": float(r.current_price) if r.current_price is not None else None
                 })
             
             return products
@@ -131,60 +132,44 @@ class AnalyticsDashboard:
             return []
 
     @staticmethod
-    def get_price_drop_statistics(db: Session, days: int = 30) -> Dict:
-        """Get price drop statistics."""
+    def get_price_drop_statistics(db: Session, days: int = 30, limit: int = 5) -> Dict:
+        """Get price drop statistics and the biggest drops."""
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
-            # Get all products with price history
-            products = db.query(Product).filter(Product.is_active == True).all()
-            
-            total_products = len(products)
-            products_with_drops = 0
-            total_drop_amount = 0
-            total_drop_percent = 0
-            biggest_drop = {"product": None, "amount": 0, "percent": 0}
-            
-            for product in products:
-                prices = db.query(PriceHistory).filter(
-                    PriceHistory.product_id == product.id,
-                    PriceHistory.created_at >= cutoff_date
-                ).order_by(PriceHistory.created_at.asc()).all()
-                
-                if len(prices) < 2:
-                    continue
-                
-                first_price = float(prices[0].price)
-                last_price = float(prices[-1].price)
-                
-                if last_price < first_price:
-                    products_with_drops += 1
-                    drop_amount = first_price - last_price
-                    drop_percent = (drop_amount / first_price) * 100
-                    
-                    total_drop_amount += drop_amount
-                    total_drop_percent += drop_percent
-                    
-                    if drop_amount > biggest_drop["amount"]:
-                        biggest_drop = {
-                            "product": product.name,
-                            "product_id": product.id,
-                            "amount": drop_amount,
-                            "percent": drop_percent,
-                            "old_price": first_price,
-                            "new_price": last_price
-                        }
-            
-            avg_drop_amount = total_drop_amount / products_with_drops if products_with_drops > 0 else 0
-            avg_drop_percent = total_drop_percent / products_with_drops if products_with_drops > 0 else 0
+            active_products = db.query(Product.id).filter(Product.is_active == True)
+            total_products = active_products.count()
+
+            # First vs last price of every active product in one window-function query
+            summary = price_drop_summary(
+                db, "ecommerce", days, item_ids=active_products.statement, limit=limit
+            )
+            products_with_drops = summary["items_with_drops"]
+
+            names = dict(
+                db.query(Product.id, Product.name).filter(
+                    Product.id.in_([drop["item_id"] for drop in summary["top_drops"]])
+                ).all()
+            ) if summary["top_drops"] else {}
+
+            top_drops = [
+                {
+                    "product": names.get(drop["item_id"], ""),
+                    "product_id": drop["item_id"],
+                    "amount": drop["amount"],
+                    "percent": drop["percent"],
+                    "old_price": drop["old_price"],
+                    "new_price": drop["new_price"]
+                }
+                for drop in summary["top_drops"]
+            ]
             
             return {
                 "total_products_tracked": total_products,
                 "products_with_price_drops": products_with_drops,
                 "drop_rate_percent": (products_with_drops / total_products * 100) if total_products > 0 else 0,
-                "average_drop_amount": round(avg_drop_amount, 2),
-                "average_drop_percent": round(avg_drop_percent, 2),
-                "biggest_drop": biggest_drop if biggest_drop["product"] else None,
+                "average_drop_amount": round(summary["average_drop_amount"], 2),
+                "average_drop_percent": round(summary["average_drop_percent"], 2),
+                "biggest_drop": top_drops[0] if top_drops else None,
+                "top_drops": top_drops,
                 "period_days": days
             }
             
@@ -197,6 +182,7 @@ class AnalyticsDashboard:
                 "average_drop_amount": 0,
                 "average_drop_percent": 0,
                 "biggest_drop": None,
+                "top_drops": [],
                 "period_days": days
             }
 
@@ -219,16 +205,14 @@ class AnalyticsDashboard:
                 Deal.is_active == True
             ).first()
             
-            # User's watchlist items at target price
+            # User's watchlist items currently at target price
             at_target = db.query(func.count(Watchlist.id)).filter(
                 Watchlist.user_id == user_id,
                 Watchlist.target_price.isnot(None)
             ).join(
-                Product, Watchlist.product_id == Product.id
-            ).join(
-                PriceHistory, Product.id == PriceHistory.product_id
+                PriceSnapshot, snapshot_join("ecommerce", Watchlist.product_id)
             ).filter(
-                PriceHistory.price <= Watchlist.target_price
+                PriceSnapshot.current_price <= Watchlist.target_price
             ).scalar()
             
             return {
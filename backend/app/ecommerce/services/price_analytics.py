@@ -8,7 +8,10 @@ from typing import Dict, List, Optional
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.ecommerce.models.price_history import PriceHistory
+from app.core.price_history.archive import archived_history
+from app.core.price_history.intervals import interval_points
+from app.core.price_history.rollups import STANDARD_WINDOWS
+from app.core.price_history.windows import PriceWindows
 
 logger = logging.getLogger(__name__)
 
@@ -17,46 +20,122 @@ class PriceAnalytics:
     """Service for analyzing price trends and statistics."""
 
     @staticmethod
-    def get_price_stats(db: Session, product_id: int, days: int = 30) -> Optional[Dict]:
-        """Get price statistics for a product over specified days."""
+    def _stats_from_summary(summary: Optional[Dict], days: int) -> Optional[Dict]:
+        """Build price statistics from a window summary."""
+        if not summary:
+            return None
+
+        current_price = summary["close"]
+        lowest_price = summary["low"]
+        highest_price = summary["high"]
+        avg_price = summary["mean"]
+
+        # Calculate price drop percentage from highest
+        price_drop_pct = ((highest_price - current_price) / highest_price * 100) if highest_price > 0 else 0
+
+        # Calculate savings from average
+        savings_from_avg = avg_price - current_price
+        savings_pct = (savings_from_avg / avg_price * 100) if avg_price > 0 else 0
+
+        last_updated = summary["last_updated"] or summary["last_day"]
+
+        return {
+            "current_price": current_price,
+            "lowest_price": lowest_price,
+            "highest_price": highest_price,
+            "average_price": round(avg_price, 2),
+            "price_drop_percentage": round(price_drop_pct, 2),
+            "savings_from_average": round(savings_from_avg, 2),
+            "savings_percentage": round(savings_pct, 2),
+            "data_points": summary["count"],
+            "period_days": days,
+            "first_tracked": summary["first_day"].isoformat(),
+            "last_updated": last_updated.isoformat()
+        }
+
+    @staticmethod
+    def _trend(windows: PriceWindows, days: int) -> str:
+        """Classify the price trend over a window."""
+        change_pct = windows.change_percent(days)
+
+        if change_pct is None:
+            return "insufficient_data"
+        if change_pct > 5:
+            return "rising"
+        elif change_pct < -5:
+            return "falling"
+        else:
+            return "stable"
+
+    @staticmethod
+    def _volatility(windows: PriceWindows, days: int) -> Optional[float]:
+        """Coefficient of variation over a window, as a percentage."""
+        summary = windows.summary(days)
+        std_dev = windows.stddev(days)
+        if std_dev is None:
+            return None
+
+        avg = summary["mean"]
+        cv = (std_dev / avg * 100) if avg > 0 else 0
+        return round(cv, 2)
+
+    @staticmethod
+    def _is_good_deal(windows: PriceWindows, threshold_pct: float) -> bool:
+        """Check the current price against the 30-day average."""
+        summary = windows.summary(30)
+        if not summary:
+            return False
+
+        current = summary["close"]
+        average = summary["mean"]
+
+        discount_pct = ((average - current) / average * 100) if average > 0 else 0
+
+        return discount_pct >= threshold_pct
+
+    @staticmethod
+    def _multi_period(windows: PriceWindows) -> Dict:
+        """Statistics for every standard window plus short and medium trends."""
+        stats = {
+            f"last_{days}_days": PriceAnalytics._stats_from_summary(windows.summary(days), days)
+            for days in STANDARD_WINDOWS
+        }
+        stats["trend_7_days"] = PriceAnalytics._trend(windows, 7)
+        stats["trend_30_days"] = PriceAnalytics._trend(windows, 30)
+        return stats
+
+    @staticmethod
+    def get_analytics_summary(db: Session, product_id: int, days: int = 30) -> Dict:
+        """Get all window statistics, trend, volatility and deal status in one read.
+
+        Equivalent to calling get_multi_period_stats, get_price_volatility,
+        is_good_deal and get_price_trend, but from a single rollup query.
+        """
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
-            prices = db.query(PriceHistory).filter(
-                PriceHistory.product_id == product_id,
-                PriceHistory.created_at >= cutoff_date
-            ).order_by(PriceHistory.created_at.asc()).all()
-            
-            if not prices:
-                return None
-            
-            price_values = [float(p.price) for p in prices]
-            current_price = price_values[-1]
-            lowest_price = min(price_values)
-            highest_price = max(price_values)
-            avg_price = sum(price_values) / len(price_values)
-            
-            # Calculate price drop percentage from highest
-            price_drop_pct = ((highest_price - current_price) / highest_price * 100) if highest_price > 0 else 0
-            
-            # Calculate savings from average
-            savings_from_avg = avg_price - current_price
-            savings_pct = (savings_from_avg / avg_price * 100) if avg_price > 0 else 0
-            
+            windows = PriceWindows.load(db, "ecommerce", product_id, [*STANDARD_WINDOWS, days])
+            return {
+                "statistics": PriceAnalytics._multi_period(windows),
+                "volatility": PriceAnalytics._volatility(windows, days),
+                "is_good_deal": PriceAnalytics._is_good_deal(windows, 10.0),
+                "trend": PriceAnalytics._trend(windows, 7),
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting analytics summary for product {product_id}: {e}")
             return {
-                "current_price": current_price,
-                "lowest_price": lowest_price,
-                "highest_price": highest_price,
-                "average_price": round(avg_price, 2),
-                "price_drop_percentage": round(price_drop_pct, 2),
-                "savings_from_average": round(savings_from_avg, 2),
-                "savings_percentage": round(savings_pct, 2),
-                "data_points": len(prices),
-                "period_days": days,
-                "first_tracked": prices[0].created_at.isoformat(),
-                "last_updated": prices[-1].created_at.isoformat()
+                "statistics": {"trend_7_days": "error", "trend_30_days": "error"},
+                "volatility": None,
+                "is_good_deal": False,
+                "trend": "error",
             }
-            
+
+    @staticmethod
+    def get_price_stats(db: Session, product_id: int, days: int = 30) -> Optional[Dict]:
+        """Get price statistics for a product over specified days."""
+        try:
+            windows = PriceWindows.load(db, "ecommerce", product_id, [days])
+            return PriceAnalytics._stats_from_summary(windows.summary(days), days)
+
         except Exception as e:
             logger.error(f"Error calculating price stats for product {product_id}: {e}")
             return None
@@ -65,29 +144,8 @@ class PriceAnalytics:
     def get_price_trend(db: Session, product_id: int, days: int = 7) -> str:
         """Calculate price trend (rising/falling/stable)."""
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
-            prices = db.query(PriceHistory).filter(
-                PriceHistory.product_id == product_id,
-                PriceHistory.created_at >= cutoff_date
-            ).order_by(PriceHistory.created_at.asc()).all()
-            
-            if len(prices) < 2:
-                return "insufficient_data"
-            
-            price_values = [float(p.price) for p in prices]
-            first_price = price_values[0]
-            last_price = price_values[-1]
-            
-            change_pct = ((last_price - first_price) / first_price * 100) if first_price > 0 else 0
-            
-            if change_pct > 5:
-                return "rising"
-            elif change_pct < -5:
-                return "falling"
-            else:
-                return "stable"
-                
+            return PriceAnalytics._trend(PriceWindows.load(db, "ecommerce", product_id, [days]), days)
+
         except Exception as e:
             logger.error(f"Error calculating price trend for product {product_id}: {e}")
             return "error"
@@ -97,21 +155,19 @@ class PriceAnalytics:
         """Get price history data for charting."""
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
-            prices = db.query(PriceHistory).filter(
-                PriceHistory.product_id == product_id,
-                PriceHistory.created_at >= cutoff_date
-            ).order_by(PriceHistory.created_at.asc()).all()
-            
+
+            # Older history is merged in from the cold archive
+            prices = archived_history.load(db, "ecommerce", product_id, cutoff_date)
+
             return [
                 {
-                    "date": p.created_at.isoformat(),
+                    "date": seen_at.isoformat(),
                     "price": float(p.price),
                     "availability": p.availability
                 }
-                for p in prices
+                for seen_at, p in interval_points(prices)
             ]
-            
+
         except Exception as e:
             logger.error(f"Error getting price history for product {product_id}: {e}")
             return []
@@ -120,15 +176,8 @@ class PriceAnalytics:
     def get_multi_period_stats(db: Session, product_id: int) -> Dict:
         """Get price statistics for multiple time periods."""
         try:
-            return {
-                "last_7_days": PriceAnalytics.get_price_stats(db, product_id, 7),
-                "last_30_days": PriceAnalytics.get_price_stats(db, product_id, 30),
-                "last_60_days": PriceAnalytics.get_price_stats(db, product_id, 60),
-                "last_90_days": PriceAnalytics.get_price_stats(db, product_id, 90),
-                "trend_7_days": PriceAnalytics.get_price_trend(db, product_id, 7),
-                "trend_30_days": PriceAnalytics.get_price_trend(db, product_id, 30)
-            }
-            
+            return PriceAnalytics._multi_period(PriceWindows.load(db, "ecommerce", product_id))
+
         except Exception as e:
             logger.error(f"Error getting multi-period stats for product {product_id}: {e}")
             return {}
@@ -137,17 +186,9 @@ class PriceAnalytics:
     def is_good_deal(db: Session, product_id: int, threshold_pct: float = 10.0) -> bool:
         """Check if current price is a good deal based on historical data."""
         try:
-            stats = PriceAnalytics.get_price_stats(db, product_id, 30)
-            if not stats:
-                return False
-            
-            current = stats["current_price"]
-            average = stats["average_price"]
-            
-            discount_pct = ((average - current) / average * 100) if average > 0 else 0
-            
-            return discount_pct >= threshold_pct
-            
+            windows = PriceWindows.load(db, "ecommerce", product_id, [30])
+            return PriceAnalytics._is_good_deal(windows, threshold_pct)
+
         except Exception as e:
             logger.error(f"Error checking deal status for product {product_id}: {e}")
             return False
@@ -156,25 +197,9 @@ class PriceAnalytics:
     def get_price_volatility(db: Session, product_id: int, days: int = 30) -> Optional[float]:
         """Calculate price volatility (standard deviation)."""
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
-            prices = db.query(PriceHistory).filter(
-                PriceHistory.product_id == product_id,
-                PriceHistory.created_at >= cutoff_date
-            ).all()
-            
-            if len(prices) < 2:
-                return None
-            
-            price_values = [float(p.price) for p in prices]
-            avg = sum(price_values) / len(price_values)
-            variance = sum((x - avg) ** 2 for x in price_values) / len(price_values)
-            std_dev = variance ** 0.5
-            
-            # Return coefficient of variation (CV) as percentage
-            cv = (std_dev / avg * 100) if avg > 0 else 0
-            return round(cv, 2)
-            
+            windows = PriceWindows.load(db, "ecommerce", product_id, [days])
+            return PriceAnalytics._volatility(windows, days)
+
         except Exception as e:
             logger.error(f"Error calculating volatility for product {product_id}: {e}")
             return None
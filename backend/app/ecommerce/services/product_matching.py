@@ -0,0 +1,282 @@
+"""Cross-retailer product matching.
+
+The same item is tracked as separate products on Jumia, Konga, Amazon and
+so on. Each product name is reduced to signature tokens (brand, model and
+capacity words without marketing noise), MinHashed, and split into LSH
+bands stored in ``product_match_buckets``. A new product is only compared
+with products sharing a band, and joins the match group of the closest one
+whose model tokens agree. Every product in a group carries the group id,
+so all offers for an item are one indexed lookup. The group id is its
+first product's id; when that product is reassigned (after a rename), the
+rest of the group is handed to its lowest remaining id first.
+"""
+
+import random
+import re
+from hashlib import blake2b
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+from urllib.parse import urlparse, urlunparse
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.models.price_snapshot import PriceSnapshot
+from app.core.price_history.snapshots import snapshot_join
+from app.ecommerce.models.product import Product
+from app.ecommerce.models.product_match import ProductMatchBucket
+from app.utils.url_normalizer import extract_product_id, normalize_url
+
+# 8 bands of 4 rows: names with ~0.6 token overlap share a band ~70% of the time
+BANDS = 8
+ROWS = 4
+
+# Minimum token-set Jaccard similarity for a candidate to match
+MIN_SIMILARITY = 0.5
+
+# Cap on candidates compared per product, in case a bucket gets crowded
+MAX_CANDIDATES = 200
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(BANDS * ROWS)
+]
+
+_UNIT_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(gb|tb|mb|mah|mp|hz|w|l|kg|ml|inch|in)\b")
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)?")
+
+# Words that say nothing about which item a listing is
+NOISE_WORDS = {
+    "new", "brand", "original", "genuine", "official", "authentic", "sealed", "latest",
+    "free", "delivery", "shipping", "offer", "sale", "hot", "best", "with", "and", "for",
+    "the", "of", "in", "a", "by", "smartphone", "phone", "mobile", "dual", "sim",
+    "black", "white", "silver", "gold", "blue", "red", "green", "grey", "gray", "pink",
+    "purple", "midnight", "starlight", "graphite", "color", "colour",
+}
+
+# Words that tell variants of a model (or its accessories) apart, so they must
+# agree like model numbers
+VARIANT_WORDS = {
+    "pro", "max", "plus", "mini", "ultra", "lite", "air", "se", "fe", "neo",
+    "case", "cover", "charger", "cable", "adapter", "protector", "pouch", "strap", "refurbished",
+}
+
+
+def canonical_url(url: str) -> str:
+    """URL of a listing without tracking parameters, fragments or host variations."""
+    parsed = urlparse(normalize_url(url.strip()))
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+
+    path = parsed.path.rstrip("/") or "/"
+    if "amazon" in host:
+        product_id = extract_product_id(url)
+        if product_id:
+            path = f"/dp/{product_id}"
+
+    return urlunparse(("https", host, path, "", parsed.query, ""))
+
+
+def signature_tokens(name: Optional[str]) -> List[str]:
+    """Lowercase brand and model words of a product name, units joined to numbers."""
+    if not name:
+        return []
+    text = _UNIT_PATTERN.sub(r"\1\2", name.lower())
+    return [token for token in _TOKEN_PATTERN.findall(text) if token not in NOISE_WORDS]
+
+
+def model_tokens(tokens: Iterable[str]) -> FrozenSet[str]:
+    """Tokens that must be equal for two names to be the same item."""
+    return frozenset(t for t in tokens if t in VARIANT_WORDS or any(c.isdigit() for c in t))
+
+
+def _hash(text: str) -> int:
+    """Stable 64-bit hash of a string."""
+    return int.from_bytes(blake2b(text.encode(), digest_size=8).digest(), "big")
+
+
+def minhash(tokens: Iterable[str]) -> List[int]:
+    """MinHash signature of a token set."""
+    hashes = [_hash(token) for token in set(tokens)]
+    if not hashes:
+        return []
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_keys(tokens: Iterable[str]) -> List[str]:
+    """LSH bucket keys of a token set, one per band."""
+    signature = minhash(tokens)
+    if not signature:
+        return []
+    return [
+        f"{band}:{_hash(repr(signature[band * ROWS:(band + 1) * ROWS])):016x}"
+        for band in range(BANDS)
+    ]
+
+
+def similarity(left: Iterable[str], right: Iterable[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    left, right = set(left), set(right)
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def is_match(left: List[str], right: List[str]) -> bool:
+    """Whether two signature token lists describe the same item."""
+    return model_tokens(left) == model_tokens(right) and similarity(left, right) >= MIN_SIMILARITY
+
+
+def choose_group(product: Product, tokens: List[str], candidates: Iterable[Product]) -> int:
+    """Match group for a product: the closest matching candidate's, or a new one."""
+    best, best_score = None, 0.0
+    for candidate in candidates:
+        candidate_tokens = signature_tokens(candidate.name)
+        if not is_match(tokens, candidate_tokens):
+            continue
+        score = similarity(tokens, candidate_tokens)
+        if score > best_score:
+            best, best_score = candidate, score
+
+    if best is None:
+        return product.id
+    return best.match_group_id or best.id
+
+
+class ProductMatcher:
+    """Keeps products' match buckets and groups up to date as they are added."""
+
+    def _candidates_query(self, product: Product, keys: List[str]):
+        """Products sharing at least one bucket with a product, most shared buckets first."""
+        shared = (
+            select(ProductMatchBucket.product_id, func.count().label("bands"))
+            .where(
+                ProductMatchBucket.band_key.in_(keys),
+                ProductMatchBucket.product_id != product.id,
+            )
+            .group_by(ProductMatchBucket.product_id)
+            .subquery()
+        )
+        return (
+            select(Product)
+            .join(shared, shared.c.product_id == Product.id)
+            .where(Product.is_active)
+            .order_by(shared.c.bands.desc(), Product.id)
+            .limit(MAX_CANDIDATES)
+        )
+
+    def _clear_buckets(self, product: Product):
+        """Statement removing a product's bucket rows."""
+        return delete(ProductMatchBucket).where(ProductMatchBucket.product_id == product.id)
+
+    def _buckets(self, product: Product, keys: List[str]) -> List[ProductMatchBucket]:
+        """Bucket rows for a product."""
+        return [ProductMatchBucket(band_key=key, product_id=product.id) for key in keys]
+
+    def _new_root_query(self, product: Product):
+        """Lowest id among the other products of the group a product roots."""
+        return select(func.min(Product.id)).where(
+            Product.match_group_id == product.id, Product.id != product.id
+        )
+
+    def _reroot(self, product: Product, root: int):
+        """Statement moving the other products of a product's group to a new root."""
+        return (
+            update(Product)
+            .where(Product.match_group_id == product.id, Product.id != product.id)
+            .values(match_group_id=root)
+            .execution_options(synchronize_session="fetch")
+        )
+
+    async def assign(self, db: AsyncSession, product: Product) -> int:
+        """Bucket a flushed product and set its canonical URL and match group.
+
+        The caller commits.
+        """
+        tokens = signature_tokens(product.name)
+        keys = band_keys(tokens)
+        product.canonical_url = canonical_url(product.url)
+
+        await db.execute(self._clear_buckets(product))
+        if product.match_group_id == product.id:
+            root = await db.scalar(self._new_root_query(product))
+            if root is not None:
+                await db.execute(self._reroot(product, root))
+
+        candidates = []
+        if keys:
+            result = await db.execute(self._candidates_query(product, keys))
+            candidates = result.scalars().all()
+
+        product.match_group_id = choose_group(product, tokens, candidates)
+        db.add_all(self._buckets(product, keys))
+        return product.match_group_id
+
+    def assign_sync(self, db: Session, product: Product) -> int:
+        """Synchronous variant of `assign`."""
+        tokens = signature_tokens(product.name)
+        keys = band_keys(tokens)
+        product.canonical_url = canonical_url(product.url)
+
+        db.execute(self._clear_buckets(product))
+        if product.match_group_id == product.id:
+            root = db.scalar(self._new_root_query(product))
+            if root is not None:
+                db.execute(self._reroot(product, root))
+
+        candidates = []
+        if keys:
+            candidates = db.execute(self._candidates_query(product, keys)).scalars().all()
+
+        product.match_group_id = choose_group(product, tokens, candidates)
+        db.add_all(self._buckets(product, keys))
+        return product.match_group_id
+
+    async def get_offers(self, db: AsyncSession, product_id: int) -> List[Dict]:
+        """Current prices of every product matching a product, cheapest first."""
+        group_id = (
+            select(Product.match_group_id).where(Product.id == product_id).scalar_subquery()
+        )
+        result = await db.execute(
+            select(Product, PriceSnapshot)
+            .join(PriceSnapshot, snapshot_join("ecommerce", Product.id))
+            .where(Product.match_group_id == group_id, Product.is_active)
+            .order_by(PriceSnapshot.current_price, Product.id)
+        )
+
+        offers = []
+        seen_urls: Set[str] = set()
+        for product, snapshot in result.all():
+            # Duplicate listings of one URL are one offer
+            listing = product.canonical_url or product.url
+            if listing in seen_urls:
+                continue
+            seen_urls.add(listing)
+            offers.append(
+                {
+                    "product_id": product.id,
+                    "name": product.name,
+                    "site": product.site,
+                    "url": product.url,
+                    "price": float(snapshot.current_price),
+                    "currency": snapshot.currency,
+                    "availability": snapshot.availability,
+                    "last_seen_at": snapshot.last_seen_at,
+                }
+            )
+        return offers
+
+
+def group_duplicate_listings(products: Iterable[Product]) -> Dict[str, List[Product]]:
+    """Products keyed by canonical URL, so each listing is scraped once."""
+    grouped: Dict[str, List[Product]] = {}
+    for product in products:
+        key = product.canonical_url or canonical_url(product.url)
+        grouped.setdefault(key, []).append(product)
+    return grouped
+
+
+# Global product matcher instance
+product_matcher = ProductMatcher()
@@ -1,40 +1,115 @@
 """Product search and discovery service."""
 
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 
-from sqlalchemy import or_
+from sqlalchemy import func, literal, literal_column, or_
 from sqlalchemy.orm import Session
 
+from app.core.price_history.recorder import record_price
 from app.core.scraping.scraper_factory import scraper_factory
 from app.ecommerce.models.product import Product
+from app.ecommerce.services.product_matching import product_matcher
+from app.ecommerce.services.search_index import product_search_index
 from app.utils.helpers import validate_url
 
 logger = logging.getLogger(__name__)
 
+# Text search configuration of the products.search_vector column
+SEARCH_CONFIG = "english"
+
+# Lowest score at which a tracked product is taken as the one a user asked for
+MIN_MATCH_SCORE = 0.6
+
+# Generated column maintained by Postgres (see the product_search_index migration)
+_search_vector = literal_column("products.search_vector")
+
 
 class ProductSearchService:
     """Service for searching and discovering products."""
 
     @staticmethod
-    def search_tracked_products(db: Session, query: str, limit: int = 10) -> List[Product]:
-        """Search existing tracked products by name."""
+    def rank_tracked_products(
+        db: Session,
+        query: str,
+        limit: int = 10,
+        site: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> List[Tuple[Product, float]]:
+        """Search tracked products by name, best match first, with scores from 0 to 1.
+
+        Postgres matches through the full-text and trigram indexes on products;
+        other databases use the in-process search index.
+        """
         try:
-            search_term = f"%{query}%"
-            products = db.query(Product).filter(
-                or_(
-                    Product.name.ilike(search_term),
-                    Product.url.ilike(search_term)
+            if db.get_bind().dialect.name == "postgresql":
+                return ProductSearchService._rank_indexed(db, query, limit, site, category)
+
+            product_search_index.refresh(db)
+            matches = product_search_index.search(query, limit, site, category)
+            products = {
+                product.id: product
+                for product in db.query(Product).filter(
+                    Product.id.in_([product_id for product_id, _ in matches])
                 )
-            ).limit(limit).all()
-            
-            return products
-            
+            }
+            return [(products[product_id], score) for product_id, score in matches]
+
         except Exception as e:
             logger.error(f"Error searching tracked products: {e}")
             return []
 
+    @staticmethod
+    def _rank_indexed(
+        db: Session, query: str, limit: int, site: Optional[str], category: Optional[str]
+    ) -> List[Tuple[Product, float]]:
+        """Ranked search over the products search_vector and name trigram indexes."""
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        # Similarity of the query to the best matching run of words in the name
+        score = func.word_similarity(query, Product.name)
+
+        products = db.query(Product, score.label("score")).filter(
+            Product.is_active,
+            or_(
+                _search_vector.op("@@")(ts_query),
+                literal(query).op("<%")(Product.name),
+            ),
+        )
+        if site:
+            products = products.filter(Product.site.ilike(f"%{site}%"))
+        if category:
+            products = products.filter(Product.category.ilike(f"%{category}%"))
+
+        rows = products.order_by(
+            func.ts_rank_cd(_search_vector, ts_query).desc(), score.desc(), Product.id
+        ).limit(limit)
+        return [(product, float(product_score)) for product, product_score in rows]
+
+    @staticmethod
+    def search_tracked_products(
+        db: Session,
+        query: str,
+        limit: int = 10,
+        site: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> List[Product]:
+        """Search existing tracked products by name, best match first."""
+        return [
+            product
+            for product, _ in ProductSearchService.rank_tracked_products(
+                db, query, limit, site, category
+            )
+        ]
+
+    @staticmethod
+    def find_tracked_product(db: Session, query: str) -> Optional[Product]:
+        """Tracked product matching a name closely enough to reuse instead of scraping."""
+        matches = ProductSearchService.rank_tracked_products(db, query, limit=1)
+        if matches and matches[0][1] >= MIN_MATCH_SCORE:
+            return matches[0][0]
+        return None
+
     @staticmethod
     async def scrape_product_from_url(db: Session, url: str) -> Optional[Product]:
         """Scrape product from URL and add to database."""
@@ -71,22 +146,23 @@ class ProductSearchService:
             )
             
             db.add(product)
+            db.flush()
+            product_matcher.assign_sync(db, product)
             db.commit()
             db.refresh(product)
             
             # Add initial price history
-            from app.ecommerce.models.price_history import PriceHistory
             from decimal import Decimal
             
-            price_history = PriceHistory(
-                product_id=product.id,
-                price=Decimal(str(product_data["price"])),
-                currency=product_data.get("currency", "NGN"),
+            record_price(
+                db,
+                "ecommerce",
+                product.id,
+                Decimal(str(product_data["price"])),
+                product_data.get("currency", "NGN"),
                 availability=product_data.get("availability", "Unknown"),
                 source="scraper"
             )
-            
-            db.add(price_history)
             db.commit()
             
             logger.info(f"Successfully scraped and added product: {product.name}")
@@ -5,11 +5,13 @@ from decimal import Decimal
 from typing import List, Optional
 
 logger = logging.getLogger(__name__)
-from sqlalchemy import select
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.price_history.recorder import PriceHistoryRecorder
 from app.ecommerce.models import Deal, PriceHistory, Product
+from app.ecommerce.services.product_matching import canonical_url, product_matcher
 from app.utils.currency import currency_converter
 from app.utils.helpers import calculate_discount_percentage, is_valid_deal
 
@@ -24,9 +26,17 @@ class ProductService:
     async def get_or_create_product(
         self, url: str, name: str, site: str, category: Optional[str] = None
     ) -> Product:
-        """Get existing product or create new one."""
+        """Get existing product or create new one.
+
+        Listings whose URLs differ only in tracking parameters are the same product.
+        """
         # Check if product exists
-        stmt = select(Product).where(Product.url == url)
+        stmt = (
+            select(Product)
+            .where(or_(Product.url == url, Product.canonical_url == canonical_url(url)))
+            .order_by(Product.id)
+            .limit(1)
+        )
         result = await self.db.execute(stmt)
         product = result.scalar_one_or_none()
 
@@ -34,12 +44,15 @@ class ProductService:
             # Update name if different
             if product.name != name:
                 product.name = name
+                await product_matcher.assign(self.db, product)
                 await self.db.commit()
             return product
 
         # Create new product
         product = Product(name=name, url=url, site=site, category=category, is_tracked=True)
         self.db.add(product)
+        await self.db.flush()
+        await product_matcher.assign(self.db, product)
         await self.db.commit()
         await self.db.refresh(product)
 
@@ -53,21 +66,20 @@ class ProductService:
         currency: str = "NGN",
         availability: Optional[str] = None,
     ) -> PriceHistory:
-        """Add price history entry."""
+        """Add price history entry, extending the current one if the price is unchanged."""
         # Ensure price is in Naira
         if currency != "NGN":
             naira_price = await currency_converter.convert_to_naira(price, currency)
             price = naira_price
             currency = "NGN"
 
-        price_entry = PriceHistory(
-            product_id=product_id, price=price, currency=currency, availability=availability
+        price_entry = await PriceHistoryRecorder(self.db).record(
+            "ecommerce", product_id, price, currency, availability=availability
         )
-        self.db.add(price_entry)
         await self.db.commit()
         await self.db.refresh(price_entry)
 
-        logger.info(f"Added price history: Product {product_id} - ₦{price}")
+        logger.info(f"Recorded price history: Product {product_id} - ₦{price}")
         return price_entry
 
     async def get_products_to_track(self) -> List[Product]:
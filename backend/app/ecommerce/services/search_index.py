@@ -0,0 +1,151 @@
+"""In-process inverted index for product search.
+
+Postgres searches products through the ``search_vector`` tsvector and
+pg_trgm indexes. Other databases (the SQLite test setup) use this index
+instead: product names are tokenized into an inverted index of terms, and
+terms are indexed by trigram so misspelled query words still find them.
+Scores mirror pg_trgm's ``word_similarity``: 1.0 when every query word
+appears in the name, lower as words are missing or misspelled.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.ecommerce.models.product import Product
+
+logger = logging.getLogger(__name__)
+
+# Same default as pg_trgm.similarity_threshold
+SIMILARITY_THRESHOLD = 0.3
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric words of a text."""
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def trigrams(term: str) -> FrozenSet[str]:
+    """Trigrams of a word, padded like pg_trgm so short words still match."""
+    padded = f"  {term} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def trigram_similarity(left: FrozenSet[str], right: FrozenSet[str]) -> float:
+    """Share of trigrams two words have in common."""
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+class ProductSearchIndex:
+    """Inverted index over product names with trigram term lookup."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._signature = None
+        self.clear()
+
+    def clear(self):
+        """Remove every product from the index."""
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._term_trigrams: Dict[str, FrozenSet[str]] = {}
+        self._trigram_terms: Dict[str, Set[str]] = defaultdict(set)
+        self._filters: Dict[int, Tuple[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._filters)
+
+    def add(self, product_id: int, name: str, site: Optional[str], category: Optional[str]):
+        """Index one product."""
+        self._filters[product_id] = ((site or "").lower(), (category or "").lower())
+        for term in tokenize(name):
+            self._postings[term].add(product_id)
+            if term not in self._term_trigrams:
+                grams = trigrams(term)
+                self._term_trigrams[term] = grams
+                for gram in grams:
+                    self._trigram_terms[gram].add(term)
+
+    def refresh(self, db: Session):
+        """Rebuild the index if products were added, changed or removed since the last build."""
+        signature = tuple(
+            db.query(func.count(Product.id), func.max(Product.updated_at))
+            .filter(Product.is_active)
+            .one()
+        )
+        if signature == self._signature:
+            return
+
+        self.clear()
+        rows = (
+            db.query(Product.id, Product.name, Product.site, Product.category)
+            .filter(Product.is_active)
+            .all()
+        )
+        for product_id, name, site, category in rows:
+            self.add(product_id, name, site, category)
+
+        self._signature = signature
+        logger.info(f"Built product search index: {len(rows)} products, {len(self._postings)} terms")
+
+    def _similar_terms(self, word: str) -> Dict[str, float]:
+        """Indexed terms matching a query word, with their similarity."""
+        if word in self._postings:
+            return {word: 1.0}
+
+        grams = trigrams(word)
+        candidates = set()
+        for gram in grams:
+            candidates |= self._trigram_terms.get(gram, set())
+
+        matches = {}
+        for term in candidates:
+            similarity = trigram_similarity(grams, self._term_trigrams[term])
+            if similarity >= SIMILARITY_THRESHOLD:
+                matches[term] = similarity
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        site: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> List[Tuple[int, float]]:
+        """Best matching product ids with scores between 0 and 1, best first."""
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # Best similarity of any name term to each query word, per product
+        best: Dict[int, List[float]] = defaultdict(lambda: [0.0] * len(words))
+        for position, word in enumerate(words):
+            for term, similarity in self._similar_terms(word).items():
+                for product_id in self._postings[term]:
+                    scores = best[product_id]
+                    scores[position] = max(scores[position], similarity)
+
+        site = site.lower() if site else None
+        category = category.lower() if category else None
+        results = []
+        for product_id, scores in best.items():
+            product_site, product_category = self._filters[product_id]
+            if site and site not in product_site:
+                continue
+            if category and category not in product_category:
+                continue
+            results.append((product_id, sum(scores) / len(words)))
+
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results[:limit]
+
+
+# Global search index instance
+product_search_index = ProductSearchIndex()
@@ -6,10 +6,6 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
-from app.core.services.notification_service import NotificationService
-from app.core.tasks.email_tasks import send_price_alert_task
-from app.ecommerce.models.price_history import PriceHistory
-from app.ecommerce.models.product import Product
 from app.ecommerce.models.watchlist import Watchlist
 
 logger = logging.getLogger(__name__)
@@ -41,10 +37,8 @@ class WatchlistService:
                 product = await ProductSearchService.scrape_product_from_url(db, product_name_or_url)
             else:
                 # Search in tracked products first
-                tracked = ProductSearchService.search_tracked_products(db, product_name_or_url, limit=1)
-                if tracked:
-                    product = tracked[0]
-                else:
+                product = ProductSearchService.find_tracked_product(db, product_name_or_url)
+                if not product:
                     # Search and scrape from e-commerce sites
                     products = await ProductSearchService.search_and_scrape_products(db, product_name_or_url, max_results=1)
                     if products:
@@ -150,105 +144,3 @@ class WatchlistService:
     def get_user_watchlist(db: Session, user_id: int) -> List[Watchlist]:
         """Get all watchlist items for a user."""
         return db.query(Watchlist).filter(Watchlist.user_id == user_id).all()
-
-    @staticmethod
-    async def check_watchlist_alerts(db: Session) -> None:
-        """Check all watchlist items for price alerts."""
-        try:
-            watchlists = db.query(Watchlist).all()
-            notification_service = NotificationService(db)
-            
-            for watchlist in watchlists:
-                product = watchlist.product
-                
-                # Get latest price
-                latest_price = db.query(PriceHistory).filter(
-                    PriceHistory.product_id == product.id
-                ).order_by(PriceHistory.created_at.desc()).first()
-                
-                if not latest_price:
-                    continue
-                
-                current_price = float(latest_price.price)
-                
-                # Check target price alert
-                if watchlist.alert_on_target and watchlist.target_price:
-                    target = float(watchlist.target_price)
-                    if current_price <= target:
-                        await WatchlistService._send_target_alert(
-                            db, watchlist, product, current_price, target
-                        )
-                
-                # Check any price drop alert
-                if watchlist.alert_on_any_drop:
-                    previous_price = db.query(PriceHistory).filter(
-                        PriceHistory.product_id == product.id,
-                        PriceHistory.id < latest_price.id
-                    ).order_by(PriceHistory.created_at.desc()).first()
-                    
-                    if previous_price and current_price < float(previous_price.price):
-                        drop_pct = ((float(previous_price.price) - current_price) / float(previous_price.price)) * 100
-                        await WatchlistService._send_drop_alert(
-                            db, watchlist, product, current_price, drop_pct
-                        )
-                        
-        except Exception as e:
-            logger.error(f"Error checking watchlist alerts: {e}")
-
-    @staticmethod
-    async def _send_target_alert(
-        db: Session,
-        watchlist: Watchlist,
-        product: Product,
-        current_price: float,
-        target_price: float
-    ) -> None:
-        """Send alert when target price is reached."""
-        try:
-            user = watchlist.user
-            
-            # Send email via Celery (non-blocking with retry)
-            send_price_alert_task.delay(
-                to=user.email,
-                product_name=product.name,
-                old_price=target_price,
-                new_price=current_price,
-                currency="₦"
-            )
-            
-            NotificationService(db).notify_price_drop(
-                user_id=user.id,
-                product_name=product.name,
-                old_price=target_price,
-                new_price=current_price
-            )
-            
-            logger.info(f"Sent target price alert for product {product.id} to user {user.id}")
-            
-        except Exception as e:
-            logger.error(f"Error sending target alert: {e}")
-
-    @staticmethod
-    async def _send_drop_alert(
-        db: Session,
-        watchlist: Watchlist,
-        product: Product,
-        current_price: float,
-        drop_percentage: float
-    ) -> None:
-        """Send alert when price drops."""
-        try:
-            user = watchlist.user
-            
-            NotificationService(db).create_notification(
-                user_id=user.id,
-                notification_type="price_drop",
-                title="Price Drop Alert",
-                message=f"{product.name} price dropped by {drop_percentage:.1f}% to ₦{current_price:.2f}",
-                data={"product_id": product.id, "drop_percentage": drop_percentage}
-            )
-            
-            logger.info(f"Sent price drop alert for product {product.id} to user {user.id}")
-            
-        except Exception as e:
-            logger.error(f"Error sending drop alert: {e}")
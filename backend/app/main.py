@@ -6,16 +6,18 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import dispose_engines
 from app.core.job_manager import job_manager
 from app.core.logging import setup_logging
 from app.core.routes.auth import router as auth_router
+from app.core.routes.autocomplete import router as autocomplete_router
 from app.core.routes.health import router as health_router
 from app.core.routes.monitoring import router as monitoring_router
 from app.core.routes.notifications import router as notifications_router
 from app.core.routes.scraping import router as scraping_router
 from app.core.routes.status import router as status_router
 from app.core.scheduler import scheduler_manager
+from app.core.services.email_service import email_service
 from app.core.scraping.scraping_jobs import scraping_scheduler
 from app.ecommerce.routes.analytics import router as analytics_router
 from app.ecommerce.routes.deals import router as deals_router
@@ -55,7 +57,8 @@ async def lifespan(app: FastAPI):
     # Shutdown
     scraping_scheduler.stop()
     await scheduler_manager.shutdown()
-    await engine.dispose()
+    await email_service.aclose()
+    await dispose_engines()
 
 
 # Create FastAPI app
@@ -83,6 +86,7 @@ app.include_router(status_router)
 app.include_router(monitoring_router)
 app.include_router(notifications_router)
 app.include_router(scraping_router)
+app.include_router(autocomplete_router)
 app.include_router(products_router)
 app.include_router(product_search_router)
 app.include_router(deals_router)
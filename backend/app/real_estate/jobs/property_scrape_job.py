@@ -6,11 +6,10 @@ from typing import Dict, List
 
 from sqlalchemy import select
 
-from app.core.database import AsyncSessionLocal
+from app.core.database import BackgroundSessionLocal
 from app.core.scraping.scraper_manager import scraper_manager
 from app.real_estate.models.property import Property
 from app.real_estate.services.deal_detector import RealEstateDealDetector
-from app.real_estate.services.watchlist_alerts import PropertyWatchlistAlerts
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +18,7 @@ async def scrape_tracked_properties():
     """Main property scraping job that processes all tracked properties."""
     logger.info("Starting property scraping job")
 
-    async with AsyncSessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         try:
             result = await db.execute(
                 select(Property).where(Property.is_active == True, Property.is_tracked == 1)
@@ -40,13 +39,14 @@ async def scrape_tracked_properties():
 
 
 async def detect_property_deals():
-    """Detect property deals based on price history."""
+    """Detect property deals among properties whose price changed."""
     logger.info("Starting property deal detection")
 
-    async with AsyncSessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         try:
             detector = RealEstateDealDetector()
-            deals = detector.detect_deals(db)
+            deals = await db.run_sync(detector.detect_changed_deals)
+            await db.commit()
             logger.info(f"Property deal detection completed: {len(deals)} deals found")
 
         except Exception as e:
@@ -54,20 +54,6 @@ async def detect_property_deals():
             raise
 
 
-async def check_property_watchlist_alerts():
-    """Check watchlist items and send alerts."""
-    logger.info("Starting property watchlist alert check")
-
-    async with AsyncSessionLocal() as db:
-        try:
-            alerts_sent = await PropertyWatchlistAlerts.check_watchlist_alerts(db)
-            logger.info(f"Property watchlist alerts completed: {alerts_sent} alerts sent")
-
-        except Exception as e:
-            logger.error(f"Property watchlist alert check failed: {e}")
-            raise
-
-
 def _group_properties_by_site(properties: List[Property]) -> Dict[str, List[Property]]:
     """Group properties by site for efficient scraping."""
     grouped = {}
@@ -3,6 +3,7 @@
 from .alert import PropertyAlertHistory, PropertyAlertRule
 from .deal import PropertyDeal
 from .deal_preference import PropertyDealPreference
+from .location import Location
 from .price_history import PropertyPriceHistory
 from .property import Property
 from .watchlist import PropertyWatchlist
@@ -15,4 +16,5 @@ __all__ = [
     "PropertyAlertHistory",
     "PropertyWatchlist",
     "PropertyDealPreference",
+    "Location",
 ]
@@ -1,6 +1,6 @@
 """Property alert models."""
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, text
 
 from app.core.models.base import BaseModel
 
@@ -9,6 +9,16 @@ class PropertyAlertRule(BaseModel):
     """Property alert rule model."""
 
     __tablename__ = "property_alert_rules"
+    __table_args__ = (
+        # Newest-first cursor pagination over active rows
+        Index(
+            "ix_property_alert_rules_keyset",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     property_id = Column(Integer, ForeignKey("properties.id"), nullable=True, index=True)
     location = Column(String(200), nullable=True, index=True)
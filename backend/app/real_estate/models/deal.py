@@ -1,6 +1,6 @@
 """Real estate deal model."""
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, text
 
 from app.core.models.base import BaseModel
 
@@ -9,6 +9,24 @@ class PropertyDeal(BaseModel):
     """Property deal model for price drops and special offers."""
 
     __tablename__ = "property_deals"
+    __table_args__ = (
+        # One active price drop deal per item, the bulk upsert's conflict target
+        Index(
+            "uq_property_deals_active_property",
+            "property_id",
+            unique=True,
+            postgresql_where=text("is_active AND deal_type = 'price_drop'"),
+            sqlite_where=text("is_active AND deal_type = 'price_drop'"),
+        ),
+        # Newest-first cursor pagination over active rows
+        Index(
+            "ix_property_deals_keyset",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     property_id = Column(Integer, ForeignKey("properties.id"), nullable=False, index=True)
     deal_type = Column(String(50), nullable=False)  # price_drop, new_listing, expired
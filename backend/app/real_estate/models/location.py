@@ -0,0 +1,30 @@
+"""Location hierarchy model for real estate listings."""
+
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+from app.core.models.base import BaseModel
+
+LEVELS = ("state", "city", "area")
+
+
+class Location(BaseModel):
+    """State, city or area parsed from listing locations.
+
+    Every node carries the ids of its state and city ancestors (its own id at
+    its own level), so a whole subtree is one indexed equality filter and
+    rollups can group by any level without walking parents.
+    """
+
+    __tablename__ = "locations"
+
+    name = Column(String(100), nullable=False)
+    slug = Column(String(100), nullable=False, index=True)
+    level = Column(String(10), nullable=False)  # state, city, area
+    key = Column(String(300), nullable=False, unique=True, index=True)  # "lagos/lekki/chevron"
+    parent_id = Column(Integer, ForeignKey("locations.id"), nullable=True, index=True)
+    state_id = Column(Integer, nullable=True, index=True)
+    city_id = Column(Integer, nullable=True, index=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<Location {self.key}>"
@@ -1,6 +1,6 @@
 """Property model for real estate listings."""
 
-from sqlalchemy import Column, Integer, Numeric, String, Text
+from sqlalchemy import Column, ForeignKey, Index, Integer, Numeric, String, Text, text
 from sqlalchemy.orm import relationship
 
 from app.core.models.base import BaseModel
@@ -10,10 +10,21 @@ class Property(BaseModel):
     """Real estate property model."""
 
     __tablename__ = "properties"
+    __table_args__ = (
+        # Newest-first cursor pagination over active rows
+        Index(
+            "ix_properties_keyset",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     name = Column(String(200), nullable=False)
     property_type = Column(String(50), nullable=False, index=True)  # house, apartment, land
     location = Column(String(200), nullable=False, index=True)
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=True, index=True)
     bedrooms = Column(Integer, nullable=True)
     bathrooms = Column(Integer, nullable=True)
     size_sqm = Column(Numeric(10, 2), nullable=True)
@@ -1,5 +1,7 @@
 """Property alert API endpoints."""
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,7 +14,7 @@ from app.real_estate.schemas.alert import (
     PropertyAlertRuleCreate,
     PropertyAlertRuleResponse,
 )
-from app.utils.pagination import PaginationParams, paginate_query
+from app.utils.pagination import CountMode, PaginationParams, paginate_query
 
 router = APIRouter(prefix="/api/real-estate/alerts", tags=["Real Estate Alerts"])
 
@@ -48,6 +50,10 @@ async def create_alert_rule(
 async def list_alerts(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(
+        None, description="How to compute the total: exact, cached, estimate or none"
+    ),
     db: AsyncSession = Depends(get_database_session),
     current_user: User = Depends(get_current_user),
 ):
@@ -56,7 +62,9 @@ async def list_alerts(
     query = select(PropertyAlertRule).where(PropertyAlertRule.is_active)
     query = query.order_by(PropertyAlertRule.created_at.desc())
 
-    pagination = PaginationParams(page=page, size=size)
-    result = await paginate_query(db, query, pagination, PropertyAlertRuleResponse)
+    pagination = PaginationParams(page=page, size=size, cursor=cursor, count=count)
+    result = await paginate_query(
+        db, query, pagination, PropertyAlertRuleResponse, keyset_model=PropertyAlertRule
+    )
 
     return PropertyAlertListResponse(**result.model_dump())
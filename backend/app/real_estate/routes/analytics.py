@@ -1,5 +1,7 @@
 """Property analytics dashboard API endpoints."""
 
+from typing import Literal, Optional
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
@@ -12,7 +14,7 @@ from app.core.constants import (
     CACHE_TTL_GLOBAL_DASHBOARD,
     CACHE_TTL_USER_DASHBOARD,
 )
-from app.core.database import get_db
+from app.core.database import get_replica_db
 from app.core.deps import get_current_user
 from app.core.models.user import User
 from app.real_estate.schemas.analytics import (
@@ -34,7 +36,7 @@ router = APIRouter(
 @cached(ttl=CACHE_TTL_USER_DASHBOARD, key_prefix="property_dashboard:user")
 async def get_user_dashboard(
     days: int = Query(30, ge=1, le=365, description="Days to analyze"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get user-specific analytics dashboard."""
@@ -46,7 +48,7 @@ async def get_user_dashboard(
 @cached(ttl=CACHE_TTL_GLOBAL_DASHBOARD, key_prefix="property_dashboard:global")
 async def get_global_dashboard(
     days: int = Query(30, ge=1, le=365, description="Days to analyze"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get global analytics dashboard."""
@@ -58,7 +60,7 @@ async def get_global_dashboard(
 @cached(ttl=CACHE_TTL_ANALYTICS_SAVINGS, key_prefix="property_analytics:savings")
 async def get_savings_stats(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get total savings statistics."""
@@ -70,7 +72,7 @@ async def get_savings_stats(
 @cached(ttl=CACHE_TTL_ANALYTICS_MOST_TRACKED, key_prefix="property_analytics:most_tracked")
 async def get_most_tracked(
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get most tracked properties."""
@@ -83,11 +85,14 @@ async def get_most_tracked(
 async def get_best_value_areas(
     days: int = Query(30, ge=1, le=365),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    level: Optional[Literal["state", "city", "area"]] = Query(
+        None, description="Roll deals up to this location level"
+    ),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get locations with best value."""
-    areas = PropertyAnalyticsDashboard.get_best_value_areas(db, days, limit)
+    areas = PropertyAnalyticsDashboard.get_best_value_areas(db, days, limit, level)
     return {
         "count": len(areas),
         "period_days": days,
@@ -99,9 +104,10 @@ async def get_best_value_areas(
 @cached(ttl=CACHE_TTL_ANALYTICS_PRICE_DROPS, key_prefix="property_analytics:price_drops")
 async def get_price_drops(
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    limit: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get price drop statistics."""
-    stats = PropertyAnalyticsDashboard.get_price_drop_statistics(db, days)
+    """Get price drop statistics and the biggest drops."""
+    stats = PropertyAnalyticsDashboard.get_price_drop_statistics(db, days, limit)
     return PriceDropStats(**stats)
@@ -1,11 +1,15 @@
 """Real estate export endpoints."""
 
-from fastapi import APIRouter, Depends, Response
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_database_session
+from app.core.deps import get_current_user, get_replica_session
 from app.core.models.user import User
+from app.core.price_history.archive import archived_history
 from app.real_estate.models import Property
 from app.utils.export import export_service
 
@@ -14,7 +18,7 @@ router = APIRouter(prefix="/api/real-estate/export", tags=["Real Estate Export"]
 
 @router.get("/properties/csv")
 async def export_properties_csv(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export properties to CSV."""
@@ -34,7 +38,7 @@ async def export_properties_csv(
 
 @router.get("/properties/pdf")
 async def export_properties_pdf(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export properties to PDF."""
@@ -50,3 +54,28 @@ async def export_properties_pdf(
         media_type="application/pdf",
         headers={"Content-Disposition": "attachment; filename=properties.pdf"},
     )
+
+
+@router.get("/properties/{property_id}/history/csv")
+async def export_property_history_csv(
+    property_id: int,
+    days: Optional[int] = Query(None, ge=1, description="Days of history (all if omitted)"),
+    db: AsyncSession = Depends(get_replica_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Export a property's price history, archived history included, to CSV."""
+    if not await db.get(Property, property_id):
+        raise HTTPException(status_code=404, detail="Property not found")
+
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    rows = await archived_history.load_async(db, "property", property_id, since)
+
+    filename = f"property_{property_id}_history.csv"
+    data = export_service.prepare_price_history_data(rows)
+    csv_output = export_service.generate_csv(data, filename)
+
+    return Response(
+        content=csv_output.getvalue(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
@@ -12,7 +12,7 @@ from app.core.constants import (
     CACHE_TTL_PRICE_TREND,
     CACHE_TTL_PRODUCT_ANALYTICS,
 )
-from app.core.database import get_db
+from app.core.database import get_replica_db
 from app.core.deps import get_current_user
 from app.core.models.user import User
 from app.real_estate.models.property import Property
@@ -31,7 +31,7 @@ router = APIRouter(prefix="/api/real-estate/analytics", tags=["Real Estate Price
 async def get_property_analytics(
     property_id: int,
     days: int = Query(30, ge=1, le=365, description="Days of history to analyze"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get comprehensive price analytics for a property."""
@@ -39,11 +39,8 @@ async def get_property_analytics(
     if not property_obj:
         raise HTTPException(status_code=404, detail="Property not found")
 
-    multi_stats = PropertyPriceAnalytics.get_multi_period_stats(db, property_id)
+    summary = PropertyPriceAnalytics.get_analytics_summary(db, property_id, days)
     history = PropertyPriceAnalytics.get_price_history_chart(db, property_id, days)
-    volatility = PropertyPriceAnalytics.get_price_volatility(db, property_id, days)
-    is_good_deal = PropertyPriceAnalytics.is_good_deal(db, property_id)
-    trend = PropertyPriceAnalytics.get_price_trend(db, property_id, 7)
 
     current_price = history[-1]["price"] if history else float(property_obj.price)
 
@@ -51,11 +48,11 @@ async def get_property_analytics(
         property_id=property_id,
         property_name=property_obj.name,
         current_price=current_price,
-        statistics=MultiPeriodStats(**multi_stats),
+        statistics=MultiPeriodStats(**summary["statistics"]),
         price_history=[PricePoint(**p) for p in history],
-        volatility=volatility,
-        is_good_deal=is_good_deal,
-        trend=trend,
+        volatility=summary["volatility"],
+        is_good_deal=summary["is_good_deal"],
+        trend=summary["trend"],
     )
 
 
@@ -64,7 +61,7 @@ async def get_property_analytics(
 async def get_price_stats(
     property_id: int,
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get price statistics for a specific time period."""
@@ -84,7 +81,7 @@ async def get_price_stats(
 async def get_price_trend(
     property_id: int,
     days: int = Query(7, ge=1, le=90),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get price trend for a property."""
@@ -102,7 +99,7 @@ async def get_price_trend(
 async def get_price_history(
     property_id: int,
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get price history for charting."""
@@ -119,7 +116,7 @@ async def get_price_history(
 async def check_if_good_deal(
     property_id: int,
     threshold: float = Query(10.0, ge=0, le=100, description="Discount threshold percentage"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Check if current price is a good deal."""
@@ -148,7 +145,7 @@ async def check_if_good_deal(
 async def get_location_trends(
     location: str,
     days: int = Query(30, ge=1, le=365),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_replica_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get price trends for a location."""
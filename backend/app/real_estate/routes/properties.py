@@ -17,8 +17,9 @@ from app.real_estate.schemas.property import (
     PropertyResponse,
     PropertyUpdate,
 )
+from app.real_estate.services.locations import find_locations_async, within_locations
 from app.real_estate.services.property_service import PropertyService
-from app.utils.pagination import PaginationParams, paginate_query
+from app.utils.pagination import CountMode, PaginationParams, paginate_query
 
 router = APIRouter(prefix="/api/real-estate/properties", tags=["Real Estate Properties"])
 
@@ -57,6 +58,10 @@ async def create_property(
 async def list_properties(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(
+        None, description="How to compute the total: exact, cached, estimate or none"
+    ),
     property_type: Optional[str] = Query(None, description="Filter by property type"),
     location: Optional[str] = Query(None, description="Filter by location"),
     listing_type: Optional[str] = Query(None, description="Filter by listing type"),
@@ -73,7 +78,7 @@ async def list_properties(
     if property_type:
         query = query.where(Property.property_type.ilike(f"%{property_type}%"))
     if location:
-        query = query.where(Property.location.ilike(f"%{location}%"))
+        query = query.where(within_locations(await find_locations_async(db, location)))
     if listing_type:
         query = query.where(Property.listing_type == listing_type)
     if min_price:
@@ -85,8 +90,8 @@ async def list_properties(
 
     query = query.order_by(Property.created_at.desc())
 
-    pagination = PaginationParams(page=page, size=size)
-    result = await paginate_query(db, query, pagination, PropertyResponse)
+    pagination = PaginationParams(page=page, size=size, cursor=cursor, count=count)
+    result = await paginate_query(db, query, pagination, PropertyResponse, keyset_model=Property)
 
     return PropertyListResponse(**result.model_dump())
 
@@ -20,6 +20,9 @@ class LocationStats(BaseModel):
     """Location statistics."""
 
     location: str
+    location_id: Optional[int] = None
+    location_key: Optional[str] = None
+    level: Optional[str] = None
     deal_count: int
     total_savings: float
     average_discount: float
@@ -34,6 +37,7 @@ class PriceDropStats(BaseModel):
     average_drop_amount: float
     average_drop_percentage: float
     biggest_drop: Optional[dict]
+    top_drops: List[dict] = []
     period_days: int
 
 
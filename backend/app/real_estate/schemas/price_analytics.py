@@ -33,10 +33,11 @@ class PeriodStats(BaseModel):
 class MultiPeriodStats(BaseModel):
     """Statistics for multiple periods."""
 
-    last_7_days: Optional[PeriodStats]
-    last_30_days: Optional[PeriodStats]
-    last_60_days: Optional[PeriodStats]
-    last_90_days: Optional[PeriodStats]
+    last_7_days: Optional[PeriodStats] = None
+    last_30_days: Optional[PeriodStats] = None
+    last_60_days: Optional[PeriodStats] = None
+    last_90_days: Optional[PeriodStats] = None
+    last_365_days: Optional[PeriodStats] = None
     trend_7_days: str
     trend_30_days: str
 
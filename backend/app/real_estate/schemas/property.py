@@ -52,6 +52,7 @@ class PropertyResponse(BaseModel):
     name: str
     property_type: str
     location: str
+    location_id: Optional[int] = None
     bedrooms: Optional[int]
     bathrooms: Optional[int]
     size_sqm: Optional[Decimal]
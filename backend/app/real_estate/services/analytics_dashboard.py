@@ -1,15 +1,18 @@
 """Property analytics dashboard service."""
 
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
+from app.core.price_history.drops import price_drop_summary
 from app.real_estate.models.deal import PropertyDeal
+from app.real_estate.models.location import Location
 from app.real_estate.models.price_history import PropertyPriceHistory
 from app.real_estate.models.property import Property
 from app.real_estate.models.watchlist import PropertyWatchlist
+from app.real_estate.services.locations import LEVEL_COLUMNS
 
 
 class PropertyAnalyticsDashboard:
@@ -171,22 +174,36 @@ class PropertyAnalyticsDashboard:
         ]
 
     @staticmethod
-    def get_best_value_areas(db: Session, days: int = 30, limit: int = 10) -> List[Dict]:
-        """Get locations with best price drops."""
+    def get_best_value_areas(
+        db: Session, days: int = 30, limit: int = 10, level: Optional[str] = None
+    ) -> List[Dict]:
+        """Get locations with best price drops.
+
+        Deals are rolled up to the state, city or area of each property, or to
+        the most specific location known for it when no level is given.
+        """
         cutoff_date = datetime.utcnow() - timedelta(days=days)
+        group_id = LEVEL_COLUMNS[level] if level else Location.id
+        area = aliased(Location)
 
         results = (
             db.query(
-                Property.location,
+                area.id,
+                area.name,
+                area.key,
+                area.level,
                 func.count(PropertyDeal.id).label("deal_count"),
                 func.sum(PropertyDeal.original_price - PropertyDeal.deal_price).label(
                     "total_savings"
                 ),
                 func.avg(PropertyDeal.discount_percent).label("avg_discount"),
             )
-            .join(PropertyDeal, Property.id == PropertyDeal.property_id)
+            .select_from(PropertyDeal)
+            .join(Property, Property.id == PropertyDeal.property_id)
+            .join(Location, Location.id == Property.location_id)
+            .join(area, area.id == group_id)
             .filter(PropertyDeal.created_at >= cutoff_date, PropertyDeal.is_active == True)
-            .group_by(Property.location)
+            .group_by(area.id, area.name, area.key, area.level)
             .order_by(func.count(PropertyDeal.id).desc())
             .limit(limit)
             .all()
@@ -194,71 +211,57 @@ class PropertyAnalyticsDashboard:
 
         return [
             {
-                "location": location,
-                "deal_count": deal_count,
-                "total_savings": float(total_savings or 0),
-                "average_discount": float(avg_discount or 0),
+                "location": row.name,
+                "location_id": row.id,
+                "location_key": row.key,
+                "level": row.level,
+                "deal_count": row.deal_count,
+                "total_savings": float(row.total_savings or 0),
+                "average_discount": float(row.avg_discount or 0),
             }
-            for location, deal_count, total_savings, avg_discount in results
+            for row in results
         ]
 
     @staticmethod
-    def get_price_drop_statistics(db: Session, days: int = 30) -> Dict:
-        """Get price drop statistics."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        total_properties = (
-            db.query(func.count(Property.id)).filter(Property.is_active == True).scalar()
-        )
-
-        properties_with_drops = (
-            db.query(func.count(func.distinct(PropertyDeal.property_id)))
-            .filter(PropertyDeal.created_at >= cutoff_date, PropertyDeal.is_active == True)
-            .scalar()
+    def get_price_drop_statistics(db: Session, days: int = 30, limit: int = 5) -> Dict:
+        """Get price drop statistics and the biggest drops."""
+        active_properties = db.query(Property.id).filter(Property.is_active == True)
+        total_properties = active_properties.count()
+
+        # First vs last price of every active property in one window-function query
+        summary = price_drop_summary(
+            db, "property", days, item_ids=active_properties.statement, limit=limit
         )
+        properties_with_drops = summary["items_with_drops"]
 
         drop_rate = (
             (properties_with_drops / total_properties * 100) if total_properties > 0 else 0
         )
 
-        avg_drop = (
-            db.query(func.avg(PropertyDeal.original_price - PropertyDeal.deal_price))
-            .filter(PropertyDeal.created_at >= cutoff_date, PropertyDeal.is_active == True)
-            .scalar()
-        )
-
-        avg_drop_percent = (
-            db.query(func.avg(PropertyDeal.discount_percent))
-            .filter(PropertyDeal.created_at >= cutoff_date, PropertyDeal.is_active == True)
-            .scalar()
+        top_ids = [drop["item_id"] for drop in summary["top_drops"]]
+        names = (
+            dict(db.query(Property.id, Property.name).filter(Property.id.in_(top_ids)).all())
+            if top_ids
+            else {}
         )
 
-        biggest_drop = (
-            db.query(
-                Property.name,
-                (PropertyDeal.original_price - PropertyDeal.deal_price).label("drop_amount"),
-                PropertyDeal.discount_percent,
-            )
-            .join(PropertyDeal, Property.id == PropertyDeal.property_id)
-            .filter(PropertyDeal.created_at >= cutoff_date, PropertyDeal.is_active == True)
-            .order_by((PropertyDeal.original_price - PropertyDeal.deal_price).desc())
-            .first()
-        )
+        top_drops = [
+            {
+                "property_id": drop["item_id"],
+                "property_name": names.get(drop["item_id"], ""),
+                "drop_amount": drop["amount"],
+                "drop_percentage": drop["percent"],
+            }
+            for drop in summary["top_drops"]
+        ]
 
         return {
             "total_properties": total_properties or 0,
-            "properties_with_drops": properties_with_drops or 0,
+            "properties_with_drops": properties_with_drops,
             "drop_rate_percentage": round(drop_rate, 2),
-            "average_drop_amount": float(avg_drop or 0),
-            "average_drop_percentage": float(avg_drop_percent or 0),
-            "biggest_drop": (
-                {
-                    "property_name": biggest_drop[0],
-                    "drop_amount": float(biggest_drop[1]),
-                    "drop_percentage": float(biggest_drop[2]),
-                }
-                if biggest_drop
-                else None
-            ),
+            "average_drop_amount": summary["average_drop_amount"],
+            "average_drop_percentage": summary["average_drop_percent"],
+            "biggest_drop": top_drops[0] if top_drops else None,
+            "top_drops": top_drops,
             "period_days": days,
         }
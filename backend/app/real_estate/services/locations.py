@@ -0,0 +1,251 @@
+"""Location parsing and the state → city → area hierarchy.
+
+Listing locations arrive as free text such as "Chevron, Lekki, Lagos State".
+They are parsed into a path of hierarchy nodes, stored once in ``locations``
+and referenced from properties by id. Location filters and analytics then
+work on indexed ids (every node knows its state and city) instead of ILIKE
+scans over raw strings.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import false, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.real_estate.models.location import Location
+from app.real_estate.models.property import Property
+
+STATES = [
+    "Abia", "Adamawa", "Akwa Ibom", "Anambra", "Bauchi", "Bayelsa", "Benue", "Borno",
+    "Cross River", "Delta", "Ebonyi", "Edo", "Ekiti", "Enugu", "FCT", "Gombe", "Imo",
+    "Jigawa", "Kaduna", "Kano", "Katsina", "Kebbi", "Kogi", "Kwara", "Lagos", "Nasarawa",
+    "Niger", "Ogun", "Ondo", "Osun", "Oyo", "Plateau", "Rivers", "Sokoto", "Taraba",
+    "Yobe", "Zamfara",
+]
+
+# Well-known cities and districts, with the state they belong to
+CITIES = {
+    "Lagos": [
+        "Lekki", "Ajah", "Ikoyi", "Victoria Island", "Ikeja", "Yaba", "Surulere", "Gbagada",
+        "Magodo", "Maryland", "Ogudu", "Ojodu", "Isolo", "Ikorodu", "Festac", "Apapa",
+        "Ikotun", "Egbeda", "Alimosho", "Ojo", "Badagry", "Epe", "Ibeju Lekki", "Sangotedo",
+        "Oshodi", "Agege", "Mushin", "Ilupeju", "Ketu", "Ogba", "Lagos Island",
+    ],
+    "FCT": [
+        "Abuja", "Asokoro", "Maitama", "Wuse", "Garki", "Gwarinpa", "Jabi", "Utako",
+        "Kubwa", "Lugbe", "Lokogoma", "Katampe", "Life Camp", "Guzape", "Kuje", "Bwari",
+    ],
+    "Rivers": ["Port Harcourt", "Obio Akpor", "Eleme", "Bonny"],
+    "Oyo": ["Ibadan", "Ogbomoso", "Oyo"],
+    "Ogun": ["Abeokuta", "Sango Ota", "Ota", "Ijebu Ode", "Mowe", "Ibafo", "Sagamu"],
+    "Enugu": ["Enugu", "Nsukka"],
+    "Edo": ["Benin City", "Benin"],
+    "Kano": ["Kano"],
+    "Kaduna": ["Kaduna", "Zaria"],
+    "Delta": ["Asaba", "Warri", "Sapele"],
+    "Anambra": ["Awka", "Onitsha", "Nnewi"],
+    "Akwa Ibom": ["Uyo", "Eket"],
+    "Cross River": ["Calabar"],
+    "Imo": ["Owerri"],
+    "Plateau": ["Jos"],
+    "Kwara": ["Ilorin"],
+}
+
+_COUNTRY = {"nigeria", "ng"}
+_STATE_SUFFIX = re.compile(r"\s+state$")
+_STATE_ALIASES = {"abuja fct": "fct", "federal capital territory": "fct"}
+
+# Column holding each node's ancestor id at a level (a node's own id at its level)
+LEVEL_COLUMNS = {"state": Location.state_id, "city": Location.city_id, "area": Location.id}
+
+
+def slugify(text: str) -> str:
+    """Lowercase words joined by hyphens."""
+    return "-".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+def _clean(part: str) -> str:
+    """Part with single spaces."""
+    return " ".join(part.split())
+
+
+_STATE_NAMES: Dict[str, str] = {slugify(state): state for state in STATES}
+_CITY_STATES: Dict[str, Tuple[str, str]] = {
+    slugify(city): (city, state) for state, cities in CITIES.items() for city in cities
+}
+
+
+def _state_slug(part: str) -> Optional[str]:
+    """Slug of the state a location part names, if it names one."""
+    text = _STATE_SUFFIX.sub("", part.lower())
+    slug = slugify(_STATE_ALIASES.get(text, text))
+    return slug if slug in _STATE_NAMES else None
+
+
+def _known_city(part: str) -> Optional[Tuple[str, str]]:
+    """Canonical (city, state) for a part that is, or starts with, a known city."""
+    slug = slugify(part)
+    words = slug.split("-")
+    for length in range(len(words), 0, -1):
+        match = _CITY_STATES.get("-".join(words[:length]))
+        if match:
+            return match
+    return None
+
+
+def parse_location(text: Optional[str]) -> List[Tuple[str, str, str]]:
+    """Hierarchy path of a location as (level, name, key) tuples, root first.
+
+    Parts are read from the end: an optional country, the state, the city and
+    then the area. Anything more specific than the area (street addresses) is
+    ignored. Locations without a recognizable state start at the city, under a
+    "_" key prefix so they never collide with state keys.
+    """
+    parts = [_clean(part) for part in re.split(r"[,|/]", text or "")]
+    parts = [part for part in parts if part and part.lower() not in _COUNTRY]
+    if not parts:
+        return []
+
+    state_slug = _state_slug(parts[-1])
+    if state_slug:
+        parts.pop()
+    else:
+        city = _known_city(parts[-1])
+        state_slug = slugify(city[1]) if city else None
+
+    # "Lagos, Lagos" and "Abuja, FCT" name the state twice
+    while parts and state_slug and _state_slug(parts[-1]) == state_slug:
+        parts.pop()
+
+    path = []
+    key = state_slug or "_"
+    if state_slug:
+        path.append(("state", _STATE_NAMES[state_slug], key))
+    if not parts:
+        return path
+
+    city_name = parts.pop()
+    area_name = parts.pop() if parts else None
+    known = _known_city(city_name)
+    if known and slugify(known[0]) != slugify(city_name) and area_name is None:
+        # "Lekki Phase 1" is an area of Lekki
+        city_name, area_name = known[0], city_name
+    elif known:
+        city_name = known[0]
+
+    key = f"{key}/{slugify(city_name)}"
+    path.append(("city", city_name, key))
+    if area_name:
+        path.append(("area", area_name, f"{key}/{slugify(area_name)}"))
+    return path
+
+
+def _new_node(level: str, name: str, key: str, parent: Optional[Location]) -> Location:
+    """Unsaved hierarchy node under a parent."""
+    return Location(
+        name=name[:100],
+        slug=slugify(name)[:100],
+        level=level,
+        key=key[:300],
+        parent_id=parent.id if parent else None,
+    )
+
+
+def _link_ancestors(node: Location, parent: Optional[Location]):
+    """Copy ancestor ids onto a newly flushed node."""
+    node.state_id = node.id if node.level == "state" else (parent.state_id if parent else None)
+    node.city_id = node.id if node.level == "city" else (parent.city_id if parent else None)
+
+
+def _by_key(key: str):
+    """Select of the hierarchy node with a key."""
+    return select(Location).where(Location.key == key[:300])
+
+
+async def _create_node(
+    db: AsyncSession, level: str, name: str, key: str, parent: Optional[Location]
+) -> Location:
+    """Insert a hierarchy node, or load it if a concurrent request just did."""
+    node = _new_node(level, name, key, parent)
+    try:
+        async with db.begin_nested():
+            db.add(node)
+    except IntegrityError:
+        return (await db.execute(_by_key(key))).scalar_one()
+    _link_ancestors(node, parent)
+    return node
+
+
+def _create_node_sync(
+    db: Session, level: str, name: str, key: str, parent: Optional[Location]
+) -> Location:
+    """Synchronous variant of `_create_node`."""
+    node = _new_node(level, name, key, parent)
+    try:
+        with db.begin_nested():
+            db.add(node)
+    except IntegrityError:
+        return db.execute(_by_key(key)).scalar_one()
+    _link_ancestors(node, parent)
+    return node
+
+
+async def get_or_create_location(db: AsyncSession, text: Optional[str]) -> Optional[Location]:
+    """Most specific hierarchy node for a location, creating missing nodes.
+
+    Each node is inserted in a savepoint, so a node another request
+    created first is loaded instead of failing the caller's transaction.
+    """
+    node = None
+    for level, name, key in parse_location(text):
+        result = await db.execute(_by_key(key))
+        parent, node = node, result.scalar_one_or_none()
+        if node is None:
+            node = await _create_node(db, level, name, key, parent)
+    return node
+
+
+def get_or_create_location_sync(db: Session, text: Optional[str]) -> Optional[Location]:
+    """Synchronous variant of `get_or_create_location`."""
+    node = None
+    for level, name, key in parse_location(text):
+        parent, node = node, db.execute(_by_key(key)).scalar_one_or_none()
+        if node is None:
+            node = _create_node_sync(db, level, name, key, parent)
+    return node
+
+
+def location_match(text: str):
+    """Filter for hierarchy nodes a location query refers to.
+
+    "Lagos" matches the state, "Lekki, Lagos" the city, and a bare name
+    such as "Lekki" matches every node with that name.
+    """
+    path = parse_location(text)
+    conditions = [Location.key == path[-1][2]] if path else []
+    parts = [part for part in re.split(r"[,|/]", text) if part.strip()]
+    if len(parts) == 1:
+        conditions.append(Location.slug == slugify(parts[0]))
+    return or_(*conditions) if conditions else false()
+
+
+def find_locations(db: Session, text: str) -> List[Location]:
+    """Hierarchy nodes a location query refers to."""
+    return db.query(Location).filter(location_match(text)).all()
+
+
+async def find_locations_async(db: AsyncSession, text: str) -> List[Location]:
+    """Hierarchy nodes a location query refers to."""
+    result = await db.execute(select(Location).where(location_match(text)))
+    return list(result.scalars().all())
+
+
+def within_locations(nodes: Iterable[Location]):
+    """Filter for properties located in any of the nodes' subtrees."""
+    conditions = [LEVEL_COLUMNS[node.level] == node.id for node in nodes]
+    if not conditions:
+        return false()
+    return Property.location_id.in_(select(Location.id).where(or_(*conditions)))
@@ -4,39 +4,30 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.real_estate.models.price_history import PropertyPriceHistory
+from app.core.price_history.archive import archived_history
+from app.core.price_history.intervals import interval_points
+from app.core.price_history.rollups import STANDARD_WINDOWS, summarize_items
+from app.core.price_history.windows import PriceWindows
 from app.real_estate.models.property import Property
+from app.real_estate.services.locations import find_locations, within_locations
 
 
 class PropertyPriceAnalytics:
     """Analytics service for property price trends and statistics."""
 
     @staticmethod
-    def get_price_stats(db: Session, property_id: int, days: int = 30) -> Optional[Dict]:
-        """Get price statistics for a property over specified period."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        prices = (
-            db.query(PropertyPriceHistory)
-            .filter(
-                PropertyPriceHistory.property_id == property_id,
-                PropertyPriceHistory.created_at >= cutoff_date,
-            )
-            .order_by(PropertyPriceHistory.created_at.desc())
-            .all()
-        )
-
-        if not prices:
+    def _stats_from_summary(summary: Optional[Dict], property_id: int, days: int) -> Optional[Dict]:
+        """Build price statistics from a window summary."""
+        if not summary:
             return None
 
-        price_values = [float(p.price) for p in prices]
-        current_price = price_values[0]
-        lowest_price = min(price_values)
-        highest_price = max(price_values)
-        average_price = sum(price_values) / len(price_values)
+        current_price = summary["close"]
+        lowest_price = summary["low"]
+        highest_price = summary["high"]
+        average_price = summary["mean"]
 
         price_drop = highest_price - current_price
         price_drop_percent = (price_drop / highest_price * 100) if highest_price > 0 else 0
@@ -55,32 +46,16 @@ class PropertyPriceAnalytics:
             "price_drop_percentage": round(price_drop_percent, 2),
             "savings_from_average": round(savings_from_avg, 2),
             "savings_percentage": round(savings_percent, 2),
-            "data_points": len(prices),
+            "data_points": summary["count"],
         }
 
     @staticmethod
-    def get_price_trend(db: Session, property_id: int, days: int = 7) -> str:
-        """Determine price trend (rising, falling, stable)."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+    def _trend(windows: PriceWindows, days: int) -> str:
+        """Classify the price trend over a window."""
+        change_percent = windows.change_percent(days)
 
-        prices = (
-            db.query(PropertyPriceHistory.price)
-            .filter(
-                PropertyPriceHistory.property_id == property_id,
-                PropertyPriceHistory.created_at >= cutoff_date,
-            )
-            .order_by(PropertyPriceHistory.created_at.asc())
-            .all()
-        )
-
-        if len(prices) < 2:
+        if change_percent is None:
             return "stable"
-
-        first_price = float(prices[0][0])
-        last_price = float(prices[-1][0])
-
-        change_percent = ((last_price - first_price) / first_price * 100) if first_price > 0 else 0
-
         if change_percent > 5:
             return "rising"
         elif change_percent < -5:
@@ -89,21 +64,88 @@ class PropertyPriceAnalytics:
             return "stable"
 
     @staticmethod
-    def get_multi_period_stats(db: Session, property_id: int) -> Dict:
-        """Get statistics for multiple time periods."""
-        periods = [7, 30, 60, 90]
+    def _volatility(windows: PriceWindows, days: int) -> Dict:
+        """Coefficient of variation over a window."""
+        summary = windows.summary(days)
+        stddev = windows.stddev(days, sample=True)
+
+        if not summary or not summary["mean"] or not stddev:
+            return {"volatility": 0, "interpretation": "insufficient_data"}
+
+        mean = summary["mean"]
+        cv = (stddev / mean * 100) if mean > 0 else 0
+
+        if cv < 10:
+            interpretation = "low"
+        elif cv < 20:
+            interpretation = "moderate"
+        else:
+            interpretation = "high"
+
+        return {
+            "volatility": round(cv, 2),
+            "interpretation": interpretation,
+            "mean_price": round(mean, 2),
+            "std_deviation": round(stddev, 2),
+        }
+
+    @staticmethod
+    def _is_good_deal(windows: PriceWindows, property_id: int, threshold: float) -> bool:
+        """Check the current price against the 30-day average."""
+        stats = PropertyPriceAnalytics._stats_from_summary(windows.summary(30), property_id, 30)
+
+        if not stats:
+            return False
+
+        return stats["savings_percentage"] >= threshold
+
+    @staticmethod
+    def _multi_period(windows: PriceWindows, property_id: int) -> Dict:
+        """Statistics for every standard window that has data, plus trends."""
         stats = {}
 
-        for days in periods:
-            period_stats = PropertyPriceAnalytics.get_price_stats(db, property_id, days)
+        for days in STANDARD_WINDOWS:
+            period_stats = PropertyPriceAnalytics._stats_from_summary(
+                windows.summary(days), property_id, days
+            )
             if period_stats:
                 stats[f"last_{days}_days"] = period_stats
 
-        stats["trend_7_days"] = PropertyPriceAnalytics.get_price_trend(db, property_id, 7)
-        stats["trend_30_days"] = PropertyPriceAnalytics.get_price_trend(db, property_id, 30)
+        stats["trend_7_days"] = PropertyPriceAnalytics._trend(windows, 7)
+        stats["trend_30_days"] = PropertyPriceAnalytics._trend(windows, 30)
 
         return stats
 
+    @staticmethod
+    def get_analytics_summary(db: Session, property_id: int, days: int = 30) -> Dict:
+        """Get all window statistics, trend, volatility and deal status in one read."""
+        windows = PriceWindows.load(db, "property", property_id, [*STANDARD_WINDOWS, days])
+
+        return {
+            "statistics": PropertyPriceAnalytics._multi_period(windows, property_id),
+            "volatility": PropertyPriceAnalytics._volatility(windows, days),
+            "is_good_deal": PropertyPriceAnalytics._is_good_deal(windows, property_id, 10.0),
+            "trend": PropertyPriceAnalytics._trend(windows, 7),
+        }
+
+    @staticmethod
+    def get_price_stats(db: Session, property_id: int, days: int = 30) -> Optional[Dict]:
+        """Get price statistics for a property over specified period."""
+        windows = PriceWindows.load(db, "property", property_id, [days])
+        return PropertyPriceAnalytics._stats_from_summary(windows.summary(days), property_id, days)
+
+    @staticmethod
+    def get_price_trend(db: Session, property_id: int, days: int = 7) -> str:
+        """Determine price trend (rising, falling, stable)."""
+        windows = PriceWindows.load(db, "property", property_id, [days])
+        return PropertyPriceAnalytics._trend(windows, days)
+
+    @staticmethod
+    def get_multi_period_stats(db: Session, property_id: int) -> Dict:
+        """Get statistics for multiple time periods."""
+        windows = PriceWindows.load(db, "property", property_id)
+        return PropertyPriceAnalytics._multi_period(windows, property_id)
+
     @staticmethod
     def get_price_history_chart(
         db: Session, property_id: int, days: int = 30
@@ -111,103 +153,48 @@ class PropertyPriceAnalytics:
         """Get price history data formatted for charting."""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        prices = (
-            db.query(PropertyPriceHistory)
-            .filter(
-                PropertyPriceHistory.property_id == property_id,
-                PropertyPriceHistory.created_at >= cutoff_date,
-            )
-            .order_by(PropertyPriceHistory.created_at.asc())
-            .all()
-        )
+        # Older history is merged in from the cold archive
+        prices = archived_history.load(db, "property", property_id, cutoff_date)
 
         return [
             {
-                "date": p.created_at.isoformat(),
+                "date": seen_at.isoformat(),
                 "price": float(p.price),
                 "price_per_sqm": float(p.price_per_sqm) if p.price_per_sqm else None,
             }
-            for p in prices
+            for seen_at, p in interval_points(prices)
         ]
 
     @staticmethod
     def get_price_volatility(db: Session, property_id: int, days: int = 30) -> Dict:
         """Calculate price volatility (coefficient of variation)."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        result = (
-            db.query(
-                func.avg(PropertyPriceHistory.price).label("mean"),
-                func.stddev(PropertyPriceHistory.price).label("stddev"),
-            )
-            .filter(
-                PropertyPriceHistory.property_id == property_id,
-                PropertyPriceHistory.created_at >= cutoff_date,
-            )
-            .first()
-        )
-
-        if not result or not result.mean or not result.stddev:
-            return {"volatility": 0, "interpretation": "insufficient_data"}
-
-        mean = float(result.mean)
-        stddev = float(result.stddev)
-        cv = (stddev / mean * 100) if mean > 0 else 0
-
-        if cv < 10:
-            interpretation = "low"
-        elif cv < 20:
-            interpretation = "moderate"
-        else:
-            interpretation = "high"
-
-        return {
-            "volatility": round(cv, 2),
-            "interpretation": interpretation,
-            "mean_price": round(mean, 2),
-            "std_deviation": round(stddev, 2),
-        }
+        windows = PriceWindows.load(db, "property", property_id, [days])
+        return PropertyPriceAnalytics._volatility(windows, days)
 
     @staticmethod
     def is_good_deal(db: Session, property_id: int, threshold: float = 10.0) -> bool:
         """Check if current price is a good deal compared to average."""
-        stats = PropertyPriceAnalytics.get_price_stats(db, property_id, 30)
-
-        if not stats:
-            return False
-
-        return stats["savings_percentage"] >= threshold
+        windows = PriceWindows.load(db, "property", property_id, [30])
+        return PropertyPriceAnalytics._is_good_deal(windows, property_id, threshold)
 
     @staticmethod
     def get_location_price_trends(db: Session, location: str, days: int = 30) -> Dict:
-        """Get average price trends for a location."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        properties = db.query(Property).filter(Property.location.ilike(f"%{location}%")).all()
+        """Get average price trends for a location and everything within it."""
+        nodes = find_locations(db, location)
+        in_location = within_locations(nodes)
+        properties_count = db.query(func.count(Property.id)).filter(in_location).scalar() or 0
 
-        if not properties:
+        if not properties_count:
             return {"location": location, "properties_count": 0}
 
-        property_ids = [p.id for p in properties]
-
-        result = (
-            db.query(
-                func.avg(PropertyPriceHistory.price).label("avg_price"),
-                func.min(PropertyPriceHistory.price).label("min_price"),
-                func.max(PropertyPriceHistory.price).label("max_price"),
-            )
-            .filter(
-                PropertyPriceHistory.property_id.in_(property_ids),
-                PropertyPriceHistory.created_at >= cutoff_date,
-            )
-            .first()
-        )
+        result = summarize_items(db, "property", select(Property.id).where(in_location), days)
 
         return {
             "location": location,
-            "properties_count": len(properties),
-            "average_price": float(result.avg_price) if result.avg_price else 0,
-            "min_price": float(result.min_price) if result.min_price else 0,
-            "max_price": float(result.max_price) if result.max_price else 0,
+            "locations": [node.key for node in nodes],
+            "properties_count": properties_count,
+            "average_price": result["avg_price"] if result else 0,
+            "min_price": result["min_price"] if result else 0,
+            "max_price": result["max_price"] if result else 0,
             "period_days": days,
         }
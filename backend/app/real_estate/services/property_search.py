@@ -7,9 +7,10 @@ from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
 
+from app.core.price_history.recorder import record_price
 from app.core.scraping.scraper_factory import scraper_factory
-from app.real_estate.models.price_history import PropertyPriceHistory
 from app.real_estate.models.property import Property
+from app.real_estate.services.locations import get_or_create_location_sync
 
 
 class PropertySearchService:
@@ -53,10 +54,14 @@ class PropertySearchService:
         if not property_data:
             return None
 
+        location = property_data.get("location", "")[:200]
+        location_node = get_or_create_location_sync(db, location)
+
         property_obj = Property(
             name=property_data.get("name", "")[:200],
             property_type=property_data.get("property_type", "house"),
-            location=property_data.get("location", "")[:200],
+            location=location,
+            location_id=location_node.id if location_node else None,
             bedrooms=property_data.get("bedrooms"),
             bathrooms=property_data.get("bathrooms"),
             size_sqm=property_data.get("size_sqm"),
@@ -74,15 +79,15 @@ class PropertySearchService:
         db.add(property_obj)
         db.flush()
 
-        price_history = PropertyPriceHistory(
-            property_id=property_obj.id,
-            price=property_data.get("price", 0),
+        record_price(
+            db,
+            "property",
+            property_obj.id,
+            property_data.get("price", 0),
+            property_data.get("currency", "NGN"),
             price_per_sqm=property_data.get("price_per_sqm"),
-            currency=property_data.get("currency", "NGN"),
             source="scraper",
         )
-
-        db.add(price_history)
         db.commit()
         db.refresh(property_obj)
 
@@ -10,7 +10,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.price_history.recorder import PriceHistoryRecorder
 from app.real_estate.models import Property, PropertyPriceHistory
+from app.real_estate.services.locations import get_or_create_location
 
 
 class PropertyService:
@@ -63,6 +65,10 @@ class PropertyService:
         if features:
             property_data["features"] = json.dumps(features)
 
+        location_node = await get_or_create_location(self.db, location)
+        if location_node:
+            property_data["location_id"] = location_node.id
+
         new_property = Property(**property_data)
         self.db.add(new_property)
         await self.db.commit()
@@ -79,18 +85,17 @@ class PropertyService:
         price_per_sqm: Optional[Decimal] = None,
         listing_status: Optional[str] = None,
     ) -> PropertyPriceHistory:
-        """Add price history entry."""
+        """Add price history entry, extending the current one if nothing changed."""
 
-        price_history = PropertyPriceHistory(
-            property_id=property_id,
-            price=price,
-            currency=currency,
+        price_history = await PriceHistoryRecorder(self.db).record(
+            "property",
+            property_id,
+            price,
+            currency,
             price_per_sqm=price_per_sqm,
             listing_status=listing_status,
         )
 
-        self.db.add(price_history)
-
         # Update current price in property
         query = select(Property).where(Property.id == property_id)
         result = await self.db.execute(query)
@@ -105,7 +110,7 @@ class PropertyService:
         await self.db.commit()
         await self.db.refresh(price_history)
 
-        logger.info(f"Added price history for property {property_id}: ₦{price}")
+        logger.info(f"Recorded price history for property {property_id}: ₦{price}")
         return price_history
 
     async def get_latest_price(self, property_id: int) -> Optional[PropertyPriceHistory]:
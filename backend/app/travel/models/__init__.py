@@ -1,9 +1,18 @@
 """Travel models."""
 
+from .airport import Airport, AirportAlias
 from .deal import TravelDeal
 from .flight import Flight
 from .hotel import Hotel
 from .price_history import TravelPriceHistory
 from .travel_alert import TravelAlertRule
 
-__all__ = ["Flight", "Hotel", "TravelDeal", "TravelAlertRule", "TravelPriceHistory"]
+__all__ = [
+    "Airport",
+    "AirportAlias",
+    "Flight",
+    "Hotel",
+    "TravelDeal",
+    "TravelAlertRule",
+    "TravelPriceHistory",
+]
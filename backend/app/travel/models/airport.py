@@ -0,0 +1,42 @@
+"""Airport models for normalizing flight routes."""
+
+from typing import List
+
+from sqlalchemy import ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.models.base import BaseModel
+
+
+class Airport(BaseModel):
+    """Airport identified by its IATA code."""
+
+    __tablename__ = "airports"
+
+    iata_code: Mapped[str] = mapped_column(String(3), nullable=False, unique=True, index=True)
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    city: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    country: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    # Relationships
+    aliases: Mapped[List["AirportAlias"]] = relationship(back_populates="airport")
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<Airport {self.iata_code} {self.city}>"
+
+
+class AirportAlias(BaseModel):
+    """Lowercase name or spelling that refers to an airport (e.g. "lagos" for LOS)."""
+
+    __tablename__ = "airport_aliases"
+
+    alias: Mapped[str] = mapped_column(String(100), nullable=False, unique=True, index=True)
+    airport_id: Mapped[int] = mapped_column(ForeignKey("airports.id"), nullable=False, index=True)
+
+    # Relationships
+    airport: Mapped["Airport"] = relationship(back_populates="aliases")
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<AirportAlias {self.alias}>"
@@ -4,7 +4,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import DECIMAL, DateTime, ForeignKey, String, Text
+from sqlalchemy import DECIMAL, DateTime, ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.models.base import BaseModel
@@ -14,6 +14,23 @@ class TravelDeal(BaseModel):
     """Travel deal model for tracking flight and hotel deals and discounts."""
 
     __tablename__ = "travel_deals"
+    __table_args__ = (
+        # One active price drop deal per item, the bulk upsert's conflict target
+        Index(
+            "uq_travel_deals_active_flight",
+            "flight_id",
+            unique=True,
+            postgresql_where=text("is_active AND deal_type = 'price_drop'"),
+            sqlite_where=text("is_active AND deal_type = 'price_drop'"),
+        ),
+        Index(
+            "uq_travel_deals_active_hotel",
+            "hotel_id",
+            unique=True,
+            postgresql_where=text("is_active AND deal_type = 'price_drop'"),
+            sqlite_where=text("is_active AND deal_type = 'price_drop'"),
+        ),
+    )
 
     flight_id: Mapped[Optional[int]] = mapped_column(ForeignKey("flights.id"), nullable=True, index=True)
     hotel_id: Mapped[Optional[int]] = mapped_column(ForeignKey("hotels.id"), nullable=True, index=True)
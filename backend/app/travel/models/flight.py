@@ -8,7 +8,7 @@ if TYPE_CHECKING:
     from app.travel.models.price_history import TravelPriceHistory
     from app.travel.models.watchlist import TravelWatchlist
 
-from sqlalchemy import Column, Date, Integer, Numeric, String, Text
+from sqlalchemy import Column, Date, Index, Integer, Numeric, String, Text
 from sqlalchemy.orm import relationship
 
 from app.core.models.base import BaseModel
@@ -18,9 +18,11 @@ class Flight(BaseModel):
     """Flight price tracking model."""
 
     __tablename__ = "flights"
+    __table_args__ = (Index("ix_flights_route_departure", "route_key", "departure_date"),)
 
     origin = Column(String(10), nullable=False, index=True)
     destination = Column(String(10), nullable=False, index=True)
+    route_key = Column(String(21), nullable=True)  # normalized "ORIGIN-DESTINATION"
     departure_date = Column(Date, nullable=False, index=True)
     return_date = Column(Date, nullable=True)
     airline = Column(String(100), nullable=True)
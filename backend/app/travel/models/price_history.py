@@ -1,8 +1,10 @@
 """Travel price history model for tracking price changes."""
 
+from datetime import datetime
 from decimal import Decimal
+from typing import Optional
 
-from sqlalchemy import DECIMAL, ForeignKey, String
+from sqlalchemy import DECIMAL, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.models.base import BaseModel
@@ -19,6 +21,10 @@ class TravelPriceHistory(BaseModel):
     currency: Mapped[str] = mapped_column(String(3), default="NGN")
     source: Mapped[str] = mapped_column(String(100), default="scraper")
 
+    # Change-only recording: a row covers created_at..last_seen_at at one price
+    last_seen_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    observations: Mapped[int] = mapped_column(Integer, default=1)
+
     # Relationships
     flight = relationship("Flight", back_populates="price_history")
     hotel = relationship("Hotel", back_populates="price_history")
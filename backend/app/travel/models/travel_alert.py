@@ -1,6 +1,6 @@
 """Travel alert models."""
 
-from sqlalchemy import Column, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, Numeric, String, text
 
 from app.core.models.base import BaseModel
 
@@ -9,6 +9,16 @@ class TravelAlertRule(BaseModel):
     """Travel-specific alert rules."""
 
     __tablename__ = "travel_alert_rules"
+    __table_args__ = (
+        # Newest-first cursor pagination over active rows
+        Index(
+            "ix_travel_alert_rules_keyset",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     flight_id = Column(Integer, ForeignKey("flights.id"), nullable=True)
     hotel_id = Column(Integer, ForeignKey("hotels.id"), nullable=True)
@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user, get_database_session
+from app.core.deps import get_current_user, get_replica_session
 from app.core.models.user import User
 from app.travel.services.analytics_dashboard import TravelAnalyticsDashboard
 
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/api/travel/analytics", tags=["Travel Analytics Dashb
 async def get_user_dashboard(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get user-specific travel dashboard metrics."""
     dashboard = TravelAnalyticsDashboard.get_user_dashboard(db, current_user.id, days)
@@ -24,7 +24,7 @@ async def get_user_dashboard(
 @router.get("/dashboard/global")
 async def get_global_dashboard(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get platform-wide travel dashboard metrics."""
     dashboard = TravelAnalyticsDashboard.get_global_dashboard(db, days)
@@ -35,7 +35,7 @@ async def get_global_dashboard(
 async def get_savings_dashboard(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get total savings statistics for user."""
     savings = TravelAnalyticsDashboard.get_total_savings(db, current_user.id, days)
@@ -45,7 +45,7 @@ async def get_savings_dashboard(
 @router.get("/dashboard/destinations")
 async def get_most_searched_destinations(
     limit: int = Query(10, ge=1, le=50, description="Maximum number of destinations"),
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get most searched travel destinations."""
     destinations = TravelAnalyticsDashboard.get_most_searched_destinations(db, limit)
@@ -59,7 +59,7 @@ async def get_most_searched_destinations(
 async def get_best_travel_deals(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of deals"),
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get best travel deals by discount percentage."""
     deals = TravelAnalyticsDashboard.get_best_travel_deals(db, days, limit)
@@ -73,8 +73,9 @@ async def get_best_travel_deals(
 @router.get("/dashboard/price-drops")
 async def get_price_drop_statistics(
     days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
-    db: Session = Depends(get_database_session)
+    limit: int = Query(5, ge=1, le=50, description="Number of biggest drops to return"),
+    db: Session = Depends(get_replica_session)
 ):
-    """Get travel price drop statistics."""
-    stats = TravelAnalyticsDashboard.get_price_drop_statistics(db, days)
+    """Get travel price drop statistics and the biggest drops."""
+    stats = TravelAnalyticsDashboard.get_price_drop_statistics(db, days, limit)
     return stats
\ No newline at end of file
@@ -1,11 +1,15 @@
 """Travel export endpoints."""
 
-from fastapi import APIRouter, Depends, Response
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_database_session
+from app.core.deps import get_current_user, get_replica_session
 from app.core.models.user import User
+from app.core.price_history.archive import archived_history
 from app.travel.models import Flight, Hotel
 from app.utils.export import export_service
 
@@ -14,7 +18,7 @@ router = APIRouter(prefix="/api/travel/export", tags=["Travel Export"])
 
 @router.get("/flights/csv")
 async def export_flights_csv(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export flights to CSV."""
@@ -34,7 +38,7 @@ async def export_flights_csv(
 
 @router.get("/flights/pdf")
 async def export_flights_pdf(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export flights to PDF."""
@@ -54,7 +58,7 @@ async def export_flights_pdf(
 
 @router.get("/hotels/csv")
 async def export_hotels_csv(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export hotels to CSV."""
@@ -74,7 +78,7 @@ async def export_hotels_csv(
 
 @router.get("/hotels/pdf")
 async def export_hotels_pdf(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export hotels to PDF."""
@@ -90,3 +94,53 @@ async def export_hotels_pdf(
         media_type="application/pdf",
         headers={"Content-Disposition": "attachment; filename=hotels.pdf"},
     )
+
+
+@router.get("/flights/{flight_id}/history/csv")
+async def export_flight_history_csv(
+    flight_id: int,
+    days: Optional[int] = Query(None, ge=1, description="Days of history (all if omitted)"),
+    db: AsyncSession = Depends(get_replica_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Export a flight's price history, archived history included, to CSV."""
+    if not await db.get(Flight, flight_id):
+        raise HTTPException(status_code=404, detail="Flight not found")
+
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    rows = await archived_history.load_async(db, "flight", flight_id, since)
+
+    filename = f"flight_{flight_id}_history.csv"
+    data = export_service.prepare_price_history_data(rows)
+    csv_output = export_service.generate_csv(data, filename)
+
+    return Response(
+        content=csv_output.getvalue(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@router.get("/hotels/{hotel_id}/history/csv")
+async def export_hotel_history_csv(
+    hotel_id: int,
+    days: Optional[int] = Query(None, ge=1, description="Days of history (all if omitted)"),
+    db: AsyncSession = Depends(get_replica_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Export a hotel's price history, archived history included, to CSV."""
+    if not await db.get(Hotel, hotel_id):
+        raise HTTPException(status_code=404, detail="Hotel not found")
+
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    rows = await archived_history.load_async(db, "hotel", hotel_id, since)
+
+    filename = f"hotel_{hotel_id}_history.csv"
+    data = export_service.prepare_price_history_data(rows)
+    csv_output = export_service.generate_csv(data, filename)
+
+    return Response(
+        content=csv_output.getvalue(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_database_session
+from app.core.deps import get_replica_session
 from app.travel.services.price_analytics import TravelPriceAnalytics
 
 router = APIRouter(prefix="/api/travel/analytics", tags=["Travel Analytics"])
@@ -13,22 +13,18 @@ router = APIRouter(prefix="/api/travel/analytics", tags=["Travel Analytics"])
 async def get_flight_analytics(
     flight_id: int,
     days: int = 30,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get complete analytics for a flight."""
-    stats = TravelPriceAnalytics.get_flight_price_stats(db, flight_id, days)
-    if not stats:
+    summary = TravelPriceAnalytics.get_analytics_summary(db, flight_id, "flight", days)
+    if not summary["stats"]:
         raise HTTPException(status_code=404, detail="Flight not found or no price data")
     
-    trend = TravelPriceAnalytics.get_price_trend(db, flight_id, "flight", 7)
-    volatility = TravelPriceAnalytics.get_price_volatility(db, flight_id, "flight", days)
-    is_deal = TravelPriceAnalytics.is_good_deal(db, flight_id, "flight")
-    
     return {
-        "stats": stats,
-        "trend": trend,
-        "volatility": volatility,
-        "is_good_deal": is_deal
+        "stats": summary["stats"],
+        "trend": summary["trend"],
+        "volatility": summary["volatility"],
+        "is_good_deal": summary["is_good_deal"]
     }
 
 
@@ -36,22 +32,18 @@ async def get_flight_analytics(
 async def get_hotel_analytics(
     hotel_id: int,
     days: int = 30,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get complete analytics for a hotel."""
-    stats = TravelPriceAnalytics.get_hotel_price_stats(db, hotel_id, days)
-    if not stats:
+    summary = TravelPriceAnalytics.get_analytics_summary(db, hotel_id, "hotel", days)
+    if not summary["stats"]:
         raise HTTPException(status_code=404, detail="Hotel not found or no price data")
     
-    trend = TravelPriceAnalytics.get_price_trend(db, hotel_id, "hotel", 7)
-    volatility = TravelPriceAnalytics.get_price_volatility(db, hotel_id, "hotel", days)
-    is_deal = TravelPriceAnalytics.is_good_deal(db, hotel_id, "hotel")
-    
     return {
-        "stats": stats,
-        "trend": trend,
-        "volatility": volatility,
-        "is_good_deal": is_deal
+        "stats": summary["stats"],
+        "trend": summary["trend"],
+        "volatility": summary["volatility"],
+        "is_good_deal": summary["is_good_deal"]
     }
 
 
@@ -59,7 +51,7 @@ async def get_hotel_analytics(
 async def get_flight_stats(
     flight_id: int,
     days: int = 30,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get price statistics for a flight."""
     stats = TravelPriceAnalytics.get_flight_price_stats(db, flight_id, days)
@@ -72,7 +64,7 @@ async def get_flight_stats(
 async def get_hotel_stats(
     hotel_id: int,
     days: int = 30,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get price statistics for a hotel."""
     stats = TravelPriceAnalytics.get_hotel_price_stats(db, hotel_id, days)
@@ -85,7 +77,7 @@ async def get_hotel_stats(
 async def get_flight_trend(
     flight_id: int,
     days: int = 7,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get price trend for a flight."""
     trend = TravelPriceAnalytics.get_price_trend(db, flight_id, "flight", days)
@@ -96,7 +88,7 @@ async def get_flight_trend(
 async def get_hotel_trend(
     hotel_id: int,
     days: int = 7,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get price trend for a hotel."""
     trend = TravelPriceAnalytics.get_price_trend(db, hotel_id, "hotel", days)
@@ -107,7 +99,7 @@ async def get_hotel_trend(
 async def get_flight_history(
     flight_id: int,
     days: int = 30,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get price history chart data for a flight."""
     history = TravelPriceAnalytics.get_price_history_chart(db, flight_id, "flight", days)
@@ -118,7 +110,7 @@ async def get_flight_history(
 async def get_hotel_history(
     hotel_id: int,
     days: int = 30,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get price history chart data for a hotel."""
     history = TravelPriceAnalytics.get_price_history_chart(db, hotel_id, "hotel", days)
@@ -128,7 +120,7 @@ async def get_hotel_history(
 @router.get("/flights/{flight_id}/multi-period")
 async def get_flight_multi_period_stats(
     flight_id: int,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get multi-period statistics for a flight."""
     stats = TravelPriceAnalytics.get_multi_period_stats(db, flight_id, "flight")
@@ -138,7 +130,7 @@ async def get_flight_multi_period_stats(
 @router.get("/hotels/{hotel_id}/multi-period")
 async def get_hotel_multi_period_stats(
     hotel_id: int,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get multi-period statistics for a hotel."""
     stats = TravelPriceAnalytics.get_multi_period_stats(db, hotel_id, "hotel")
@@ -149,7 +141,7 @@ async def get_hotel_multi_period_stats(
 async def get_destination_trends(
     destination: str,
     days: int = 30,
-    db: Session = Depends(get_database_session)
+    db: Session = Depends(get_replica_session)
 ):
     """Get price trends for a destination."""
     trends = TravelPriceAnalytics.get_destination_price_trends(db, destination, days)
@@ -24,9 +24,10 @@ from app.travel.schemas.travel_list import (
     TravelAlertListResponse,
     TravelDealListResponse,
 )
+from app.travel.services.airports import airport_directory
 from app.travel.services.deal_service import TravelDealService
 from app.travel.services.travel_service import TravelService
-from app.utils.pagination import PaginationParams, paginate_query
+from app.utils.pagination import CountMode, PaginationParams, paginate_query
 
 router = APIRouter(prefix="/api/travel", tags=["Travel"])
 
@@ -68,10 +69,13 @@ async def list_flights(
     """List tracked flights."""
     query = select(Flight).where(Flight.is_active)
 
+    # Airport names and cities match every airport they refer to
     if origin:
-        query = query.where(Flight.origin.ilike(f"%{origin.upper()}%"))
+        origins = airport_directory.search_codes(origin) or [origin.upper()]
+        query = query.where(Flight.origin.in_(origins))
     if destination:
-        query = query.where(Flight.destination.ilike(f"%{destination.upper()}%"))
+        destinations = airport_directory.search_codes(destination) or [destination.upper()]
+        query = query.where(Flight.destination.in_(destinations))
 
     query = query.order_by(Flight.departure_date.asc())
 
@@ -198,6 +202,10 @@ async def create_alert_rule(
 async def list_alerts(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(
+        None, description="How to compute the total: exact, cached, estimate or none"
+    ),
     db: AsyncSession = Depends(get_database_session),
     current_user: User = Depends(get_current_user),
 ):
@@ -205,7 +213,9 @@ async def list_alerts(
     query = select(TravelAlertRule).where(TravelAlertRule.is_active)
     query = query.order_by(TravelAlertRule.created_at.desc())
 
-    pagination = PaginationParams(page=page, size=size)
-    result = await paginate_query(db, query, pagination, TravelAlertRuleResponse)
+    pagination = PaginationParams(page=page, size=size, cursor=cursor, count=count)
+    result = await paginate_query(
+        db, query, pagination, TravelAlertRuleResponse, keyset_model=TravelAlertRule
+    )
 
     return TravelAlertListResponse(**result.model_dump())
@@ -1,6 +1,6 @@
 """Travel list response schemas."""
 
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -37,7 +37,9 @@ class TravelDealListResponse(BaseModel):
 class TravelAlertListResponse(BaseModel):
     """Schema for travel alert list response."""
     items: List[dict]
-    total: int
-    page: int = 1
+    total: Optional[int] = None
+    page: Optional[int] = 1
     size: int = 20
-    pages: int = 1
\ No newline at end of file
+    pages: Optional[int] = 1
+    has_more: bool = False
+    next_cursor: Optional[str] = None
@@ -0,0 +1,186 @@
+"""Airport directory and normalized flight routes.
+
+Flight origins and destinations arrive as free text ("Lagos", "los",
+"Murtala Muhammed"). They are normalized to IATA codes on write, and each
+flight stores a ``route_key`` such as "LOS-LHR". Route lookups are then
+index seeks on (route_key, departure_date) instead of ILIKE scans.
+
+The directory below is the source of the ``airports`` and
+``airport_aliases`` tables, which analytics join for city names.
+"""
+
+import re
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from app.travel.models.flight import Flight
+
+# (IATA code, airport name, city, country, extra aliases)
+AIRPORTS = [
+    (
+        "LOS", "Murtala Muhammed International Airport", "Lagos", "Nigeria",
+        ["ikeja", "murtala muhammed", "mmia"],
+    ),
+    ("ABV", "Nnamdi Azikiwe International Airport", "Abuja", "Nigeria", ["nnamdi azikiwe"]),
+    ("PHC", "Port Harcourt International Airport", "Port Harcourt", "Nigeria", ["omagwa"]),
+    ("KAN", "Mallam Aminu Kano International Airport", "Kano", "Nigeria", ["aminu kano"]),
+    ("ENU", "Akanu Ibiam International Airport", "Enugu", "Nigeria", ["akanu ibiam"]),
+    ("QOW", "Sam Mbakwe Airport", "Owerri", "Nigeria", ["sam mbakwe"]),
+    ("BNI", "Benin Airport", "Benin City", "Nigeria", ["benin"]),
+    ("IBA", "Ibadan Airport", "Ibadan", "Nigeria", []),
+    ("ILR", "Ilorin International Airport", "Ilorin", "Nigeria", []),
+    ("CBQ", "Margaret Ekpo International Airport", "Calabar", "Nigeria", ["margaret ekpo"]),
+    ("QUO", "Victor Attah International Airport", "Uyo", "Nigeria", ["victor attah"]),
+    ("JOS", "Yakubu Gowon Airport", "Jos", "Nigeria", []),
+    ("KAD", "Kaduna International Airport", "Kaduna", "Nigeria", []),
+    ("SKO", "Sadiq Abubakar III International Airport", "Sokoto", "Nigeria", []),
+    ("ABB", "Asaba International Airport", "Asaba", "Nigeria", []),
+    ("ACC", "Kotoka International Airport", "Accra", "Ghana", ["kotoka"]),
+    ("NBO", "Jomo Kenyatta International Airport", "Nairobi", "Kenya", ["jomo kenyatta"]),
+    ("JNB", "O. R. Tambo International Airport", "Johannesburg", "South Africa", ["or tambo"]),
+    ("CAI", "Cairo International Airport", "Cairo", "Egypt", []),
+    ("ADD", "Addis Ababa Bole International Airport", "Addis Ababa", "Ethiopia", ["bole"]),
+    ("LHR", "Heathrow Airport", "London", "United Kingdom", ["heathrow", "london"]),
+    ("LGW", "Gatwick Airport", "London", "United Kingdom", ["gatwick"]),
+    ("CDG", "Charles de Gaulle Airport", "Paris", "France", ["charles de gaulle", "paris"]),
+    ("AMS", "Amsterdam Airport Schiphol", "Amsterdam", "Netherlands", ["schiphol"]),
+    ("FRA", "Frankfurt Airport", "Frankfurt", "Germany", []),
+    ("IST", "Istanbul Airport", "Istanbul", "Turkey", []),
+    ("DXB", "Dubai International Airport", "Dubai", "United Arab Emirates", []),
+    ("DOH", "Hamad International Airport", "Doha", "Qatar", ["hamad"]),
+    ("JFK", "John F. Kennedy International Airport", "New York", "United States", ["new york"]),
+    ("IAD", "Washington Dulles International Airport", "Washington", "United States", ["dulles"]),
+    ("ATL", "Hartsfield-Jackson Atlanta Airport", "Atlanta", "United States", []),
+    ("IAH", "George Bush Intercontinental Airport", "Houston", "United States", []),
+    ("YYZ", "Toronto Pearson International Airport", "Toronto", "Canada", ["pearson"]),
+]
+
+_ROUTE_SEPARATOR = re.compile(r"\s*(?:-|→|>|\bto\b)\s*", re.IGNORECASE)
+_IATA_CODE = re.compile(r"[A-Za-z]{3}")
+
+
+def _alias_key(text: str) -> str:
+    """Lowercase text with single spaces and without punctuation."""
+    return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+
+class AirportDirectory:
+    """Resolves airport names, cities and codes to IATA codes."""
+
+    def __init__(self, airports: Iterable[Tuple[str, str, str, str, List[str]]]):
+        """Index airports by code, alias and city."""
+        self._cities: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+        self._city_codes: Dict[str, List[str]] = {}
+
+        for code, name, city, _, aliases in airports:
+            self._cities[code] = city
+            self._city_codes.setdefault(_alias_key(city), []).append(code)
+            for alias in [code, name, *aliases]:
+                self._aliases.setdefault(_alias_key(alias), code)
+
+        # A city with a single airport is an alias for it
+        for city, codes in self._city_codes.items():
+            if len(codes) == 1:
+                self._aliases.setdefault(city, codes[0])
+
+    def aliases(self) -> Dict[str, str]:
+        """Every alias and the code it resolves to."""
+        return dict(self._aliases)
+
+    def city(self, code: str) -> Optional[str]:
+        """City served by an airport."""
+        return self._cities.get(code)
+
+    def resolve(self, text: Optional[str]) -> Optional[str]:
+        """IATA code for an airport name, city or code, if it can be recognized."""
+        if not text:
+            return None
+        code = self._aliases.get(_alias_key(text))
+        if code:
+            return code
+        text = text.strip()
+        return text.upper() if _IATA_CODE.fullmatch(text) else None
+
+    def normalize(self, text: str) -> str:
+        """IATA code for a place, or the cleaned-up text when it is not recognized."""
+        return self.resolve(text) or " ".join(text.split()).upper()[:10]
+
+    def search_codes(self, query: str) -> List[str]:
+        """Codes of airports whose code, name, alias or city starts with the query."""
+        key = _alias_key(query)
+        if not key:
+            return []
+
+        codes = {code for alias, code in self._aliases.items() if alias.startswith(key)}
+        for city, city_codes in self._city_codes.items():
+            if city.startswith(key):
+                codes.update(city_codes)
+        if not codes and _IATA_CODE.fullmatch(query.strip()):
+            codes.add(query.strip().upper())
+        return sorted(codes)
+
+
+# Global airport directory instance
+airport_directory = AirportDirectory(AIRPORTS)
+
+
+def route_key(origin: str, destination: str) -> str:
+    """Route key for normalized origin and destination codes."""
+    return f"{origin}-{destination}"
+
+
+def normalize_route(origin: str, destination: str) -> Tuple[str, str, str]:
+    """Normalized origin, destination and route key of a flight."""
+    origin = airport_directory.normalize(origin)
+    destination = airport_directory.normalize(destination)
+    return origin, destination, route_key(origin, destination)
+
+
+def parse_route(query: str) -> Optional[Tuple[str, str]]:
+    """Origin and destination codes from a query like "Lagos to London" or "LOS-LHR"."""
+    parts = _ROUTE_SEPARATOR.split(query.strip(), maxsplit=1)
+    if len(parts) != 2 or not all(part.strip() for part in parts):
+        return None
+    return airport_directory.normalize(parts[0]), airport_directory.normalize(parts[1])
+
+
+def flights_on_route(
+    db: Session,
+    origin: str,
+    destination: str,
+    departure_from: Optional[date] = None,
+    departure_to: Optional[date] = None,
+) -> Query:
+    """Active flights on a route, soonest departure first."""
+    query = db.query(Flight).filter(
+        Flight.route_key == route_key(origin, destination), Flight.is_active == True
+    )
+    if departure_from:
+        query = query.filter(Flight.departure_date >= departure_from)
+    if departure_to:
+        query = query.filter(Flight.departure_date <= departure_to)
+    return query.order_by(Flight.departure_date)
+
+
+def cheapest_route_fare(
+    db: Session, key: str, departure_date: date, window_days: int = 3
+) -> Optional[Decimal]:
+    """Lowest active fare on a route departing within `window_days` of a date."""
+    return (
+        db.query(func.min(Flight.price))
+        .filter(
+            Flight.route_key == key,
+            Flight.departure_date.between(
+                departure_date - timedelta(days=window_days),
+                departure_date + timedelta(days=window_days),
+            ),
+            Flight.is_active == True,
+            Flight.price > 0,
+        )
+        .scalar()
+    )
@@ -6,6 +6,8 @@ from typing import Dict, List
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.price_history.drops import price_drop_summary
+from app.travel.models.airport import Airport
 from app.travel.models.deal import TravelDeal
 from app.travel.models.flight import Flight
 from app.travel.models.hotel import Hotel
@@ -259,15 +261,17 @@ class TravelAnalyticsDashboard:
     @staticmethod
     def get_most_searched_destinations(db: Session, limit: int = 10) -> List[Dict]:
         """Get most searched destinations."""
-        # Flight destinations
+        # Flight destinations, by city so they combine with hotel locations
+        destination = func.coalesce(Airport.city, Flight.destination)
         flight_destinations = (
             db.query(
-                Flight.destination.label("destination"),
+                destination.label("destination"),
                 func.count(TravelWatchlist.id).label("search_count"),
             )
             .join(TravelWatchlist, Flight.id == TravelWatchlist.flight_id)
+            .outerjoin(Airport, Airport.iata_code == Flight.destination)
             .filter(TravelWatchlist.is_active == True, Flight.is_active == True)
-            .group_by(Flight.destination)
+            .group_by(destination)
             .order_by(func.count(TravelWatchlist.id).desc())
             .limit(limit)
             .all()
@@ -348,88 +352,90 @@ class TravelAnalyticsDashboard:
         return deals
 
     @staticmethod
-    def get_price_drop_statistics(db: Session, days: int = 30) -> Dict:
-        """Get price drop statistics."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        total_flights = (
-            db.query(func.count(Flight.id)).filter(Flight.is_active == True).scalar()
+    def get_price_drop_statistics(db: Session, days: int = 30, limit: int = 5) -> Dict:
+        """Get price drop statistics and the biggest drops."""
+        active_flights = db.query(Flight.id).filter(Flight.is_active == True)
+        active_hotels = db.query(Hotel.id).filter(Hotel.is_active == True)
+        total_flights = active_flights.count()
+        total_hotels = active_hotels.count()
+
+        # First vs last price of every active flight and hotel, one query per type
+        flight_drops = price_drop_summary(
+            db, "flight", days, item_ids=active_flights.statement, limit=limit
         )
-
-        total_hotels = (
-            db.query(func.count(Hotel.id)).filter(Hotel.is_active == True).scalar()
+        hotel_drops = price_drop_summary(
+            db, "hotel", days, item_ids=active_hotels.statement, limit=limit
         )
 
-        flights_with_drops = (
-            db.query(func.count(func.distinct(TravelDeal.flight_id)))
-            .filter(
-                TravelDeal.flight_id.isnot(None),
-                TravelDeal.created_at >= cutoff_date,
-                TravelDeal.is_active == True
-            )
-            .scalar()
-        )
-
-        hotels_with_drops = (
-            db.query(func.count(func.distinct(TravelDeal.hotel_id)))
-            .filter(
-                TravelDeal.hotel_id.isnot(None),
-                TravelDeal.created_at >= cutoff_date,
-                TravelDeal.is_active == True
-            )
-            .scalar()
-        )
+        flights_with_drops = flight_drops["items_with_drops"]
+        hotels_with_drops = hotel_drops["items_with_drops"]
 
         total_items = total_flights + total_hotels
         items_with_drops = flights_with_drops + hotels_with_drops
         drop_rate = (items_with_drops / total_items * 100) if total_items > 0 else 0
 
-        avg_drop = (
-            db.query(func.avg(TravelDeal.original_price - TravelDeal.deal_price))
-            .filter(TravelDeal.created_at >= cutoff_date, TravelDeal.is_active == True)
-            .scalar()
-        )
-
+        total_drop_amount = flight_drops["total_drop_amount"] + hotel_drops["total_drop_amount"]
+        avg_drop = total_drop_amount / items_with_drops if items_with_drops else 0
         avg_drop_percent = (
-            db.query(func.avg(TravelDeal.discount_percent))
-            .filter(TravelDeal.created_at >= cutoff_date, TravelDeal.is_active == True)
-            .scalar()
+            (
+                flight_drops["average_drop_percent"] * flights_with_drops
+                + hotel_drops["average_drop_percent"] * hotels_with_drops
+            )
+            / items_with_drops
+            if items_with_drops
+            else 0
         )
 
-        biggest_drop = (
-            db.query(
-                TravelDeal,
-                Flight.origin,
-                Flight.destination,
-                Hotel.name,
-                (TravelDeal.original_price - TravelDeal.deal_price).label("drop_amount"),
+        flight_ids = [drop["item_id"] for drop in flight_drops["top_drops"]]
+        hotel_ids = [drop["item_id"] for drop in hotel_drops["top_drops"]]
+        routes = {
+            flight_id: f"{origin}-{destination}"
+            for flight_id, origin, destination in (
+                db.query(Flight.id, Flight.origin, Flight.destination)
+                .filter(Flight.id.in_(flight_ids))
+                .all()
+                if flight_ids
+                else []
             )
-            .outerjoin(Flight, TravelDeal.flight_id == Flight.id)
-            .outerjoin(Hotel, TravelDeal.hotel_id == Hotel.id)
-            .filter(TravelDeal.created_at >= cutoff_date, TravelDeal.is_active == True)
-            .order_by((TravelDeal.original_price - TravelDeal.deal_price).desc())
-            .first()
+        }
+        hotel_names = (
+            dict(db.query(Hotel.id, Hotel.name).filter(Hotel.id.in_(hotel_ids)).all())
+            if hotel_ids
+            else {}
         )
 
+        top_drops = [
+            {
+                "type": "flight",
+                "id": drop["item_id"],
+                "name": routes.get(drop["item_id"], ""),
+                "drop_amount": drop["amount"],
+                "drop_percentage": drop["percent"],
+            }
+            for drop in flight_drops["top_drops"]
+        ] + [
+            {
+                "type": "hotel",
+                "id": drop["item_id"],
+                "name": hotel_names.get(drop["item_id"], ""),
+                "drop_amount": drop["amount"],
+                "drop_percentage": drop["percent"],
+            }
+            for drop in hotel_drops["top_drops"]
+        ]
+        top_drops = sorted(top_drops, key=lambda drop: drop["drop_amount"], reverse=True)[:limit]
+
         return {
             "total_flights": total_flights or 0,
             "total_hotels": total_hotels or 0,
             "total_items": total_items,
-            "flights_with_drops": flights_with_drops or 0,
-            "hotels_with_drops": hotels_with_drops or 0,
+            "flights_with_drops": flights_with_drops,
+            "hotels_with_drops": hotels_with_drops,
             "items_with_drops": items_with_drops,
             "drop_rate_percentage": round(drop_rate, 2),
-            "average_drop_amount": float(avg_drop or 0),
-            "average_drop_percentage": float(avg_drop_percent or 0),
-            "biggest_drop": (
-                {
-                    "type": "flight" if biggest_drop[1] else "hotel",
-                    "name": f"{biggest_drop[1]}-{biggest_drop[2]}" if biggest_drop[1] else biggest_drop[3],
-                    "drop_amount": float(biggest_drop[4]),
-                    "drop_percentage": float(biggest_drop[0].discount_percent),
-                }
-                if biggest_drop
-                else None
-            ),
+            "average_drop_amount": avg_drop,
+            "average_drop_percentage": avg_drop_percent,
+            "biggest_drop": top_drops[0] if top_drops else None,
+            "top_drops": top_drops,
             "period_days": days,
         }
\ No newline at end of file
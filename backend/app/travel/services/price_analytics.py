@@ -4,40 +4,32 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.price_history.archive import archived_history
+from app.core.price_history.intervals import interval_points
+from app.core.price_history.rollups import STANDARD_WINDOWS, summarize_items
+from app.core.price_history.windows import PriceWindows
 from app.travel.models.flight import Flight
 from app.travel.models.hotel import Hotel
-from app.travel.models.price_history import TravelPriceHistory
+from app.travel.services.airports import airport_directory
 
 
 class TravelPriceAnalytics:
     """Analytics service for travel price trends and statistics."""
 
     @staticmethod
-    def get_flight_price_stats(db: Session, flight_id: int, days: int = 30) -> Optional[Dict]:
-        """Get price statistics for a flight over specified period."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        prices = (
-            db.query(TravelPriceHistory)
-            .filter(
-                TravelPriceHistory.flight_id == flight_id,
-                TravelPriceHistory.created_at >= cutoff_date,
-            )
-            .order_by(TravelPriceHistory.created_at.desc())
-            .all()
-        )
-
-        if not prices:
+    def _stats_from_summary(
+        summary: Optional[Dict], item_type: str, item_id: int, days: int
+    ) -> Optional[Dict]:
+        """Build price statistics from a window summary."""
+        if not summary:
             return None
 
-        price_values = [float(p.price) for p in prices]
-        current_price = price_values[0]
-        lowest_price = min(price_values)
-        highest_price = max(price_values)
-        average_price = sum(price_values) / len(price_values)
+        current_price = summary["close"]
+        lowest_price = summary["low"]
+        highest_price = summary["high"]
+        average_price = summary["mean"]
 
         price_drop = highest_price - current_price
         price_drop_percent = (price_drop / highest_price * 100) if highest_price > 0 else 0
@@ -46,7 +38,7 @@ class TravelPriceAnalytics:
         savings_percent = (savings_from_avg / average_price * 100) if average_price > 0 else 0
 
         return {
-            "flight_id": flight_id,
+            f"{item_type}_id": item_id,
             "period_days": days,
             "current_price": current_price,
             "lowest_price": lowest_price,
@@ -56,107 +48,114 @@ class TravelPriceAnalytics:
             "price_drop_percentage": round(price_drop_percent, 2),
             "savings_from_average": round(savings_from_avg, 2),
             "savings_percentage": round(savings_percent, 2),
-            "data_points": len(prices),
+            "data_points": summary["count"],
         }
 
     @staticmethod
-    def get_hotel_price_stats(db: Session, hotel_id: int, days: int = 30) -> Optional[Dict]:
-        """Get price statistics for a hotel over specified period."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+    def _trend(windows: PriceWindows, days: int) -> str:
+        """Classify the price trend over a window."""
+        change_percent = windows.change_percent(days)
 
-        prices = (
-            db.query(TravelPriceHistory)
-            .filter(
-                TravelPriceHistory.hotel_id == hotel_id,
-                TravelPriceHistory.created_at >= cutoff_date,
-            )
-            .order_by(TravelPriceHistory.created_at.desc())
-            .all()
-        )
+        if change_percent is None:
+            return "stable"
+        if change_percent > 5:
+            return "rising"
+        elif change_percent < -5:
+            return "falling"
+        else:
+            return "stable"
 
-        if not prices:
-            return None
+    @staticmethod
+    def _volatility(windows: PriceWindows, days: int) -> Dict:
+        """Coefficient of variation over a window."""
+        summary = windows.summary(days)
+        stddev = windows.stddev(days, sample=True)
 
-        price_values = [float(p.price) for p in prices]
-        current_price = price_values[0]
-        lowest_price = min(price_values)
-        highest_price = max(price_values)
-        average_price = sum(price_values) / len(price_values)
+        if not summary or not summary["mean"] or not stddev:
+            return {"volatility": 0, "interpretation": "insufficient_data"}
 
-        price_drop = highest_price - current_price
-        price_drop_percent = (price_drop / highest_price * 100) if highest_price > 0 else 0
+        mean = summary["mean"]
+        cv = (stddev / mean * 100) if mean > 0 else 0
 
-        savings_from_avg = average_price - current_price
-        savings_percent = (savings_from_avg / average_price * 100) if average_price > 0 else 0
+        if cv < 10:
+            interpretation = "low"
+        elif cv < 20:
+            interpretation = "moderate"
+        else:
+            interpretation = "high"
 
         return {
-            "hotel_id": hotel_id,
-            "period_days": days,
-            "current_price": current_price,
-            "lowest_price": lowest_price,
-            "highest_price": highest_price,
-            "average_price": round(average_price, 2),
-            "price_drop": round(price_drop, 2),
-            "price_drop_percentage": round(price_drop_percent, 2),
-            "savings_from_average": round(savings_from_avg, 2),
-            "savings_percentage": round(savings_percent, 2),
-            "data_points": len(prices),
+            "volatility": round(cv, 2),
+            "interpretation": interpretation,
+            "mean_price": round(mean, 2),
+            "std_deviation": round(stddev, 2),
         }
 
     @staticmethod
-    def get_price_trend(db: Session, item_id: int, item_type: str, days: int = 7) -> str:
-        """Determine price trend (rising, falling, stable)."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+    def _is_good_deal(windows: PriceWindows, item_type: str, item_id: int, threshold: float) -> bool:
+        """Check the current price against the 30-day average."""
+        stats = TravelPriceAnalytics._stats_from_summary(windows.summary(30), item_type, item_id, 30)
 
-        if item_type == "flight":
-            filter_condition = TravelPriceHistory.flight_id == item_id
-        else:
-            filter_condition = TravelPriceHistory.hotel_id == item_id
+        if not stats:
+            return False
+
+        return stats["savings_percentage"] >= threshold
+
+    @staticmethod
+    def _multi_period(windows: PriceWindows, item_type: str, item_id: int) -> Dict:
+        """Statistics for every standard window that has data, plus trends."""
+        stats = {}
 
-        prices = (
-            db.query(TravelPriceHistory.price)
-            .filter(
-                filter_condition,
-                TravelPriceHistory.created_at >= cutoff_date,
+        for days in STANDARD_WINDOWS:
+            period_stats = TravelPriceAnalytics._stats_from_summary(
+                windows.summary(days), item_type, item_id, days
             )
-            .order_by(TravelPriceHistory.created_at.asc())
-            .all()
-        )
+            if period_stats:
+                stats[f"last_{days}_days"] = period_stats
 
-        if len(prices) < 2:
-            return "stable"
+        stats["trend_7_days"] = TravelPriceAnalytics._trend(windows, 7)
+        stats["trend_30_days"] = TravelPriceAnalytics._trend(windows, 30)
 
-        first_price = float(prices[0][0])
-        last_price = float(prices[-1][0])
+        return stats
 
-        change_percent = ((last_price - first_price) / first_price * 100) if first_price > 0 else 0
+    @staticmethod
+    def get_analytics_summary(db: Session, item_id: int, item_type: str, days: int = 30) -> Dict:
+        """Get period stats, all window statistics, trend, volatility and deal status in one read."""
+        windows = PriceWindows.load(db, item_type, item_id, [*STANDARD_WINDOWS, days])
 
-        if change_percent > 5:
-            return "rising"
-        elif change_percent < -5:
-            return "falling"
-        else:
-            return "stable"
+        return {
+            "stats": TravelPriceAnalytics._stats_from_summary(
+                windows.summary(days), item_type, item_id, days
+            ),
+            "statistics": TravelPriceAnalytics._multi_period(windows, item_type, item_id),
+            "volatility": TravelPriceAnalytics._volatility(windows, days),
+            "is_good_deal": TravelPriceAnalytics._is_good_deal(windows, item_type, item_id, 10.0),
+            "trend": TravelPriceAnalytics._trend(windows, 7),
+        }
 
     @staticmethod
-    def get_multi_period_stats(db: Session, item_id: int, item_type: str) -> Dict:
-        """Get statistics for multiple time periods."""
-        periods = [7, 30, 60, 90]
-        stats = {}
+    def get_flight_price_stats(db: Session, flight_id: int, days: int = 30) -> Optional[Dict]:
+        """Get price statistics for a flight over specified period."""
+        windows = PriceWindows.load(db, "flight", flight_id, [days])
+        return TravelPriceAnalytics._stats_from_summary(windows.summary(days), "flight", flight_id, days)
 
-        for days in periods:
-            if item_type == "flight":
-                period_stats = TravelPriceAnalytics.get_flight_price_stats(db, item_id, days)
-            else:
-                period_stats = TravelPriceAnalytics.get_hotel_price_stats(db, item_id, days)
-            
-            if period_stats:
-                stats[f"last_{days}_days"] = period_stats
+    @staticmethod
+    def get_hotel_price_stats(db: Session, hotel_id: int, days: int = 30) -> Optional[Dict]:
+        """Get price statistics for a hotel over specified period."""
+        windows = PriceWindows.load(db, "hotel", hotel_id, [days])
+        return TravelPriceAnalytics._stats_from_summary(windows.summary(days), "hotel", hotel_id, days)
 
-        stats["trend_7_days"] = TravelPriceAnalytics.get_price_trend(db, item_id, item_type, 7)
-        stats["trend_30_days"] = TravelPriceAnalytics.get_price_trend(db, item_id, item_type, 30)
+    @staticmethod
+    def get_price_trend(db: Session, item_id: int, item_type: str, days: int = 7) -> str:
+        """Determine price trend (rising, falling, stable)."""
+        windows = PriceWindows.load(db, item_type, item_id, [days])
+        return TravelPriceAnalytics._trend(windows, days)
 
-        return stats
+    @staticmethod
+    def get_multi_period_stats(db: Session, item_id: int, item_type: str) -> Dict:
+        """Get statistics for multiple time periods."""
+        windows = PriceWindows.load(db, item_type, item_id)
+        return TravelPriceAnalytics._multi_period(windows, item_type, item_id)
 
     @staticmethod
     def get_price_history_chart(
@@ -165,141 +164,58 @@ class TravelPriceAnalytics:
         """Get price history data formatted for charting."""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        if item_type == "flight":
-            filter_condition = TravelPriceHistory.flight_id == item_id
-        else:
-            filter_condition = TravelPriceHistory.hotel_id == item_id
-
-        prices = (
-            db.query(TravelPriceHistory)
-            .filter(
-                filter_condition,
-                TravelPriceHistory.created_at >= cutoff_date,
-            )
-            .order_by(TravelPriceHistory.created_at.asc())
-            .all()
-        )
+        # Older history is merged in from the cold archive
+        prices = archived_history.load(db, item_type, item_id, cutoff_date)
 
         return [
             {
-                "date": p.created_at.isoformat(),
+                "date": seen_at.isoformat(),
                 "price": float(p.price),
             }
-            for p in prices
+            for seen_at, p in interval_points(prices)
         ]
 
     @staticmethod
     def get_price_volatility(db: Session, item_id: int, item_type: str, days: int = 30) -> Dict:
         """Calculate price volatility (coefficient of variation)."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        if item_type == "flight":
-            filter_condition = TravelPriceHistory.flight_id == item_id
-        else:
-            filter_condition = TravelPriceHistory.hotel_id == item_id
-
-        result = (
-            db.query(
-                func.avg(TravelPriceHistory.price).label("mean"),
-                func.stddev(TravelPriceHistory.price).label("stddev"),
-            )
-            .filter(
-                filter_condition,
-                TravelPriceHistory.created_at >= cutoff_date,
-            )
-            .first()
-        )
-
-        if not result or not result.mean or not result.stddev:
-            return {"volatility": 0, "interpretation": "insufficient_data"}
-
-        mean = float(result.mean)
-        stddev = float(result.stddev)
-        cv = (stddev / mean * 100) if mean > 0 else 0
-
-        if cv < 10:
-            interpretation = "low"
-        elif cv < 20:
-            interpretation = "moderate"
-        else:
-            interpretation = "high"
-
-        return {
-            "volatility": round(cv, 2),
-            "interpretation": interpretation,
-            "mean_price": round(mean, 2),
-            "std_deviation": round(stddev, 2),
-        }
+        windows = PriceWindows.load(db, item_type, item_id, [days])
+        return TravelPriceAnalytics._volatility(windows, days)
 
     @staticmethod
     def is_good_deal(db: Session, item_id: int, item_type: str, threshold: float = 10.0) -> bool:
         """Check if current price is a good deal compared to average."""
-        if item_type == "flight":
-            stats = TravelPriceAnalytics.get_flight_price_stats(db, item_id, 30)
-        else:
-            stats = TravelPriceAnalytics.get_hotel_price_stats(db, item_id, 30)
-
-        if not stats:
-            return False
-
-        return stats["savings_percentage"] >= threshold
+        windows = PriceWindows.load(db, item_type, item_id, [30])
+        return TravelPriceAnalytics._is_good_deal(windows, item_type, item_id, threshold)
 
     @staticmethod
     def get_destination_price_trends(db: Session, destination: str, days: int = 30) -> Dict:
         """Get average price trends for a destination."""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
         # Flight prices to destination
-        flights = db.query(Flight).filter(Flight.destination.ilike(f"%{destination}%")).all()
-        flight_ids = [f.id for f in flights]
-
-        flight_result = None
-        if flight_ids:
-            flight_result = (
-                db.query(
-                    func.avg(TravelPriceHistory.price).label("avg_price"),
-                    func.min(TravelPriceHistory.price).label("min_price"),
-                    func.max(TravelPriceHistory.price).label("max_price"),
-                )
-                .filter(
-                    TravelPriceHistory.flight_id.in_(flight_ids),
-                    TravelPriceHistory.created_at >= cutoff_date,
-                )
-                .first()
-            )
+        codes = airport_directory.search_codes(destination)
+        flights = (
+            db.query(Flight).filter(Flight.destination.in_(codes)).all()
+            if codes
+            else db.query(Flight).filter(Flight.destination.ilike(f"%{destination}%")).all()
+        )
+        flight_result = summarize_items(db, "flight", [f.id for f in flights], days)
 
         # Hotel prices in destination
         hotels = db.query(Hotel).filter(Hotel.location.ilike(f"%{destination}%")).all()
-        hotel_ids = [h.id for h in hotels]
-
-        hotel_result = None
-        if hotel_ids:
-            hotel_result = (
-                db.query(
-                    func.avg(TravelPriceHistory.price).label("avg_price"),
-                    func.min(TravelPriceHistory.price).label("min_price"),
-                    func.max(TravelPriceHistory.price).label("max_price"),
-                )
-                .filter(
-                    TravelPriceHistory.hotel_id.in_(hotel_ids),
-                    TravelPriceHistory.created_at >= cutoff_date,
-                )
-                .first()
-            )
+        hotel_result = summarize_items(db, "hotel", [h.id for h in hotels], days)
 
         return {
             "destination": destination,
             "flights": {
                 "count": len(flights),
-                "average_price": float(flight_result.avg_price) if flight_result and flight_result.avg_price else 0,
-                "min_price": float(flight_result.min_price) if flight_result and flight_result.min_price else 0,
-                "max_price": float(flight_result.max_price) if flight_result and flight_result.max_price else 0,
+                "average_price": flight_result["avg_price"] if flight_result else 0,
+                "min_price": flight_result["min_price"] if flight_result else 0,
+                "max_price": flight_result["max_price"] if flight_result else 0,
             },
             "hotels": {
                 "count": len(hotels),
-                "average_price": float(hotel_result.avg_price) if hotel_result and hotel_result.avg_price else 0,
-                "min_price": float(hotel_result.min_price) if hotel_result and hotel_result.min_price else 0,
-                "max_price": float(hotel_result.max_price) if hotel_result and hotel_result.max_price else 0,
+                "average_price": hotel_result["avg_price"] if hotel_result else 0,
+                "min_price": hotel_result["min_price"] if hotel_result else 0,
+                "max_price": hotel_result["max_price"] if hotel_result else 0,
             },
             "period_days": days,
-        }
\ No newline at end of file
+        }
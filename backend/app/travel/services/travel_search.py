@@ -5,12 +5,19 @@ from typing import Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
+from app.core.price_history.recorder import record_price
 from app.core.scraping.scraper_factory import scraper_factory
 from app.travel.models.flight import Flight
 from app.travel.models.hotel import Hotel
-from app.travel.models.price_history import TravelPriceHistory
+from app.travel.services.airports import (
+    airport_directory,
+    flights_on_route,
+    normalize_route,
+    parse_route,
+)
 
 
 class TravelSearchService:
@@ -29,18 +36,29 @@ class TravelSearchService:
     def search_tracked_flights(
         db: Session, query: str, limit: int = 10
     ) -> List[Flight]:
-        """Search existing tracked flights."""
-        # Search by origin-destination or airline
+        """Search existing tracked flights by route, airport or city, or airline."""
+        # "Lagos to London" or "LOS-LHR": seek on the route index
+        route = parse_route(query)
+        if route:
+            return flights_on_route(db, *route).limit(limit).all()
+
+        # A place: flights from or to any of its airports
+        codes = airport_directory.search_codes(query)
+        if codes:
+            return (
+                db.query(Flight)
+                .filter(
+                    or_(Flight.origin.in_(codes), Flight.destination.in_(codes)),
+                    Flight.is_active == True,
+                )
+                .order_by(Flight.departure_date)
+                .limit(limit)
+                .all()
+            )
+
         return (
             db.query(Flight)
-            .filter(
-                db.or_(
-                    Flight.origin.ilike(f"%{query}%"),
-                    Flight.destination.ilike(f"%{query}%"),
-                    Flight.airline.ilike(f"%{query}%"),
-                ),
-                Flight.is_active == True
-            )
+            .filter(Flight.airline.ilike(f"%{query}%"), Flight.is_active == True)
             .limit(limit)
             .all()
         )
@@ -80,9 +98,13 @@ class TravelSearchService:
         if not flight_data or flight_data.get("type") != "flight":
             return None
 
+        origin, destination, key = normalize_route(
+            flight_data.get("origin", ""), flight_data.get("destination", "")
+        )
         flight = Flight(
-            origin=flight_data.get("origin", "")[:10],
-            destination=flight_data.get("destination", "")[:10],
+            origin=origin,
+            destination=destination,
+            route_key=key,
             departure_date=flight_data.get("departure_date"),
             return_date=flight_data.get("return_date"),
             airline=flight_data.get("airline", "")[:100],
@@ -98,14 +120,14 @@ class TravelSearchService:
         db.add(flight)
         db.flush()
 
-        price_history = TravelPriceHistory(
-            flight_id=flight.id,
-            price=flight_data.get("price", 0),
-            currency=flight_data.get("currency", "NGN"),
+        record_price(
+            db,
+            "flight",
+            flight.id,
+            flight_data.get("price", 0),
+            flight_data.get("currency", "NGN"),
             source="scraper",
         )
-
-        db.add(price_history)
         db.commit()
         db.refresh(flight)
 
@@ -147,14 +169,14 @@ class TravelSearchService:
         db.add(hotel)
         db.flush()
 
-        price_history = TravelPriceHistory(
-            hotel_id=hotel.id,
-            price=hotel_data.get("total_price", 0),
-            currency=hotel_data.get("currency", "NGN"),
+        record_price(
+            db,
+            "hotel",
+            hotel.id,
+            hotel_data.get("total_price", 0),
+            hotel_data.get("currency", "NGN"),
             source="scraper",
         )
-
-        db.add(price_history)
         db.commit()
         db.refresh(hotel)
 
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.travel.models import Flight, Hotel
+from app.travel.services.airports import normalize_route
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +31,11 @@ class TravelService:
         site: str,
     ) -> Flight:
         """Create new flight tracking."""
+        origin, destination, key = normalize_route(origin, destination)
         flight = Flight(
-            origin=origin.upper(),
-            destination=destination.upper(),
+            origin=origin,
+            destination=destination,
+            route_key=key,
             departure_date=departure_date,
             return_date=return_date,
             flight_class=flight_class,
@@ -5,7 +5,7 @@ from typing import Dict, List
 
 logger = logging.getLogger(__name__)
 
-from app.core.database import AsyncSessionLocal
+from app.core.database import BackgroundSessionLocal
 from app.utilities.models import UtilityService
 from app.utilities.services.scrapers.utility_scraper import UtilityScraper
 from app.utilities.services.utility_service import UtilityServiceManager
@@ -15,7 +15,7 @@ async def scrape_tracked_utilities():
     """Main utility scraping job that processes all tracked services."""
     logger.info("Starting utility scraping job")
 
-    async with AsyncSessionLocal() as db:
+    async with BackgroundSessionLocal() as db:
         try:
             service_manager = UtilityServiceManager(db)
             services = await service_manager.get_services_to_track()
@@ -1,6 +1,6 @@
 """Utility alert models."""
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, text
 
 from app.core.models.base import BaseModel
 
@@ -9,6 +9,16 @@ class UtilityAlertRule(BaseModel):
     """Utility alert rule model."""
 
     __tablename__ = "utility_alert_rules"
+    __table_args__ = (
+        # Newest-first cursor pagination over active rows
+        Index(
+            "ix_utility_alert_rules_keyset",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     service_id = Column(Integer, ForeignKey("utility_services.id"), nullable=True, index=True)
     service_type = Column(String(50), nullable=True, index=True)
@@ -1,6 +1,6 @@
 """Utility service model for utilities and subscriptions."""
 
-from sqlalchemy import Column, Integer, Numeric, String, Text
+from sqlalchemy import Column, Index, Integer, Numeric, String, Text, text
 from sqlalchemy.orm import relationship
 
 from app.core.models.base import BaseModel
@@ -10,6 +10,16 @@ class UtilityService(BaseModel):
     """Utility service model for utilities and subscriptions."""
 
     __tablename__ = "utility_services"
+    __table_args__ = (
+        # Newest-first cursor pagination over active rows
+        Index(
+            "ix_utility_services_keyset",
+            "created_at",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     name = Column(String(200), nullable=False)
     service_type = Column(
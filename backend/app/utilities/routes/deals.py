@@ -13,7 +13,7 @@ from app.utilities.schemas.deal import (
     UtilityDealListResponse,
     UtilityDealResponse,
 )
-from app.utils.pagination import PaginationParams, paginate_query
+from app.utils.pagination import CountMode, PaginationParams, paginate_query
 
 router = APIRouter(prefix="/api/utilities/deals", tags=["Utility Deals"])
 
@@ -22,6 +22,10 @@ router = APIRouter(prefix="/api/utilities/deals", tags=["Utility Deals"])
 async def list_deals(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(
+        None, description="How to compute the total: exact, cached, estimate or none"
+    ),
     deal_type: Optional[str] = Query(None, description="Filter by deal type"),
     db: AsyncSession = Depends(get_database_session),
     current_user: User = Depends(get_current_user),
@@ -35,8 +39,10 @@ async def list_deals(
 
     query = query.order_by(UtilityDeal.created_at.desc())
 
-    pagination = PaginationParams(page=page, size=size)
-    result = await paginate_query(db, query, pagination, UtilityDealResponse)
+    pagination = PaginationParams(page=page, size=size, cursor=cursor, count=count)
+    result = await paginate_query(
+        db, query, pagination, UtilityDealResponse, keyset_model=UtilityDeal
+    )
 
     return UtilityDealListResponse(**result.model_dump())
 
@@ -1,11 +1,15 @@
 """Utilities export endpoints."""
 
-from fastapi import APIRouter, Depends, Response
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_database_session
+from app.core.deps import get_current_user, get_replica_session
 from app.core.models.user import User
+from app.core.price_history.archive import archived_history
 from app.utilities.models import UtilityService
 from app.utils.export import export_service
 
@@ -14,7 +18,7 @@ router = APIRouter(prefix="/api/utilities/export", tags=["Utilities Export"])
 
 @router.get("/services/csv")
 async def export_services_csv(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export utility services to CSV."""
@@ -34,7 +38,7 @@ async def export_services_csv(
 
 @router.get("/services/pdf")
 async def export_services_pdf(
-    db: AsyncSession = Depends(get_database_session),
+    db: AsyncSession = Depends(get_replica_session),
     current_user: User = Depends(get_current_user),
 ):
     """Export utility services to PDF."""
@@ -50,3 +54,28 @@ async def export_services_pdf(
         media_type="application/pdf",
         headers={"Content-Disposition": "attachment; filename=services.pdf"},
     )
+
+
+@router.get("/services/{service_id}/history/csv")
+async def export_service_history_csv(
+    service_id: int,
+    days: Optional[int] = Query(None, ge=1, description="Days of history (all if omitted)"),
+    db: AsyncSession = Depends(get_replica_session),
+    current_user: User = Depends(get_current_user),
+):
+    """Export a service's price history, archived history included, to CSV."""
+    if not await db.get(UtilityService, service_id):
+        raise HTTPException(status_code=404, detail="Service not found")
+
+    since = datetime.now(timezone.utc) - timedelta(days=days) if days else None
+    rows = await archived_history.load_async(db, "utility", service_id, since)
+
+    filename = f"service_{service_id}_history.csv"
+    data = export_service.prepare_price_history_data(rows)
+    csv_output = export_service.generate_csv(data, filename)
+
+    return Response(
+        content=csv_output.getvalue(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
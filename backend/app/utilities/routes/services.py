@@ -17,7 +17,7 @@ from app.utilities.schemas.service import (
     UtilityServiceUpdate,
 )
 from app.utilities.services.utility_service import UtilityServiceManager
-from app.utils.pagination import PaginationParams, paginate_query
+from app.utils.pagination import CountMode, PaginationParams, paginate_query
 
 router = APIRouter(prefix="/api/utilities/services", tags=["Utility Services"])
 
@@ -52,6 +52,10 @@ async def create_service(
 async def list_services(
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    count: Optional[CountMode] = Query(
+        None, description="How to compute the total: exact, cached, estimate or none"
+    ),
     service_type: Optional[str] = Query(None, description="Filter by service type"),
     provider: Optional[str] = Query(None, description="Filter by provider"),
     billing_type: Optional[str] = Query(None, description="Filter by billing type"),
@@ -74,8 +78,10 @@ async def list_services(
 
     query = query.order_by(UtilityService.created_at.desc())
 
-    pagination = PaginationParams(page=page, size=size)
-    result = await paginate_query(db, query, pagination, UtilityServiceResponse)
+    pagination = PaginationParams(page=page, size=size, cursor=cursor, count=count)
+    result = await paginate_query(
+        db, query, pagination, UtilityServiceResponse, keyset_model=UtilityService
+    )
 
     return UtilityServiceListResponse(**result.model_dump())
 
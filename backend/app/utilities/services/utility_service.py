@@ -9,6 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.price_history.recorder import PriceHistoryRecorder
 from app.utilities.models import UtilityPriceHistory, UtilityService
 
 
@@ -71,17 +72,12 @@ class UtilityServiceManager:
         currency: str = "NGN",
         tariff_details: Optional[str] = None,
     ) -> UtilityPriceHistory:
-        """Add price history entry."""
+        """Add price history entry, extending the current one if nothing changed."""
 
-        price_history = UtilityPriceHistory(
-            service_id=service_id,
-            price=price,
-            currency=currency,
-            tariff_details=tariff_details,
+        price_history = await PriceHistoryRecorder(self.db).record(
+            "utility", service_id, price, currency, tariff_details=tariff_details
         )
 
-        self.db.add(price_history)
-
         # Update current price in service
         query = select(UtilityService).where(UtilityService.id == service_id)
         result = await self.db.execute(query)
@@ -94,7 +90,7 @@ class UtilityServiceManager:
         await self.db.commit()
         await self.db.refresh(price_history)
 
-        logger.info(f"Added price history for service {service_id}: ₦{price}")
+        logger.info(f"Recorded price history for service {service_id}: ₦{price}")
         return price_history
 
     async def get_latest_price(self, service_id: int) -> Optional[UtilityPriceHistory]:
@@ -163,6 +163,20 @@ class ExportService:
                 for item in items
             ]
 
+    def prepare_price_history_data(self, rows: List[Any]) -> List[Dict[str, Any]]:
+        """Prepare price history intervals (hot or archived) for export."""
+        return [
+            {
+                "First Seen": row.created_at.strftime("%Y-%m-%d %H:%M"),
+                "Last Seen": (row.last_seen_at or row.created_at).strftime("%Y-%m-%d %H:%M"),
+                "Price": f"{row.price:,.2f}",
+                "Currency": row.currency,
+                "Observations": row.observations,
+                "Source": row.source or "N/A",
+            }
+            for row in rows
+        ]
+
 
 # Global export service instance
 export_service = ExportService()
@@ -1,88 +1,225 @@
-"""Pagination utilities for API endpoints."""
-
+"""Pagination utilities for API endpoints.
+
+Two modes are supported. Page mode applies OFFSET/LIMIT for a page number.
+Cursor (keyset) mode continues after the last row of the previous page on
+(created_at, id), so deep pages cost the same as the first one. Listings
+that pass a keyset model return a next_cursor in both modes.
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
 from math import ceil
-from typing import Any, Callable, List, TypeVar
+from typing import Any, Callable, List, Literal, Optional, Tuple, TypeVar
 
+from fastapi import HTTPException
 from pydantic import BaseModel
-from sqlalchemy import func, select
+from sqlalchemy import func, select, text, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cache_manager
+
+logger = logging.getLogger(__name__)
+
 T = TypeVar("T", bound=BaseModel)
 
+# exact: COUNT(*) per request; cached: COUNT(*) reused for a short TTL;
+# estimate: planner row estimate (Postgres, else cached); none: no total
+CountMode = Literal["exact", "cached", "estimate", "none"]
+
+COUNT_CACHE_TTL = 60
+
 
 class PaginationParams(BaseModel):
     """Pagination parameters."""
 
     page: int = 1
     size: int = 20
+    cursor: Optional[str] = None
+    count: Optional[CountMode] = None
 
     @property
     def offset(self) -> int:
         """Calculate offset for database query."""
         return (self.page - 1) * self.size
 
+    @property
+    def count_mode(self) -> CountMode:
+        """Requested count mode, defaulting to exact for pages and cached for cursors."""
+        if self.count:
+            return self.count
+        return "cached" if self.cursor else "exact"
+
 
 class PaginatedResponse(BaseModel):
     """Generic paginated response."""
 
     items: List[Any]
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     size: int
-    pages: int
+    pages: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
 
 
-async def paginate_query(
-    db: AsyncSession, query: Any, pagination: PaginationParams, response_model: type[T]
-) -> PaginatedResponse:
-    """Paginate a SQLAlchemy query and return formatted response."""
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Opaque cursor for the position after a row."""
+    payload = json.dumps([created_at.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
 
-    # Apply pagination to query
-    paginated_query = query.offset(pagination.offset).limit(pagination.size)
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Position encoded in a cursor; raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
 
-    # Execute query
-    result = await db.execute(paginated_query)
-    items = list(result.scalars().all())
 
-    # Calculate total pages
-    pages = ceil(total / pagination.size) if total > 0 else 0
+def _keyset_order(query: Any, keyset_model: Any) -> Any:
+    """Order a query newest first on the keyset columns."""
+    return query.order_by(None).order_by(keyset_model.created_at.desc(), keyset_model.id.desc())
 
-    # Format items using response model
-    formatted_items = [response_model.model_validate(item) for item in items]
+
+async def _count(db: AsyncSession, query: Any, mode: CountMode) -> Optional[int]:
+    """Total rows for a query according to the count mode."""
+    if mode == "none":
+        return None
+
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+
+    if mode == "estimate" and db.get_bind().dialect.name == "postgresql":
+        try:
+            compiled = count_query.compile(
+                dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            # The count's input node carries the planner's row estimate
+            return int(plan.scalar()[0]["Plan"]["Plans"][0]["Plan Rows"])
+        except Exception as e:
+            logger.warning(f"Falling back to cached count, estimate failed: {e}")
+
+    if mode in ("cached", "estimate"):
+        compiled = count_query.compile()
+        cache_key = cache_manager.make_key("pagination_count", str(compiled), **compiled.params)
+        cached_total = cache_manager.get(cache_key)
+        if cached_total is not None:
+            return cached_total
+
+        total = (await db.execute(count_query)).scalar() or 0
+        cache_manager.set(cache_key, total, COUNT_CACHE_TTL)
+        return total
+
+    total_result = await db.execute(count_query)
+    return total_result.scalar() or 0
+
+
+async def _fetch_page(
+    db: AsyncSession,
+    query: Any,
+    pagination: PaginationParams,
+    keyset_model: Any,
+    scalars: bool,
+) -> Tuple[List[Any], Optional[int], bool, Optional[str]]:
+    """Fetch one page of rows, the total, whether more follow and the next cursor."""
+    if pagination.cursor and keyset_model is None:
+        raise HTTPException(status_code=400, detail="Cursor pagination is not supported here")
+
+    if keyset_model is not None:
+        query = _keyset_order(query, keyset_model)
+
+    total = await _count(db, query, pagination.count_mode)
+
+    if pagination.cursor:
+        try:
+            created_at, item_id = decode_cursor(pagination.cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        paginated_query = query.where(
+            tuple_(keyset_model.created_at, keyset_model.id) < tuple_(created_at, item_id)
+        )
+    else:
+        paginated_query = query.offset(pagination.offset)
+
+    # One extra row tells whether there is a next page
+    result = await db.execute(paginated_query.limit(pagination.size + 1))
+    rows = list(result.scalars().all()) if scalars else list(result.all())
+    has_more = len(rows) > pagination.size
+    rows = rows[: pagination.size]
+
+    next_cursor = None
+    if keyset_model is not None and has_more:
+        last = rows[-1] if scalars else rows[-1][0]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return rows, total, has_more, next_cursor
+
+
+def _response(
+    items: List[Any],
+    total: Optional[int],
+    pagination: PaginationParams,
+    has_more: bool,
+    next_cursor: Optional[str],
+) -> PaginatedResponse:
+    """Build the response for a fetched page."""
+    pages = None
+    if total is not None:
+        pages = ceil(total / pagination.size) if total > 0 else 0
 
     return PaginatedResponse(
-        items=formatted_items, total=total, page=pagination.page, size=pagination.size, pages=pages
+        items=items,
+        total=total,
+        page=None if pagination.cursor else pagination.page,
+        size=pagination.size,
+        pages=pages,
+        has_more=has_more,
+        next_cursor=next_cursor,
     )
 
 
-async def paginate_joined_query(
-    db: AsyncSession, query: Any, pagination: PaginationParams, formatter_func: Callable[[Any], Any]
+async def paginate_query(
+    db: AsyncSession,
+    query: Any,
+    pagination: PaginationParams,
+    response_model: type[T],
+    keyset_model: Any = None,
 ) -> PaginatedResponse:
-    """Paginate a joined query with custom formatting function."""
+    """Paginate a SQLAlchemy query and return formatted response.
 
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
+    With a keyset model (the listed model, newest first), the query is
+    ordered on its (created_at, id) and supports cursor pagination.
+    """
+    items, total, has_more, next_cursor = await _fetch_page(
+        db, query, pagination, keyset_model, scalars=True
+    )
+
+    # Format items using response model
+    formatted_items = [response_model.model_validate(item) for item in items]
 
-    # Apply pagination to query
-    paginated_query = query.offset(pagination.offset).limit(pagination.size)
+    return _response(formatted_items, total, pagination, has_more, next_cursor)
 
-    # Execute query
-    result = await db.execute(paginated_query)
-    raw_items = result.all()
 
-    # Calculate total pages
-    pages = ceil(total / pagination.size) if total > 0 else 0
+async def paginate_joined_query(
+    db: AsyncSession,
+    query: Any,
+    pagination: PaginationParams,
+    formatter_func: Callable[[Any], Any],
+    keyset_model: Any = None,
+) -> PaginatedResponse:
+    """Paginate a joined query with custom formatting function.
+
+    The keyset model must be the entity selected first in each row.
+    """
+    raw_items, total, has_more, next_cursor = await _fetch_page(
+        db, query, pagination, keyset_model, scalars=False
+    )
 
     # Format items using custom formatter
     formatted_items = [formatter_func(item) for item in raw_items]
 
-    return PaginatedResponse(
-        items=formatted_items, total=total, page=pagination.page, size=pagination.size, pages=pages
-    )
+    return _response(formatted_items, total, pagination, has_more, next_cursor)
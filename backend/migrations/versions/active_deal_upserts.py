@@ -0,0 +1,58 @@
+"""Allow one active price drop deal per item for bulk deal upserts
+
+Revision ID: active_deal_upserts
+Revises: price_baselines
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'active_deal_upserts'
+down_revision = 'price_baselines'
+branch_labels = None
+depends_on = None
+
+ACTIVE_PRICE_DROP = "is_active AND deal_type = 'price_drop'"
+
+# index name -> (table, item column)
+ACTIVE_DEAL_INDEXES = {
+    'uq_deals_active_product': ('deals', 'product_id'),
+    'uq_travel_deals_active_flight': ('travel_deals', 'flight_id'),
+    'uq_travel_deals_active_hotel': ('travel_deals', 'hotel_id'),
+    'uq_property_deals_active_property': ('property_deals', 'property_id'),
+    'uq_utility_deals_active_service': ('utility_deals', 'service_id'),
+}
+
+
+def upgrade() -> None:
+    # The e-commerce deals table never got the base model's is_active column
+    op.add_column(
+        'deals',
+        sa.Column('is_active', sa.Boolean(), server_default=sa.true(), nullable=False),
+    )
+
+    for name, (table, column) in ACTIVE_DEAL_INDEXES.items():
+        # Keep only the newest active price drop deal of each item
+        op.execute(
+            f"UPDATE {table} SET is_active = false "
+            f"WHERE {ACTIVE_PRICE_DROP} AND {column} IS NOT NULL AND id NOT IN ("
+            f"SELECT max(id) FROM {table} WHERE {ACTIVE_PRICE_DROP} AND {column} IS NOT NULL "
+            f"GROUP BY {column})"
+        )
+        op.create_index(
+            name,
+            table,
+            [column],
+            unique=True,
+            postgresql_where=sa.text(ACTIVE_PRICE_DROP),
+            sqlite_where=sa.text(ACTIVE_PRICE_DROP),
+        )
+
+
+def downgrade() -> None:
+    for name, (table, _) in ACTIVE_DEAL_INDEXES.items():
+        op.drop_index(name, table_name=table)
+    op.drop_column('deals', 'is_active')
@@ -0,0 +1,39 @@
+"""Add alert deliveries for deduplicating repeated alerts
+
+Revision ID: alert_deliveries
+Revises: watchlist_alert_watermark
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'alert_deliveries'
+down_revision = 'watchlist_alert_watermark'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('alert_deliveries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=20), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('rule', sa.String(length=50), nullable=False),
+    sa.Column('last_price', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('last_sent_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'category', 'item_id', 'rule', name='uq_alert_deliveries_key')
+    )
+    op.create_index(op.f('ix_alert_deliveries_id'), 'alert_deliveries', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_alert_deliveries_id'), table_name='alert_deliveries')
+    op.drop_table('alert_deliveries')
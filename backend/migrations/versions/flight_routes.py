@@ -0,0 +1,216 @@
+"""Add airports and normalized flight routes
+
+Revision ID: flight_routes
+Revises: product_search_index
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'flight_routes'
+down_revision = 'product_search_index'
+branch_labels = None
+depends_on = None
+
+AIRPORTS = [
+    ('LOS', 'Murtala Muhammed International Airport', 'Lagos', 'Nigeria'),
+    ('ABV', 'Nnamdi Azikiwe International Airport', 'Abuja', 'Nigeria'),
+    ('PHC', 'Port Harcourt International Airport', 'Port Harcourt', 'Nigeria'),
+    ('KAN', 'Mallam Aminu Kano International Airport', 'Kano', 'Nigeria'),
+    ('ENU', 'Akanu Ibiam International Airport', 'Enugu', 'Nigeria'),
+    ('QOW', 'Sam Mbakwe Airport', 'Owerri', 'Nigeria'),
+    ('BNI', 'Benin Airport', 'Benin City', 'Nigeria'),
+    ('IBA', 'Ibadan Airport', 'Ibadan', 'Nigeria'),
+    ('ILR', 'Ilorin International Airport', 'Ilorin', 'Nigeria'),
+    ('CBQ', 'Margaret Ekpo International Airport', 'Calabar', 'Nigeria'),
+    ('QUO', 'Victor Attah International Airport', 'Uyo', 'Nigeria'),
+    ('JOS', 'Yakubu Gowon Airport', 'Jos', 'Nigeria'),
+    ('KAD', 'Kaduna International Airport', 'Kaduna', 'Nigeria'),
+    ('SKO', 'Sadiq Abubakar III International Airport', 'Sokoto', 'Nigeria'),
+    ('ABB', 'Asaba International Airport', 'Asaba', 'Nigeria'),
+    ('ACC', 'Kotoka International Airport', 'Accra', 'Ghana'),
+    ('NBO', 'Jomo Kenyatta International Airport', 'Nairobi', 'Kenya'),
+    ('JNB', 'O. R. Tambo International Airport', 'Johannesburg', 'South Africa'),
+    ('CAI', 'Cairo International Airport', 'Cairo', 'Egypt'),
+    ('ADD', 'Addis Ababa Bole International Airport', 'Addis Ababa', 'Ethiopia'),
+    ('LHR', 'Heathrow Airport', 'London', 'United Kingdom'),
+    ('LGW', 'Gatwick Airport', 'London', 'United Kingdom'),
+    ('CDG', 'Charles de Gaulle Airport', 'Paris', 'France'),
+    ('AMS', 'Amsterdam Airport Schiphol', 'Amsterdam', 'Netherlands'),
+    ('FRA', 'Frankfurt Airport', 'Frankfurt', 'Germany'),
+    ('IST', 'Istanbul Airport', 'Istanbul', 'Turkey'),
+    ('DXB', 'Dubai International Airport', 'Dubai', 'United Arab Emirates'),
+    ('DOH', 'Hamad International Airport', 'Doha', 'Qatar'),
+    ('JFK', 'John F. Kennedy International Airport', 'New York', 'United States'),
+    ('IAD', 'Washington Dulles International Airport', 'Washington', 'United States'),
+    ('ATL', 'Hartsfield-Jackson Atlanta Airport', 'Atlanta', 'United States'),
+    ('IAH', 'George Bush Intercontinental Airport', 'Houston', 'United States'),
+    ('YYZ', 'Toronto Pearson International Airport', 'Toronto', 'Canada'),
+]
+
+# (alias, IATA code)
+AIRPORT_ALIASES = [
+    ('asaba', 'ABB'),
+    ('asaba international airport', 'ABB'),
+    ('abuja', 'ABV'),
+    ('nnamdi azikiwe', 'ABV'),
+    ('nnamdi azikiwe international airport', 'ABV'),
+    ('accra', 'ACC'),
+    ('kotoka', 'ACC'),
+    ('kotoka international airport', 'ACC'),
+    ('addis ababa', 'ADD'),
+    ('addis ababa bole international airport', 'ADD'),
+    ('bole', 'ADD'),
+    ('amsterdam', 'AMS'),
+    ('amsterdam airport schiphol', 'AMS'),
+    ('schiphol', 'AMS'),
+    ('atlanta', 'ATL'),
+    ('hartsfield jackson atlanta airport', 'ATL'),
+    ('benin', 'BNI'),
+    ('benin airport', 'BNI'),
+    ('benin city', 'BNI'),
+    ('cairo', 'CAI'),
+    ('cairo international airport', 'CAI'),
+    ('calabar', 'CBQ'),
+    ('margaret ekpo', 'CBQ'),
+    ('margaret ekpo international airport', 'CBQ'),
+    ('charles de gaulle', 'CDG'),
+    ('charles de gaulle airport', 'CDG'),
+    ('paris', 'CDG'),
+    ('doha', 'DOH'),
+    ('hamad', 'DOH'),
+    ('hamad international airport', 'DOH'),
+    ('dubai', 'DXB'),
+    ('dubai international airport', 'DXB'),
+    ('akanu ibiam', 'ENU'),
+    ('akanu ibiam international airport', 'ENU'),
+    ('enugu', 'ENU'),
+    ('frankfurt', 'FRA'),
+    ('frankfurt airport', 'FRA'),
+    ('dulles', 'IAD'),
+    ('washington', 'IAD'),
+    ('washington dulles international airport', 'IAD'),
+    ('george bush intercontinental airport', 'IAH'),
+    ('houston', 'IAH'),
+    ('ibadan', 'IBA'),
+    ('ibadan airport', 'IBA'),
+    ('ilorin', 'ILR'),
+    ('ilorin international airport', 'ILR'),
+    ('istanbul', 'IST'),
+    ('istanbul airport', 'IST'),
+    ('john f kennedy international airport', 'JFK'),
+    ('new york', 'JFK'),
+    ('johannesburg', 'JNB'),
+    ('o r tambo international airport', 'JNB'),
+    ('or tambo', 'JNB'),
+    ('yakubu gowon airport', 'JOS'),
+    ('kaduna', 'KAD'),
+    ('kaduna international airport', 'KAD'),
+    ('aminu kano', 'KAN'),
+    ('kano', 'KAN'),
+    ('mallam aminu kano international airport', 'KAN'),
+    ('gatwick', 'LGW'),
+    ('gatwick airport', 'LGW'),
+    ('heathrow', 'LHR'),
+    ('heathrow airport', 'LHR'),
+    ('london', 'LHR'),
+    ('ikeja', 'LOS'),
+    ('lagos', 'LOS'),
+    ('mmia', 'LOS'),
+    ('murtala muhammed', 'LOS'),
+    ('murtala muhammed international airport', 'LOS'),
+    ('jomo kenyatta', 'NBO'),
+    ('jomo kenyatta international airport', 'NBO'),
+    ('nairobi', 'NBO'),
+    ('omagwa', 'PHC'),
+    ('port harcourt', 'PHC'),
+    ('port harcourt international airport', 'PHC'),
+    ('owerri', 'QOW'),
+    ('sam mbakwe', 'QOW'),
+    ('sam mbakwe airport', 'QOW'),
+    ('uyo', 'QUO'),
+    ('victor attah', 'QUO'),
+    ('victor attah international airport', 'QUO'),
+    ('sadiq abubakar iii international airport', 'SKO'),
+    ('sokoto', 'SKO'),
+    ('pearson', 'YYZ'),
+    ('toronto', 'YYZ'),
+    ('toronto pearson international airport', 'YYZ'),
+]
+
+
+def upgrade() -> None:
+    airports = op.create_table('airports',
+    sa.Column('iata_code', sa.String(length=3), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('city', sa.String(length=100), nullable=False),
+    sa.Column('country', sa.String(length=100), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_airports_city'), 'airports', ['city'], unique=False)
+    op.create_index(op.f('ix_airports_iata_code'), 'airports', ['iata_code'], unique=True)
+    op.create_index(op.f('ix_airports_id'), 'airports', ['id'], unique=False)
+
+    op.create_table('airport_aliases',
+    sa.Column('alias', sa.String(length=100), nullable=False),
+    sa.Column('airport_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['airport_id'], ['airports.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_airport_aliases_airport_id'), 'airport_aliases', ['airport_id'], unique=False)
+    op.create_index(op.f('ix_airport_aliases_alias'), 'airport_aliases', ['alias'], unique=True)
+    op.create_index(op.f('ix_airport_aliases_id'), 'airport_aliases', ['id'], unique=False)
+
+    op.bulk_insert(
+        airports,
+        [
+            {'iata_code': code, 'name': name, 'city': city, 'country': country, 'is_active': True}
+            for code, name, city, country in AIRPORTS
+        ],
+    )
+    for alias, code in AIRPORT_ALIASES:
+        op.execute(
+            sa.text(
+                "INSERT INTO airport_aliases (alias, airport_id, is_active) "
+                "SELECT :alias, id, true FROM airports WHERE iata_code = :code"
+            ).bindparams(alias=alias, code=code)
+        )
+
+    # Normalize free-text places to IATA codes, then key every flight by route
+    for column in ('origin', 'destination'):
+        op.execute(
+            f"""
+            UPDATE flights f SET {column} = a.iata_code
+            FROM airport_aliases aa JOIN airports a ON a.id = aa.airport_id
+            WHERE lower(trim(f.{column})) = aa.alias
+            """
+        )
+        op.execute(f"UPDATE flights SET {column} = upper(trim({column}))")
+
+    op.add_column('flights', sa.Column('route_key', sa.String(length=21), nullable=True))
+    op.execute("UPDATE flights SET route_key = origin || '-' || destination")
+    op.create_index('ix_flights_route_departure', 'flights', ['route_key', 'departure_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_flights_route_departure', table_name='flights')
+    op.drop_column('flights', 'route_key')
+    op.drop_index(op.f('ix_airport_aliases_id'), table_name='airport_aliases')
+    op.drop_index(op.f('ix_airport_aliases_alias'), table_name='airport_aliases')
+    op.drop_index(op.f('ix_airport_aliases_airport_id'), table_name='airport_aliases')
+    op.drop_table('airport_aliases')
+    op.drop_index(op.f('ix_airports_id'), table_name='airports')
+    op.drop_index(op.f('ix_airports_iata_code'), table_name='airports')
+    op.drop_index(op.f('ix_airports_city'), table_name='airports')
+    op.drop_table('airports')
@@ -0,0 +1,49 @@
+"""Add (created_at, id) indexes for cursor pagination
+
+Revision ID: keyset_pagination_indexes
+Revises: email_outbox
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'keyset_pagination_indexes'
+down_revision = 'email_outbox'
+branch_labels = None
+depends_on = None
+
+# index name -> (table, only active rows); lists over active rows get partial indexes
+KEYSET_INDEXES = {
+    'ix_products_keyset': ('products', True),
+    'ix_deals_keyset': ('deals', True),
+    'ix_alert_history_keyset': ('alert_history', False),
+    'ix_properties_keyset': ('properties', True),
+    'ix_property_deals_keyset': ('property_deals', True),
+    'ix_property_alert_rules_keyset': ('property_alert_rules', True),
+    'ix_travel_alert_rules_keyset': ('travel_alert_rules', True),
+    'ix_utility_services_keyset': ('utility_services', True),
+    'ix_utility_deals_keyset': ('utility_deals', True),
+    'ix_utility_alert_rules_keyset': ('utility_alert_rules', True),
+}
+
+
+def upgrade() -> None:
+    for name, (table, active_only) in KEYSET_INDEXES.items():
+        # Predicates as each backend renders the lists' is_active filter,
+        # since SQLite only uses a partial index whose predicate it can match
+        op.create_index(
+            name,
+            table,
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_where=sa.text('is_active') if active_only else None,
+            sqlite_where=sa.text('is_active = 1') if active_only else None,
+        )
+
+
+def downgrade() -> None:
+    for name, (table, _) in KEYSET_INDEXES.items():
+        op.drop_index(name, table_name=table)
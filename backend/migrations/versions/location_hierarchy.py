@@ -0,0 +1,200 @@
+"""Add location hierarchy for properties
+
+Revision ID: location_hierarchy
+Revises: flight_routes
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'location_hierarchy'
+down_revision = 'flight_routes'
+branch_labels = None
+depends_on = None
+
+# Fixed copy of the location parser as of this revision, so later changes to
+# the app's gazetteer or parsing rules don't change what this backfill does
+STATES = [
+    'Abia', 'Adamawa', 'Akwa Ibom', 'Anambra', 'Bauchi', 'Bayelsa', 'Benue', 'Borno',
+    'Cross River', 'Delta', 'Ebonyi', 'Edo', 'Ekiti', 'Enugu', 'FCT', 'Gombe', 'Imo',
+    'Jigawa', 'Kaduna', 'Kano', 'Katsina', 'Kebbi', 'Kogi', 'Kwara', 'Lagos', 'Nasarawa',
+    'Niger', 'Ogun', 'Ondo', 'Osun', 'Oyo', 'Plateau', 'Rivers', 'Sokoto', 'Taraba',
+    'Yobe', 'Zamfara',
+]
+
+CITIES = {
+    'Lagos': [
+        'Lekki', 'Ajah', 'Ikoyi', 'Victoria Island', 'Ikeja', 'Yaba', 'Surulere', 'Gbagada',
+        'Magodo', 'Maryland', 'Ogudu', 'Ojodu', 'Isolo', 'Ikorodu', 'Festac', 'Apapa',
+        'Ikotun', 'Egbeda', 'Alimosho', 'Ojo', 'Badagry', 'Epe', 'Ibeju Lekki', 'Sangotedo',
+        'Oshodi', 'Agege', 'Mushin', 'Ilupeju', 'Ketu', 'Ogba', 'Lagos Island',
+    ],
+    'FCT': [
+        'Abuja', 'Asokoro', 'Maitama', 'Wuse', 'Garki', 'Gwarinpa', 'Jabi', 'Utako',
+        'Kubwa', 'Lugbe', 'Lokogoma', 'Katampe', 'Life Camp', 'Guzape', 'Kuje', 'Bwari',
+    ],
+    'Rivers': ['Port Harcourt', 'Obio Akpor', 'Eleme', 'Bonny'],
+    'Oyo': ['Ibadan', 'Ogbomoso', 'Oyo'],
+    'Ogun': ['Abeokuta', 'Sango Ota', 'Ota', 'Ijebu Ode', 'Mowe', 'Ibafo', 'Sagamu'],
+    'Enugu': ['Enugu', 'Nsukka'],
+    'Edo': ['Benin City', 'Benin'],
+    'Kano': ['Kano'],
+    'Kaduna': ['Kaduna', 'Zaria'],
+    'Delta': ['Asaba', 'Warri', 'Sapele'],
+    'Anambra': ['Awka', 'Onitsha', 'Nnewi'],
+    'Akwa Ibom': ['Uyo', 'Eket'],
+    'Cross River': ['Calabar'],
+    'Imo': ['Owerri'],
+    'Plateau': ['Jos'],
+    'Kwara': ['Ilorin'],
+}
+
+COUNTRY = {'nigeria', 'ng'}
+STATE_SUFFIX = re.compile(r'\s+state$')
+STATE_ALIASES = {'abuja fct': 'fct', 'federal capital territory': 'fct'}
+
+
+def slugify(text):
+    return '-'.join(re.sub(r'[^\w\s]', ' ', text.lower()).split())
+
+
+STATE_NAMES = {slugify(state): state for state in STATES}
+CITY_STATES = {slugify(city): (city, state) for state, cities in CITIES.items() for city in cities}
+
+
+def state_slug_of(part):
+    text = STATE_SUFFIX.sub('', part.lower())
+    slug = slugify(STATE_ALIASES.get(text, text))
+    return slug if slug in STATE_NAMES else None
+
+
+def known_city(part):
+    words = slugify(part).split('-')
+    for length in range(len(words), 0, -1):
+        match = CITY_STATES.get('-'.join(words[:length]))
+        if match:
+            return match
+    return None
+
+
+def parse_location(text):
+    """(level, name, key) path of a listing location, root first."""
+    parts = [' '.join(part.split()) for part in re.split(r'[,|/]', text or '')]
+    parts = [part for part in parts if part and part.lower() not in COUNTRY]
+    if not parts:
+        return []
+
+    state_slug = state_slug_of(parts[-1])
+    if state_slug:
+        parts.pop()
+    else:
+        city = known_city(parts[-1])
+        state_slug = slugify(city[1]) if city else None
+
+    while parts and state_slug and state_slug_of(parts[-1]) == state_slug:
+        parts.pop()
+
+    path = []
+    key = state_slug or '_'
+    if state_slug:
+        path.append(('state', STATE_NAMES[state_slug], key))
+    if not parts:
+        return path
+
+    city_name = parts.pop()
+    area_name = parts.pop() if parts else None
+    known = known_city(city_name)
+    if known and slugify(known[0]) != slugify(city_name) and area_name is None:
+        city_name, area_name = known[0], city_name
+    elif known:
+        city_name = known[0]
+
+    key = f'{key}/{slugify(city_name)}'
+    path.append(('city', city_name, key))
+    if area_name:
+        path.append(('area', area_name, f'{key}/{slugify(area_name)}'))
+    return path
+
+
+def upgrade() -> None:
+    op.create_table('locations',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('slug', sa.String(length=100), nullable=False),
+    sa.Column('level', sa.String(length=10), nullable=False),
+    sa.Column('key', sa.String(length=300), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('state_id', sa.Integer(), nullable=True),
+    sa.Column('city_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['parent_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_locations_city_id'), 'locations', ['city_id'], unique=False)
+    op.create_index(op.f('ix_locations_id'), 'locations', ['id'], unique=False)
+    op.create_index(op.f('ix_locations_key'), 'locations', ['key'], unique=True)
+    op.create_index(op.f('ix_locations_parent_id'), 'locations', ['parent_id'], unique=False)
+    op.create_index(op.f('ix_locations_slug'), 'locations', ['slug'], unique=False)
+    op.create_index(op.f('ix_locations_state_id'), 'locations', ['state_id'], unique=False)
+
+    op.add_column('properties', sa.Column('location_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_properties_location_id', 'properties', 'locations', ['location_id'], ['id']
+    )
+    op.create_index(op.f('ix_properties_location_id'), 'properties', ['location_id'], unique=False)
+
+    # Parse every distinct listing location once and point its properties at the node
+    conn = op.get_bind()
+    nodes = {}
+    for (text,) in conn.execute(sa.text("SELECT DISTINCT location FROM properties")):
+        parent = None
+        for level, name, key in parse_location(text):
+            if key not in nodes:
+                state_id = parent[1] if parent else None
+                city_id = parent[2] if parent else None
+                node_id = conn.execute(
+                    sa.text(
+                        "INSERT INTO locations (name, slug, level, key, parent_id, is_active) "
+                        "VALUES (:name, :slug, :level, :key, :parent_id, true) RETURNING id"
+                    ),
+                    {
+                        'name': name[:100],
+                        'slug': slugify(name)[:100],
+                        'level': level,
+                        'key': key[:300],
+                        'parent_id': parent[0] if parent else None,
+                    },
+                ).scalar()
+                state_id = node_id if level == 'state' else state_id
+                city_id = node_id if level == 'city' else city_id
+                conn.execute(
+                    sa.text("UPDATE locations SET state_id = :state_id, city_id = :city_id WHERE id = :id"),
+                    {'state_id': state_id, 'city_id': city_id, 'id': node_id},
+                )
+                nodes[key] = (node_id, state_id, city_id)
+            parent = nodes[key]
+        if parent:
+            conn.execute(
+                sa.text("UPDATE properties SET location_id = :id WHERE location = :location"),
+                {'id': parent[0], 'location': text},
+            )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_properties_location_id'), table_name='properties')
+    op.drop_constraint('fk_properties_location_id', 'properties', type_='foreignkey')
+    op.drop_column('properties', 'location_id')
+    op.drop_index(op.f('ix_locations_state_id'), table_name='locations')
+    op.drop_index(op.f('ix_locations_slug'), table_name='locations')
+    op.drop_index(op.f('ix_locations_parent_id'), table_name='locations')
+    op.drop_index(op.f('ix_locations_key'), table_name='locations')
+    op.drop_index(op.f('ix_locations_id'), table_name='locations')
+    op.drop_index(op.f('ix_locations_city_id'), table_name='locations')
+    op.drop_table('locations')
@@ -0,0 +1,139 @@
+"""Partition price history tables and add daily rollups
+
+Revision ID: partition_price_history
+Revises: travel_price_history
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_price_history'
+down_revision = 'travel_price_history'
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+# table -> (item column, referenced table)
+HISTORY_TABLES = {
+    'price_history': [('product_id', 'products')],
+    'travel_price_history': [('flight_id', 'flights'), ('hotel_id', 'hotels')],
+    'property_price_history': [('property_id', 'properties')],
+    'utility_price_history': [('service_id', 'utility_services')],
+}
+
+
+def _add_months(value, months):
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_table(conn, table, item_columns):
+    """Rebuild a plain table as a monthly range-partitioned table."""
+    legacy = f'{table}_legacy'
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    op.execute(f'ALTER TABLE {legacy} RENAME CONSTRAINT {table}_pkey TO {legacy}_pkey')
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE (created_at)'
+    )
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)')
+
+    oldest = conn.execute(sa.text(f'SELECT min(created_at) FROM {legacy}')).scalar()
+    today = datetime.now(timezone.utc).date()
+    month = date((oldest or today).year, (oldest or today).month, 1)
+    last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month.year:04d}{month.month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        month = upper
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+
+    sequence = conn.execute(
+        sa.text('SELECT pg_get_serial_sequence(:table, :column)'),
+        {'table': legacy, 'column': 'id'},
+    ).scalar()
+    if sequence:
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}.id')
+
+    op.execute(f'DROP TABLE {legacy}')
+
+    for column, referenced in item_columns:
+        op.create_foreign_key(None, table, referenced, [column], ['id'])
+        op.create_index(f'ix_{table}_{column}_created_at', table, [column, 'created_at'], unique=False)
+    op.create_index(f'ix_{table}_created_at', table, ['created_at'], unique=False)
+
+
+def _unpartition_table(conn, table, item_columns):
+    """Rebuild a partitioned table as a plain table."""
+    partitioned = f'{table}_partitioned'
+    op.execute(f'ALTER TABLE {table} RENAME TO {partitioned}')
+    op.execute(f'ALTER TABLE {partitioned} RENAME CONSTRAINT {table}_pkey TO {partitioned}_pkey')
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    op.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+
+    sequence = conn.execute(
+        sa.text('SELECT pg_get_serial_sequence(:table, :column)'),
+        {'table': partitioned, 'column': 'id'},
+    ).scalar()
+    if sequence:
+        op.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}.id')
+
+    op.execute(f'DROP TABLE {partitioned} CASCADE')
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
+
+    op.create_index(op.f(f'ix_{table}_id'), table, ['id'], unique=False)
+    for column, referenced in item_columns:
+        op.create_foreign_key(None, table, referenced, [column], ['id'])
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+
+
+def upgrade() -> None:
+    op.create_table('price_history_daily',
+    sa.Column('category', sa.String(length=20), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('open_price', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('high_price', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('low_price', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('close_price', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('avg_price', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('sample_count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('category', 'item_id', 'day', name='uq_price_history_daily_item_day')
+    )
+    op.create_index(op.f('ix_price_history_daily_id'), 'price_history_daily', ['id'], unique=False)
+
+    # Range partitioning is Postgres-only; other backends keep plain tables
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+
+    for table, item_columns in HISTORY_TABLES.items():
+        _partition_table(conn, table, item_columns)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'postgresql':
+        for table, item_columns in HISTORY_TABLES.items():
+            _unpartition_table(conn, table, item_columns)
+
+    op.drop_index(op.f('ix_price_history_daily_id'), table_name='price_history_daily')
+    op.drop_table('price_history_daily')
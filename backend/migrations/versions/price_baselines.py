@@ -0,0 +1,51 @@
+"""Add robust baseline price state to snapshots
+
+Revision ID: price_baselines
+Revises: price_window_extremes
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from datetime import date, timedelta
+from itertools import groupby
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.price_history.baselines import BASELINE_DAYS, PriceBaselines
+
+
+# revision identifiers, used by Alembic.
+revision = 'price_baselines'
+down_revision = 'price_window_extremes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('price_snapshots', sa.Column('baselines', sa.Text(), nullable=True))
+
+    # Seed each item's daily closes from its rollups
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT category, item_id, day, close_price FROM price_history_daily "
+            "WHERE day >= :since ORDER BY category, item_id, day"
+        ),
+        {'since': date.today() - timedelta(days=BASELINE_DAYS)},
+    )
+    for (category, item_id), days in groupby(rows, key=lambda row: (row.category, row.item_id)):
+        conn.execute(
+            sa.text(
+                "UPDATE price_snapshots SET baselines = :baselines "
+                "WHERE category = :category AND item_id = :item_id"
+            ),
+            {
+                'baselines': PriceBaselines.from_rollups(days).dumps(),
+                'category': category,
+                'item_id': item_id,
+            },
+        )
+
+
+def downgrade() -> None:
+    op.drop_column('price_snapshots', 'baselines')
@@ -0,0 +1,40 @@
+"""Add price change events for incremental deal detection
+
+Revision ID: price_change_events
+Revises: product_matching
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'price_change_events'
+down_revision = 'product_matching'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('price_change_events',
+    sa.Column('category', sa.String(length=20), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('old_price', sa.DECIMAL(precision=15, scale=2), nullable=True),
+    sa.Column('new_price', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('observed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_price_change_events_id'), 'price_change_events', ['id'], unique=False)
+    op.create_index('ix_price_change_events_queue', 'price_change_events', ['category', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_price_change_events_queue', table_name='price_change_events')
+    op.drop_index(op.f('ix_price_change_events_id'), table_name='price_change_events')
+    op.drop_table('price_change_events')
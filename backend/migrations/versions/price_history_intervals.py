@@ -0,0 +1,35 @@
+"""Add change-only interval columns to price history tables
+
+Revision ID: price_history_intervals
+Revises: partition_price_history
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'price_history_intervals'
+down_revision = 'partition_price_history'
+branch_labels = None
+depends_on = None
+
+HISTORY_TABLES = [
+    'price_history',
+    'travel_price_history',
+    'property_price_history',
+    'utility_price_history',
+]
+
+
+def upgrade() -> None:
+    for table in HISTORY_TABLES:
+        op.add_column(table, sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=True))
+        op.add_column(table, sa.Column('observations', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    for table in HISTORY_TABLES:
+        op.drop_column(table, 'observations')
+        op.drop_column(table, 'last_seen_at')
@@ -0,0 +1,41 @@
+"""Store running sums on daily price rollups
+
+Revision ID: price_history_rollup_sums
+Revises: price_history_intervals
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'price_history_rollup_sums'
+down_revision = 'price_history_intervals'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('price_history_daily', sa.Column('price_sum', sa.Numeric(precision=30, scale=2), nullable=True))
+    op.add_column('price_history_daily', sa.Column('price_sumsq', sa.Numeric(precision=38, scale=4), nullable=True))
+
+    # Existing rows only kept the average; their within-day variance is lost
+    op.execute(
+        'UPDATE price_history_daily '
+        'SET price_sum = avg_price * sample_count, '
+        'price_sumsq = avg_price * avg_price * sample_count'
+    )
+
+    op.alter_column('price_history_daily', 'price_sum', existing_type=sa.Numeric(precision=30, scale=2), nullable=False)
+    op.alter_column('price_history_daily', 'price_sumsq', existing_type=sa.Numeric(precision=38, scale=4), nullable=False)
+    op.drop_column('price_history_daily', 'avg_price')
+
+
+def downgrade() -> None:
+    op.add_column('price_history_daily', sa.Column('avg_price', sa.DECIMAL(precision=15, scale=2), nullable=True))
+    op.execute('UPDATE price_history_daily SET avg_price = price_sum / sample_count')
+
+    op.alter_column('price_history_daily', 'avg_price', existing_type=sa.DECIMAL(precision=15, scale=2), nullable=False)
+    op.drop_column('price_history_daily', 'price_sumsq')
+    op.drop_column('price_history_daily', 'price_sum')
@@ -0,0 +1,89 @@
+"""Add latest price snapshots
+
+Revision ID: price_snapshots
+Revises: price_history_rollup_sums
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'price_snapshots'
+down_revision = 'price_history_rollup_sums'
+branch_labels = None
+depends_on = None
+
+# category -> (history table, item column, availability column)
+SNAPSHOT_SOURCES = {
+    'ecommerce': ('price_history', 'product_id', 'availability'),
+    'flight': ('travel_price_history', 'flight_id', None),
+    'hotel': ('travel_price_history', 'hotel_id', None),
+    'property': ('property_price_history', 'property_id', 'listing_status'),
+    'utility': ('utility_price_history', 'service_id', None),
+}
+
+
+def _backfill(category, table, item_column, availability_column):
+    """Snapshot each item's latest history row, with the row before it as previous."""
+    availability = f'latest.{availability_column}' if availability_column else 'NULL'
+    op.execute(
+        f"""
+        WITH ranked AS (
+            SELECT h.*, row_number() OVER (
+                PARTITION BY h.{item_column} ORDER BY h.created_at DESC, h.id DESC
+            ) AS position
+            FROM {table} h
+            WHERE h.{item_column} IS NOT NULL
+        )
+        INSERT INTO price_snapshots (
+            category, item_id, current_price, previous_price, currency, availability,
+            last_changed_at, last_seen_at, low_7d, high_7d, created_at, updated_at, is_active
+        )
+        SELECT
+            '{category}', latest.{item_column}, latest.price, previous.price, latest.currency,
+            {availability}, latest.created_at, COALESCE(latest.last_seen_at, latest.created_at),
+            (SELECT min(d.low_price) FROM price_history_daily d
+             WHERE d.category = '{category}' AND d.item_id = latest.{item_column}
+             AND d.day >= CURRENT_DATE - 6),
+            (SELECT max(d.high_price) FROM price_history_daily d
+             WHERE d.category = '{category}' AND d.item_id = latest.{item_column}
+             AND d.day >= CURRENT_DATE - 6),
+            now(), now(), true
+        FROM ranked latest
+        LEFT JOIN ranked previous
+            ON previous.{item_column} = latest.{item_column} AND previous.position = 2
+        WHERE latest.position = 1
+        """
+    )
+
+
+def upgrade() -> None:
+    op.create_table('price_snapshots',
+    sa.Column('category', sa.String(length=20), nullable=False),
+    sa.Column('item_id', sa.Integer(), nullable=False),
+    sa.Column('current_price', sa.DECIMAL(precision=15, scale=2), nullable=False),
+    sa.Column('previous_price', sa.DECIMAL(precision=15, scale=2), nullable=True),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('availability', sa.String(length=50), nullable=True),
+    sa.Column('last_changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_seen_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('low_7d', sa.DECIMAL(precision=15, scale=2), nullable=True),
+    sa.Column('high_7d', sa.DECIMAL(precision=15, scale=2), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('category', 'item_id', name='uq_price_snapshots_item')
+    )
+    op.create_index(op.f('ix_price_snapshots_id'), 'price_snapshots', ['id'], unique=False)
+
+    for category, (table, item_column, availability_column) in SNAPSHOT_SOURCES.items():
+        _backfill(category, table, item_column, availability_column)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_price_snapshots_id'), table_name='price_snapshots')
+    op.drop_table('price_snapshots')
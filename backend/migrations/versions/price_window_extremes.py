@@ -0,0 +1,64 @@
+"""Add sliding-window price extremes to snapshots
+
+Revision ID: price_window_extremes
+Revises: price_change_events
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.price_history.extremes import HORIZON_HOURS, RollingExtremes
+
+
+# revision identifiers, used by Alembic.
+revision = 'price_window_extremes'
+down_revision = 'price_change_events'
+branch_labels = None
+depends_on = None
+
+# category -> (history table, item column)
+HISTORY_SOURCES = {
+    'ecommerce': ('price_history', 'product_id'),
+    'flight': ('travel_price_history', 'flight_id'),
+    'hotel': ('travel_price_history', 'hotel_id'),
+    'property': ('property_price_history', 'property_id'),
+    'utility': ('utility_price_history', 'service_id'),
+}
+
+
+def upgrade() -> None:
+    op.add_column('price_snapshots', sa.Column('extremes', sa.Text(), nullable=True))
+
+    # Replay each item's intervals from the longest window into its state
+    conn = op.get_bind()
+    since = datetime.now(timezone.utc) - timedelta(hours=HORIZON_HOURS)
+    for category, (table, item_column) in HISTORY_SOURCES.items():
+        rows = conn.execute(
+            sa.text(
+                f"SELECT {item_column} AS item_id, price, created_at, last_seen_at FROM {table} "
+                f"WHERE {item_column} IS NOT NULL "
+                "AND COALESCE(last_seen_at, created_at) >= :since "
+                f"ORDER BY {item_column}, created_at, id"
+            ),
+            {'since': since},
+        )
+        for item_id, intervals in groupby(rows, key=lambda row: row.item_id):
+            conn.execute(
+                sa.text(
+                    "UPDATE price_snapshots SET extremes = :extremes "
+                    "WHERE category = :category AND item_id = :item_id"
+                ),
+                {
+                    'extremes': RollingExtremes.from_intervals(intervals).dumps(),
+                    'category': category,
+                    'item_id': item_id,
+                },
+            )
+
+
+def downgrade() -> None:
+    op.drop_column('price_snapshots', 'extremes')
@@ -0,0 +1,93 @@
+"""Add cross-retailer product matching
+
+Revision ID: product_matching
+Revises: location_hierarchy
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.ecommerce.services.product_matching import (
+    band_keys,
+    canonical_url,
+    is_match,
+    signature_tokens,
+    similarity,
+)
+
+
+# revision identifiers, used by Alembic.
+revision = 'product_matching'
+down_revision = 'location_hierarchy'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('canonical_url', sa.Text(), nullable=True))
+    op.add_column('products', sa.Column('match_group_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_products_canonical_url'), 'products', ['canonical_url'], unique=False)
+    op.create_index(op.f('ix_products_match_group_id'), 'products', ['match_group_id'], unique=False)
+
+    buckets = op.create_table('product_match_buckets',
+    sa.Column('band_key', sa.String(length=24), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_product_match_buckets_band_key'), 'product_match_buckets', ['band_key'], unique=False)
+    op.create_index(op.f('ix_product_match_buckets_id'), 'product_match_buckets', ['id'], unique=False)
+    op.create_index(op.f('ix_product_match_buckets_product_id'), 'product_match_buckets', ['product_id'], unique=False)
+
+    # Match existing products in id order, as if they had been added one by one
+    conn = op.get_bind()
+    tokens_by_id = {}
+    groups = {}
+    bucket_members = {}
+    rows = []
+    for product_id, name, url in conn.execute(
+        sa.text("SELECT id, name, url FROM products ORDER BY id")
+    ):
+        tokens = signature_tokens(name)
+        keys = band_keys(tokens)
+        candidates = {other for key in keys for other in bucket_members.get(key, ())}
+
+        group_id, best_score = product_id, 0.0
+        for other in sorted(candidates):
+            if is_match(tokens, tokens_by_id[other]):
+                score = similarity(tokens, tokens_by_id[other])
+                if score > best_score:
+                    group_id, best_score = groups[other], score
+
+        tokens_by_id[product_id] = tokens
+        groups[product_id] = group_id
+        for key in keys:
+            bucket_members.setdefault(key, []).append(product_id)
+            rows.append({'band_key': key, 'product_id': product_id, 'is_active': True})
+
+        conn.execute(
+            sa.text(
+                "UPDATE products SET canonical_url = :canonical_url, match_group_id = :group_id "
+                "WHERE id = :id"
+            ),
+            {'canonical_url': canonical_url(url), 'group_id': group_id, 'id': product_id},
+        )
+
+    if rows:
+        op.bulk_insert(buckets, rows)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_product_match_buckets_product_id'), table_name='product_match_buckets')
+    op.drop_index(op.f('ix_product_match_buckets_id'), table_name='product_match_buckets')
+    op.drop_index(op.f('ix_product_match_buckets_band_key'), table_name='product_match_buckets')
+    op.drop_table('product_match_buckets')
+    op.drop_index(op.f('ix_products_match_group_id'), table_name='products')
+    op.drop_index(op.f('ix_products_canonical_url'), table_name='products')
+    op.drop_column('products', 'match_group_id')
+    op.drop_column('products', 'canonical_url')
@@ -0,0 +1,51 @@
+"""Add full-text and trigram search indexes on products
+
+Revision ID: product_search_index
+Revises: price_snapshots
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'product_search_index'
+down_revision = 'price_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Full-text and trigram search are Postgres-only; other backends scan names
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Name words rank above category and site words
+    op.execute(
+        """
+        ALTER TABLE products ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(category, '') || ' ' || coalesce(site, '')), 'B')
+        ) STORED
+        """
+    )
+    op.create_index(
+        'ix_products_search_vector', 'products', ['search_vector'],
+        unique=False, postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_products_name_trgm', 'products', ['name'],
+        unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_products_name_trgm', table_name='products')
+    op.drop_index('ix_products_search_vector', table_name='products')
+    op.drop_column('products', 'search_vector')
@@ -0,0 +1,37 @@
+"""Add job watermarks for change-driven watchlist alerts
+
+Revision ID: watchlist_alert_watermark
+Revises: active_deal_upserts
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'watchlist_alert_watermark'
+down_revision = 'active_deal_upserts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('job_watermarks',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_job_watermarks_id'), 'job_watermarks', ['id'], unique=False)
+    op.create_index('ix_price_snapshots_last_changed', 'price_snapshots', ['last_changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_price_snapshots_last_changed', table_name='price_snapshots')
+    op.drop_index(op.f('ix_job_watermarks_id'), table_name='job_watermarks')
+    op.drop_table('job_watermarks')
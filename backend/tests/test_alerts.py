@@ -1,12 +1,34 @@
 """Unit tests for alert system functionality."""
 
+import json
 import unittest
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.alerts.deliveries import AlertDeliveryStore, Delivery, DeliveryKey
+from app.core.alerts.rule_index import AlertRuleIndex, IndexedRule, ProductRuleIndex
 from app.core.alerts.rules_engine import AlertRulesEngine
-from app.core.models.alert import AlertRule
+from app.core.alerts.watchlists import WatchlistAlertEvaluator
+from app.core.models.alert import AlertHistory, AlertRule
+from app.core.models.alert_delivery import AlertDelivery
+from app.core.models.email_outbox import EmailOutbox
+from app.core.models.job_watermark import JobWatermark
+from app.core.models.price_snapshot import PriceSnapshot
+from app.core.models.user import User
 from app.core.notifications.service import NotificationService
+from app.core.services.notification_service import Notification
+from app.ecommerce.models import Product
+from app.ecommerce.models.watchlist import Watchlist
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.real_estate.models import Location, Property, PropertyWatchlist
+from app.travel.models import Flight, Hotel
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
+from app.travel.models.watchlist import TravelWatchlist
 
 
 class TestAlertRulesEngine(unittest.TestCase):
@@ -84,6 +106,194 @@ class TestAlertRulesEngine(unittest.TestCase):
         self.assertIsNone(result)
 
 
+class TestProductRuleIndex(unittest.TestCase):
+    """Test matching prices against indexed alert rules."""
+
+    def setUp(self):
+        """Set up rules of every type for one product."""
+        rules = [
+            IndexedRule(1, 1, "threshold", Decimal("15.00"), None),
+            IndexedRule(2, 1, "threshold", Decimal("10.00"), None),
+            IndexedRule(3, 1, "threshold", Decimal("18.00"), None),
+            IndexedRule(4, 1, "price_drop", None, Decimal("10")),
+            IndexedRule(5, 1, "price_drop", None, Decimal("30")),
+            IndexedRule(6, 1, "price_drop", None, None),
+            IndexedRule(7, 1, "deal_appeared", None, None),
+        ]
+        self.index = ProductRuleIndex(rules)
+
+    def matched(self, current_price, previous_price=None):
+        """Ids of the rules a price triggers."""
+        return sorted(rule.id for rule in self.index.match(current_price, previous_price))
+
+    def test_thresholds(self):
+        """Test thresholds at or above the price trigger."""
+        self.assertEqual(self.matched(Decimal("15.00")), [1, 3])
+        self.assertEqual(self.matched(Decimal("9.99")), [1, 2, 3])
+        self.assertEqual(self.matched(Decimal("20.00")), [])
+
+    def test_drop_buckets(self):
+        """Test drop rules trigger up to the drop's percentage."""
+        # 12% drop: the 5% default and 10% buckets, and the deal rule
+        self.assertEqual(self.matched(Decimal("22.00"), Decimal("25.00")), [4, 6, 7])
+        # 6% drop
+        self.assertEqual(self.matched(Decimal("23.50"), Decimal("25.00")), [6])
+        # Price increase
+        self.assertEqual(self.matched(Decimal("30.00"), Decimal("25.00")), [])
+        self.assertEqual(len(self.index), 7)
+
+
+class TestIndexedEvaluation(unittest.IsolatedAsyncioTestCase):
+    """Test price changes are evaluated through the rule index."""
+
+    async def asyncSetUp(self):
+        """Set up a product with two threshold rules."""
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            for model in (Product, AlertRule, AlertHistory, AlertDelivery, PriceSnapshot):
+                await conn.run_sync(model.__table__.create)
+        self.db = AsyncSession(self.engine, expire_on_commit=False)
+        self.db.add_all(
+            [
+                AlertRule(product_id=1, rule_type="threshold", threshold_value=Decimal("15")),
+                AlertRule(product_id=1, rule_type="threshold", threshold_value=Decimal("12")),
+            ]
+        )
+        await self.db.commit()
+        self.index = AlertRuleIndex(ttl=3600)
+        deliveries = patch("app.core.alerts.rules_engine.alert_deliveries", AlertDeliveryStore())
+        deliveries.start()
+        self.addCleanup(deliveries.stop)
+
+    async def asyncTearDown(self):
+        """Close the database."""
+        await self.db.close()
+        await self.engine.dispose()
+
+    async def test_triggered_rules_are_saved_together(self):
+        """Test only triggered rules produce history rows."""
+        with patch("app.core.alerts.rules_engine.alert_rule_index", self.index):
+            alerts = await AlertRulesEngine(self.db).evaluate_price_change(
+                1, Decimal("14"), Decimal("20")
+            )
+
+        self.assertEqual([alert.alert_rule_id for alert in alerts], [1])
+        self.assertIsNotNone(alerts[0].id)
+        self.assertEqual(await self.db.scalar(select(func.count(AlertHistory.id))), 1)
+
+    async def test_repeated_alerts_are_suppressed(self):
+        """Test a rule that keeps triggering alerts again only on a further drop."""
+        with patch("app.core.alerts.rules_engine.alert_rule_index", self.index):
+            engine = AlertRulesEngine(self.db)
+            await engine.evaluate_price_change(1, Decimal("14"), Decimal("20"))
+            repeated = await engine.evaluate_price_change(1, Decimal("14"), Decimal("14.50"))
+            further = await engine.evaluate_price_change(1, Decimal("11"), Decimal("14"))
+
+        self.assertEqual(repeated, [])
+        # Rule 1 had dropped 5% below its last alert, rule 2 never alerted
+        self.assertEqual(sorted(alert.alert_rule_id for alert in further), [1, 2])
+        self.assertEqual(await self.db.scalar(select(func.count(AlertHistory.id))), 3)
+
+    async def test_new_rules_invalidate_the_index(self):
+        """Test a cached index is rebuilt once the product's rules change."""
+        with patch("app.core.alerts.rules_engine.alert_rule_index", self.index):
+            engine = AlertRulesEngine(self.db)
+            self.assertEqual(len(await self.index.get(self.db, 1)), 2)
+
+            await engine.create_alert_rule(1, "threshold", threshold_value=Decimal("20"))
+
+            self.assertEqual(len(await self.index.get(self.db, 1)), 3)
+
+
+class TestAlertDeliveryStore(unittest.TestCase):
+    """Test the repeat policy of alert deliveries."""
+
+    def setUp(self):
+        """Set up a store with a day's cooldown and a 5% repeat drop."""
+        self.store = AlertDeliveryStore(
+            cooldown=timedelta(hours=24), repeat_drop_percent=5, max_entries=2
+        )
+        self.now = datetime.now(timezone.utc)
+
+    def test_should_send(self):
+        """Test alerts repeat after the cooldown or a further drop."""
+        last = Delivery(Decimal("100"), self.now - timedelta(hours=1))
+        self.assertTrue(self.store.should_send(None, Decimal("100"), self.now))
+        self.assertFalse(self.store.should_send(last, Decimal("100"), self.now))
+        self.assertFalse(self.store.should_send(last, Decimal("96"), self.now))
+        self.assertTrue(self.store.should_send(last, Decimal("95"), self.now))
+        self.assertTrue(
+            self.store.should_send(last, Decimal("100"), self.now + timedelta(hours=23))
+        )
+
+    def test_cache_is_bounded(self):
+        """Test the least recently used deliveries are evicted."""
+        for item_id in range(3):
+            self.store._remember(
+                ("user", "ecommerce", item_id, "price_drop"), Delivery(Decimal("1"), self.now)
+            )
+        self.assertEqual([key[2] for key in self.store._cache], [1, 2])
+
+    def test_cache_defers_to_other_processes(self):
+        """Test a cached delivery the cooldown let through is checked against the table."""
+        engine = create_engine("sqlite://")
+        AlertDelivery.__table__.create(engine)
+        other = AlertDeliveryStore(cooldown=timedelta(hours=24), repeat_drop_percent=5)
+        key = DeliveryKey(1, "ecommerce", 1, "price_drop")
+        later = self.now + timedelta(hours=25)
+
+        with Session(engine) as db:
+            self.assertEqual(self.store.claim(db, [(key, Decimal("100"))], now=self.now), {key})
+            db.commit()
+            # Another process sends once the cooldown passes
+            self.assertEqual(other.claim(db, [(key, Decimal("100"))], now=later), {key})
+            db.commit()
+
+            # This store's cached delivery is past its cooldown, the table's is not
+            self.assertEqual(self.store.claim(db, [(key, Decimal("100"))], now=later), set())
+        engine.dispose()
+
+    def test_record_in_chunks(self):
+        """Test deliveries beyond one upsert statement's chunk are all recorded."""
+        engine = create_engine("sqlite://")
+        AlertDelivery.__table__.create(engine)
+        inserts = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: inserts.append(statement)
+            if statement.startswith("INSERT")
+            else None,
+        )
+        alerts = [
+            (DeliveryKey(user_id, "ecommerce", 1, "price_drop"), Decimal("100"))
+            for user_id in range(250)
+        ]
+
+        with patch("app.core.alerts.deliveries.RECORD_CHUNK_SIZE", 100), Session(engine) as db:
+            self.assertEqual(len(self.store.claim(db, alerts, now=self.now)), 250)
+            db.commit()
+            self.assertEqual(db.scalar(select(func.count(AlertDelivery.id))), 250)
+        self.assertEqual(len(inserts), 3)
+        engine.dispose()
+
+    def test_purge(self):
+        """Test deliveries past the cooldown are purged."""
+        engine = create_engine("sqlite://")
+        AlertDelivery.__table__.create(engine)
+        keys = [DeliveryKey(1, "ecommerce", item_id, "price_drop") for item_id in (1, 2)]
+
+        with Session(engine) as db:
+            self.store.claim(db, [(keys[0], Decimal("100"))], now=self.now - timedelta(hours=30))
+            self.store.claim(db, [(keys[1], Decimal("100"))], now=self.now - timedelta(hours=1))
+            db.commit()
+
+            self.assertEqual(self.store.purge(db, now=self.now), 1)
+            db.commit()
+            self.assertEqual(db.scalars(select(AlertDelivery.item_id)).all(), [2])
+        engine.dispose()
+
+
 class TestNotificationService(unittest.TestCase):
     """Test notification service functionality."""
 
@@ -123,3 +333,133 @@ class TestNotificationService(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+class TestWatchlistAlerts(unittest.TestCase):
+    """Test watchlist alerts are evaluated from price changes since the watermark."""
+
+    def setUp(self):
+        """Set up watchlisted products whose prices changed at different times."""
+        self.engine = create_engine("sqlite://")
+        for model in (
+            User,
+            Product,
+            Watchlist,
+            Location,
+            Property,
+            PropertyWatchlist,
+            Flight,
+            Hotel,
+            TravelWatchlist,
+            PriceSnapshot,
+            Notification,
+            JobWatermark,
+        ):
+            model.__table__.create(self.engine)
+        AlertDelivery.__table__.create(self.engine)
+        EmailOutbox.__table__.create(self.engine)
+        self.db = Session(self.engine)
+
+        self.now = datetime.now(timezone.utc)
+        self.db.add(User(email="user@example.com", hashed_password="x"))
+        self.db.add(
+            JobWatermark(name="watchlist_alerts", watermark=self.now - timedelta(hours=1))
+        )
+        changes = (
+            # (price, previous price, target, changed minutes ago)
+            (80, 100, None, 10),  # dropped
+            (120, 100, None, 10),  # rose
+            (90, 100, 95, 20),  # crossed its target
+            (70, 80, 95, 20),  # already below its target, dropped further
+            (50, 100, None, 120),  # dropped before the watermark
+        )
+        for number, (price, previous, target, minutes) in enumerate(changes, start=1):
+            self.db.add(
+                Product(name=f"Product {number}", url=f"https://example.com/{number}", site="ex")
+            )
+            self.db.add(Watchlist(user_id=1, product_id=number, target_price=target))
+            changed_at = self.now - timedelta(minutes=minutes)
+            self.db.add(
+                PriceSnapshot(
+                    category="ecommerce",
+                    item_id=number,
+                    current_price=price,
+                    previous_price=previous,
+                    last_changed_at=changed_at,
+                    last_seen_at=changed_at,
+                )
+            )
+        self.db.commit()
+        self.evaluator = WatchlistAlertEvaluator(
+            lag=timedelta(minutes=5), deliveries=AlertDeliveryStore()
+        )
+
+    def tearDown(self):
+        """Close the session."""
+        self.db.close()
+
+    def test_alerts_changed_prices_once(self):
+        """Test only drops and target crossings since the watermark alert, once."""
+        alerts = self.evaluator.evaluate(self.db, now=self.now)
+        self.db.commit()
+
+        notifications = {n.title: n for n in self.db.scalars(select(Notification))}
+        emails = self.db.scalars(select(EmailOutbox.payload)).all()
+        self.assertEqual(alerts, 3)
+        self.assertEqual(
+            sorted(json.loads(payload)["product_name"] for payload in emails),
+            ["Product 1", "Product 3", "Product 4"],
+        )
+        self.assertEqual(self.db.scalar(select(func.count(Notification.id))), 3)
+        self.assertIn("Target Price Reached", notifications)
+
+        # The watermark moved up to the lag, so nothing alerts again
+        self.assertEqual(self.evaluator.evaluate(self.db, now=self.now), 0)
+        self.assertEqual(self.db.scalar(select(func.count(Notification.id))), 3)
+
+    def test_repeated_drops_wait_for_cooldown(self):
+        """Test a drop alerted recently is repeated only once it drops further."""
+        self.evaluator.evaluate(self.db, now=self.now)
+        self.db.commit()
+
+        later = self.now + timedelta(hours=1)
+        for price in (Decimal("79"), Decimal("75")):
+            snapshot = self.db.scalar(select(PriceSnapshot).where(PriceSnapshot.item_id == 1))
+            snapshot.previous_price = snapshot.current_price
+            snapshot.current_price = price
+            snapshot.last_changed_at = later - timedelta(minutes=10)
+            self.db.commit()
+            alerts = self.evaluator.evaluate(self.db, now=later)
+            self.db.commit()
+            later += timedelta(minutes=30)
+
+            # 79 is within 5% of the alerted 80, 75 is not
+            self.assertEqual(alerts, 0 if price == Decimal("79") else 1)
+
+        self.assertEqual(self.db.scalar(select(func.count(AlertDelivery.id))), 3)
+
+    def test_target_reached_in_several_changes(self):
+        """Test a target passed by more than one change within a run still alerts."""
+        self.db.add(Product(name="Product 6", url="https://example.com/6", site="ex"))
+        self.db.add(
+            Watchlist(user_id=1, product_id=6, target_price=100, alert_on_any_drop=False)
+        )
+        # 200 -> 90 -> 80 between two runs leaves 90 as the previous price
+        changed_at = self.now - timedelta(minutes=10)
+        self.db.add(
+            PriceSnapshot(
+                category="ecommerce",
+                item_id=6,
+                current_price=80,
+                previous_price=90,
+                last_changed_at=changed_at,
+                last_seen_at=changed_at,
+            )
+        )
+        self.db.commit()
+
+        self.evaluator.evaluate(self.db, now=self.now)
+        self.db.commit()
+
+        messages = self.db.scalars(select(Notification.message)).all()
+        self.assertIn("Product 6 is now at your target price of ₦100.00", messages)
@@ -0,0 +1,159 @@
+"""Tests for prefix autocomplete."""
+
+import asyncio
+import time
+import unittest
+from datetime import date
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.autocomplete.prefix_index import PrefixIndex
+from app.core.autocomplete.service import AutocompleteService
+from app.ecommerce.models import Product
+from app.ecommerce.models.watchlist import Watchlist
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.real_estate.models.property import Property
+from app.real_estate.models.watchlist import PropertyWatchlist
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
+from app.travel.models.flight import Flight
+from app.travel.models.hotel import Hotel
+from app.travel.models.watchlist import TravelWatchlist
+
+
+class TestPrefixIndex(unittest.TestCase):
+    """Test the sorted-array prefix index."""
+
+    def setUp(self):
+        """Index a few products."""
+        self.index = PrefixIndex(top_k=5)
+        self.index.add("Apple iPhone 13 Pro", 1)
+        self.index.add("Apple iPhone 13", 2, weight=3)
+        self.index.add("Apple MacBook Air", 3, weight=1)
+        self.index.add("iPad Mini", 4)
+
+    def texts(self, prefix, limit=10):
+        """Texts of the suggestions for a prefix."""
+        return [s.text for s in self.index.search(prefix, limit)]
+
+    def test_matches_any_word_start(self):
+        """Test prefixes match the start of any word, ranked by weight."""
+        self.assertEqual(self.texts("iph"), ["Apple iPhone 13", "Apple iPhone 13 Pro"])
+        self.assertEqual(self.texts("iphone 13 p"), ["Apple iPhone 13 Pro"])
+        self.assertEqual(self.texts("IP"), ["Apple iPhone 13", "iPad Mini", "Apple iPhone 13 Pro"])
+        self.assertEqual(self.texts("samsung"), [])
+
+    def test_short_prefixes_match_scan(self):
+        """Test precomputed short prefix lists agree with a full range scan."""
+        self.assertEqual(self.texts("app", limit=5), self.texts("app", limit=10))
+        self.assertEqual(
+            self.texts("a", limit=5),
+            ["Apple iPhone 13", "Apple MacBook Air", "Apple iPhone 13 Pro"],
+        )
+
+    def test_weight_updates(self):
+        """Test added weight reorders suggestions and items without ids merge by text."""
+        self.index.add("iPad Mini", 4, weight=10)
+        self.assertEqual(self.texts("i", limit=1), ["iPad Mini"])
+
+        self.index.add("Lagos", weight=1)
+        self.index.add("LAGOS ", weight=1)
+        [lagos] = self.index.search("lag")
+        self.assertEqual(lagos.weight, 2)
+
+    def test_lookup_time_independent_of_catalog(self):
+        """Test a short prefix answers quickly from a large index."""
+        index = PrefixIndex()
+        for i in range(20000):
+            index.add(f"Product {i} model x{i % 97}", i, weight=i % 13)
+        index.flush()
+
+        start = time.perf_counter()
+        for prefix in ("p", "pr", "pro", "product 1", "model x5"):
+            self.assertTrue(index.search(prefix))
+        self.assertLess((time.perf_counter() - start) / 5, 0.005)
+
+
+class TestAutocompleteService(unittest.IsolatedAsyncioTestCase):
+    """Test incremental refresh from the database."""
+
+    async def asyncSetUp(self):
+        """Set up an in-memory database with tracked items."""
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        tables = [Product, Watchlist, Hotel, Flight, TravelWatchlist, Property, PropertyWatchlist]
+        async with self.engine.begin() as conn:
+            for model in tables:
+                await conn.run_sync(model.__table__.create)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        async with self.session_factory() as db:
+            db.add_all(
+                [
+                    Product(name="Samsung Galaxy S22", url="http://example.com/1", site="jumia"),
+                    Product(name="Samsung Galaxy A14", url="http://example.com/2", site="jumia"),
+                    Hotel(
+                        name="Eko Hotel",
+                        location="Lagos",
+                        check_in=date(2026, 12, 1),
+                        check_out=date(2026, 12, 3),
+                        room_type="standard",
+                        price_per_night=50000,
+                        total_price=100000,
+                        url="http://example.com/h",
+                        site="booking",
+                    ),
+                ]
+            )
+            await db.commit()
+
+    async def asyncTearDown(self):
+        """Dispose the database."""
+        await self.engine.dispose()
+
+    async def test_incremental_refresh(self):
+        """Test new items and watchlist entries are picked up without a rebuild."""
+        service = AutocompleteService()
+
+        async with self.session_factory() as db:
+            await service.refresh(db)
+            self.assertEqual(
+                [s["text"] for s in service.suggest("sams", ["product"])],
+                ["Samsung Galaxy A14", "Samsung Galaxy S22"],
+            )
+            self.assertEqual(service.suggest("lag", ["destination"])[0]["text"], "Lagos")
+
+            db.add(Watchlist(user_id=1, product_id=1))
+            db.add(Product(name="Samsung Galaxy Buds", url="http://example.com/3", site="konga"))
+            await db.commit()
+
+            # Throttled until the refresh interval passes
+            await service.refresh(db)
+            self.assertEqual(len(service.suggest("galaxy")), 2)
+
+            await service.refresh(db, force=True)
+            suggestions = service.suggest("galaxy")
+
+        self.assertEqual(
+            suggestions[0],
+            {"kind": "product", "text": "Samsung Galaxy S22", "item_id": 1, "weight": 1},
+        )
+        self.assertEqual(len(suggestions), 3)
+
+    async def test_concurrent_refreshes_count_watches_once(self):
+        """Test refreshes racing at startup index each watchlist entry once."""
+        service = AutocompleteService()
+        async with self.session_factory() as db:
+            db.add(Watchlist(user_id=1, product_id=1))
+            await db.commit()
+
+        async def refresh():
+            async with self.session_factory() as db:
+                await service.refresh(db)
+
+        await asyncio.gather(refresh(), refresh())
+
+        self.assertTrue(service.ready)
+        self.assertEqual(service.suggest("samsung galaxy s")[0]["weight"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for workload-aware database pools."""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.database import (
+    BackgroundSessionLocal,
+    ReplicaSessionLocal,
+    background_engine,
+    create_pooled_engine,
+    engine,
+    get_pool_metrics,
+    replica_engine,
+)
+
+
+class TestPoolRouting(unittest.TestCase):
+    """Test sessions are bound to the engine of their workload."""
+
+    def test_workload_engines(self):
+        """Test background work has its own pool and reads fall back to the primary."""
+        self.assertIs(BackgroundSessionLocal.kw["bind"], background_engine)
+        self.assertIsNot(background_engine, engine)
+        self.assertIs(ReplicaSessionLocal.kw["bind"], replica_engine)
+        # No replica configured in tests
+        self.assertIs(replica_engine, engine)
+        self.assertNotIn("replica", get_pool_metrics())
+
+
+class TestPoolMetrics(unittest.IsolatedAsyncioTestCase):
+    """Test checkout wait and saturation metrics."""
+
+    async def asyncSetUp(self):
+        """Create a one-connection pool on a temporary database."""
+        handle, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.engine = create_pooled_engine(
+            "test", f"sqlite+aiosqlite:///{self.path}", pool_size=1, max_overflow=0, pool_timeout=1
+        )
+
+    async def asyncTearDown(self):
+        """Dispose the pool and remove the database."""
+        await self.engine.dispose()
+        os.remove(self.path)
+
+    async def test_checkouts_and_timeouts(self):
+        """Test a saturated pool reports its usage and a timed out checkout."""
+        async with self.engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            metrics = get_pool_metrics()["test"]
+            self.assertEqual(metrics["checked_out"], 1)
+            self.assertEqual(metrics["saturation"], 1.0)
+
+            # The only connection is in use, so a second checkout waits and gives up
+            with self.assertRaises(PoolTimeoutError):
+                async with self.engine.connect() as other:
+                    await other.execute(text("SELECT 1"))
+
+        await asyncio.sleep(0)
+        metrics = get_pool_metrics()["test"]
+        self.assertEqual(metrics["checkouts"], 1)
+        self.assertEqual(metrics["timeouts"], 1)
+        self.assertEqual(metrics["checked_out"], 0)
+        self.assertEqual(metrics["peak_checked_out"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,236 @@
+"""Tests for event-driven and concurrent deal detection."""
+
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.deal_detection.deal_manager import DETECTOR_CLASSES, DealDetectionManager
+from app.core.models.price_change_event import PriceChangeEvent
+from app.core.models.price_history_daily import PriceHistoryDaily
+from app.core.models.price_snapshot import PriceSnapshot
+from app.core.price_history.baselines import PriceBaselines
+from app.core.price_history.extremes import RollingExtremes
+from app.ecommerce.services.deal_detector import EcommerceDealDetector
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.real_estate.models import Location, Property, PropertyDeal
+from app.real_estate.services.deal_detector import RealEstateDealDetector
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
+
+
+class TestChangedDeals(unittest.TestCase):
+    """Test only items with queued price changes are evaluated."""
+
+    def setUp(self):
+        """Set up properties whose snapshots all show a 7-day high of 100."""
+        self.engine = create_engine("sqlite://")
+        for model in (
+            Location,
+            Property,
+            PropertyDeal,
+            PriceHistoryDaily,
+            PriceSnapshot,
+            PriceChangeEvent,
+        ):
+            model.__table__.create(self.engine)
+        self.db = Session(self.engine)
+
+        now = datetime.now(timezone.utc)
+        for number, price in enumerate([80, 50, 99], start=1):
+            self.db.add(
+                Property(
+                    name=f"House {number}",
+                    property_type="house",
+                    location="Lekki, Lagos",
+                    price=price,
+                    url=f"https://example.com/{number}",
+                    site="example",
+                )
+            )
+            self.db.add(
+                PriceSnapshot(
+                    category="property",
+                    item_id=number,
+                    current_price=price,
+                    previous_price=100,
+                    last_changed_at=now,
+                    last_seen_at=now,
+                    low_7d=price,
+                    high_7d=100,
+                )
+            )
+
+        # House 2 dropped too, but before the last run claimed its change
+        for number, price in ((1, 80), (3, 99), (1, 80)):
+            self.db.add(
+                PriceChangeEvent(
+                    category="property",
+                    item_id=number,
+                    old_price=Decimal("100"),
+                    new_price=price,
+                    observed_at=now,
+                )
+            )
+        self.db.commit()
+
+    def tearDown(self):
+        """Close the database."""
+        self.db.close()
+        self.engine.dispose()
+
+    def test_detects_changed_items_only(self):
+        """Test drops are found for changed items and events are consumed."""
+        detector = RealEstateDealDetector()
+
+        deals = detector.detect_changed_deals(self.db)
+        self.db.commit()
+
+        self.assertEqual([deal["item"].id for deal in deals], [1])
+        self.assertEqual(deals[0]["deal_data"]["original_price"], Decimal("100"))
+        self.assertEqual(self.db.scalar(select(func.count()).select_from(PriceChangeEvent)), 0)
+        self.assertEqual(self.db.scalar(select(func.count()).select_from(PropertyDeal)), 1)
+
+        # Nothing changed since, so nothing is evaluated
+        self.assertEqual(detector.detect_changed_deals(self.db), [])
+
+    def test_claims_are_batched(self):
+        """Test a run only claims up to its limit of events."""
+        detector = RealEstateDealDetector()
+
+        deals = detector.detect_changed_deals(self.db, limit=1)
+        self.db.commit()
+
+        self.assertEqual([deal["item"].id for deal in deals], [1])
+        self.assertEqual(self.db.scalar(select(func.count()).select_from(PriceChangeEvent)), 2)
+
+    def test_reconciliation_uses_window_extremes(self):
+        """Test the full rescan measures drops from the 7-day high in the extremes state."""
+        now = datetime.now(timezone.utc)
+        extremes = RollingExtremes()
+        for days_ago, price in ((10, 200), (3, 90), (0, 80)):
+            extremes.append(now - timedelta(days=days_ago), Decimal(price))
+        snapshot = self.db.scalar(select(PriceSnapshot).where(PriceSnapshot.item_id == 1))
+        snapshot.extremes = extremes.dumps()
+        self.db.commit()
+
+        deals = RealEstateDealDetector().detect_deals(self.db)
+
+        # House 1 is 11% under its 7-day high of 90; house 2 has no extremes yet
+        # and falls back to its rollup high_7d
+        self.assertEqual([deal["item"].id for deal in deals], [1, 2])
+        self.assertEqual(deals[0]["deal_data"]["original_price"], Decimal("90"))
+        self.assertEqual(deals[1]["deal_data"]["original_price"], Decimal("100"))
+
+    def test_manufactured_discount_is_rejected(self):
+        """Test a drop back to the usual price after a brief hike is not a deal."""
+        now = datetime.now(timezone.utc)
+        baselines = PriceBaselines()
+        for days_ago in range(10, 0, -1):
+            baselines.append(now - timedelta(days=days_ago), Decimal("85"))
+        baselines.append(now - timedelta(hours=1), Decimal("100"))
+        snapshot = self.db.scalar(select(PriceSnapshot).where(PriceSnapshot.item_id == 1))
+        snapshot.baselines = baselines.dumps()
+        self.db.commit()
+
+        deals = RealEstateDealDetector().detect_deals(self.db)
+
+        # House 1 is back near its usual 85, house 2 dropped from 100 to 50
+        self.assertEqual([deal["item"].id for deal in deals], [2])
+
+    def test_rescan_refreshes_active_deals(self):
+        """Test a repeated run updates each item's active deal instead of adding one."""
+        detector = RealEstateDealDetector()
+        first = detector.detect_deals(self.db)
+        self.db.commit()
+        property_ = self.db.get(Property, 2)
+        property_.price = 40
+        self.db.commit()
+
+        second = detector.detect_deals(self.db)
+        self.db.commit()
+
+        self.assertEqual(
+            [deal["deal"].id for deal in second], [deal["deal"].id for deal in first]
+        )
+        self.assertEqual(self.db.scalar(select(func.count()).select_from(PropertyDeal)), 2)
+        self.assertEqual(self.db.get(PropertyDeal, second[1]["deal"].id).deal_price, 40)
+
+    def test_shards_partition_items(self):
+        """Test each shard rescans only the items whose id falls in it."""
+        detector = RealEstateDealDetector()
+
+        odd = detector.detect_deals(self.db, (1, 2))
+        even = detector.detect_deals(self.db, (0, 2))
+
+        self.assertEqual([deal["item"].id for deal in odd], [1])
+        self.assertEqual([deal["item"].id for deal in even], [2])
+
+
+class TestConcurrentDetection(unittest.IsolatedAsyncioTestCase):
+    """Test categories and shards run on their own sessions."""
+
+    async def asyncSetUp(self):
+        """Set up a file database with one dropped property."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{self.directory.name}/deals.db")
+        async with self.engine.begin() as conn:
+            for model in (Location, Property, PropertyDeal, PriceHistoryDaily, PriceSnapshot):
+                await conn.run_sync(model.__table__.create)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        async with self.session_factory() as db:
+            db.add(
+                Property(
+                    name="House",
+                    property_type="house",
+                    location="Lekki, Lagos",
+                    price=80,
+                    url="https://example.com/1",
+                    site="example",
+                )
+            )
+            now = datetime.now(timezone.utc)
+            db.add(
+                PriceSnapshot(
+                    category="property",
+                    item_id=1,
+                    current_price=80,
+                    last_changed_at=now,
+                    last_seen_at=now,
+                    high_7d=100,
+                )
+            )
+            await db.commit()
+
+    async def asyncTearDown(self):
+        """Dispose of the database."""
+        await self.engine.dispose()
+        self.directory.cleanup()
+
+    async def test_failing_category_does_not_roll_back_others(self):
+        """Test each shard commits independently of a failing category."""
+        classes = {"real_estate": RealEstateDealDetector, "ecommerce": EcommerceDealDetector}
+        with patch.dict(DETECTOR_CLASSES, classes, clear=True), patch.object(
+            settings, "deal_detection_shards", {"real_estate": 2}
+        ):
+            results = await DealDetectionManager().run_concurrently(
+                session_factory=self.session_factory, workers=2
+            )
+
+        self.assertEqual(results["real_estate"]["deals"], 1)
+        self.assertEqual(results["real_estate"]["shards"], 2)
+        self.assertEqual(results["real_estate"]["failed_shards"], 0)
+        # The e-commerce tables do not exist here
+        self.assertEqual(results["ecommerce"]["failed_shards"], 1)
+        async with self.session_factory() as db:
+            self.assertEqual(await db.scalar(select(func.count()).select_from(PropertyDeal)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+"""Tests for the property location hierarchy."""
+
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.models.price_history_daily import PriceHistoryDaily
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.real_estate.models import Location, Property, PropertyDeal
+from app.real_estate.services.analytics_dashboard import PropertyAnalyticsDashboard
+from app.real_estate.services.locations import (
+    _create_node_sync,
+    find_locations,
+    get_or_create_location_sync,
+    parse_location,
+)
+from app.real_estate.services.price_analytics import PropertyPriceAnalytics
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
+
+
+class TestParseLocation(unittest.TestCase):
+    """Test free-text locations parse into state, city and area."""
+
+    def test_full_address(self):
+        """Test street parts are dropped and the state suffix is ignored."""
+        self.assertEqual(
+            parse_location("Plot 4, Admiralty Way, Chevron, Lekki, Lagos State, Nigeria"),
+            [
+                ("state", "Lagos", "lagos"),
+                ("city", "Lekki", "lagos/lekki"),
+                ("area", "Chevron", "lagos/lekki/chevron"),
+            ],
+        )
+
+    def test_inferred_parts(self):
+        """Test states are inferred from known cities and areas from city prefixes."""
+        self.assertEqual(
+            parse_location("Lekki Phase 1"),
+            [
+                ("state", "Lagos", "lagos"),
+                ("city", "Lekki", "lagos/lekki"),
+                ("area", "Lekki Phase 1", "lagos/lekki/lekki-phase-1"),
+            ],
+        )
+        self.assertEqual(
+            parse_location("Abuja, FCT"), [("state", "FCT", "fct"), ("city", "Abuja", "fct/abuja")]
+        )
+        self.assertEqual(parse_location("lagos, Lagos"), [("state", "Lagos", "lagos")])
+        self.assertEqual(parse_location("Somewhere"), [("city", "Somewhere", "_/somewhere")])
+        self.assertEqual(parse_location("  "), [])
+
+
+class TestLocationAnalytics(unittest.TestCase):
+    """Test location filters and rollups over hierarchy ids."""
+
+    def setUp(self):
+        """Set up an in-memory database with properties in a few places."""
+        self.engine = create_engine("sqlite://")
+        for model in (Location, Property, PropertyDeal, PriceHistoryDaily):
+            model.__table__.create(self.engine)
+        self.db = Session(self.engine)
+
+        places = [
+            ("Chevron, Lekki, Lagos", 100),
+            ("Lekki Phase 1, Lagos", 200),
+            ("Ikeja GRA, Ikeja, Lagos", 300),
+            ("Wuse 2, Abuja", 400),
+        ]
+        for number, (place, price) in enumerate(places, start=1):
+            node = get_or_create_location_sync(self.db, place)
+            self.db.add(
+                Property(
+                    name=f"House {number}",
+                    property_type="house",
+                    location=place,
+                    location_id=node.id,
+                    price=price,
+                    url=f"https://example.com/{number}",
+                    site="example",
+                )
+            )
+            self.db.add(
+                PriceHistoryDaily(
+                    category="property",
+                    item_id=number,
+                    day=date.today(),
+                    open_price=price,
+                    high_price=price,
+                    low_price=price,
+                    close_price=price,
+                    price_sum=price,
+                    price_sumsq=price * price,
+                    sample_count=1,
+                )
+            )
+            self.db.add(
+                PropertyDeal(
+                    property_id=number,
+                    deal_type="price_drop",
+                    discount_percent=Decimal("10"),
+                    original_price=price + 10,
+                    deal_price=price,
+                    deal_start_date=datetime.utcnow(),
+                )
+            )
+        self.db.commit()
+
+    def tearDown(self):
+        """Close the database."""
+        self.db.close()
+        self.engine.dispose()
+
+    def test_nodes_are_shared(self):
+        """Test parents are created once and carry ancestor ids."""
+        self.assertEqual(self.db.query(Location).filter(Location.level == "state").count(), 2)
+        chevron = self.db.query(Location).filter(Location.key == "lagos/lekki/chevron").one()
+        lekki = self.db.query(Location).filter(Location.key == "lagos/lekki").one()
+        self.assertEqual(chevron.parent_id, lekki.id)
+        self.assertEqual(chevron.city_id, lekki.id)
+        self.assertEqual(chevron.state_id, lekki.state_id)
+
+    def test_node_created_concurrently_is_loaded(self):
+        """Test a node inserted first by another request is loaded, not duplicated."""
+        lagos = self.db.query(Location).filter(Location.key == "lagos").one()
+
+        # As if the lookup ran before the other request's insert committed
+        node = _create_node_sync(self.db, "state", "Lagos", "lagos", None)
+
+        self.assertEqual(node.id, lagos.id)
+        get_or_create_location_sync(self.db, "Yaba, Lagos")
+        self.db.commit()
+        self.assertEqual(self.db.query(Location).filter(Location.key == "lagos").count(), 1)
+
+    def test_location_price_trends(self):
+        """Test trends cover every property within the location."""
+        lagos = PropertyPriceAnalytics.get_location_price_trends(self.db, "Lagos")
+        self.assertEqual(lagos["properties_count"], 3)
+        self.assertEqual(lagos["average_price"], 200)
+        self.assertEqual(lagos["locations"], ["lagos"])
+
+        lekki = PropertyPriceAnalytics.get_location_price_trends(self.db, "lekki")
+        self.assertEqual(lekki["properties_count"], 2)
+        self.assertEqual(lekki["max_price"], 200)
+
+        missing = PropertyPriceAnalytics.get_location_price_trends(self.db, "Kano")
+        self.assertEqual(missing, {"location": "Kano", "properties_count": 0})
+
+    def test_best_value_areas_by_level(self):
+        """Test deals roll up to the requested level."""
+        states = PropertyAnalyticsDashboard.get_best_value_areas(self.db, level="state")
+        self.assertEqual(
+            [(area["location"], area["deal_count"]) for area in states], [("Lagos", 3), ("FCT", 1)]
+        )
+
+        cities = PropertyAnalyticsDashboard.get_best_value_areas(self.db, level="city")
+        self.assertEqual(cities[0]["location_key"], "lagos/lekki")
+        self.assertEqual(cities[0]["deal_count"], 2)
+
+        areas = PropertyAnalyticsDashboard.get_best_value_areas(self.db)
+        self.assertEqual(len(areas), 4)
+        self.assertEqual({area["level"] for area in areas}, {"area"})
+
+    def test_find_locations(self):
+        """Test a bare name matches nodes at any level."""
+        self.assertEqual([node.key for node in find_locations(self.db, "Ikeja")], ["lagos/ikeja"])
+        self.assertEqual(find_locations(self.db, "Lekki, Abuja"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+"""Tests for page and cursor pagination."""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.ecommerce.models import Product
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
+from app.utils.pagination import (
+    PaginationParams,
+    _keyset_order,
+    decode_cursor,
+    encode_cursor,
+    paginate_joined_query,
+    paginate_query,
+)
+
+
+class ProductItem(BaseModel):
+    """Minimal product item for pagination tests."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+
+
+class TestCursorEncoding(unittest.TestCase):
+    """Test opaque cursor encoding."""
+
+    def test_round_trip(self):
+        """Test a cursor decodes to the position it was built from."""
+        created_at = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 42)), (created_at, 42))
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected."""
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestKeysetPagination(unittest.IsolatedAsyncioTestCase):
+    """Test cursor pagination over (created_at, id)."""
+
+    async def asyncSetUp(self):
+        """Set up an in-memory database with products sharing timestamps."""
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Product.__table__.create)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        start = datetime(2026, 1, 1)
+        async with self.session_factory() as db:
+            for i in range(7):
+                db.add(
+                    Product(
+                        name=f"Product {i}",
+                        url=f"http://example.com/{i}",
+                        site="example",
+                        # Pairs of products share a timestamp to exercise the id tie-break
+                        created_at=start + timedelta(hours=i // 2),
+                    )
+                )
+            await db.commit()
+
+    async def asyncTearDown(self):
+        """Dispose the database."""
+        await self.engine.dispose()
+
+    async def test_cursor_pages_match_offset_pages(self):
+        """Test following cursors visits every row once in offset order."""
+        query = select(Product).where(Product.is_active).order_by(Product.created_at.desc())
+
+        async with self.session_factory() as db:
+            offset_ids = []
+            for page in (1, 2, 3):
+                result = await paginate_query(
+                    db, query, PaginationParams(page=page, size=3), ProductItem, keyset_model=Product
+                )
+                offset_ids.extend(item.id for item in result.items)
+
+            cursor_ids = []
+            cursor = None
+            first = True
+            while first or cursor:
+                first = False
+                result = await paginate_query(
+                    db,
+                    query,
+                    PaginationParams(size=3, cursor=cursor, count="none"),
+                    ProductItem,
+                    keyset_model=Product,
+                )
+                cursor_ids.extend(item.id for item in result.items)
+                cursor = result.next_cursor
+
+        self.assertEqual(cursor_ids, offset_ids)
+        self.assertEqual(sorted(cursor_ids), list(range(1, 8)))
+        self.assertEqual(cursor_ids[:2], [7, 6])
+
+    async def test_totals_and_has_more(self):
+        """Test totals follow the count mode and the last page has no cursor."""
+        query = select(Product)
+
+        async with self.session_factory() as db:
+            first = await paginate_query(
+                db, query, PaginationParams(size=5), ProductItem, keyset_model=Product
+            )
+            last = await paginate_query(
+                db,
+                query,
+                PaginationParams(size=5, cursor=first.next_cursor, count="none"),
+                ProductItem,
+                keyset_model=Product,
+            )
+
+        self.assertEqual((first.total, first.pages, first.page), (7, 2, 1))
+        self.assertTrue(first.has_more)
+        self.assertEqual(len(last.items), 2)
+        self.assertIsNone(last.total)
+        self.assertIsNone(last.page)
+        self.assertFalse(last.has_more)
+        self.assertIsNone(last.next_cursor)
+
+    async def test_joined_query_cursor(self):
+        """Test joined rows are keyed on their first entity."""
+        query = select(Product, Product.site)
+
+        async with self.session_factory() as db:
+            result = await paginate_joined_query(
+                db,
+                query,
+                PaginationParams(size=4),
+                lambda row: row[0].id,
+                keyset_model=Product,
+            )
+            rest = await paginate_joined_query(
+                db,
+                query,
+                PaginationParams(size=4, cursor=result.next_cursor),
+                lambda row: row[0].id,
+                keyset_model=Product,
+            )
+
+        self.assertEqual(result.items + rest.items, [7, 6, 5, 4, 3, 2, 1])
+
+    async def test_cursor_page_uses_keyset_index(self):
+        """Test a cursor page over active rows reads the index instead of sorting."""
+        query = _keyset_order(select(Product).where(Product.is_active), Product)
+        page = query.where(
+            tuple_(Product.created_at, Product.id) < tuple_(datetime(2026, 1, 2), 5)
+        ).limit(4)
+
+        async with self.engine.connect() as conn:
+            compiled = page.compile(conn.engine, compile_kwargs={"literal_binds": True})
+            plan = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+        details = " ".join(row[-1] for row in plan)
+        self.assertIn("ix_products_keyset", details)
+        self.assertNotIn("TEMP B-TREE", details)
+
+    async def test_invalid_cursor_rejected(self):
+        """Test bad cursors and unsupported listings return 400."""
+        async with self.session_factory() as db:
+            with self.assertRaises(HTTPException) as ctx:
+                await paginate_query(
+                    db,
+                    select(Product),
+                    PaginationParams(cursor="garbage"),
+                    ProductItem,
+                    keyset_model=Product,
+                )
+            self.assertEqual(ctx.exception.status_code, 400)
+
+            cursor = encode_cursor(datetime(2026, 1, 1), 1)
+            with self.assertRaises(HTTPException):
+                await paginate_query(db, select(Product), PaginationParams(cursor=cursor), ProductItem)
+
+
+if __name__ == "__main__":
+    unittest.main()
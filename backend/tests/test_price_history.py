@@ -0,0 +1,766 @@
+"""Tests for price history retention and downsampling."""
+
+import tempfile
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.models.price_change_event import PriceChangeEvent
+from app.core.models.price_history_daily import PriceHistoryDaily
+from app.core.models.price_snapshot import PriceSnapshot
+from app.core.price_history.archive import (
+    ArchivedHistory,
+    PriceHistoryArchive,
+    archive_expired,
+    archive_record,
+    merge_history,
+)
+from app.core.price_history.baselines import PriceBaselines
+from app.core.price_history.bulk import PriceSeriesBatch
+from app.core.price_history.changes import claim_price_changes
+from app.core.price_history.drops import price_drop_summary
+from app.core.price_history.extremes import RollingExtremes
+from app.core.price_history.intervals import interval_points, observation_count, weighted_mean
+from app.core.price_history.recorder import PriceHistoryRecorder, record_price
+from app.core.price_history.registry import get_history_table
+from app.core.price_history.rollups import sample_stddev, summarize_rollups, window_start
+from app.core.price_history.retention import (
+    PriceHistoryRetention,
+    add_months,
+    expired_partitions,
+    months_to_create,
+    partition_month,
+    partition_name,
+)
+from app.core.price_history.windows import PriceWindows, summarize_windows
+from app.ecommerce.models import PriceHistory
+from app.real_estate.services.price_analytics import PropertyPriceAnalytics
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
+
+
+def rollup_row(day, prices):
+    """Build a rollup row from a day's observed prices."""
+    prices = [Decimal(p) for p in prices]
+    return PriceHistoryDaily(
+        category="ecommerce",
+        item_id=1,
+        day=day,
+        open_price=prices[0],
+        high_price=max(prices),
+        low_price=min(prices),
+        close_price=prices[-1],
+        price_sum=sum(prices),
+        price_sumsq=sum(p * p for p in prices),
+        sample_count=len(prices),
+    )
+
+
+class TestPartitionHelpers(unittest.TestCase):
+    """Test monthly partition naming and bounds."""
+
+    def test_add_months_wraps_year(self):
+        """Test month arithmetic across year boundaries."""
+        self.assertEqual(add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+
+    def test_partition_name_round_trip(self):
+        """Test partition names parse back to their month."""
+        name = partition_name("price_history", date(2025, 7, 1))
+        self.assertEqual(name, "price_history_p202507")
+        self.assertEqual(partition_month("price_history", name), date(2025, 7, 1))
+        self.assertIsNone(partition_month("price_history", "price_history_default"))
+        self.assertIsNone(partition_month("price_history", "travel_price_history_p202507"))
+
+    def test_months_to_create(self):
+        """Test partitions are kept from last month through the lookahead."""
+        months = months_to_create(date(2025, 12, 15), 2)
+        self.assertEqual(months, [date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1)])
+
+    def test_expired_partitions(self):
+        """Test only partitions entirely before the cutoff expire."""
+        names = ["price_history_p202501", "price_history_p202502", "price_history_default"]
+        cutoff = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        self.assertEqual(
+            expired_partitions("price_history", names, cutoff),
+            ["price_history_p202501", "price_history_p202502"],
+        )
+        cutoff = datetime(2025, 2, 20, tzinfo=timezone.utc)
+        self.assertEqual(expired_partitions("price_history", names, cutoff), ["price_history_p202501"])
+
+    def test_cutoff_aligned_to_midnight(self):
+        """Test the retention cutoff never splits a day."""
+        retention = PriceHistoryRetention(db=None, retention_days=30)
+        now = datetime(2025, 6, 30, 15, 45, tzinfo=timezone.utc)
+        self.assertEqual(retention.cutoff(now), datetime(2025, 5, 31, tzinfo=timezone.utc))
+
+    def test_unknown_category(self):
+        """Test registry lookup rejects unknown categories."""
+        self.assertEqual(get_history_table("flight").item_column, "flight_id")
+        with self.assertRaises(ValueError):
+            get_history_table("boats")
+
+
+class TestDownsampling(unittest.IsolatedAsyncioTestCase):
+    """Test folding raw rows into daily OHLC rows."""
+
+    async def asyncSetUp(self):
+        """Set up an in-memory database."""
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(PriceHistory.__table__.create)
+            await conn.run_sync(PriceHistoryDaily.__table__.create)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def asyncTearDown(self):
+        """Dispose the database."""
+        await self.engine.dispose()
+
+    async def test_downsample_and_purge(self):
+        """Test old rows become OHLC rows and recent rows are untouched."""
+        old_day = datetime(2025, 1, 10, tzinfo=timezone.utc)
+        recent = datetime.now(timezone.utc) - timedelta(days=1)
+        prices = [("100.00", 8), ("90.00", 11), ("120.00", 14), ("110.00", 20)]
+
+        async with self.session_factory() as db:
+            for price, hour in prices:
+                db.add(
+                    PriceHistory(
+                        product_id=1,
+                        price=Decimal(price),
+                        currency="NGN",
+                        source="scraper",
+                        created_at=old_day.replace(hour=hour),
+                    )
+                )
+            db.add(PriceHistory(product_id=1, price=Decimal("95.00"), currency="NGN", source="scraper", created_at=recent))
+            await db.commit()
+
+            retention = PriceHistoryRetention(db, retention_days=30)
+            table = get_history_table("ecommerce")
+            cutoff = retention.cutoff()
+
+            self.assertEqual(await retention.downsample(table, cutoff), 1)
+            # Re-running does not duplicate days already folded
+            self.assertEqual(await retention.downsample(table, cutoff), 0)
+            self.assertEqual(await retention.purge_raw(table, cutoff), 4)
+            await db.commit()
+
+            daily = (await db.execute(select(PriceHistoryDaily))).scalar_one()
+            self.assertEqual(daily.category, "ecommerce")
+            self.assertEqual(daily.item_id, 1)
+            self.assertEqual(daily.open_price, Decimal("100.00"))
+            self.assertEqual(daily.high_price, Decimal("120.00"))
+            self.assertEqual(daily.low_price, Decimal("90.00"))
+            self.assertEqual(daily.close_price, Decimal("110.00"))
+            self.assertEqual(daily.price_sum, Decimal("420.00"))
+            self.assertEqual(daily.sample_count, 4)
+
+            remaining = (await db.execute(select(PriceHistory))).scalars().all()
+            self.assertEqual([row.price for row in remaining], [Decimal("95.00")])
+
+    async def test_live_interval_is_kept(self):
+        """Test an old interval that is still being observed is rolled up but kept."""
+        started = datetime(2025, 1, 10, tzinfo=timezone.utc)
+
+        async with self.session_factory() as db:
+            db.add(
+                PriceHistory(
+                    product_id=2,
+                    price=Decimal("50.00"),
+                    currency="NGN",
+                    source="scraper",
+                    created_at=started,
+                    last_seen_at=datetime.now(timezone.utc),
+                    observations=40,
+                )
+            )
+            await db.commit()
+
+            retention = PriceHistoryRetention(db, retention_days=30)
+            table = get_history_table("ecommerce")
+            cutoff = retention.cutoff()
+
+            self.assertEqual(await retention.downsample(table, cutoff), 1)
+            self.assertEqual(await retention.purge_raw(table, cutoff), 0)
+
+
+class TestChangeOnlyRecording(unittest.IsolatedAsyncioTestCase):
+    """Test run-length recording of unchanged prices."""
+
+    async def asyncSetUp(self):
+        """Set up an in-memory database."""
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(PriceHistory.__table__.create)
+            await conn.run_sync(PriceHistoryDaily.__table__.create)
+            await conn.run_sync(PriceSnapshot.__table__.create)
+            await conn.run_sync(PriceChangeEvent.__table__.create)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def asyncTearDown(self):
+        """Dispose the database."""
+        await self.engine.dispose()
+
+    async def test_unchanged_price_extends_interval(self):
+        """Test repeated prices extend one row and changes start a new one."""
+        base = datetime(2025, 3, 1, tzinfo=timezone.utc)
+        observations = [("100", "In stock"), ("100.00", "In stock"), ("100", None), ("90", "In stock")]
+
+        async with self.session_factory() as db:
+            recorder = PriceHistoryRecorder(db, change_only=True)
+            for hour, (price, availability) in enumerate(observations):
+                await recorder.record(
+                    "ecommerce",
+                    1,
+                    Decimal(price),
+                    observed_at=base + timedelta(hours=hour),
+                    availability=availability,
+                )
+                await db.commit()
+
+            rows = (
+                await db.execute(select(PriceHistory).order_by(PriceHistory.created_at))
+            ).scalars().all()
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0].observations, 3)
+        self.assertEqual(rows[0].price, Decimal("100.00"))
+        self.assertEqual(rows[1].observations, 1)
+        self.assertEqual(observation_count(rows), 4)
+        self.assertAlmostEqual(weighted_mean(rows), 97.5)
+
+        points = interval_points(rows)
+        self.assertEqual([float(row.price) for _, row in points], [100.0, 100.0, 90.0])
+
+    async def test_observations_update_daily_rollup(self):
+        """Test every observation is folded into the day's rollup row."""
+        base = datetime(2025, 3, 1, tzinfo=timezone.utc)
+
+        async with self.session_factory() as db:
+            recorder = PriceHistoryRecorder(db, change_only=True)
+            for hour, price in enumerate(["100", "100", "120", "90"]):
+                await recorder.record(
+                    "ecommerce", 1, Decimal(price), observed_at=base + timedelta(hours=hour)
+                )
+                await db.commit()
+
+            daily = (await db.execute(select(PriceHistoryDaily))).scalar_one()
+
+        self.assertEqual(daily.day, date(2025, 3, 1))
+        self.assertEqual(daily.open_price, Decimal("100.00"))
+        self.assertEqual(daily.high_price, Decimal("120.00"))
+        self.assertEqual(daily.low_price, Decimal("90.00"))
+        self.assertEqual(daily.close_price, Decimal("90.00"))
+        self.assertEqual(daily.price_sum, Decimal("410.00"))
+        self.assertEqual(daily.sample_count, 4)
+
+    async def test_observations_update_snapshot(self):
+        """Test the snapshot tracks current, previous and 7-day range on every write."""
+        base = datetime.now(timezone.utc) - timedelta(days=1)
+        observations = [("100", "In stock"), ("120", None), ("120", None), ("90", "Out of stock")]
+
+        async with self.session_factory() as db:
+            recorder = PriceHistoryRecorder(db, change_only=True)
+            for hour, (price, availability) in enumerate(observations):
+                await recorder.record(
+                    "ecommerce",
+                    1,
+                    Decimal(price),
+                    observed_at=base + timedelta(hours=hour),
+                    availability=availability,
+                )
+                await db.commit()
+
+                # Upserts bypass the identity map, so reload the row each time
+                snapshot = (
+                    await db.execute(
+                        select(PriceSnapshot).execution_options(populate_existing=True)
+                    )
+                ).scalar_one()
+                if hour == 2:
+                    # Unchanged price keeps previous price, change time and availability
+                    self.assertEqual(snapshot.previous_price, Decimal("100.00"))
+                    self.assertEqual(snapshot.availability, "In stock")
+                    self.assertEqual(
+                        snapshot.last_changed_at.replace(tzinfo=timezone.utc),
+                        base + timedelta(hours=1),
+                    )
+
+        self.assertEqual(snapshot.current_price, Decimal("90.00"))
+        self.assertEqual(snapshot.previous_price, Decimal("120.00"))
+        self.assertEqual(snapshot.availability, "Out of stock")
+        self.assertEqual(snapshot.low_7d, Decimal("90.00"))
+        self.assertEqual(snapshot.high_7d, Decimal("120.00"))
+        self.assertAlmostEqual(snapshot.change_percent, -25.0)
+        extremes = RollingExtremes.loads(snapshot.extremes)
+        self.assertEqual(extremes.high(7, base + timedelta(hours=3)), Decimal("120"))
+        self.assertEqual(extremes.low(7, base + timedelta(hours=3)), Decimal("90"))
+
+    async def test_availability_change_starts_interval(self):
+        """Test a state change at the same price starts a new row."""
+        async with self.session_factory() as db:
+            recorder = PriceHistoryRecorder(db, change_only=True)
+            await recorder.record("ecommerce", 1, Decimal("100"), availability="In stock")
+            await db.commit()
+            await recorder.record("ecommerce", 1, Decimal("100"), availability="Out of stock")
+            await db.commit()
+
+            rows = (await db.execute(select(PriceHistory))).scalars().all()
+
+        self.assertEqual(len(rows), 2)
+
+    async def test_price_changes_queue_events(self):
+        """Test only price changes queue events, and claiming removes them."""
+        async with self.session_factory() as db:
+            recorder = PriceHistoryRecorder(db, change_only=True)
+            for item_id, price in [(1, "100"), (1, "100"), (1, "90"), (2, "50"), (1, "95")]:
+                await recorder.record("ecommerce", item_id, Decimal(price))
+                await db.commit()
+
+            events = (
+                await db.execute(select(PriceChangeEvent).order_by(PriceChangeEvent.id))
+            ).scalars().all()
+            self.assertEqual(
+                [(e.item_id, e.old_price, e.new_price) for e in events],
+                [(1, Decimal("100.00"), Decimal("90.00")), (1, Decimal("90.00"), Decimal("95.00"))],
+            )
+
+            self.assertEqual(await db.run_sync(claim_price_changes, "ecommerce", 10), [1])
+            self.assertEqual(await db.run_sync(claim_price_changes, "ecommerce", 10), [])
+            self.assertEqual(await db.run_sync(claim_price_changes, "flight", 10), [])
+
+    async def test_change_only_disabled(self):
+        """Test every observation is a row when change-only mode is off."""
+        async with self.session_factory() as db:
+            recorder = PriceHistoryRecorder(db, change_only=False)
+            for _ in range(3):
+                await recorder.record("ecommerce", 1, Decimal("100"))
+                await db.commit()
+
+            rows = (await db.execute(select(PriceHistory))).scalars().all()
+
+        self.assertEqual(len(rows), 3)
+
+    def test_sync_session_recording(self):
+        """Test sync code records history, rollup and snapshot like the recorder."""
+        engine = create_engine("sqlite://")
+        for model in (PriceHistory, PriceHistoryDaily, PriceSnapshot, PriceChangeEvent):
+            model.__table__.create(engine)
+
+        with Session(engine) as db:
+            record_price(db, "ecommerce", 1, Decimal("100"), availability="In stock", source="scraper")
+            db.commit()
+            record_price(db, "ecommerce", 1, Decimal("90"))
+            db.commit()
+
+            self.assertEqual(len(db.scalars(select(PriceHistory)).all()), 2)
+            self.assertEqual(db.scalar(select(PriceHistoryDaily.sample_count)), 2)
+            snapshot = db.scalar(select(PriceSnapshot))
+            self.assertEqual(snapshot.current_price, Decimal("90.00"))
+            self.assertEqual(snapshot.availability, "In stock")
+            self.assertEqual(len(db.scalars(select(PriceChangeEvent)).all()), 1)
+        engine.dispose()
+
+
+class TestRollingExtremes(unittest.TestCase):
+    """Test sliding-window maxima and minima."""
+
+    def setUp(self):
+        """Set up a reference time."""
+        self.now = datetime(2025, 6, 30, 12, tzinfo=timezone.utc)
+
+    def test_windows(self):
+        """Test each window sees only its own observations."""
+        extremes = RollingExtremes()
+        for days_ago, price in [(80, "300"), (20, "50"), (10, "200"), (3, "120"), (1, "100")]:
+            extremes.append(self.now - timedelta(days=days_ago), Decimal(price))
+
+        self.assertEqual(extremes.high(7, self.now), Decimal("120"))
+        self.assertEqual(extremes.low(7, self.now), Decimal("100"))
+        self.assertEqual(extremes.high(30, self.now), Decimal("200"))
+        self.assertEqual(extremes.low(30, self.now), Decimal("50"))
+        self.assertEqual(extremes.high(90, self.now), Decimal("300"))
+        # Nothing observed in the window
+        self.assertIsNone(extremes.high(7, self.now + timedelta(days=30)))
+
+    def test_queues_stay_monotonic_and_bounded(self):
+        """Test dominated and expired entries are dropped as prices are appended."""
+        extremes = RollingExtremes()
+        for hour in range(24 * 200):
+            price = Decimal(100 + (hour * 37) % 50)
+            extremes.append(self.now + timedelta(hours=hour), price)
+
+        highs = [price for _, price in extremes.highs]
+        lows = [price for _, price in extremes.lows]
+        self.assertEqual(highs, sorted(highs, reverse=True))
+        self.assertEqual(lows, sorted(lows))
+        self.assertEqual(len(set(highs)), len(highs))
+        self.assertLessEqual(extremes.highs[-1][0] - extremes.highs[0][0], 90 * 24)
+
+    def test_round_trip_and_intervals(self):
+        """Test state survives serialization and interval rows are replayed."""
+        rows = [
+            PriceHistory(
+                price=Decimal("150.00"),
+                created_at=self.now - timedelta(days=12),
+                last_seen_at=self.now - timedelta(days=6),
+            ),
+            PriceHistory(price=Decimal("90.00"), created_at=self.now - timedelta(days=5)),
+        ]
+        extremes = RollingExtremes.loads(RollingExtremes.from_intervals(rows).dumps())
+
+        # The first interval was still observed six days ago
+        self.assertEqual(extremes.high(7, self.now), Decimal("150.00"))
+        self.assertEqual(extremes.low(30, self.now), Decimal("90.00"))
+        self.assertIsNone(RollingExtremes.loads(None).high(7))
+
+
+class TestPriceBaselines(unittest.TestCase):
+    """Test robust reference prices from daily closes."""
+
+    def setUp(self):
+        """Set up a reference time."""
+        self.now = datetime(2025, 6, 30, 12, tzinfo=timezone.utc)
+
+    def baselines(self, closes):
+        """Baselines from daily closes ending yesterday."""
+        start = self.now - timedelta(days=len(closes))
+        baselines = PriceBaselines()
+        for days, price in enumerate(closes):
+            baselines.append(start + timedelta(days=days), Decimal(price))
+        return baselines
+
+    def test_one_day_hike_is_capped(self):
+        """Test a day's price hike does not raise the reference price."""
+        baselines = self.baselines(["100"] * 28 + ["150"])
+
+        self.assertEqual(baselines.median(self.now), Decimal("100"))
+        self.assertEqual(baselines.reference(Decimal("150"), self.now), Decimal("100"))
+
+    def test_long_hike_falls_back_to_pre_spike_level(self):
+        """Test a hike that dominates the window is caught by the pre-spike level."""
+        baselines = self.baselines(["100"] * 10 + ["150"] * 19)
+
+        self.assertEqual(baselines.median(self.now), Decimal("150"))
+        self.assertEqual(baselines.pre_spike(self.now), Decimal("100"))
+        self.assertEqual(baselines.reference(Decimal("150"), self.now), Decimal("100"))
+
+    def test_genuine_drop_keeps_reference(self):
+        """Test a steady price, or one recovering from a sale, is not a spike."""
+        baselines = self.baselines(["100"] * 20 + ["70"] + ["100"] * 8)
+
+        self.assertIsNone(baselines.pre_spike(self.now))
+        self.assertEqual(baselines.trimmed_mean(self.now), Decimal("100"))
+        self.assertEqual(baselines.reference(Decimal("100"), self.now), Decimal("100"))
+        # Too little history caps nothing
+        self.assertEqual(self.baselines(["80", "80"]).reference(Decimal("100"), self.now), 100)
+
+    def test_append_keeps_one_close_per_day(self):
+        """Test appends replace the day's close and expire old days."""
+        baselines = PriceBaselines()
+        for hours in range(0, 24 * 40, 6):
+            baselines.append(self.now + timedelta(hours=hours), Decimal(hours))
+        baselines = PriceBaselines.loads(baselines.dumps())
+
+        days = [day for day, _ in baselines.closes]
+        self.assertEqual(len(days), 30)
+        self.assertEqual(days, sorted(set(days)))
+        self.assertEqual(baselines.closes[-1][1], Decimal(24 * 40 - 6))
+
+
+class TestRollupSummaries(unittest.TestCase):
+    """Test combining daily rollups into window statistics."""
+
+    def test_summarize_rollups(self):
+        """Test window stats match the stats of the underlying observations."""
+        rows = [
+            rollup_row(date(2025, 3, 1), ["100", "110"]),
+            rollup_row(date(2025, 3, 2), ["90", "100"]),
+        ]
+        summary = summarize_rollups(rows)
+
+        self.assertEqual(summary["open"], 100.0)
+        self.assertEqual(summary["close"], 100.0)
+        self.assertEqual(summary["low"], 90.0)
+        self.assertEqual(summary["high"], 110.0)
+        self.assertEqual(summary["count"], 4)
+        self.assertAlmostEqual(summary["mean"], 100.0)
+        self.assertAlmostEqual(summary["variance"], 50.0)
+        self.assertAlmostEqual(sample_stddev(summary), (200 / 3) ** 0.5)
+
+    def test_empty_and_window_start(self):
+        """Test empty windows and window boundaries."""
+        self.assertIsNone(summarize_rollups([]))
+        self.assertEqual(window_start(7, today=date(2025, 3, 10)), date(2025, 3, 4))
+        self.assertEqual(window_start(1, today=date(2025, 3, 10)), date(2025, 3, 10))
+
+
+class TestPriceWindows(unittest.TestCase):
+    """Test computing several windows from one pass over rollups."""
+
+    def setUp(self):
+        """Build forty days of rollups ending today."""
+        self.today = date(2025, 6, 30)
+        self.rows = [
+            rollup_row(self.today - timedelta(days=offset), [str(100 + offset), str(95 + offset)])
+            for offset in range(39, -1, -1)
+        ]
+
+    def test_single_pass_matches_slices(self):
+        """Test every window equals summarizing its own slice of rows."""
+        windows = summarize_windows(self.rows, [7, 30, 90], today=self.today)
+
+        for days in (7, 30, 90):
+            start = window_start(days, today=self.today)
+            expected = summarize_rollups([row for row in self.rows if row.day >= start])
+            actual = windows[days]
+            self.assertEqual(actual["count"], expected["count"])
+            self.assertEqual(actual["days"], expected["days"])
+            self.assertEqual(actual["open"], expected["open"])
+            self.assertEqual(actual["low"], expected["low"])
+            self.assertEqual(actual["high"], expected["high"])
+            self.assertEqual(actual["first_day"], expected["first_day"])
+            self.assertAlmostEqual(actual["mean"], expected["mean"])
+            self.assertAlmostEqual(actual["variance"], expected["variance"])
+
+    def test_empty_windows(self):
+        """Test windows with no rows summarize to None."""
+        self.assertEqual(summarize_windows([], [7, 30]), {7: None, 30: None})
+        windows = summarize_windows(self.rows, [1], today=self.today + timedelta(days=5))
+        self.assertIsNone(windows[1])
+
+    def test_trend_and_volatility_helpers(self):
+        """Test change and deviation come from the preloaded windows."""
+        windows = PriceWindows(self.rows, [7, 30], today=self.today)
+
+        self.assertAlmostEqual(windows.change_percent(7), (95 - 106) / 106 * 100)
+        summary = windows.summary(7)
+        self.assertAlmostEqual(windows.stddev(7), summary["variance"] ** 0.5)
+        self.assertAlmostEqual(windows.stddev(7, sample=True), sample_stddev(summary))
+        # Windows not preloaded are computed from the same rows
+        self.assertEqual(windows.summary(14)["days"], 14)
+
+
+class TestBulkStatistics(unittest.TestCase):
+    """Test vectorized statistics across many items."""
+
+    def setUp(self):
+        """Build rollups for three items with rising, falling and flat prices."""
+        self.today = date(2025, 6, 30)
+        self.series = {
+            1: [rollup_row(self.today - timedelta(days=9 - i), [str(100 + 10 * i)]) for i in range(10)],
+            2: [rollup_row(self.today - timedelta(days=9 - i), [str(200 - 10 * i), "150"]) for i in range(10)],
+            3: [rollup_row(self.today, ["50"])],
+        }
+        rows = [
+            (item_id, row.day, row.open_price, row.close_price, row.low_price, row.high_price,
+             row.price_sum, row.price_sumsq, row.sample_count)
+            for item_id, item_rows in self.series.items()
+            for row in item_rows
+        ]
+        self.batch = PriceSeriesBatch(rows, today=self.today)
+
+    def test_matches_per_item_windows(self):
+        """Test segment reductions equal the per-item window summaries."""
+        for days in (7, 30):
+            stats = self.batch.window(days)
+            for item_id, rows in self.series.items():
+                expected = summarize_windows(rows, [days], today=self.today)[days]
+                actual = stats.get(item_id)
+                self.assertEqual(actual["current_price"], expected["close"])
+                self.assertEqual(actual["lowest_price"], expected["low"])
+                self.assertEqual(actual["highest_price"], expected["high"])
+                self.assertEqual(actual["data_points"], expected["count"])
+                self.assertAlmostEqual(actual["average_price"], round(expected["mean"], 2))
+
+                windows = PriceWindows(rows, [days], today=self.today)
+                self.assertEqual(stats.trend(item_id), PropertyPriceAnalytics._trend(windows, days))
+
+    def test_price_drops(self):
+        """Test only items whose price fell are reported, optionally filtered."""
+        stats = self.batch.window(30)
+        indexes, amounts = stats.price_drops()
+        self.assertEqual(stats.item_ids[indexes].tolist(), [2])
+        self.assertEqual(amounts.tolist(), [50.0])
+
+        indexes, _ = stats.price_drops([1, 3])
+        self.assertEqual(len(indexes), 0)
+
+    def test_empty_batch(self):
+        """Test a category without rollups yields empty statistics."""
+        stats = PriceSeriesBatch([], today=self.today).window(30)
+        self.assertEqual(len(stats), 0)
+        self.assertIsNone(stats.get(1))
+        self.assertEqual(stats.trend(1), "stable")
+
+
+class TestPriceDropSummary(unittest.TestCase):
+    """Test window-function price drop statistics."""
+
+    def setUp(self):
+        """Set up an in-memory database with three items' rollups."""
+        self.engine = create_engine("sqlite://")
+        PriceHistoryDaily.__table__.create(self.engine)
+        today = datetime.now(timezone.utc).date()
+        series = {
+            1: ["100", "90", "80"],  # dropped 20
+            2: ["200", "210", "150"],  # dropped 50
+            3: ["50", "55"],  # rose
+            4: ["70"],  # single observation
+        }
+        with Session(self.engine) as db:
+            for item_id, prices in series.items():
+                for offset, price in enumerate(prices):
+                    row = rollup_row(today - timedelta(days=len(prices) - 1 - offset), [price])
+                    row.item_id = item_id
+                    db.add(row)
+            # Outside the window, must not change item 1's first price
+            old = rollup_row(today - timedelta(days=60), ["500"])
+            old.item_id = 1
+            db.add(old)
+            db.commit()
+
+    def tearDown(self):
+        """Dispose the database."""
+        self.engine.dispose()
+
+    def test_aggregates_and_top_drops(self):
+        """Test drops are counted once per item and ranked by amount."""
+        with Session(self.engine) as db:
+            summary = price_drop_summary(db, "ecommerce", 30, limit=1)
+
+        self.assertEqual(summary["items_with_drops"], 2)
+        self.assertAlmostEqual(summary["total_drop_amount"], 70.0)
+        self.assertAlmostEqual(summary["average_drop_amount"], 35.0)
+        self.assertAlmostEqual(summary["average_drop_percent"], (20.0 + 25.0) / 2)
+        self.assertEqual(len(summary["top_drops"]), 1)
+        self.assertEqual(summary["top_drops"][0]["item_id"], 2)
+        self.assertEqual(summary["top_drops"][0]["old_price"], 200.0)
+        self.assertEqual(summary["top_drops"][0]["new_price"], 150.0)
+
+    def test_item_filter_and_no_drops(self):
+        """Test restricting items and the empty result."""
+        with Session(self.engine) as db:
+            summary = price_drop_summary(db, "ecommerce", 30, item_ids=[1, 3])
+            self.assertEqual([drop["item_id"] for drop in summary["top_drops"]], [1])
+
+            selected = select(PriceHistoryDaily.item_id).where(PriceHistoryDaily.item_id == 1)
+            summary = price_drop_summary(db, "ecommerce", 30, item_ids=selected)
+            self.assertEqual([drop["item_id"] for drop in summary["top_drops"]], [1])
+
+            summary = price_drop_summary(db, "hotel", 30)
+            self.assertEqual(summary["items_with_drops"], 0)
+            self.assertEqual(summary["top_drops"], [])
+
+
+class TestColdArchive(unittest.IsolatedAsyncioTestCase):
+    """Test archiving expired raw rows to Arrow files and reading them back."""
+
+    async def asyncSetUp(self):
+        """Set up an in-memory database and an archive directory."""
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(PriceHistory.__table__.create)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.archive = PriceHistoryArchive(self.tempdir.name)
+        self.table = get_history_table("ecommerce")
+
+    async def asyncTearDown(self):
+        """Dispose the database and remove the archive."""
+        await self.engine.dispose()
+        self.tempdir.cleanup()
+
+    def history_row(self, row_id, product_id, price, created_at, last_seen_at=None):
+        """Build a raw history row."""
+        return PriceHistory(
+            id=row_id,
+            product_id=product_id,
+            price=Decimal(price),
+            currency="NGN",
+            source="scraper",
+            created_at=created_at,
+            last_seen_at=last_seen_at,
+            observations=1,
+            availability="in_stock",
+        )
+
+    def test_write_and_read(self):
+        """Test records round-trip, are partitioned by month and filtered by item and time."""
+        rows = [
+            self.history_row(1, 7, "100.00", datetime(2025, 1, 10, tzinfo=timezone.utc)),
+            self.history_row(2, 8, "55.50", datetime(2025, 1, 12, tzinfo=timezone.utc)),
+            self.history_row(
+                3,
+                7,
+                "90.00",
+                datetime(2025, 1, 20, tzinfo=timezone.utc),
+                datetime(2025, 2, 3, tzinfo=timezone.utc),
+            ),
+        ]
+        records = [archive_record(self.table, row) for row in rows]
+        self.assertEqual(self.archive.write(self.table, records), 3)
+        months = [path.name for path in self.archive.months("ecommerce")]
+        self.assertEqual(months, ["2025-01", "2025-02"])
+
+        archived = self.archive.read("ecommerce", 7)
+        self.assertEqual([row.id for row in archived], [1, 3])
+        self.assertEqual(archived[0].price, Decimal("100.00"))
+        self.assertEqual(archived[0].availability, "in_stock")
+        self.assertEqual(archived[1].last_seen_at, datetime(2025, 2, 3, tzinfo=timezone.utc))
+
+        since = datetime(2025, 2, 1, tzinfo=timezone.utc)
+        self.assertEqual([row.id for row in self.archive.read("ecommerce", 7, since)], [3])
+        self.assertEqual(self.archive.read("ecommerce", 9), [])
+
+        # Rows archived twice by a retried run are read back once
+        self.archive.write(self.table, records)
+        self.assertEqual([row.id for row in self.archive.read("ecommerce", 7)], [1, 3])
+
+    def test_merge_prefers_hot_rows(self):
+        """Test a row in both the database and the archive is taken from the database."""
+        hot = [self.history_row(2, 7, "95.00", datetime(2025, 3, 1))]
+        archived = [
+            self.history_row(1, 7, "100.00", datetime(2025, 1, 1, tzinfo=timezone.utc)),
+            self.history_row(2, 7, "1.00", datetime(2025, 3, 1, tzinfo=timezone.utc)),
+        ]
+        merged = merge_history(hot, archived)
+        self.assertEqual([row.price for row in merged], [Decimal("100.00"), Decimal("95.00")])
+
+    async def test_archive_then_purge(self):
+        """Test expired rows are archived before purging and loads merge them back."""
+        old_day = datetime(2025, 1, 10, tzinfo=timezone.utc)
+        recent = datetime.now(timezone.utc) - timedelta(days=1)
+
+        async with self.session_factory() as db:
+            db.add(self.history_row(None, 1, "100.00", old_day))
+            db.add(self.history_row(None, 1, "90.00", old_day.replace(hour=12)))
+            db.add(self.history_row(None, 1, "95.00", recent))
+            await db.commit()
+
+            retention = PriceHistoryRetention(db, retention_days=30, archive=self.archive)
+            cutoff = retention.cutoff()
+            self.assertEqual(await archive_expired(db, self.archive, self.table, cutoff), 2)
+            self.assertEqual(await retention.purge_raw(self.table, cutoff), 2)
+            await db.commit()
+
+            history = ArchivedHistory(self.archive)
+            rows = await history.load_async(db, "ecommerce", 1)
+            self.assertEqual(
+                [row.price for row in rows],
+                [Decimal("100.00"), Decimal("90.00"), Decimal("95.00")],
+            )
+
+            # Recent windows never touch the archive
+            since = datetime.now(timezone.utc) - timedelta(days=7)
+            rows = await history.load_async(db, "ecommerce", 1, since)
+            self.assertEqual([row.price for row in rows], [Decimal("95.00")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+"""Tests for cross-retailer product matching."""
+
+import unittest
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.models.price_history_daily import PriceHistoryDaily
+from app.core.models.price_snapshot import PriceSnapshot
+from app.core.price_history.snapshots import update_snapshot
+from app.ecommerce.models import Product, ProductMatchBucket
+from app.ecommerce.services.product_matching import (
+    band_keys,
+    canonical_url,
+    group_duplicate_listings,
+    is_match,
+    product_matcher,
+    signature_tokens,
+)
+from app.ecommerce.services.product_service import ProductService
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
+
+
+class TestSignatures(unittest.TestCase):
+    """Test name signatures and URL normalization."""
+
+    def test_signature_tokens(self):
+        """Test marketing words and colors are dropped and units joined."""
+        self.assertEqual(
+            signature_tokens("NEW Apple iPhone 13 Pro (256 GB) - Graphite, Free Delivery"),
+            ["apple", "iphone", "13", "pro", "256gb"],
+        )
+
+    def test_is_match(self):
+        """Test listings of one item match and different models do not."""
+        jumia = signature_tokens("Apple iPhone 13 Pro 256GB Graphite")
+        konga = signature_tokens("iPhone 13 Pro - 256 GB - Sierra Blue (Apple)")
+        self.assertTrue(is_match(jumia, konga))
+        self.assertFalse(is_match(jumia, signature_tokens("Apple iPhone 13 256GB")))
+        self.assertFalse(is_match(jumia, signature_tokens("Apple iPhone 13 Pro 128GB")))
+        self.assertFalse(is_match(jumia, signature_tokens("Apple iPhone 13 Pro Case 256GB")))
+
+    def test_similar_names_share_buckets(self):
+        """Test matching names land in a common LSH bucket."""
+        left = band_keys(signature_tokens("Samsung Galaxy S22 Ultra 5G 256GB"))
+        right = band_keys(signature_tokens("Samsung Galaxy S22 Ultra 5G - 256GB Phantom"))
+        self.assertEqual(len(left), 8)
+        self.assertTrue(set(left) & set(right))
+        self.assertEqual(band_keys([]), [])
+
+    def test_canonical_url(self):
+        """Test tracking parameters, hosts and Amazon slugs are normalized."""
+        self.assertEqual(
+            canonical_url("http://www.jumia.com.ng/apple-iphone-13-123.html/?utm_source=x#top"),
+            "https://jumia.com.ng/apple-iphone-13-123.html",
+        )
+        self.assertEqual(
+            canonical_url("https://www.amazon.com/Apple-iPhone-13/dp/B09G9FPHY6/ref=sr_1_1?tag=a"),
+            "https://amazon.com/dp/B09G9FPHY6",
+        )
+        self.assertEqual(
+            canonical_url("https://www.jumia.com.ng/catalog/?sku=AP123&utm_medium=email"),
+            "https://jumia.com.ng/catalog?sku=AP123",
+        )
+
+    def test_group_duplicate_listings(self):
+        """Test listings differing only in tracking parameters are scraped once."""
+        products = [
+            Product(id=1, name="A", url="https://konga.com/product/a-1?ref=home", site="konga"),
+            Product(id=2, name="A", url="https://www.konga.com/product/a-1", site="konga"),
+            Product(id=3, name="B", url="https://konga.com/product/b-2", site="konga"),
+        ]
+        grouped = group_duplicate_listings(products)
+        self.assertEqual([[p.id for p in group] for group in grouped.values()], [[1, 2], [3]])
+
+
+class TestProductMatcher(unittest.IsolatedAsyncioTestCase):
+    """Test match groups maintained as products are added."""
+
+    async def asyncSetUp(self):
+        """Set up an in-memory database."""
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            for model in (Product, ProductMatchBucket, PriceSnapshot, PriceHistoryDaily):
+                await conn.run_sync(model.__table__.create)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def asyncTearDown(self):
+        """Dispose the database."""
+        await self.engine.dispose()
+
+    async def test_groups_and_offers(self):
+        """Test products across retailers share a group and offers sort by price."""
+        async with self.session_factory() as db:
+            service = ProductService(db)
+            jumia = await service.get_or_create_product(
+                "https://www.jumia.com.ng/iphone-13-pro-1.html",
+                "Apple iPhone 13 Pro 256GB Graphite",
+                "jumia",
+            )
+            konga = await service.get_or_create_product(
+                "https://www.konga.com/product/iphone-13-pro-2",
+                "iPhone 13 Pro - 256 GB - Sierra Blue (Apple)",
+                "konga",
+            )
+            amazon = await service.get_or_create_product(
+                "https://www.amazon.com/dp/B09G9FPHY6",
+                "Apple iPhone 13 Pro, 256GB, Gold - Unlocked",
+                "amazon",
+            )
+            other = await service.get_or_create_product(
+                "https://www.konga.com/product/iphone-13-3",
+                "Apple iPhone 13 256GB",
+                "konga",
+            )
+            duplicate = await service.get_or_create_product(
+                "https://konga.com/product/iphone-13-pro-2?utm_source=newsletter",
+                "iPhone 13 Pro - 256 GB - Sierra Blue (Apple)",
+                "konga",
+            )
+
+            self.assertEqual(duplicate.id, konga.id)
+            self.assertEqual(konga.match_group_id, jumia.id)
+            self.assertEqual(amazon.match_group_id, jumia.id)
+            self.assertEqual(other.match_group_id, other.id)
+
+            for product, price in ((jumia, 950000), (konga, 920000), (amazon, 990000)):
+                await db.run_sync(update_snapshot, "ecommerce", product.id, Decimal(price))
+            await db.commit()
+
+            offers = await product_matcher.get_offers(db, amazon.id)
+            self.assertEqual([offer["site"] for offer in offers], ["konga", "jumia", "amazon"])
+            self.assertEqual(offers[0]["price"], 920000)
+            self.assertEqual(await product_matcher.get_offers(db, other.id), [])
+
+            # Renaming re-buckets the product instead of adding more buckets
+            other.name = "Apple iPhone 13 Pro 256GB"
+            await product_matcher.assign(db, other)
+            await db.commit()
+            self.assertEqual(other.match_group_id, jumia.id)
+            result = await db.execute(
+                select(ProductMatchBucket).where(ProductMatchBucket.product_id == other.id)
+            )
+            self.assertEqual(len(result.scalars().all()), 8)
+
+    async def test_renamed_root_leaves_group(self):
+        """Test renaming a group's first product hands the group to another member."""
+        async with self.session_factory() as db:
+            service = ProductService(db)
+            jumia = await service.get_or_create_product(
+                "https://www.jumia.com.ng/galaxy-s23-ultra-1.html",
+                "Samsung Galaxy S23 Ultra 256GB",
+                "jumia",
+            )
+            konga = await service.get_or_create_product(
+                "https://www.konga.com/product/galaxy-s23-ultra-2",
+                "Samsung Galaxy S23 Ultra - 256 GB - Phantom Black",
+                "konga",
+            )
+            amazon = await service.get_or_create_product(
+                "https://www.amazon.com/dp/B0BSLC1ZD4",
+                "Samsung Galaxy S23 Ultra 256GB Unlocked",
+                "amazon",
+            )
+            self.assertEqual(konga.match_group_id, jumia.id)
+            self.assertEqual(amazon.match_group_id, jumia.id)
+
+            jumia.name = "Apple iPhone 15 Pro Max 512GB"
+            await product_matcher.assign(db, jumia)
+            await db.commit()
+
+            self.assertEqual(jumia.match_group_id, jumia.id)
+            self.assertEqual(konga.match_group_id, konga.id)
+            self.assertEqual(amazon.match_group_id, konga.id)
+
+            for product, price in ((jumia, 1500000), (konga, 900000), (amazon, 950000)):
+                await db.run_sync(update_snapshot, "ecommerce", product.id, Decimal(price))
+            await db.commit()
+            offers = await product_matcher.get_offers(db, jumia.id)
+            self.assertEqual([offer["product_id"] for offer in offers], [jumia.id])
+            offers = await product_matcher.get_offers(db, amazon.id)
+            self.assertEqual([offer["site"] for offer in offers], ["konga", "amazon"])
+
+            # Renaming it back rejoins the group under its new root
+            jumia.name = "Samsung Galaxy S23 Ultra 256GB"
+            await product_matcher.assign(db, jumia)
+            await db.commit()
+            self.assertEqual(jumia.match_group_id, konga.id)
+
+
+if __name__ == "__main__":
+    unittest.main()
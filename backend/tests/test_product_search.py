@@ -0,0 +1,91 @@
+"""Tests for tracked product search."""
+
+import unittest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.ecommerce.models import Product
+from app.ecommerce.services.product_search import ProductSearchService
+from app.ecommerce.services.search_index import ProductSearchIndex, tokenize
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
+
+
+class TestProductSearchIndex(unittest.TestCase):
+    """Test the in-process inverted index."""
+
+    def setUp(self):
+        """Index a small catalog."""
+        self.index = ProductSearchIndex()
+        self.index.add(1, "Apple iPhone 13 Pro Max 256GB", "jumia", "Phones")
+        self.index.add(2, "Samsung Galaxy S22 Ultra", "konga", "Phones")
+        self.index.add(3, "Apple MacBook Air M2", "jumia", "Computers")
+        self.index.add(4, "iPhone 13 Silicone Case", "konga", "Accessories")
+
+    def test_tokenize(self):
+        """Test names split into lowercase words."""
+        self.assertEqual(tokenize("Apple iPhone-13 (256GB)"), ["apple", "iphone", "13", "256gb"])
+
+    def test_ranks_full_matches_first(self):
+        """Test products matching every query word rank above partial matches."""
+        results = self.index.search("iphone 13 pro")
+        self.assertEqual(results[0], (1, 1.0))
+        self.assertEqual(results[1][0], 4)
+        self.assertLess(results[1][1], 1.0)
+
+    def test_tolerates_typos(self):
+        """Test misspelled words still find the product."""
+        results = self.index.search("samsng galaxi")
+        self.assertEqual(results[0][0], 2)
+        self.assertGreater(results[0][1], 0.3)
+
+    def test_filters(self):
+        """Test site and category filters."""
+        self.assertEqual([pid for pid, _ in self.index.search("apple", site="jumia")], [1, 3])
+        self.assertEqual([pid for pid, _ in self.index.search("apple", category="computer")], [3])
+        self.assertEqual(self.index.search("iphone", site="slot"), [])
+
+
+class TestTrackedProductSearch(unittest.TestCase):
+    """Test the search service on a database without search indexes."""
+
+    def setUp(self):
+        """Set up an in-memory database with products."""
+        self.engine = create_engine("sqlite://")
+        Product.__table__.create(self.engine)
+        self.db = Session(self.engine)
+        for i, name in enumerate(["Apple iPhone 13 Pro Max", "Samsung Galaxy S22", "Tecno Spark 10"]):
+            self.db.add(Product(name=name, url=f"http://example.com/{i}", site="jumia"))
+        self.db.commit()
+
+    def tearDown(self):
+        """Close the database."""
+        self.db.close()
+        self.engine.dispose()
+
+    def test_search_and_match(self):
+        """Test ranked search and the match threshold for reusing a product."""
+        products = ProductSearchService.search_tracked_products(self.db, "galaxy s22")
+        self.assertEqual([p.name for p in products], ["Samsung Galaxy S22"])
+
+        self.assertEqual(
+            ProductSearchService.find_tracked_product(self.db, "iphone 13 pro max").name,
+            "Apple iPhone 13 Pro Max",
+        )
+        # One shared word is not close enough to skip a live search
+        self.assertIsNone(ProductSearchService.find_tracked_product(self.db, "iphone 15 case cover"))
+
+    def test_index_follows_catalog_changes(self):
+        """Test new products are searchable without a restart."""
+        self.assertEqual(ProductSearchService.search_tracked_products(self.db, "infinix"), [])
+
+        self.db.add(Product(name="Infinix Hot 30", url="http://example.com/new", site="konga"))
+        self.db.commit()
+
+        products = ProductSearchService.search_tracked_products(self.db, "infinix hot")
+        self.assertEqual([p.name for p in products], ["Infinix Hot 30"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,27 @@
 """Unit tests for service layer functionality."""
 
 import unittest
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.models.email_outbox import EmailOutbox
+from app.core.services.email_outbox import (
+    EmailOutboxDrainer,
+    enqueue_email,
+    enqueue_emails,
+    outbox_email,
+    outbox_metrics,
+    purge_emails,
+)
+from app.core.services.email_service import EmailService, MemoryTransport
 from app.ecommerce.models import Product
 from app.ecommerce.services.product_service import ProductService
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
 
 
 class TestProductService(unittest.TestCase):
@@ -93,5 +109,143 @@ class TestProductService(unittest.TestCase):
         self.assertEqual(result[0].name, "Product 1")
 
 
+class TestEmailService(unittest.IsolatedAsyncioTestCase):
+    """Test email sending through the in-memory transport."""
+
+    def setUp(self):
+        """Set up a service that keeps emails in memory."""
+        self.transport = MemoryTransport()
+        self.service = EmailService(transport=self.transport, concurrency=2)
+
+    def test_templates_are_precompiled(self):
+        """Test every template is compiled when the service is created."""
+        self.assertIn("price_alert.html", self.service.templates)
+        self.assertIn("welcome.html", self.service.templates)
+
+    async def test_send_email(self):
+        """Test a single email is sent in one request."""
+        self.assertTrue(await self.service.send_welcome_email("user@example.com", "User"))
+        self.assertEqual(self.transport.sent[0].to, ["user@example.com"])
+        self.assertEqual(self.transport.requests, 1)
+
+    async def test_price_alerts_are_batched(self):
+        """Test an alert fan-out sends one email per recipient in batches."""
+        recipients = [f"user{number}@example.com" for number in range(250)]
+
+        sent = await self.service.send_price_alerts(recipients, "Phone", 100.0, 80.0)
+
+        self.assertEqual(sent, 250)
+        self.assertEqual(self.transport.requests, 3)
+        self.assertEqual([message.to for message in self.transport.sent][-1], [recipients[-1]])
+        self.assertIn("Phone", self.transport.sent[0].subject)
+
+    async def test_unconfigured_service_sends_nothing(self):
+        """Test sending without a transport fails without raising."""
+        self.service.transport = None
+        self.assertFalse(await self.service.send_welcome_email("user@example.com", "User"))
+        self.assertEqual(await self.service.send_price_alerts(["user@example.com"], "A", 2, 1), 0)
+
+
+class FailingTransport(MemoryTransport):
+    """A transport whose provider rejects every request."""
+
+    async def send_batch(self, messages):
+        """Fail the batch."""
+        raise RuntimeError("provider unavailable")
+
+
+class TestEmailOutbox(unittest.IsolatedAsyncioTestCase):
+    """Test queued emails are drained in batches with retries."""
+
+    async def asyncSetUp(self):
+        """Set up an outbox holding 150 price alerts and a welcome email."""
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(EmailOutbox.__table__.create)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        async with self.sessions() as db:
+            await db.run_sync(
+                enqueue_emails,
+                [
+                    outbox_email(
+                        "price_alert",
+                        f"user{number}@example.com",
+                        product_name="Phone",
+                        old_price=100.0,
+                        new_price=80.0,
+                    )
+                    for number in range(150)
+                ],
+            )
+            enqueue_email(db, "welcome", to="new@example.com", user_name="New")
+            await db.commit()
+
+    async def asyncTearDown(self):
+        """Close the database."""
+        await self.engine.dispose()
+
+    def drainer(self, transport, **kwargs):
+        """A drainer sending through `transport` without rate limiting."""
+        service = EmailService(transport=transport)
+        return EmailOutboxDrainer(service, requests_per_second=0, **kwargs)
+
+    async def statuses(self):
+        """Outbox emails per status."""
+        async with self.sessions() as db:
+            return await db.run_sync(outbox_metrics)
+
+    async def test_drain_sends_in_batches(self):
+        """Test due emails are sent in provider batches and marked sent."""
+        transport = MemoryTransport()
+
+        result = await self.drainer(transport).drain(self.sessions)
+
+        self.assertEqual(result["sent"], 151)
+        self.assertEqual(transport.requests, 2)
+        self.assertIn("Welcome", transport.sent[-1].subject)
+        self.assertEqual((await self.statuses())["sent"], 151)
+        self.assertEqual((await self.statuses())["pending"], 0)
+
+    async def test_failed_emails_are_retried_then_failed(self):
+        """Test a failed batch is retried later, until the attempts run out."""
+        drainer = self.drainer(FailingTransport(), batch_size=10, max_attempts=2)
+
+        result = await drainer.drain(self.sessions)
+        self.assertEqual(result["failed"], 10)
+        metrics = await self.statuses()
+        self.assertEqual(metrics["pending"], 151)
+        self.assertEqual(metrics["due"], 141)
+
+        # Due again once the backoff has passed
+        async with self.sessions() as db:
+            for email in await db.scalars(select(EmailOutbox).where(EmailOutbox.attempts > 0)):
+                email.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+                self.assertEqual(email.last_error, "provider unavailable")
+            await db.commit()
+        drainer.batch_size = 151
+        await drainer.drain(self.sessions)
+
+        metrics = await self.statuses()
+        self.assertEqual(metrics["failed"], 10)
+        self.assertEqual(metrics["pending"], 141)
+
+    async def test_purge_keeps_pending_and_recent_emails(self):
+        """Test only sent and failed emails older than their retention are purged."""
+        await self.drainer(MemoryTransport(), batch_size=100).drain(self.sessions)
+        now = datetime.now(timezone.utc)
+
+        async with self.sessions() as db:
+            kept = await db.run_sync(purge_emails, now, now)
+            self.assertEqual(kept, 0)
+            later = now + timedelta(days=1)
+            purged = await db.run_sync(purge_emails, later, now)
+            await db.commit()
+
+        self.assertEqual(purged, 100)
+        metrics = await self.statuses()
+        self.assertEqual((metrics["sent"], metrics["pending"]), (0, 51))
+
+
 if __name__ == "__main__":
     unittest.main()
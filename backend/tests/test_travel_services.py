@@ -4,7 +4,20 @@ import unittest
 from datetime import date
 from unittest.mock import AsyncMock, MagicMock
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.main import app  # noqa: F401  # registers all models for mapper configuration
+from app.travel.models.deal_preference import TravelDealPreference  # noqa: F401
+from app.travel.models.flight import Flight
+from app.travel.services.airports import (
+    airport_directory,
+    cheapest_route_fare,
+    normalize_route,
+    parse_route,
+)
 from app.travel.services.deal_service import TravelDealService
+from app.travel.services.travel_search import TravelSearchService
 from app.travel.services.travel_service import TravelService
 
 
@@ -37,6 +50,7 @@ class TestTravelService(unittest.IsolatedAsyncioTestCase):
 
         self.mock_db.add.assert_called_once()
         self.mock_db.commit.assert_called_once()
+        self.assertEqual(self.mock_db.add.call_args[0][0].route_key, "NYC-LAX")
 
     async def test_create_hotel(self):
         """Test creating hotel."""
@@ -98,3 +112,80 @@ class TestTravelDealService(unittest.IsolatedAsyncioTestCase):
 
         self.mock_db.execute.assert_called_once()
         self.assertEqual(result, [])
+
+
+class TestAirportDirectory(unittest.TestCase):
+    """Test airport and route normalization."""
+
+    def test_normalize(self):
+        """Test names, cities and codes resolve to IATA codes."""
+        self.assertEqual(airport_directory.normalize("Lagos"), "LOS")
+        self.assertEqual(airport_directory.normalize(" murtala  muhammed "), "LOS")
+        self.assertEqual(airport_directory.normalize("lhr"), "LHR")
+        self.assertEqual(airport_directory.normalize("XYZ"), "XYZ")
+        self.assertEqual(airport_directory.normalize("Somewhere far"), "SOMEWHERE ")
+
+    def test_routes(self):
+        """Test route keys and route queries."""
+        self.assertEqual(normalize_route("Lagos", "heathrow"), ("LOS", "LHR", "LOS-LHR"))
+        self.assertEqual(parse_route("Abuja to London"), ("ABV", "LHR"))
+        self.assertEqual(parse_route("los-dxb"), ("LOS", "DXB"))
+        self.assertIsNone(parse_route("Air Peace"))
+
+    def test_search_codes(self):
+        """Test a city matches all of its airports."""
+        self.assertEqual(airport_directory.search_codes("london"), ["LGW", "LHR"])
+        self.assertEqual(airport_directory.search_codes("Port Harc"), ["PHC"])
+        self.assertEqual(airport_directory.search_codes("arik"), [])
+
+
+class TestRouteSearch(unittest.TestCase):
+    """Test route-level flight lookups."""
+
+    def setUp(self):
+        """Set up an in-memory database with flights."""
+        self.engine = create_engine("sqlite://")
+        Flight.__table__.create(self.engine)
+        self.db = Session(self.engine)
+        for origin, destination, day, price, airline in [
+            ("Lagos", "London", 10, 900000, "Air Peace"),
+            ("LOS", "LGW", 11, 850000, "British Airways"),
+            ("LOS", "LHR", 20, 700000, "Virgin"),
+            ("Abuja", "Dubai", 10, 600000, "Emirates"),
+        ]:
+            origin, destination, key = normalize_route(origin, destination)
+            self.db.add(
+                Flight(
+                    origin=origin,
+                    destination=destination,
+                    route_key=key,
+                    departure_date=date(2026, 12, day),
+                    airline=airline,
+                    price=price,
+                    url="https://example.com",
+                    site="example",
+                )
+            )
+        self.db.commit()
+
+    def tearDown(self):
+        """Close the database."""
+        self.db.close()
+        self.engine.dispose()
+
+    def test_search_tracked_flights(self):
+        """Test route, city and airline queries."""
+        by_route = TravelSearchService.search_tracked_flights(self.db, "Lagos to Heathrow")
+        self.assertEqual([f.departure_date.day for f in by_route], [10, 20])
+
+        to_london = TravelSearchService.search_tracked_flights(self.db, "london")
+        self.assertEqual(len(to_london), 3)
+
+        by_airline = TravelSearchService.search_tracked_flights(self.db, "emirates")
+        self.assertEqual([f.destination for f in by_airline], ["DXB"])
+
+    def test_cheapest_route_fare(self):
+        """Test the cheapest fare only counts the route and nearby dates."""
+        self.assertEqual(cheapest_route_fare(self.db, "LOS-LHR", date(2026, 12, 11)), 900000)
+        self.assertEqual(cheapest_route_fare(self.db, "LOS-LHR", date(2026, 12, 19)), 700000)
+        self.assertIsNone(cheapest_route_fare(self.db, "ABV-LHR", date(2026, 12, 10)))